@@ -0,0 +1,124 @@
+"""SQLite-backed cache of Garmin wellness responses, keyed by (date, metric)."""
+
+from __future__ import annotations
+
+import json
+import sqlite3
+import threading
+import time
+from datetime import date, timedelta
+from typing import Any
+
+
+class WellnessCache:
+    """Cache per-day Garmin wellness responses with a finality rule.
+
+    Sleep, resting HR, HRV and stress for a day are only revised while the watch
+    can still sync data for it. A response fetched when its date was already more
+    than ``final_after_days`` old is final and kept until explicitly invalidated.
+    A response for a more recent date expires after ``recent_ttl`` seconds.
+    """
+
+    DEFAULT_RECENT_TTL = 600  # 10 minutes
+    DEFAULT_FINAL_AFTER_DAYS = 2
+
+    def __init__(
+        self,
+        db_path: str,
+        recent_ttl: float = DEFAULT_RECENT_TTL,
+        final_after_days: int = DEFAULT_FINAL_AFTER_DAYS,
+    ) -> None:
+        self._db_path = db_path
+        self._recent_ttl = recent_ttl
+        self._final_after_days = final_after_days
+        # One connection shared across the wellness fetch workers, opened on first use.
+        self._lock = threading.Lock()
+        self._conn: sqlite3.Connection | None = None
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            conn = sqlite3.connect(self._db_path, check_same_thread=False)
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS wellness_cache (
+                    date TEXT NOT NULL,
+                    metric TEXT NOT NULL,
+                    data TEXT NOT NULL,
+                    fetched_at REAL NOT NULL,
+                    final INTEGER NOT NULL,
+                    PRIMARY KEY (date, metric)
+                ) WITHOUT ROWID
+            """)
+            conn.commit()
+            self._conn = conn
+        return self._conn
+
+    def is_final(self, day: str) -> bool:
+        """Whether a response fetched now for ``day`` (YYYY-MM-DD) will never change."""
+        return day < (date.today() - timedelta(days=self._final_after_days)).isoformat()
+
+    def get(self, day: str, metric: str, default: Any = None) -> Any:
+        """Return the cached response, or ``default`` on a miss or an expired recent entry.
+
+        A cached response may itself be None (Garmin had no data for that day), so
+        pass a sentinel ``default`` to tell the two apart.
+        """
+        with self._lock:
+            row = (
+                self._connect()
+                .execute(
+                    "SELECT data, fetched_at, final FROM wellness_cache WHERE date = ? AND metric = ?",
+                    (day, metric),
+                )
+                .fetchone()
+            )
+        if row is None:
+            return default
+        data, fetched_at, final = row
+        if not final and time.time() - fetched_at > self._recent_ttl:
+            return default
+        return json.loads(data)
+
+    def set(self, day: str, metric: str, data: Any) -> None:
+        with self._lock:
+            conn = self._connect()
+            with conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO wellness_cache (date, metric, data, fetched_at, final)"
+                    " VALUES (?, ?, ?, ?, ?)",
+                    (day, metric, json.dumps(data), time.time(), int(self.is_final(day))),
+                )
+
+    def invalidate(self, start: str | None = None, end: str | None = None, metric: str | None = None) -> int:
+        """Drop cached responses for dates in [start, end] (either bound optional), optionally one metric.
+
+        Returns the number of entries removed.
+        """
+        clauses, params = [], []
+        if start is not None:
+            clauses.append("date >= ?")
+            params.append(start)
+        if end is not None:
+            clauses.append("date <= ?")
+            params.append(end)
+        if metric is not None:
+            clauses.append("metric = ?")
+            params.append(metric)
+        where = f" WHERE {' AND '.join(clauses)}" if clauses else ""
+        with self._lock:
+            conn = self._connect()
+            with conn:
+                return conn.execute(f"DELETE FROM wellness_cache{where}", params).rowcount
+
+    def clear_expired(self) -> int:
+        """Remove recent entries past their TTL. Final entries are kept."""
+        cutoff = time.time() - self._recent_ttl
+        with self._lock:
+            conn = self._connect()
+            with conn:
+                return conn.execute("DELETE FROM wellness_cache WHERE final = 0 AND fetched_at < ?", (cutoff,)).rowcount
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
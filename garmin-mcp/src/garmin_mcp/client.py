@@ -2,18 +2,26 @@
 
 from __future__ import annotations
 
+import copy
 import logging
+import threading
+import time
 from typing import TYPE_CHECKING, Any
 
 from garminconnect import Garmin
 
 from garmin_mcp.auth import GarminAuth
+from garmin_mcp.cache import WellnessCache
 
 if TYPE_CHECKING:
+    from collections.abc import Callable, Hashable
+
     from garmin_mcp.config import Settings
 
 logger = logging.getLogger(__name__)
 
+_MISSING = object()
+
 
 class GarminAPIError(RuntimeError):
     """Structured error from the Garmin Connect API with recovery guidance."""
@@ -31,19 +39,111 @@ class GarminAPIError(RuntimeError):
         }
 
 
+class RateLimiter:
+    """Spaces requests to one host at least ``1 / rate`` seconds apart, across threads."""
+
+    def __init__(self, rate: float) -> None:
+        self._interval = 1.0 / rate if rate > 0 else 0.0
+        self._lock = threading.Lock()
+        self._next = 0.0
+
+    def acquire(self) -> None:
+        """Block until the next request slot is free, then claim it."""
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next)
+            self._next = slot + self._interval
+        if slot > now:
+            time.sleep(slot - now)
+
+    def pause(self, seconds: float) -> None:
+        """Hold every caller back for ``seconds``, e.g. after the host answered 429."""
+        with self._lock:
+            self._next = max(self._next, time.monotonic() + seconds)
+
+
+class _Flight:
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: BaseException | None = None
+
+
+class SingleFlight:
+    """Collapse concurrent identical calls into one, across threads.
+
+    The first thread to ask for a key makes the call; threads asking for it while
+    the call is in flight wait and get a copy of its result, or its exception.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._flights: dict[Hashable, _Flight] = {}
+        self._counters = dict.fromkeys(("calls", "collapsed"), 0)
+
+    def do(self, key: Hashable, call: Callable[[], Any]) -> Any:
+        with self._lock:
+            self._counters["calls"] += 1
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = _Flight()
+            else:
+                self._counters["collapsed"] += 1
+
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return copy.deepcopy(flight.result)
+
+        try:
+            flight.result = call()
+        except BaseException as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._flights[key]
+            flight.done.set()
+        return flight.result
+
+    def stats(self) -> dict[str, int]:
+        """Calls made through the layer, how many of them joined one already in flight, and flights open now."""
+        with self._lock:
+            return {**self._counters, "in_flight": len(self._flights)}
+
+
 class GarminClient:
-    """Wraps garminconnect.Garmin with lazy init and error handling."""
+    """Wraps garminconnect.Garmin with lazy init and error handling.
+
+    Concurrent identical reads (``get_*`` methods of garminconnect) share one request.
+    """
 
     def __init__(self, settings: Settings) -> None:
         self._settings = settings
         self._garmin: Garmin | None = None
         self._auth = GarminAuth(settings.garth_home)
+        self._login_lock = threading.Lock()
+        # Every call goes to connectapi.garmin.com, so one limiter per client is per host.
+        self.rate_limiter = RateLimiter(settings.max_requests_per_second)
+        self.flights = SingleFlight()
+        self.wellness_cache = WellnessCache(settings.db_path)
 
     def _ensure_client(self) -> Garmin:
-        """Lazily initialize and authenticate the Garmin client."""
+        """Lazily initialize and authenticate the Garmin client.
+
+        Safe to call from several threads at once: only the first caller logs in.
+        """
         if self._garmin is not None:
             return self._garmin
+        with self._login_lock:
+            if self._garmin is None:
+                self._login()
+        return self._garmin
 
+    def _login(self) -> None:
+        """Resume the stored session and log in; caller holds ``_login_lock``."""
         if not self._auth.resume():
             raise GarminAPIError(
                 code="auth_required",
@@ -52,24 +152,31 @@ class GarminClient:
             )
 
         try:
-            self._garmin = Garmin()
-            self._garmin.login(self._settings.garth_home)
+            garmin = Garmin()
+            garmin.login(self._settings.garth_home)
         except Exception as e:
             raise GarminAPIError(
                 code="auth_failed",
                 message=f"Failed to initialize Garmin client: {e}",
                 action="Run `garmin-mcp-login` to re-authenticate.",
             ) from e
-
-        return self._garmin
+        self._garmin = garmin
 
     def _call(self, method_name: str, *args: Any, **kwargs: Any) -> Any:
+        """Call a method on the Garmin client, collapsing identical concurrent reads."""
+        if not method_name.startswith("get_"):
+            return self._invoke(method_name, *args, **kwargs)
+        key = (method_name, repr(args), repr(sorted(kwargs.items())))
+        return self.flights.do(key, lambda: self._invoke(method_name, *args, **kwargs))
+
+    def _invoke(self, method_name: str, *args: Any, **kwargs: Any) -> Any:
         """Call a method on the Garmin client with error handling."""
         client = self._ensure_client()
         method = getattr(client, method_name, None)
         if method is None:
             msg = f"Garmin client has no method '{method_name}'"
             raise AttributeError(msg)
+        self.rate_limiter.acquire()
         try:
             return method(*args, **kwargs)
         except Exception as e:
@@ -122,6 +229,7 @@ class GarminClient:
         """
         client = self._ensure_client()
         workout_id = workout_json.get("workoutId")
+        self.rate_limiter.acquire()
         try:
             url = f"/workout-service/workout/{workout_id}"
             resp = client.garth.put("connectapi", url, api=True, json=workout_json)
@@ -143,6 +251,7 @@ class GarminClient:
         Uses garth directly since garminconnect doesn't expose this method.
         """
         client = self._ensure_client()
+        self.rate_limiter.acquire()
         try:
             url = f"/workout-service/workout/{workout_id}"
             resp = client.garth.delete("connectapi", url, api=True)
@@ -165,6 +274,7 @@ class GarminClient:
         Uses garth directly since garminconnect doesn't expose this method.
         """
         client = self._ensure_client()
+        self.rate_limiter.acquire()
         try:
             url = f"/workout-service/schedule/{workout_id}"
             payload = {"date": date}
@@ -188,7 +298,11 @@ class GarminClient:
             year: Calendar year.
             month: Calendar month, 0-indexed (0=Jan, 11=Dec).
         """
+        return self.flights.do(("get_calendar", year, month), lambda: self._fetch_calendar(year, month))
+
+    def _fetch_calendar(self, year: int, month: int) -> Any:
         client = self._ensure_client()
+        self.rate_limiter.acquire()
         try:
             url = f"/calendar-service/year/{year}/month/{month}"
             resp = client.garth.get("connectapi", url, api=True)
@@ -208,6 +322,7 @@ class GarminClient:
             schedule_id: The calendar schedule entry ID (not the workout ID).
         """
         client = self._ensure_client()
+        self.rate_limiter.acquire()
         try:
             url = f"/workout-service/schedule/{schedule_id}"
             resp = client.garth.delete("connectapi", url, api=True)
@@ -222,13 +337,22 @@ class GarminClient:
 
     # ── Wellness Data ─────────────────────────────────────────────────
 
+    def _wellness(self, metric: str, method_name: str, date: str) -> Any:
+        """Fetch one day of a wellness metric, answering from ``wellness_cache`` when it can."""
+        cached = self.wellness_cache.get(date, metric, _MISSING)
+        if cached is not _MISSING:
+            return cached
+        data = self._call(method_name, date)
+        self.wellness_cache.set(date, metric, data)
+        return data
+
     def get_body_battery(self, date: str) -> Any:
         """Get daily body battery data.
 
         Args:
             date: Date in YYYY-MM-DD format.
         """
-        return self._call("get_body_battery", date)
+        return self._wellness("body_battery", "get_body_battery", date)
 
     def get_sleep(self, date: str) -> Any:
         """Get sleep score and summary.
@@ -236,7 +360,7 @@ class GarminClient:
         Args:
             date: Date in YYYY-MM-DD format.
         """
-        return self._call("get_sleep_data", date)
+        return self._wellness("sleep", "get_sleep_data", date)
 
     def get_hrv(self, date: str) -> Any:
         """Get HRV status.
@@ -244,7 +368,7 @@ class GarminClient:
         Args:
             date: Date in YYYY-MM-DD format.
         """
-        return self._call("get_hrv_data", date)
+        return self._wellness("hrv", "get_hrv_data", date)
 
     def get_training_readiness(self, date: str) -> Any:
         """Get training readiness score.
@@ -252,7 +376,7 @@ class GarminClient:
         Args:
             date: Date in YYYY-MM-DD format.
         """
-        return self._call("get_training_readiness", date)
+        return self._wellness("training_readiness", "get_training_readiness", date)
 
     def get_stress(self, date: str) -> Any:
         """Get daily stress data.
@@ -260,7 +384,7 @@ class GarminClient:
         Args:
             date: Date in YYYY-MM-DD format.
         """
-        return self._call("get_stress_data", date)
+        return self._wellness("stress", "get_stress_data", date)
 
     def get_resting_hr(self, date: str) -> Any:
         """Get resting heart rate for a date.
@@ -268,4 +392,4 @@ class GarminClient:
         Args:
             date: Date in YYYY-MM-DD format.
         """
-        return self._call("get_rhr_day", date)
+        return self._wellness("resting_hr", "get_rhr_day", date)
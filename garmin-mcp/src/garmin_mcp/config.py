@@ -28,6 +28,17 @@ def _parse_port(value: str) -> int:
         raise ValueError(msg) from None
 
 
+def _parse_number(name: str, value: str, kind: type[int] | type[float]) -> int | float:
+    try:
+        parsed = kind(value)
+    except ValueError:
+        parsed = 0
+    if parsed <= 0:
+        msg = f"{name} must be a positive number, got: {value!r}"
+        raise ValueError(msg)
+    return parsed
+
+
 @dataclass(frozen=True)
 class Settings:
     email: str
@@ -35,6 +46,9 @@ class Settings:
     host: str = "127.0.0.1"
     port: int = 8003
     garth_home: str = "~/.garth"
+    db_path: str = "garmin_mcp.db"
+    wellness_workers: int = 4
+    max_requests_per_second: float = 8.0
 
     @classmethod
     def from_env(cls) -> Settings:
@@ -49,10 +63,23 @@ class Settings:
             msg = "GARMIN_EMAIL and GARMIN_PASSWORD must be set"
             raise ValueError(msg)
 
+        raw_db = os.environ.get("GARMIN_MCP_DB", "garmin_mcp.db")
+        # Resolve relative db_path against the .env directory so it's stable
+        # regardless of which process/cwd imports this module.
+        if not os.path.isabs(raw_db) and env_file is not None:
+            raw_db = str(env_file.parent / raw_db)
+
         return cls(
             email=email,
             password=password,
             host=os.environ.get("GARMIN_MCP_HOST", "127.0.0.1"),
             port=_parse_port(os.environ.get("GARMIN_MCP_PORT", "8003")),
             garth_home=os.environ.get("GARTH_HOME", "~/.garth"),
+            db_path=raw_db,
+            wellness_workers=int(
+                _parse_number("GARMIN_WELLNESS_WORKERS", os.environ.get("GARMIN_WELLNESS_WORKERS", "4"), int)
+            ),
+            max_requests_per_second=float(
+                _parse_number("GARMIN_MAX_RPS", os.environ.get("GARMIN_MAX_RPS", "8"), float)
+            ),
         )
@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import asyncio
 import json
 from datetime import date, timedelta
 from typing import Any
@@ -10,6 +11,7 @@ from mcp.server.fastmcp import FastMCP
 
 from garmin_mcp.client import GarminAPIError, GarminClient
 from garmin_mcp.config import Settings
+from garmin_mcp.wellness import WELLNESS_METRICS, fetch_wellness_days
 from garmin_mcp.workout_builder import (
     WORKOUT_TYPES,
     build_cardio_workout,
@@ -106,7 +108,7 @@ async def list_workouts(start: int = 0, limit: int = 50) -> dict:
         limit: Max results to return (default 50).
     """
     try:
-        workouts = garmin.get_workouts(start, limit)
+        workouts = await asyncio.to_thread(garmin.get_workouts, start, limit)
         if isinstance(workouts, list):
             return {
                 "count": len(workouts),
@@ -134,7 +136,7 @@ async def get_workout(workout_id: int) -> dict:
         workout_id: The Garmin workout ID.
     """
     try:
-        return garmin.get_workout(workout_id)
+        return await asyncio.to_thread(garmin.get_workout, workout_id)
     except GarminAPIError as e:
         return e.to_dict()
 
@@ -196,7 +198,7 @@ async def list_calendar(start_date: str, end_date: str) -> dict:
         if key not in seen_months:
             seen_months.add(key)
             try:
-                data = garmin.get_calendar(current.year, current.month - 1)
+                data = await asyncio.to_thread(garmin.get_calendar, current.year, current.month - 1)
                 items = data.get("calendarItems", []) if isinstance(data, dict) else []
                 all_items.extend(items)
             except GarminAPIError:
@@ -312,7 +314,7 @@ async def get_body_battery(date: str) -> dict:
         date: Date in YYYY-MM-DD format.
     """
     try:
-        return {"date": date, "data": garmin.get_body_battery(date)}
+        return {"date": date, "data": await asyncio.to_thread(garmin.get_body_battery, date)}
     except GarminAPIError as e:
         return e.to_dict()
 
@@ -325,7 +327,7 @@ async def get_sleep(date: str) -> dict:
         date: Date in YYYY-MM-DD format.
     """
     try:
-        return garmin.get_sleep(date)
+        return await asyncio.to_thread(garmin.get_sleep, date)
     except GarminAPIError as e:
         return e.to_dict()
 
@@ -338,7 +340,7 @@ async def get_hrv(date: str) -> dict:
         date: Date in YYYY-MM-DD format.
     """
     try:
-        data = garmin.get_hrv(date)
+        data = await asyncio.to_thread(garmin.get_hrv, date)
         if data is None:
             return {"date": date, "hrv": None, "message": "No HRV data available for this date."}
         return data
@@ -354,7 +356,7 @@ async def get_training_readiness(date: str) -> dict:
         date: Date in YYYY-MM-DD format.
     """
     try:
-        return garmin.get_training_readiness(date)
+        return await asyncio.to_thread(garmin.get_training_readiness, date)
     except GarminAPIError as e:
         return e.to_dict()
 
@@ -367,7 +369,7 @@ async def get_stress(date: str) -> dict:
         date: Date in YYYY-MM-DD format.
     """
     try:
-        return garmin.get_stress(date)
+        return await asyncio.to_thread(garmin.get_stress, date)
     except GarminAPIError as e:
         return e.to_dict()
 
@@ -380,7 +382,7 @@ async def get_resting_hr(date: str) -> dict:
         date: Date in YYYY-MM-DD format.
     """
     try:
-        data = garmin.get_resting_hr(date)
+        data = await asyncio.to_thread(garmin.get_resting_hr, date)
         if data is None:
             return {"date": date, "resting_hr": None, "message": "No resting HR data available for this date."}
         return data
@@ -401,24 +403,38 @@ async def get_wellness_snapshot(days: int = 7) -> dict:
     today = date.today()
     dates = [(today - timedelta(days=i)).isoformat() for i in range(days)]
 
-    snapshot: dict[str, Any] = {"dates": dates, "days": []}
-    for d in dates:
-        day_data: dict[str, Any] = {"date": d}
-        for metric, fetch in [
-            ("body_battery", garmin.get_body_battery),
-            ("sleep", garmin.get_sleep),
-            ("hrv", garmin.get_hrv),
-            ("resting_hr", garmin.get_resting_hr),
-            ("training_readiness", garmin.get_training_readiness),
-            ("stress", garmin.get_stress),
-        ]:
-            try:
-                day_data[metric] = fetch(d)
-            except GarminAPIError:
-                day_data[metric] = None
-        snapshot["days"].append(day_data)
+    # Fan the (day, metric) requests out on a worker pool, off the event loop.
+    fetched = await asyncio.to_thread(
+        lambda: dict(fetch_wellness_days(garmin, dates, workers=settings.wellness_workers))
+    )
+    return {"dates": dates, "days": [{"date": d, **fetched[d]} for d in dates]}
 
-    return snapshot
+
+@mcp.tool()
+async def invalidate_wellness_cache(
+    start_date: str | None = None,
+    end_date: str | None = None,
+    metric: str | None = None,
+) -> dict:
+    """Drop cached wellness responses so the next fetch goes back to Garmin.
+
+    Responses for days more than two days old are cached indefinitely; use this
+    after Garmin revises an older day (e.g. a late watch sync or manual edit).
+    With no arguments, the whole cache is cleared.
+
+    Args:
+        start_date: First date to drop (YYYY-MM-DD), inclusive.
+        end_date: Last date to drop (YYYY-MM-DD), inclusive.
+        metric: Only drop this metric (body_battery, sleep, hrv, resting_hr, training_readiness, stress).
+    """
+    if metric is not None and metric not in WELLNESS_METRICS:
+        return {
+            "error": "invalid_metric",
+            "message": f"Unknown metric: {metric}",
+            "action": f"Use one of: {', '.join(WELLNESS_METRICS)}.",
+        }
+    removed = garmin.wellness_cache.invalidate(start_date, end_date, metric)
+    return {"invalidated": removed}
 
 
 # ── Resources ──────────────────────────────────────────────────────────
@@ -430,6 +446,12 @@ async def workout_types_resource() -> str:
     return json.dumps(WORKOUT_TYPES, indent=2)
 
 
+@mcp.resource("garmin://request-stats")
+async def request_stats_resource() -> dict:
+    """Single-flight counters: ``collapsed`` calls shared an identical in-flight request instead of calling Garmin."""
+    return {"single_flight": garmin.flights.stats()}
+
+
 # ── Helpers ────────────────────────────────────────────────────────────
 
 
@@ -0,0 +1,114 @@
+"""Concurrent fetching of Garmin wellness metrics over a (day, metric) matrix.
+
+A 14-day first sync or a 30-day snapshot is one independent request per (day, metric) pair.
+``fetch_wellness_days`` runs them on a bounded worker pool behind the client's
+per-host rate limiter, retries requests Garmin throttles with exponential backoff,
+and yields each day as soon as all of its metrics are in.
+"""
+
+from __future__ import annotations
+
+import logging
+import random
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import TYPE_CHECKING, Any
+
+from garmin_mcp.client import GarminAPIError
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Iterator
+
+    from garmin_mcp.client import GarminClient
+
+logger = logging.getLogger(__name__)
+
+# Metric name → GarminClient method that fetches it for one date.
+WELLNESS_METRICS: dict[str, str] = {
+    "body_battery": "get_body_battery",
+    "sleep": "get_sleep",
+    "hrv": "get_hrv",
+    "resting_hr": "get_resting_hr",
+    "training_readiness": "get_training_readiness",
+    "stress": "get_stress",
+}
+
+DEFAULT_WORKERS = 4
+DEFAULT_MAX_RETRIES = 3
+DEFAULT_BACKOFF_S = 2.0
+
+
+def fetch_metric(
+    client: GarminClient,
+    date: str,
+    metric: str,
+    *,
+    max_retries: int = DEFAULT_MAX_RETRIES,
+    backoff_s: float = DEFAULT_BACKOFF_S,
+) -> Any:
+    """Fetch one metric for one date, retrying when Garmin rate-limits the request.
+
+    A 429 pauses the client's rate limiter for an exponentially growing, jittered
+    delay, so every worker backs off together. Returns None once retries are spent
+    or on any other failure.
+    """
+    fetch = getattr(client, WELLNESS_METRICS[metric])
+    for attempt in range(max_retries + 1):
+        try:
+            return fetch(date)
+        except GarminAPIError as e:
+            if e.code != "rate_limited" or attempt == max_retries:
+                logger.warning("Garmin %s for %s failed: %s", metric, date, e)
+                return None
+            delay = backoff_s * 2**attempt * (1 + random.random() / 4)
+            logger.info("Garmin rate limited on %s for %s; backing off %.1fs", metric, date, delay)
+            client.rate_limiter.pause(delay)
+        except Exception:
+            logger.warning("Garmin %s for %s failed", metric, date, exc_info=True)
+            return None
+    return None
+
+
+def fetch_wellness_days(
+    client: GarminClient,
+    dates: Iterable[str],
+    metrics: Iterable[str] = tuple(WELLNESS_METRICS),
+    *,
+    workers: int = DEFAULT_WORKERS,
+    max_retries: int = DEFAULT_MAX_RETRIES,
+    backoff_s: float = DEFAULT_BACKOFF_S,
+) -> Iterator[tuple[str, dict[str, Any]]]:
+    """Fetch every (date, metric) pair concurrently, yielding ``(date, {metric: data})`` per day.
+
+    Requests are queued day by day, so early dates tend to finish first, but days are
+    yielded in completion order. A metric that fails is None. Closing the iterator
+    early cancels requests that have not started.
+
+    Raises:
+        ValueError: If a metric is not in ``WELLNESS_METRICS``.
+    """
+    dates = list(dict.fromkeys(dates))
+    metrics = list(dict.fromkeys(metrics))
+    unknown = [m for m in metrics if m not in WELLNESS_METRICS]
+    if unknown:
+        msg = f"Unknown wellness metrics: {', '.join(unknown)}"
+        raise ValueError(msg)
+    if not dates or not metrics:
+        return
+
+    results: dict[str, dict[str, Any]] = {d: {} for d in dates}
+    pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="garmin-wellness")
+    try:
+        futures = {
+            pool.submit(fetch_metric, client, d, m, max_retries=max_retries, backoff_s=backoff_s): (d, m)
+            for d in dates
+            for m in metrics
+        }
+        for future in as_completed(futures):
+            d, m = futures[future]
+            day = results[d]
+            day[m] = future.result()
+            if len(day) == len(metrics):
+                del results[d]
+                yield d, {metric: day[metric] for metric in metrics}
+    finally:
+        pool.shutdown(wait=False, cancel_futures=True)
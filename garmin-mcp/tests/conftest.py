@@ -16,12 +16,13 @@ from garmin_mcp.config import Settings
 
 
 @pytest.fixture()
-def settings():
+def settings(tmp_path):
     """Test settings with dummy credentials."""
     return Settings(
         email="test@example.com",
         password="test_password",
         garth_home="/tmp/test_garth",
+        db_path=str(tmp_path / "garmin.db"),
     )
 
 
@@ -436,3 +436,30 @@ class TestGetWellnessSnapshot:
         for day in result["days"]:
             assert day["hrv"] is None
             assert day["sleep"]["sleepScore"] == 82
+
+    @pytest.mark.asyncio()
+    async def test_invalidate_wellness_cache(self, _wired):
+        from garmin_mcp.server import invalidate_wellness_cache
+
+        _wired.wellness_cache.invalidate.return_value = 4
+        result = await invalidate_wellness_cache(start_date="2026-03-01", metric="sleep")
+        assert result == {"invalidated": 4}
+        _wired.wellness_cache.invalidate.assert_called_once_with("2026-03-01", None, "sleep")
+
+    @pytest.mark.asyncio()
+    async def test_invalidate_wellness_cache_unknown_metric(self, _wired):
+        from garmin_mcp.server import invalidate_wellness_cache
+
+        result = await invalidate_wellness_cache(metric="vo2max")
+        assert result["error"] == "invalid_metric"
+        _wired.wellness_cache.invalidate.assert_not_called()
+
+
+@pytest.mark.usefixtures("_wired")
+class TestRequestStats:
+    @pytest.mark.asyncio()
+    async def test_reports_single_flight_counters(self, _wired):
+        from garmin_mcp.server import request_stats_resource
+
+        _wired.flights.stats.return_value = {"calls": 4, "collapsed": 3, "in_flight": 0}
+        assert await request_stats_resource() == {"single_flight": {"calls": 4, "collapsed": 3, "in_flight": 0}}
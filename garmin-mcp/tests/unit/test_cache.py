@@ -0,0 +1,89 @@
+"""Unit tests for the wellness cache."""
+
+from __future__ import annotations
+
+import time
+from datetime import date, timedelta
+from unittest.mock import patch
+
+import pytest
+
+from garmin_mcp.cache import WellnessCache
+
+_MISS = object()
+
+
+def _day(days_ago: int) -> str:
+    return (date.today() - timedelta(days=days_ago)).isoformat()
+
+
+@pytest.fixture()
+def cache(tmp_path):
+    c = WellnessCache(str(tmp_path / "garmin.db"), recent_ttl=60)
+    yield c
+    c.close()
+
+
+class TestWellnessCache:
+    def test_set_and_get(self, cache):
+        cache.set(_day(10), "sleep", {"sleepTimeSeconds": 28000})
+        assert cache.get(_day(10), "sleep") == {"sleepTimeSeconds": 28000}
+
+    def test_miss_returns_default(self, cache):
+        assert cache.get(_day(10), "sleep", _MISS) is _MISS
+
+    def test_cached_none_is_a_hit(self, cache):
+        cache.set(_day(10), "hrv", None)
+        assert cache.get(_day(10), "hrv", _MISS) is None
+
+    def test_finality_rule(self, cache):
+        assert cache.is_final(_day(3))
+        assert not cache.is_final(_day(2))
+        assert not cache.is_final(_day(0))
+
+    def test_recent_day_expires_after_ttl(self, cache):
+        cache.set(_day(1), "sleep", {"v": 1})
+        cache.set(_day(5), "sleep", {"v": 5})
+
+        with patch("garmin_mcp.cache.time") as mock_time:
+            mock_time.time.return_value = time.time() + 3600
+            assert cache.get(_day(1), "sleep", _MISS) is _MISS
+            assert cache.get(_day(5), "sleep") == {"v": 5}
+
+    def test_recent_entry_stays_volatile_after_it_ages(self, tmp_path):
+        """Finality is decided at fetch time: yesterday's data cached today is not final later on."""
+        c = WellnessCache(str(tmp_path / "garmin.db"), recent_ttl=60)
+        c.set(_day(1), "sleep", {"v": 1})
+        c._final_after_days = -10  # now every date counts as final for new writes
+        with patch("garmin_mcp.cache.time") as mock_time:
+            mock_time.time.return_value = time.time() + 3600
+            assert c.get(_day(1), "sleep", _MISS) is _MISS
+
+    def test_invalidate_range_and_metric(self, cache):
+        for days_ago in (3, 4, 5):
+            cache.set(_day(days_ago), "sleep", {})
+            cache.set(_day(days_ago), "stress", {})
+
+        assert cache.invalidate(_day(4), _day(3), "sleep") == 2
+        assert cache.get(_day(3), "sleep", _MISS) is _MISS
+        assert cache.get(_day(3), "stress", _MISS) == {}
+        assert cache.get(_day(5), "sleep", _MISS) == {}
+
+        assert cache.invalidate() == 4
+        assert cache.get(_day(5), "stress", _MISS) is _MISS
+
+    def test_clear_expired_keeps_final(self, cache):
+        cache.set(_day(0), "sleep", {})
+        cache.set(_day(9), "sleep", {})
+
+        with patch("garmin_mcp.cache.time") as mock_time:
+            mock_time.time.return_value = time.time() + 3600
+            assert cache.clear_expired() == 1
+        assert cache.get(_day(9), "sleep", _MISS) == {}
+
+    def test_persists_across_instances(self, tmp_path):
+        path = str(tmp_path / "garmin.db")
+        first = WellnessCache(path)
+        first.set(_day(7), "resting_hr", {"restingHeartRate": 50})
+        first.close()
+        assert WellnessCache(path).get(_day(7), "resting_hr") == {"restingHeartRate": 50}
@@ -2,17 +2,22 @@
 
 from __future__ import annotations
 
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from unittest.mock import MagicMock, patch
 
 import pytest
 
-from garmin_mcp.client import GarminAPIError, GarminClient
+from garmin_mcp.client import GarminAPIError, GarminClient, RateLimiter, SingleFlight
 from garmin_mcp.config import Settings
 
 
 @pytest.fixture()
-def client_settings():
-    return Settings(email="test@example.com", password="test", garth_home="/tmp/test_garth")
+def client_settings(tmp_path):
+    return Settings(
+        email="test@example.com", password="test", garth_home="/tmp/test_garth", db_path=str(tmp_path / "garmin.db")
+    )
 
 
 class TestGarminAPIError:
@@ -29,6 +34,72 @@ class TestGarminAPIError:
         assert str(err) == "msg"
 
 
+class TestRateLimiter:
+    def test_spaces_requests(self):
+        limiter = RateLimiter(rate=50)
+        start = time.monotonic()
+        for _ in range(6):
+            limiter.acquire()
+        assert time.monotonic() - start >= 5 / 50
+
+    def test_pause_holds_back_next_request(self):
+        limiter = RateLimiter(rate=0)
+        limiter.pause(0.05)
+        start = time.monotonic()
+        limiter.acquire()
+        assert time.monotonic() - start >= 0.04
+
+    def test_zero_rate_is_unlimited(self):
+        limiter = RateLimiter(rate=0)
+        start = time.monotonic()
+        for _ in range(100):
+            limiter.acquire()
+        assert time.monotonic() - start < 0.05
+
+
+class TestSingleFlight:
+    def test_concurrent_calls_share_one_result(self):
+        flights = SingleFlight()
+        calls = []
+
+        def fetch():
+            calls.append(1)
+            time.sleep(0.05)
+            return {"score": 80}
+
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            results = list(pool.map(lambda _: flights.do("k", fetch), range(4)))
+        assert len(calls) == 1
+        assert results == [{"score": 80}] * 4
+        assert len({id(r) for r in results}) == 4  # waiting threads get copies
+        assert flights.stats() == {"calls": 4, "collapsed": 3, "in_flight": 0}
+
+    def test_error_is_shared(self):
+        flights = SingleFlight()
+        started = threading.Event()
+
+        def fail():
+            started.set()
+            time.sleep(0.05)
+            raise GarminAPIError(code="api_error", message="boom", action="retry")
+
+        def run(_):
+            try:
+                flights.do("k", fail)
+            except GarminAPIError as e:
+                return str(e)
+
+        with ThreadPoolExecutor(max_workers=3) as pool:
+            assert list(pool.map(run, range(3))) == ["boom"] * 3
+        assert flights.stats()["calls"] == 3
+
+    def test_sequential_calls_are_not_collapsed(self):
+        flights = SingleFlight()
+        assert flights.do("k", lambda: 1) == 1
+        assert flights.do("k", lambda: 2) == 2
+        assert flights.stats()["collapsed"] == 0
+
+
 class TestGarminClient:
     def test_ensure_client_no_session_raises(self, client_settings):
         client = GarminClient(client_settings)
@@ -61,6 +132,40 @@ class TestGarminClient:
             result = client._ensure_client()
             assert result is mock_instance
 
+    def test_ensure_client_logs_in_once_across_threads(self, client_settings):
+        client = GarminClient(client_settings)
+        with (
+            patch.object(client._auth, "resume", return_value=True),
+            patch("garmin_mcp.client.Garmin") as mock_garmin_cls,
+        ):
+            mock_garmin_cls.return_value.login.side_effect = lambda _home: time.sleep(0.05)
+            with ThreadPoolExecutor(max_workers=4) as pool:
+                clients = list(pool.map(lambda _: client._ensure_client(), range(4)))
+        assert mock_garmin_cls.call_count == 1
+        assert all(c is clients[0] for c in clients)
+
+    def test_concurrent_identical_reads_share_one_request(self, client_settings):
+        client = GarminClient(client_settings)
+        mock_garmin = MagicMock()
+        mock_garmin.get_sleep_data.side_effect = lambda _date: time.sleep(0.05) or {"sleep": 1}
+        client._garmin = mock_garmin
+
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            results = list(pool.map(lambda _: client._call("get_sleep_data", "2026-03-01"), range(4)))
+        assert results == [{"sleep": 1}] * 4
+        assert mock_garmin.get_sleep_data.call_count == 1
+        assert client.flights.stats()["collapsed"] == 3
+
+    def test_writes_are_never_collapsed(self, client_settings):
+        client = GarminClient(client_settings)
+        mock_garmin = MagicMock()
+        mock_garmin.upload_workout.side_effect = lambda _json: time.sleep(0.05) or {"workoutId": 1}
+        client._garmin = mock_garmin
+
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            list(pool.map(lambda _: client.create_workout({"workoutName": "Easy"}), range(2)))
+        assert mock_garmin.upload_workout.call_count == 2
+
     def test_call_auth_error_clears_client(self, client_settings):
         client = GarminClient(client_settings)
         mock_garmin = MagicMock()
@@ -250,6 +355,33 @@ class TestGarminClient:
         mock_garmin.get_stress_data.assert_called_once_with("2026-03-10")
         assert result == {"overallStressLevel": 35}
 
+    def test_past_wellness_day_served_from_cache(self, client_settings):
+        client = GarminClient(client_settings)
+        mock_garmin = MagicMock()
+        mock_garmin.get_sleep_data.return_value = {"sleepScore": 82}
+        mock_garmin.get_hrv_data.return_value = None
+        client._garmin = mock_garmin
+
+        assert client.get_sleep("2026-01-05") == client.get_sleep("2026-01-05") == {"sleepScore": 82}
+        assert client.get_hrv("2026-01-05") is None
+        assert client.get_hrv("2026-01-05") is None
+        assert mock_garmin.get_sleep_data.call_count == 1
+        assert mock_garmin.get_hrv_data.call_count == 1
+
+        client.wellness_cache.invalidate("2026-01-05", "2026-01-05", "sleep")
+        client.get_sleep("2026-01-05")
+        assert mock_garmin.get_sleep_data.call_count == 2
+
+    def test_failed_wellness_fetch_is_not_cached(self, client_settings):
+        client = GarminClient(client_settings)
+        mock_garmin = MagicMock()
+        mock_garmin.get_stress_data.side_effect = [Exception("500 server error"), {"overallStressLevel": 35}]
+        client._garmin = mock_garmin
+
+        with pytest.raises(GarminAPIError):
+            client.get_stress("2026-01-05")
+        assert client.get_stress("2026-01-05") == {"overallStressLevel": 35}
+
     def test_get_resting_hr_delegates(self, client_settings):
         client = GarminClient(client_settings)
         mock_garmin = MagicMock()
@@ -23,6 +23,37 @@ class TestSettings:
         assert s.port == 9003
         assert s.garth_home == "/custom/garth"
 
+    def test_fetch_tuning_defaults_and_overrides(self, monkeypatch):
+        monkeypatch.setenv("GARMIN_EMAIL", "runner@test.com")
+        monkeypatch.setenv("GARMIN_PASSWORD", "secret123")
+        monkeypatch.delenv("GARMIN_WELLNESS_WORKERS", raising=False)
+        monkeypatch.delenv("GARMIN_MAX_RPS", raising=False)
+        s = Settings.from_env()
+        assert s.wellness_workers == 4
+        assert s.max_requests_per_second == 8.0
+
+        monkeypatch.setenv("GARMIN_WELLNESS_WORKERS", "2")
+        monkeypatch.setenv("GARMIN_MAX_RPS", "2.5")
+        s = Settings.from_env()
+        assert s.wellness_workers == 2
+        assert s.max_requests_per_second == 2.5
+
+    def test_db_path_resolved_against_env_file(self, monkeypatch, tmp_path):
+        env_file = tmp_path / ".env"
+        env_file.write_text("")
+        monkeypatch.setattr("garmin_mcp.config._find_env_file", lambda: env_file)
+        monkeypatch.setenv("GARMIN_EMAIL", "runner@test.com")
+        monkeypatch.setenv("GARMIN_PASSWORD", "secret123")
+        monkeypatch.setenv("GARMIN_MCP_DB", "cache.db")
+        assert Settings.from_env().db_path == str(tmp_path / "cache.db")
+
+    def test_invalid_max_rps_raises(self, monkeypatch):
+        monkeypatch.setenv("GARMIN_EMAIL", "runner@test.com")
+        monkeypatch.setenv("GARMIN_PASSWORD", "secret123")
+        monkeypatch.setenv("GARMIN_MAX_RPS", "fast")
+        with pytest.raises(ValueError, match="GARMIN_MAX_RPS"):
+            Settings.from_env()
+
     def test_from_env_missing_email_raises(self, monkeypatch):
         monkeypatch.setattr("garmin_mcp.config._find_env_file", lambda: None)
         monkeypatch.delenv("GARMIN_EMAIL", raising=False)
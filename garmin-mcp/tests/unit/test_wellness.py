@@ -0,0 +1,152 @@
+"""Unit tests for the wellness fetch scheduler."""
+
+from __future__ import annotations
+
+import threading
+import time
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from garmin_mcp.client import GarminAPIError, RateLimiter
+from garmin_mcp.wellness import WELLNESS_METRICS, fetch_metric, fetch_wellness_days
+
+DATES = ["2026-03-10", "2026-03-11", "2026-03-12"]
+
+
+def _client(**side_effects) -> MagicMock:
+    """Mock GarminClient whose wellness methods echo (metric, date) unless overridden."""
+    client = MagicMock()
+    client.rate_limiter = RateLimiter(rate=0)
+    for metric, method in WELLNESS_METRICS.items():
+        getattr(client, method).side_effect = side_effects.get(metric, lambda d, metric=metric: (metric, d))
+    return client
+
+
+class TestFetchMetric:
+    def test_retries_rate_limited_then_succeeds(self):
+        calls = []
+
+        def sleep(d):
+            calls.append(d)
+            if len(calls) < 3:
+                raise GarminAPIError("rate_limited", "429", "wait")
+            return {"sleepTimeSeconds": 28000}
+
+        client = _client(sleep=sleep)
+        client.rate_limiter = MagicMock()
+
+        assert fetch_metric(client, "2026-03-10", "sleep", backoff_s=1.0) == {"sleepTimeSeconds": 28000}
+        assert len(calls) == 3
+        delays = [c.args[0] for c in client.rate_limiter.pause.call_args_list]
+        assert len(delays) == 2
+        assert 1.0 <= delays[0] <= 1.25
+        assert 2.0 <= delays[1] <= 2.5
+
+    def test_gives_up_after_max_retries(self):
+        client = _client(stress=MagicMock(side_effect=GarminAPIError("rate_limited", "429", "wait")))
+
+        assert fetch_metric(client, "2026-03-10", "stress", max_retries=2, backoff_s=0) is None
+        assert client.get_stress.call_count == 3
+
+    def test_other_errors_are_not_retried(self):
+        client = _client(hrv=MagicMock(side_effect=GarminAPIError("api_error", "boom", "retry")))
+
+        assert fetch_metric(client, "2026-03-10", "hrv", backoff_s=0) is None
+        assert client.get_hrv.call_count == 1
+
+
+class TestFetchWellnessDays:
+    def test_fetches_full_matrix(self):
+        client = _client()
+
+        days = dict(fetch_wellness_days(client, DATES, workers=3))
+
+        assert set(days) == set(DATES)
+        for d in DATES:
+            assert days[d] == {m: (m, d) for m in WELLNESS_METRICS}
+
+    def test_metric_subset_and_failures(self):
+        client = _client(sleep=MagicMock(side_effect=GarminAPIError("api_error", "no data", "retry")))
+
+        days = dict(fetch_wellness_days(client, DATES[:1], ["sleep", "stress"]))
+
+        assert days == {DATES[0]: {"sleep": None, "stress": ("stress", DATES[0])}}
+        client.get_hrv.assert_not_called()
+
+    def test_requests_run_concurrently(self):
+        in_flight = 0
+        peak = 0
+        lock = threading.Lock()
+
+        def slow(d):
+            nonlocal in_flight, peak
+            with lock:
+                in_flight += 1
+                peak = max(peak, in_flight)
+            time.sleep(0.02)
+            with lock:
+                in_flight -= 1
+            return {}
+
+        client = _client(**dict.fromkeys(WELLNESS_METRICS, slow))
+
+        days = list(fetch_wellness_days(client, DATES, workers=4))
+
+        assert len(days) == len(DATES)
+        assert peak == 4
+
+    def test_streams_days_as_they_complete(self):
+        release_last_day = threading.Event()
+
+        def body_battery(d):
+            if d == DATES[-1]:
+                release_last_day.wait(5)
+            return d
+
+        client = _client(body_battery=body_battery)
+        stream = fetch_wellness_days(client, DATES, workers=6)
+
+        first = [next(stream)[0], next(stream)[0]]
+        release_last_day.set()
+        rest = [d for d, _ in stream]
+
+        assert sorted(first) == DATES[:2]
+        assert rest == DATES[-1:]
+
+    def test_unknown_metric_raises(self):
+        with pytest.raises(ValueError, match="vo2max"):
+            list(fetch_wellness_days(_client(), DATES, ["sleep", "vo2max"]))
+
+    def test_no_dates(self):
+        client = _client()
+        assert list(fetch_wellness_days(client, [])) == []
+
+    def test_repeat_window_served_from_cache(self, settings):
+        """A second 30-day fetch only goes upstream for the three volatile days."""
+        from datetime import date, timedelta
+
+        from garmin_mcp.client import GarminClient
+
+        client = GarminClient(settings)
+        client.rate_limiter = RateLimiter(rate=0)
+        client._garmin = MagicMock()
+        for method in ("get_body_battery", "get_sleep_data", "get_hrv_data", "get_rhr_day"):
+            getattr(client._garmin, method).return_value = {"value": 1}
+        client._garmin.get_training_readiness.return_value = None
+        client._garmin.get_stress_data.return_value = [{"stress": 30}]
+        dates = [(date.today() - timedelta(days=i)).isoformat() for i in range(30)]
+
+        first = dict(fetch_wellness_days(client, dates))
+        upstream = len(client._garmin.method_calls)
+        second = dict(fetch_wellness_days(client, dates))
+
+        assert upstream == 30 * len(WELLNESS_METRICS)
+        assert len(client._garmin.method_calls) - upstream == 0  # recent days are still within their TTL
+        assert second.keys() == first.keys()
+
+        client.wellness_cache.clear_expired()
+        with patch("garmin_mcp.cache.time") as mock_time:
+            mock_time.time.return_value = time.time() + 3600
+            dict(fetch_wellness_days(client, dates))
+        assert len(client._garmin.method_calls) - upstream == 3 * len(WELLNESS_METRICS)
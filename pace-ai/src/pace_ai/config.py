@@ -11,6 +11,7 @@ class Settings:
     host: str = "127.0.0.1"
     port: int = 8002
     db_path: str = "pace_ai.db"
+    db_workers: int = 4
 
     @classmethod
     def from_env(cls) -> Settings:
@@ -18,4 +19,5 @@ class Settings:
             host=os.environ.get("PACE_AI_HOST", "127.0.0.1"),
             port=int(os.environ.get("PACE_AI_PORT", "8002")),
             db_path=os.environ.get("PACE_AI_DB", "pace_ai.db"),
+            db_workers=int(os.environ.get("PACE_AI_DB_WORKERS", "4")),
         )
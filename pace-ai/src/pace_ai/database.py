@@ -2,10 +2,142 @@
 
 from __future__ import annotations
 
+import asyncio
+import datetime
+import functools
+import hashlib
 import json
+import os
+import re
 import sqlite3
+import threading
 import time
-from typing import Any
+import zlib
+from concurrent.futures import Executor, ThreadPoolExecutor
+from contextlib import contextmanager, nullcontext
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, ClassVar, Generic, TypeVar
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterable, Iterator, Mapping, Sequence
+    from contextlib import AbstractContextManager
+
+T = TypeVar("T")
+DB = TypeVar("DB")
+
+# Per-connection tuning, applied once when a connection is opened.
+_CONNECTION_PRAGMAS = (
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA mmap_size=268435456",  # 256 MiB
+    "PRAGMA cache_size=-32000",  # ~32 MiB
+    "PRAGMA busy_timeout=5000",
+    "PRAGMA temp_store=MEMORY",
+)
+
+
+class ConnectionManager:
+    """Process-wide SQLite connections for one database file.
+
+    Holds a single shared writer connection, serialised by a lock, and one
+    reader connection per thread. The database runs in WAL mode so readers
+    never wait on the writer, and each schema setup runs once per process
+    instead of on every ``HistoryDB``/``GoalDB`` construction.
+    """
+
+    _registry: ClassVar[dict[str, ConnectionManager]] = {}
+    _registry_lock: ClassVar[threading.Lock] = threading.Lock()
+
+    def __init__(self, db_path: str) -> None:
+        self._db_path = db_path
+        # In-memory databases are private to one connection, so reads must share the writer.
+        self._in_memory = db_path == ":memory:" or db_path.startswith("file::memory:")
+        self._write_lock = threading.RLock()
+        self._writer: sqlite3.Connection | None = None
+        self._local = threading.local()
+        self._readers: set[sqlite3.Connection] = set()  # every thread's reader, so close() reaches them all
+        self._readers_lock = threading.Lock()
+        self._generation = 0
+        self._schemas: set[str] = set()
+
+    @classmethod
+    def for_path(cls, db_path: str) -> ConnectionManager:
+        """Return the shared manager for a database path, creating it on first use."""
+        key = db_path if db_path.startswith((":memory:", "file:")) else os.path.abspath(db_path)
+        with cls._registry_lock:
+            manager = cls._registry.get(key)
+            if manager is None:
+                manager = cls._registry[key] = cls(db_path)
+            return manager
+
+    def _open(self, *, readonly: bool = False) -> sqlite3.Connection:
+        conn = sqlite3.connect(self._db_path, check_same_thread=False, uri=self._db_path.startswith("file:"))
+        conn.row_factory = sqlite3.Row
+        for pragma in _CONNECTION_PRAGMAS:
+            conn.execute(pragma)
+        if readonly:
+            conn.execute("PRAGMA query_only=ON")
+        return conn
+
+    def _ensure_writer(self) -> sqlite3.Connection:
+        with self._write_lock:
+            if self._writer is None:
+                conn = self._open()
+                if not self._in_memory:
+                    conn.execute("PRAGMA journal_mode=WAL")
+                self._writer = conn
+            return self._writer
+
+    @contextmanager
+    def write(self) -> Iterator[sqlite3.Connection]:
+        """Yield the shared writer connection; commits on exit, rolls back on error."""
+        with self._write_lock:
+            conn = self._ensure_writer()
+            with conn:
+                yield conn
+
+    @contextmanager
+    def read(self) -> Iterator[sqlite3.Connection]:
+        """Yield this thread's reader connection (read-only, never blocked by the writer)."""
+        if self._in_memory:
+            with self.write() as conn:
+                yield conn
+            return
+        conn = getattr(self._local, "conn", None)
+        if conn is None or getattr(self._local, "generation", None) != self._generation:
+            if self._writer is None:
+                self._ensure_writer()  # make sure WAL is on before the first reader attaches
+            conn = self._open(readonly=True)
+            with self._readers_lock:
+                self._readers.add(conn)
+            self._local.conn = conn
+            self._local.generation = self._generation
+        yield conn
+
+    def ensure_schema(self, name: str, setup: Callable[[sqlite3.Connection], None]) -> None:
+        """Run a schema setup function once per process for this database."""
+        with self._write_lock:
+            if name in self._schemas:
+                return
+            with self.write() as conn:
+                setup(conn)
+            self._schemas.add(name)
+
+    def close(self) -> None:
+        """Close the writer and every thread's reader connection.
+
+        Threads that read again afterwards open a fresh reader.
+        """
+        with self._write_lock:
+            if self._writer is not None:
+                self._writer.close()
+                self._writer = None
+            self._generation += 1
+            self._schemas.clear()
+        with self._readers_lock:
+            readers, self._readers = self._readers, set()
+        for conn in readers:
+            conn.close()
+        self._local.conn = None
 
 
 class GoalDB:
@@ -13,26 +145,28 @@ class GoalDB:
 
     def __init__(self, db_path: str) -> None:
         self._db_path = db_path
-        self._ensure_table()
+        self._pool = ConnectionManager.for_path(db_path)
+        self._pool.ensure_schema("goals", self._ensure_table)
 
-    def _connect(self) -> sqlite3.Connection:
-        conn = sqlite3.connect(self._db_path)
-        conn.row_factory = sqlite3.Row
-        return conn
+    def _connect(self) -> AbstractContextManager[sqlite3.Connection]:
+        return self._pool.write()
 
-    def _ensure_table(self) -> None:
-        with self._connect() as conn:
-            conn.execute("""
-                CREATE TABLE IF NOT EXISTS goals (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    race_type TEXT NOT NULL,
-                    target_time_seconds INTEGER NOT NULL,
-                    race_date TEXT,
-                    notes TEXT,
-                    created_at REAL NOT NULL,
-                    updated_at REAL NOT NULL
-                )
-            """)
+    def _read(self) -> AbstractContextManager[sqlite3.Connection]:
+        return self._pool.read()
+
+    @staticmethod
+    def _ensure_table(conn: sqlite3.Connection) -> None:
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS goals (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                race_type TEXT NOT NULL,
+                target_time_seconds INTEGER NOT NULL,
+                race_date TEXT,
+                notes TEXT,
+                created_at REAL NOT NULL,
+                updated_at REAL NOT NULL
+            )
+        """)
 
     def create(
         self,
@@ -52,14 +186,14 @@ class GoalDB:
         return self.get(goal_id)
 
     def get(self, goal_id: int) -> dict[str, Any] | None:
-        with self._connect() as conn:
+        with self._read() as conn:
             row = conn.execute("SELECT * FROM goals WHERE id = ?", (goal_id,)).fetchone()
         if row is None:
             return None
         return dict(row)
 
     def list_all(self) -> list[dict[str, Any]]:
-        with self._connect() as conn:
+        with self._read() as conn:
             rows = conn.execute("SELECT * FROM goals ORDER BY created_at DESC").fetchall()
         return [dict(r) for r in rows]
 
@@ -85,379 +219,1196 @@ class GoalDB:
             return cursor.rowcount > 0
 
 
+# ── Schema Migrations ──────────────────────────────────────────────────
+
+# Sport families with their own indexed ``activities.sport_class`` value. The class is
+# derived with the same substring rule the old ``LOWER(sport_type) LIKE '%run%'``
+# filters used, so "TrailRun"/"VirtualRun" -> "run", "EBikeRide" -> "ride", etc.
+SPORT_CLASSES = ("run", "ride", "swim", "walk", "hike")
+_SPORT_CLASS_EXPR = (
+    "CASE "
+    + " ".join(f"WHEN LOWER(sport_type) LIKE '%{c}%' THEN '{c}'" for c in SPORT_CLASSES)
+    + " ELSE LOWER(sport_type) END"
+)
+# Garmin workout sport keys ("running", "road_biking", "lap_swimming", ...) in the same classes.
+_WORKOUT_SPORT_CLASS_EXPR = (
+    "CASE WHEN LOWER(sport_type) LIKE '%run%' THEN 'run'"
+    " WHEN LOWER(sport_type) LIKE '%cycl%' OR LOWER(sport_type) LIKE '%bik%' THEN 'ride' "
+    + " ".join(f"WHEN LOWER(sport_type) LIKE '%{c}%' THEN '{c}'" for c in SPORT_CLASSES[1:])
+    + " ELSE LOWER(sport_type) END"
+)
+
+
+@dataclass(frozen=True)
+class Migration:
+    """One numbered schema change for the history store."""
+
+    version: int
+    description: str
+    apply: Callable[[sqlite3.Connection], None]
+
+
+def _add_columns(table: str, *columns: tuple[str, str]) -> Callable[[sqlite3.Connection], None]:
+    """Build an idempotent ADD COLUMN step (older databases may already have the columns)."""
+
+    def apply(conn: sqlite3.Connection) -> None:
+        existing = {row[1] for row in conn.execute(f"PRAGMA table_xinfo({table})").fetchall()}
+        for column, col_type in columns:
+            if column not in existing:
+                conn.execute(f"ALTER TABLE {table} ADD COLUMN {column} {col_type}")
+
+    return apply
+
+
+def _execute(*statements: str) -> Callable[[sqlite3.Connection], None]:
+    """Build a step that runs each SQL statement in order."""
+
+    def apply(conn: sqlite3.Connection) -> None:
+        for statement in statements:
+            conn.execute(statement)
+
+    return apply
+
+
+def _steps(*steps: Callable[[sqlite3.Connection], None]) -> Callable[[sqlite3.Connection], None]:
+    """Build a step that runs several steps in order."""
+
+    def apply(conn: sqlite3.Connection) -> None:
+        for step in steps:
+            step(conn)
+
+    return apply
+
+
+# Payloads shorter than this are stored as plain JSON: zlib's header and per-call setup
+# cost more than deflate saves on them.
+RAW_COMPRESS_MIN_BYTES = 256
+
+
+def _pack_raw(value: Any) -> bytes | None:
+    """Pack an upstream payload for the raw side tables (``None`` for empty payloads)."""
+    if not value:
+        return None
+    text = (value if isinstance(value, str) else json.dumps(value)).encode()
+    if len(text) < RAW_COMPRESS_MIN_BYTES:
+        return text
+    # Level 1: payloads are cold, and on backfills compression cost shows up in sync time.
+    return zlib.compress(text, 1)
+
+
+def _unpack_raw(blob: bytes) -> Any:
+    # A zlib stream starts with 0x78 ("x"), which JSON text never does.
+    return json.loads(zlib.decompress(blob) if blob[:1] == b"x" else blob)
+
+
+def _move_raw_payloads(table: str, key_column: str, raw_table: str) -> Callable[[sqlite3.Connection], None]:
+    """Build a step that creates a compressed side table and moves ``table.raw`` into it."""
+
+    def apply(conn: sqlite3.Connection) -> None:
+        conn.execute(f"CREATE TABLE IF NOT EXISTS {raw_table} ({key_column} TEXT PRIMARY KEY, payload BLOB NOT NULL)")
+        rows = conn.execute(f"SELECT {key_column}, raw FROM {table} WHERE raw IS NOT NULL")
+        conn.executemany(
+            f"INSERT OR REPLACE INTO {raw_table} ({key_column}, payload) VALUES (?, ?)",
+            ((key, _pack_raw(raw)) for key, raw in rows.fetchall()),
+        )
+        # The column stays (DROP COLUMN needs SQLite 3.35+) but is no longer written.
+        conn.execute(f"UPDATE {table} SET raw = NULL WHERE raw IS NOT NULL")
+
+    return apply
+
+
+_LOAD_METRICS_SQL = """
+    distance_m REAL,
+    moving_time_s INTEGER,
+    elevation_gain_m REAL,
+    activity_count INTEGER NOT NULL,
+    longest_m REAL,
+    hr_time_s INTEGER,
+    hr_load REAL
+"""
+
+_LOAD_ROLLUP_SCHEMA = f"""
+    CREATE TABLE IF NOT EXISTS daily_load (
+        date TEXT NOT NULL,
+        sport_class TEXT NOT NULL,
+        {_LOAD_METRICS_SQL},
+        PRIMARY KEY (date, sport_class)
+    ) WITHOUT ROWID;
+
+    CREATE TABLE IF NOT EXISTS weekly_load (
+        week TEXT NOT NULL,
+        sport_class TEXT NOT NULL,
+        week_start TEXT NOT NULL,
+        {_LOAD_METRICS_SQL},
+        PRIMARY KEY (week, sport_class)
+    ) WITHOUT ROWID;
+"""
+
+
+_DAILY_LOAD_INSERT = """
+    INSERT INTO daily_load
+    (date, sport_class, distance_m, moving_time_s, elevation_gain_m, activity_count, longest_m, hr_time_s, hr_load)
+    SELECT date, sport_class, SUM(distance_m), SUM(moving_time_s), SUM(elevation_gain_m), COUNT(*), MAX(distance_m),
+           SUM(CASE WHEN average_hr > 0 THEN moving_time_s END), SUM(moving_time_s / 60.0 * average_hr)
+    FROM activities
+"""
+
+_WEEKLY_LOAD_INSERT = """
+    INSERT INTO weekly_load
+    (week, sport_class, week_start, distance_m, moving_time_s, elevation_gain_m, activity_count, longest_m,
+     hr_time_s, hr_load)
+    SELECT week, sport_class, MIN(date), SUM(distance_m), SUM(moving_time_s), SUM(elevation_gain_m),
+           SUM(activity_count), MAX(longest_m), SUM(hr_time_s), SUM(hr_load)
+    FROM (SELECT strftime('%Y-W%W', date) AS week, * FROM daily_load {where})
+"""
+
+
+def refresh_load_rollups(conn: sqlite3.Connection, dates: Iterable[str] | None = None) -> None:
+    """Recompute ``daily_load`` for ``dates`` (every date if None) and ``weekly_load`` for their weeks.
+
+    Weeks use the same ``strftime('%Y-W%W', date)`` buckets as the older ad-hoc
+    aggregates. ``hr_load`` is moving minutes x average HR, summed over
+    activities that recorded HR; ``hr_time_s`` is the moving time it covers.
+    """
+    if dates is None:
+        conn.execute("DELETE FROM daily_load")
+        conn.execute("DELETE FROM weekly_load")
+        conn.execute(f"{_DAILY_LOAD_INSERT} GROUP BY date, sport_class")
+        conn.execute(f"{_WEEKLY_LOAD_INSERT.format(where='')} GROUP BY week, sport_class")
+        return
+
+    days = sorted({d for d in dates if d})
+    if not days:
+        return
+    touched = json.dumps(days)
+    in_days = "date IN (SELECT value FROM json_each(?))"
+    in_weeks = "week IN (SELECT DISTINCT strftime('%Y-W%W', value) FROM json_each(?))"
+    conn.execute(f"DELETE FROM daily_load WHERE {in_days}", (touched,))
+    conn.execute(f"DELETE FROM weekly_load WHERE {in_weeks}", (touched,))
+    conn.execute(f"{_DAILY_LOAD_INSERT} WHERE {in_days} GROUP BY date, sport_class", (touched,))
+    # Every %W bucket lies inside one Monday-Sunday span, so bound the daily_load
+    # scan to the spans around the touched days before filtering on the bucket.
+    first = datetime.date.fromisoformat(days[0][:10])
+    last = datetime.date.fromisoformat(days[-1][:10])
+    lo = first - datetime.timedelta(days=first.weekday())
+    hi = last + datetime.timedelta(days=6 - last.weekday())
+    conn.execute(
+        f"{_WEEKLY_LOAD_INSERT.format(where='WHERE date BETWEEN ? AND ?')} WHERE {in_weeks} GROUP BY week, sport_class",
+        (lo.isoformat(), hi.isoformat(), touched),
+    )
+
+
+@contextmanager
+def _activity_chunk_upkeep(conn: sqlite3.Connection, chunk: list[tuple[Any, ...]], touched: set[str]) -> Iterator[None]:
+    """Around an activity upsert chunk: index new activities for search and note the dates touched.
+
+    New rows go into ``activity_notes_fts`` with one ``INSERT ... SELECT`` per chunk
+    rather than a per-row trigger, which FTS5 handles several times faster. Every
+    date the chunk touches, old dates included, is added to ``touched`` so the
+    caller can refresh the rollups once for the whole batch.
+    """
+    keys = json.dumps([row[0] for row in chunk])
+    in_keys = "strava_id IN (SELECT value FROM json_each(?))"
+    previous = dict(conn.execute(f"SELECT strava_id, date FROM activities WHERE {in_keys}", (keys,)))
+    yield
+    new = [row[0] for row in chunk if row[0] not in previous]
+    if new:
+        conn.execute(
+            f"""INSERT INTO activity_notes_fts (rowid, name, description, private_note)
+               SELECT id, name, description, private_note FROM activities WHERE {in_keys}""",
+            (json.dumps(new),),
+        )
+    touched.update(previous.values(), (row[1] for row in chunk))
+
+
+def _create_load_rollups(conn: sqlite3.Connection) -> None:
+    for statement in _LOAD_ROLLUP_SCHEMA.split(";"):
+        if statement.strip():
+            conn.execute(statement)
+    refresh_load_rollups(conn)
+
+
+def _fts_index(fts_table: str, content_table: str, columns: tuple[str, ...]) -> Callable[[sqlite3.Connection], None]:
+    """Build a step creating an external-content FTS5 index over ``columns``, kept in sync by triggers."""
+    cols = ", ".join(columns)
+    new = ", ".join(f"new.{c}" for c in columns)
+    old = ", ".join(f"old.{c}" for c in columns)
+    changed = " OR ".join(f"old.{c} IS NOT new.{c}" for c in columns)
+    return _execute(
+        f"""CREATE VIRTUAL TABLE IF NOT EXISTS {fts_table} USING fts5(
+                {cols}, content='{content_table}', content_rowid='id', tokenize='porter unicode61 remove_diacritics 2'
+            )""",
+        f"""CREATE TRIGGER IF NOT EXISTS {fts_table}_ai AFTER INSERT ON {content_table} BEGIN
+                INSERT INTO {fts_table}(rowid, {cols}) VALUES (new.id, {new});
+            END""",
+        f"""CREATE TRIGGER IF NOT EXISTS {fts_table}_ad AFTER DELETE ON {content_table} BEGIN
+                INSERT INTO {fts_table}({fts_table}, rowid, {cols}) VALUES ('delete', old.id, {old});
+            END""",
+        f"""CREATE TRIGGER IF NOT EXISTS {fts_table}_au AFTER UPDATE OF {cols} ON {content_table}
+            WHEN {changed} BEGIN
+                INSERT INTO {fts_table}({fts_table}, rowid, {cols}) VALUES ('delete', old.id, {old});
+                INSERT INTO {fts_table}(rowid, {cols}) VALUES (new.id, {new});
+            END""",
+        f"INSERT INTO {fts_table}({fts_table}) VALUES ('rebuild')",
+    )
+
+
+# Original schema, before versioned migrations existed.
+_HISTORY_BASELINE_SCHEMA = """
+    CREATE TABLE IF NOT EXISTS activities (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        strava_id TEXT UNIQUE NOT NULL,
+        date TEXT NOT NULL,
+        sport_type TEXT NOT NULL,
+        name TEXT,
+        distance_m REAL,
+        moving_time_s INTEGER,
+        elapsed_time_s INTEGER,
+        elevation_gain_m REAL,
+        average_hr REAL,
+        max_hr REAL,
+        average_cadence REAL,
+        average_speed_ms REAL,
+        description TEXT,
+        private_note TEXT,
+        garmin_workout_id TEXT,
+        perceived_effort INTEGER,
+        raw JSON
+    );
+
+    CREATE TABLE IF NOT EXISTS wellness_snapshots (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        date TEXT UNIQUE NOT NULL,
+        body_battery_max INTEGER,
+        body_battery_min INTEGER,
+        hrv_status TEXT,
+        hrv_value REAL,
+        sleep_score INTEGER,
+        sleep_duration_s INTEGER,
+        sleep_deep_s INTEGER,
+        sleep_rem_s INTEGER,
+        stress_avg INTEGER,
+        stress_max INTEGER,
+        training_readiness INTEGER,
+        resting_hr INTEGER,
+        respiration_avg REAL,
+        raw JSON
+    );
+
+    CREATE TABLE IF NOT EXISTS body_measurements (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        date TEXT NOT NULL,
+        weight_kg REAL,
+        bmi REAL,
+        body_fat_pct REAL,
+        muscle_mass_kg REAL,
+        bone_mass_kg REAL,
+        water_pct REAL,
+        systolic_bp INTEGER,
+        diastolic_bp INTEGER,
+        raw JSON,
+        UNIQUE(date, weight_kg)
+    );
+
+    CREATE TABLE IF NOT EXISTS diary_entries (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        date TEXT UNIQUE NOT NULL,
+        stress_1_5 INTEGER,
+        niggles TEXT,
+        notes TEXT
+    );
+
+    CREATE TABLE IF NOT EXISTS scheduled_workouts (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        garmin_workout_id TEXT UNIQUE NOT NULL,
+        sport_type TEXT NOT NULL,
+        scheduled_date TEXT,
+        workout_name TEXT,
+        workout_detail TEXT,
+        created_at TEXT,
+        completed INTEGER DEFAULT 0,
+        strava_activity_id TEXT,
+        skipped_reason TEXT
+    );
+
+    CREATE TABLE IF NOT EXISTS race_results (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        date TEXT NOT NULL,
+        distance_m REAL NOT NULL,
+        distance_label TEXT,
+        time_s INTEGER NOT NULL,
+        event_name TEXT,
+        course_type TEXT,
+        conditions TEXT,
+        vdot REAL,
+        source TEXT,
+        pb INTEGER DEFAULT 0,
+        UNIQUE(date, distance_m, time_s)
+    );
+
+    CREATE TABLE IF NOT EXISTS athlete_profile (
+        id INTEGER PRIMARY KEY DEFAULT 1,
+        updated_at TEXT NOT NULL,
+        estimated_vdot REAL,
+        vdot_peak REAL,
+        vdot_peak_date TEXT,
+        vdot_current REAL,
+        typical_weekly_km REAL,
+        typical_long_run_km REAL,
+        typical_easy_pace_min_per_km REAL,
+        max_weekly_km_ever REAL,
+        current_weekly_km REAL,
+        training_age_years REAL,
+        weight_kg_current REAL,
+        weight_kg_trend TEXT,
+        resting_hr_baseline REAL,
+        hrv_baseline REAL,
+        systolic_bp REAL,
+        diastolic_bp REAL,
+        date_of_birth TEXT,
+        gender TEXT,
+        experience_level TEXT,
+        injury_history TEXT,
+        preferred_long_run_day TEXT,
+        available_days_per_week INTEGER,
+        notes TEXT
+    );
+
+    CREATE TABLE IF NOT EXISTS sync_log (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        source TEXT NOT NULL,
+        synced_at TEXT NOT NULL,
+        records_added INTEGER,
+        earliest_date TEXT,
+        latest_date TEXT,
+        status TEXT,
+        error TEXT
+    );
+
+    CREATE TABLE IF NOT EXISTS coaching_log (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        summary TEXT NOT NULL,
+        prescriptions TEXT,
+        workout_ids TEXT,
+        acwr REAL,
+        weekly_km REAL,
+        body_battery INTEGER,
+        stress_level INTEGER,
+        notion_stress INTEGER,
+        notion_niggles TEXT,
+        follow_up TEXT
+    );
+
+    CREATE TABLE IF NOT EXISTS coaching_context (
+        id INTEGER PRIMARY KEY DEFAULT 1,
+        updated_at TIMESTAMP NOT NULL,
+        content TEXT NOT NULL
+    );
+
+    CREATE TABLE IF NOT EXISTS athlete_facts (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        updated_at TIMESTAMP NOT NULL,
+        category TEXT NOT NULL,
+        fact TEXT NOT NULL,
+        active INTEGER DEFAULT 1,
+        source TEXT
+    );
+"""
+
+
+# Append-only: ``_HISTORY_BASELINE_SCHEMA`` is frozen, and every later change gets the
+# next version number here. Never edit a released entry.
+HISTORY_MIGRATIONS: tuple[Migration, ...] = (
+    Migration(1, "add activities.private_note", _add_columns("activities", ("private_note", "TEXT"))),
+    Migration(
+        2,
+        "add athlete_profile blood pressure",
+        _add_columns("athlete_profile", ("systolic_bp", "REAL"), ("diastolic_bp", "REAL")),
+    ),
+    Migration(
+        3,
+        "add activities.sport_class",
+        _add_columns("activities", ("sport_class", f"TEXT GENERATED ALWAYS AS ({_SPORT_CLASS_EXPR}) VIRTUAL")),
+    ),
+    Migration(
+        4,
+        "index activities by date",
+        _execute("CREATE INDEX IF NOT EXISTS idx_activities_date ON activities(date)"),
+    ),
+    Migration(
+        5,
+        "index activities by sport class and date",
+        _execute(
+            "CREATE INDEX IF NOT EXISTS idx_activities_sport_class_date ON activities(sport_class, date, distance_m)"
+        ),
+    ),
+    Migration(
+        6,
+        "index sync_log by source and status",
+        _execute("CREATE INDEX IF NOT EXISTS idx_sync_log_source_status ON sync_log(source, status, id)"),
+    ),
+    Migration(
+        7,
+        "index scheduled_workouts by completion and date",
+        _execute(
+            "CREATE INDEX IF NOT EXISTS idx_scheduled_workouts_completed_date"
+            " ON scheduled_workouts(completed, scheduled_date)",
+            "CREATE INDEX IF NOT EXISTS idx_scheduled_workouts_date ON scheduled_workouts(scheduled_date)",
+        ),
+    ),
+    Migration(
+        8,
+        "move activity and wellness raw payloads to compressed side tables",
+        _steps(
+            _move_raw_payloads("activities", "strava_id", "activity_raw"),
+            _move_raw_payloads("wellness_snapshots", "date", "wellness_raw"),
+        ),
+    ),
+    Migration(9, "add daily_load and weekly_load rollups", _create_load_rollups),
+    Migration(
+        10,
+        "add full-text indexes over coaching log, diary, activity notes and facts",
+        _steps(
+            _fts_index("coaching_log_fts", "coaching_log", ("summary", "prescriptions", "follow_up")),
+            _fts_index("diary_fts", "diary_entries", ("notes", "niggles")),
+            _fts_index("activity_notes_fts", "activities", ("name", "description", "private_note")),
+            _fts_index("athlete_facts_fts", "athlete_facts", ("fact",)),
+        ),
+    ),
+    Migration(
+        11,
+        "add activities.detail_fetched_at and compressed activity_detail payloads",
+        _steps(
+            _add_columns("activities", ("detail_fetched_at", "TEXT")),
+            _execute(
+                "CREATE TABLE IF NOT EXISTS activity_detail"
+                " (strava_id TEXT PRIMARY KEY, fetched_at TEXT NOT NULL, payload BLOB NOT NULL)"
+            ),
+        ),
+    ),
+    Migration(
+        12,
+        "add scheduled_workouts plan targets and sport_class",
+        # Matching joins on activities(sport_class, date), already indexed by migration 5.
+        _add_columns(
+            "scheduled_workouts",
+            ("planned_duration_s", "INTEGER"),
+            ("planned_distance_m", "REAL"),
+            ("sport_class", f"TEXT GENERATED ALWAYS AS ({_WORKOUT_SPORT_CLASS_EXPR}) VIRTUAL"),
+        ),
+    ),
+    Migration(
+        13,
+        "add sync_cursor for resumable backfills",
+        _execute(
+            """CREATE TABLE IF NOT EXISTS sync_cursor (
+                source TEXT PRIMARY KEY,
+                cursor TEXT NOT NULL,
+                complete INTEGER NOT NULL DEFAULT 0,
+                updated_at TEXT NOT NULL
+            )"""
+        ),
+    ),
+    Migration(
+        14,
+        "add content hashes to synced tables and the change_log journal",
+        _steps(
+            *(
+                _add_columns(table, ("content_hash", "TEXT"))
+                for table in (
+                    "activities",
+                    "wellness_snapshots",
+                    "body_measurements",
+                    "diary_entries",
+                    "scheduled_workouts",
+                )
+            ),
+            _execute(
+                """CREATE TABLE IF NOT EXISTS change_log (
+                    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+                    table_name TEXT NOT NULL,
+                    entity TEXT NOT NULL,
+                    date TEXT
+                )""",
+            ),
+        ),
+    ),
+    Migration(
+        15,
+        "add profile_state for incremental athlete-profile refreshes",
+        _execute(
+            """CREATE TABLE IF NOT EXISTS profile_state (
+                name TEXT PRIMARY KEY,
+                seq INTEGER NOT NULL,
+                computed_on TEXT NOT NULL,
+                state TEXT
+            )"""
+        ),
+    ),
+    Migration(
+        16,
+        "add sync_lease and sync_run for cross-process single-flight syncs",
+        _execute(
+            """CREATE TABLE IF NOT EXISTS sync_lease (
+                name TEXT PRIMARY KEY,
+                run_id TEXT NOT NULL,
+                holder TEXT NOT NULL,
+                sources TEXT NOT NULL,
+                acquired_at REAL NOT NULL,
+                expires_at REAL NOT NULL
+            )""",
+            """CREATE TABLE IF NOT EXISTS sync_run (
+                run_id TEXT PRIMARY KEY,
+                sources TEXT NOT NULL,
+                started_at REAL NOT NULL,
+                finished_at REAL,
+                result TEXT
+            )""",
+        ),
+    ),
+    Migration(
+        17,
+        "index new activities for search per upsert chunk instead of per row",
+        # upsert_activities inserts into activity_notes_fts itself (_activity_chunk_upkeep).
+        _execute("DROP TRIGGER IF EXISTS activity_notes_fts_ai"),
+    ),
+    Migration(
+        18,
+        "add change_cursor so change_log pruning waits for in-flight readers",
+        _execute(
+            """CREATE TABLE IF NOT EXISTS change_cursor (
+                consumer TEXT PRIMARY KEY,
+                seq INTEGER NOT NULL,
+                opened_at REAL NOT NULL
+            )"""
+        ),
+    ),
+)
+
+
+def schema_version(conn: sqlite3.Connection) -> int:
+    """Return the highest applied history migration version (0 for a baseline database)."""
+    exists = conn.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'schema_version'").fetchone()
+    if not exists:
+        return 0
+    return conn.execute("SELECT COALESCE(MAX(version), 0) FROM schema_version").fetchone()[0]
+
+
+def migrate_history_schema(conn: sqlite3.Connection, target_version: int | None = None) -> list[int]:
+    """Apply pending history migrations in order, up to ``target_version`` if given.
+
+    Runs inside one ``BEGIN IMMEDIATE`` transaction so two processes starting at
+    once cannot both apply the same migration. Returns the versions applied.
+    """
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS schema_version (
+                version INTEGER PRIMARY KEY,
+                description TEXT NOT NULL,
+                applied_at TEXT NOT NULL
+            )
+        """)
+        current = schema_version(conn)
+        applied: list[int] = []
+        for migration in HISTORY_MIGRATIONS:
+            if migration.version <= current:
+                continue
+            if target_version is not None and migration.version > target_version:
+                break
+            migration.apply(conn)
+            conn.execute(
+                "INSERT INTO schema_version (version, description, applied_at) VALUES (?, ?, ?)",
+                (migration.version, migration.description, time.strftime("%Y-%m-%dT%H:%M:%SZ")),
+            )
+            applied.append(migration.version)
+    except Exception:
+        conn.rollback()
+        raise
+    conn.commit()
+    return applied
+
+
+def explain_query_plan(conn: sqlite3.Connection, sql: str, params: Sequence[Any] = ()) -> list[str]:
+    """Return the EXPLAIN QUERY PLAN detail lines for a query."""
+    return [row[3] for row in conn.execute(f"EXPLAIN QUERY PLAN {sql}", params).fetchall()]
+
+
+def _sport_filter(sport_type: str) -> tuple[str, str]:
+    """WHERE clause and parameter for a sport filter, using the sport_class index when possible."""
+    key = sport_type.lower()
+    if key in SPORT_CLASSES:
+        return "sport_class = ?", key
+    return "LOWER(sport_type) LIKE ?", f"%{key}%"
+
+
+def _fts_query(text: str) -> str | None:
+    """Turn free text into a safe FTS5 query: every word must match, as a prefix.
+
+    Each word is quoted, so punctuation, ``-`` or ``OR`` in the user's text is
+    never parsed as FTS5 syntax. Returns None when the text has no words.
+    """
+    words = re.findall(r"\w+", text)
+    if not words:
+        return None
+    return " ".join(f'"{w}"*' for w in words)
+
+
+@dataclass(frozen=True)
+class _SearchSource:
+    """How ``HistoryDB.search_history`` queries one FTS index.
+
+    ``ref`` is the handle callers use to look the row up again; column
+    expressions refer to the content table as ``c``.
+    """
+
+    fts_table: str
+    content_table: str
+    ref: str
+    date: str
+    title: str = "NULL"
+    where: str = ""
+
+
+_SEARCH_SOURCES: dict[str, _SearchSource] = {
+    "coaching_log": _SearchSource("coaching_log_fts", "coaching_log", "c.id", "c.created_at"),
+    "diary": _SearchSource("diary_fts", "diary_entries", "c.date", "c.date"),
+    "activities": _SearchSource("activity_notes_fts", "activities", "c.strava_id", "c.date", "c.name"),
+    "facts": _SearchSource("athlete_facts_fts", "athlete_facts", "c.id", "c.updated_at", "c.category", "c.active = 1"),
+}
+SEARCH_SOURCES = tuple(_SEARCH_SOURCES)
+
+
+# Rows per write transaction for bulk upserts. Each chunk commits on its own, so a
+# multi-year backfill never holds the writer lock for the whole batch.
+UPSERT_CHUNK_SIZE = 1000
+
+# A change_cursor older than this belongs to a reader that died without closing it;
+# pruning stops waiting on it.
+CHANGE_CURSOR_TTL = 24 * 3600.0
+
+
+@dataclass(frozen=True)
+class UpsertResult:
+    """Outcome of a bulk upsert: distinct rows inserted, updated, or skipped as unchanged.
+
+    ``changed`` holds the first key column of every row inserted or updated.
+    """
+
+    inserted: int = 0
+    updated: int = 0
+    unchanged: int = 0
+    changed: frozenset[Any] = field(default=frozenset(), compare=False)
+
+    @property
+    def total(self) -> int:
+        return self.inserted + self.updated
+
+    def __add__(self, other: UpsertResult) -> UpsertResult:
+        return UpsertResult(
+            self.inserted + other.inserted,
+            self.updated + other.updated,
+            self.unchanged + other.unchanged,
+            self.changed | other.changed,
+        )
+
+
+def _content_hash(row: tuple[Any, ...], raw: bytes | None = None) -> str:
+    """Stable digest of an upsert row (and its packed raw payload) for change detection.
+
+    Row values are plain scalars, whose ``repr`` is deterministic and several times
+    cheaper than ``json.dumps`` on a backfill-sized batch.
+    """
+    digest = hashlib.blake2b(repr(row).encode(), digest_size=16)
+    if raw is not None:
+        digest.update(raw)
+    return digest.hexdigest()
+
+
+def _json_or_none(value: Any) -> str | None:
+    return json.dumps(value) if value else None
+
+
+def write_athlete_profile(conn: sqlite3.Connection, fields: dict[str, Any]) -> None:
+    """Create or update the athlete profile row (always id=1) on ``conn``, inside the caller's transaction."""
+    fields["updated_at"] = time.strftime("%Y-%m-%dT%H:%M:%SZ")
+    cols = ", ".join(fields)
+    updates = ", ".join(f"{k}=excluded.{k}" for k in fields)
+    conn.execute(
+        f"""INSERT INTO athlete_profile (id, {cols}) VALUES (1, {", ".join("?" * len(fields))})
+            ON CONFLICT(id) DO UPDATE SET {updates}""",
+        list(fields.values()),
+    )
+
+
+def prune_change_log(conn: sqlite3.Connection) -> None:
+    """Delete ``change_log`` entries every consumer has read, inside the caller's transaction.
+
+    Consumers are the profile groups (``profile_state``) and open change cursors
+    (``change_cursor``); an entry is kept while any of them has not read past it.
+    """
+    conn.execute(
+        """DELETE FROM change_log WHERE seq <= (
+             SELECT MIN(seq) FROM (
+               SELECT seq FROM profile_state
+               UNION ALL SELECT seq FROM change_cursor WHERE opened_at > ?
+             )
+           )""",
+        (time.time() - CHANGE_CURSOR_TTL,),
+    )
+
+
+# Default read projections: every hot column, never the cold raw payload
+# (that lives compressed in activity_raw / wellness_raw, see get_*_raw).
+ACTIVITY_COLUMNS = (
+    "id",
+    "strava_id",
+    "date",
+    "sport_type",
+    "sport_class",
+    "name",
+    "distance_m",
+    "moving_time_s",
+    "elapsed_time_s",
+    "elevation_gain_m",
+    "average_hr",
+    "max_hr",
+    "average_cadence",
+    "average_speed_ms",
+    "description",
+    "private_note",
+    "garmin_workout_id",
+    "perceived_effort",
+)
+WELLNESS_COLUMNS = (
+    "id",
+    "date",
+    "body_battery_max",
+    "body_battery_min",
+    "hrv_status",
+    "hrv_value",
+    "sleep_score",
+    "sleep_duration_s",
+    "sleep_deep_s",
+    "sleep_rem_s",
+    "stress_avg",
+    "stress_max",
+    "training_readiness",
+    "resting_hr",
+    "respiration_avg",
+)
+
+
+def _projection(columns: Sequence[str] | None, allowed: tuple[str, ...]) -> str:
+    """SELECT list for a caller-chosen subset of ``allowed`` columns (all of them if None)."""
+    if columns is None:
+        return ", ".join(allowed)
+    unknown = [c for c in columns if c not in allowed]
+    if unknown or not columns:
+        raise ValueError(f"Unknown or empty column projection: {', '.join(unknown) or '(none)'}")
+    return ", ".join(columns)
+
+
 class HistoryDB:
     """Central history store for activities, wellness, measurements, diary, workouts, races, and profile."""
 
     def __init__(self, db_path: str) -> None:
         self._db_path = db_path
-        self._ensure_tables()
+        self._pool = ConnectionManager.for_path(db_path)
+        self._pool.ensure_schema("history", self._ensure_tables)
 
-    def _connect(self) -> sqlite3.Connection:
-        conn = sqlite3.connect(self._db_path)
-        conn.row_factory = sqlite3.Row
-        return conn
+    def _connect(self) -> AbstractContextManager[sqlite3.Connection]:
+        """Shared writer connection; commits on exit, rolls back on error."""
+        return self._pool.write()
 
-    def _ensure_tables(self) -> None:
-        with self._connect() as conn:
-            conn.executescript("""
-                CREATE TABLE IF NOT EXISTS activities (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    strava_id TEXT UNIQUE NOT NULL,
-                    date TEXT NOT NULL,
-                    sport_type TEXT NOT NULL,
-                    name TEXT,
-                    distance_m REAL,
-                    moving_time_s INTEGER,
-                    elapsed_time_s INTEGER,
-                    elevation_gain_m REAL,
-                    average_hr REAL,
-                    max_hr REAL,
-                    average_cadence REAL,
-                    average_speed_ms REAL,
-                    description TEXT,
-                    private_note TEXT,
-                    garmin_workout_id TEXT,
-                    perceived_effort INTEGER,
-                    raw JSON
-                );
-
-                CREATE TABLE IF NOT EXISTS wellness_snapshots (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    date TEXT UNIQUE NOT NULL,
-                    body_battery_max INTEGER,
-                    body_battery_min INTEGER,
-                    hrv_status TEXT,
-                    hrv_value REAL,
-                    sleep_score INTEGER,
-                    sleep_duration_s INTEGER,
-                    sleep_deep_s INTEGER,
-                    sleep_rem_s INTEGER,
-                    stress_avg INTEGER,
-                    stress_max INTEGER,
-                    training_readiness INTEGER,
-                    resting_hr INTEGER,
-                    respiration_avg REAL,
-                    raw JSON
-                );
-
-                CREATE TABLE IF NOT EXISTS body_measurements (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    date TEXT NOT NULL,
-                    weight_kg REAL,
-                    bmi REAL,
-                    body_fat_pct REAL,
-                    muscle_mass_kg REAL,
-                    bone_mass_kg REAL,
-                    water_pct REAL,
-                    systolic_bp INTEGER,
-                    diastolic_bp INTEGER,
-                    raw JSON,
-                    UNIQUE(date, weight_kg)
-                );
-
-                CREATE TABLE IF NOT EXISTS diary_entries (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    date TEXT UNIQUE NOT NULL,
-                    stress_1_5 INTEGER,
-                    niggles TEXT,
-                    notes TEXT
-                );
-
-                CREATE TABLE IF NOT EXISTS scheduled_workouts (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    garmin_workout_id TEXT UNIQUE NOT NULL,
-                    sport_type TEXT NOT NULL,
-                    scheduled_date TEXT,
-                    workout_name TEXT,
-                    workout_detail TEXT,
-                    created_at TEXT,
-                    completed INTEGER DEFAULT 0,
-                    strava_activity_id TEXT,
-                    skipped_reason TEXT
-                );
-
-                CREATE TABLE IF NOT EXISTS race_results (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    date TEXT NOT NULL,
-                    distance_m REAL NOT NULL,
-                    distance_label TEXT,
-                    time_s INTEGER NOT NULL,
-                    event_name TEXT,
-                    course_type TEXT,
-                    conditions TEXT,
-                    vdot REAL,
-                    source TEXT,
-                    pb INTEGER DEFAULT 0,
-                    UNIQUE(date, distance_m, time_s)
-                );
-
-                CREATE TABLE IF NOT EXISTS athlete_profile (
-                    id INTEGER PRIMARY KEY DEFAULT 1,
-                    updated_at TEXT NOT NULL,
-                    estimated_vdot REAL,
-                    vdot_peak REAL,
-                    vdot_peak_date TEXT,
-                    vdot_current REAL,
-                    typical_weekly_km REAL,
-                    typical_long_run_km REAL,
-                    typical_easy_pace_min_per_km REAL,
-                    max_weekly_km_ever REAL,
-                    current_weekly_km REAL,
-                    training_age_years REAL,
-                    weight_kg_current REAL,
-                    weight_kg_trend TEXT,
-                    resting_hr_baseline REAL,
-                    hrv_baseline REAL,
-                    systolic_bp REAL,
-                    diastolic_bp REAL,
-                    date_of_birth TEXT,
-                    gender TEXT,
-                    experience_level TEXT,
-                    injury_history TEXT,
-                    preferred_long_run_day TEXT,
-                    available_days_per_week INTEGER,
-                    notes TEXT
-                );
-
-                CREATE TABLE IF NOT EXISTS sync_log (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    source TEXT NOT NULL,
-                    synced_at TEXT NOT NULL,
-                    records_added INTEGER,
-                    earliest_date TEXT,
-                    latest_date TEXT,
-                    status TEXT,
-                    error TEXT
-                );
-
-                CREATE TABLE IF NOT EXISTS coaching_log (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    summary TEXT NOT NULL,
-                    prescriptions TEXT,
-                    workout_ids TEXT,
-                    acwr REAL,
-                    weekly_km REAL,
-                    body_battery INTEGER,
-                    stress_level INTEGER,
-                    notion_stress INTEGER,
-                    notion_niggles TEXT,
-                    follow_up TEXT
-                );
-
-                CREATE TABLE IF NOT EXISTS coaching_context (
-                    id INTEGER PRIMARY KEY DEFAULT 1,
-                    updated_at TIMESTAMP NOT NULL,
-                    content TEXT NOT NULL
-                );
-
-                CREATE TABLE IF NOT EXISTS athlete_facts (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    updated_at TIMESTAMP NOT NULL,
-                    category TEXT NOT NULL,
-                    fact TEXT NOT NULL,
-                    active INTEGER DEFAULT 1,
-                    source TEXT
-                );
-            """)
-            # Migrations for existing databases
-            self._migrate_add_column(conn, "activities", "private_note", "TEXT")
-            self._migrate_add_column(conn, "athlete_profile", "systolic_bp", "REAL")
-            self._migrate_add_column(conn, "athlete_profile", "diastolic_bp", "REAL")
+    def _read(self) -> AbstractContextManager[sqlite3.Connection]:
+        """Per-thread reader connection; does not wait on in-flight writes."""
+        return self._pool.read()
 
-    @staticmethod
-    def _migrate_add_column(conn: sqlite3.Connection, table: str, column: str, col_type: str) -> None:
-        """Add a column if it doesn't already exist (idempotent migration)."""
-        existing = {row[1] for row in conn.execute(f"PRAGMA table_info({table})").fetchall()}
-        if column not in existing:
-            conn.execute(f"ALTER TABLE {table} ADD COLUMN {column} {col_type}")
+    def _ensure_tables(self, conn: sqlite3.Connection) -> None:
+        conn.executescript(_HISTORY_BASELINE_SCHEMA)
+        migrate_history_schema(conn)
+
+    def _bulk_upsert(
+        self,
+        table: str,
+        key_columns: tuple[str, ...],
+        sql: str,
+        rows: list[tuple[Any, ...]],
+        chunk_size: int | None = None,
+        raw_table: str | None = None,
+        raw_rows: list[tuple[Any, bytes | None]] | None = None,
+        chunk_hook: Callable[[sqlite3.Connection, list[tuple[Any, ...]]], AbstractContextManager[None]] | None = None,
+        date_index: int | None = None,
+        date_column: str | None = None,
+    ) -> UpsertResult:
+        """Run an upsert statement over ``rows`` with ``executemany``, one transaction per chunk.
+
+        Each row tuple must start with the values of ``key_columns``; ``sql`` takes
+        one more parameter than the row has, the row's ``content_hash``. A row whose
+        key is stored with the same hash is skipped, so re-sending an unchanged
+        upstream payload writes nothing and ``chunk_hook`` never sees it. Changed rows
+        are journalled in ``change_log`` (with the date at ``date_index``) in the same
+        transaction. Where the date is not part of the key, ``date_column`` names its
+        stored column, and a row whose date moved is journalled under its previous
+        date too, so readers bucketing by date also revisit where it used to be.
+
+        Keys already present are looked up per chunk so the result counts distinct
+        rows inserted, updated and unchanged; a key repeated in the input counts once.
+        Rows with a NULL key column never conflict (blood-pressure-only body
+        measurements have no ``weight_kg``), so their ``content_hash`` stands in for
+        the key: one already stored is unchanged, anything else is inserted.
+        """
+        chunk_size = chunk_size or UPSERT_CHUNK_SIZE
+        width = len(key_columns)
+        lookup = (
+            f"SELECT {', '.join((*key_columns, 'content_hash', date_column or 'NULL'))} FROM {table}"
+            f" WHERE {key_columns[0]} IN (SELECT value FROM json_each(?))"
+        )
+        by_hash = f"SELECT content_hash FROM {table} WHERE content_hash IN (SELECT value FROM json_each(?))"
+        seen: set[tuple[Any, ...]] = set()
+        seen_hashes: set[str] = set()
+        changed: set[Any] = set()
+        inserted = updated = unchanged = 0
+        for start in range(0, len(rows), chunk_size):
+            chunk = rows[start : start + chunk_size]
+            raws = raw_rows[start : start + chunk_size] if raw_rows else [(None, None)] * len(chunk)
+            hashes = [_content_hash(row, raw) for row, (_, raw) in zip(chunk, raws, strict=True)]
+            keys = {row[:width] for row in chunk if None not in row[:width]} - seen
+            keyless = {digest for row, digest in zip(chunk, hashes, strict=True) if None in row[:width]} - seen_hashes
+            with self._connect() as conn:
+                existing: dict[tuple[Any, ...], str | None] = {}
+                stored_dates: dict[tuple[Any, ...], str | None] = {}
+                if keys:
+                    lead = sorted({k[0] for k in keys})
+                    for r in conn.execute(lookup, (json.dumps(lead),)):
+                        existing[tuple(r[:width])] = r[width]
+                        stored_dates[tuple(r[:width])] = r[width + 1]
+                stored = {r[0] for r in conn.execute(by_hash, (json.dumps(sorted(keyless)),))} if keyless else set()
+                writes = []
+                for row, raw, digest in zip(chunk, raws, hashes, strict=True):
+                    key = row[:width]
+                    if None in key:
+                        if digest in seen_hashes:
+                            continue
+                        seen_hashes.add(digest)
+                        if digest in stored:
+                            unchanged += 1
+                            continue
+                        inserted += 1
+                    elif existing.get(key) == digest:
+                        continue
+                    writes.append((row, raw, digest))
+                if writes:
+                    params = [(*row, digest) for row, _, digest in writes]
+                    with chunk_hook(conn, [row for row, _, _ in writes]) if chunk_hook else nullcontext():
+                        conn.executemany(sql, params)
+                    payloads = [raw for _, raw, _ in writes if raw_table and raw[1] is not None]
+                    if payloads:
+                        conn.executemany(f"INSERT OR REPLACE INTO {raw_table} VALUES (?, ?)", payloads)
+                    journal = []
+                    for row, _, _ in writes:
+                        day = row[date_index] if date_index is not None else None
+                        previous = stored_dates.get(row[:width], day) if date_column else day
+                        if previous != day:
+                            journal.append((table, str(row[0]), previous))
+                        journal.append((table, str(row[0]), day))
+                    conn.executemany("INSERT INTO change_log (table_name, entity, date) VALUES (?, ?, ?)", journal)
+            written = {row[:width] for row, _, _ in writes} & keys
+            found = {k for k in keys if k in existing}
+            updated += len(written & found)
+            inserted += len(written - found)
+            unchanged += len(keys - written)
+            changed |= {row[0] for row, _, _ in writes}
+            seen |= keys
+        return UpsertResult(inserted, updated, unchanged, frozenset(changed))
 
     # ── Activities ─────────────────────────────────────────────────────
 
-    def upsert_activities(self, activities: list[dict[str, Any]]) -> int:
-        """Insert or update activities by strava_id. Returns count of rows affected."""
-        count = 0
-        with self._connect() as conn:
-            for a in activities:
-                conn.execute(
-                    """INSERT INTO activities
-                       (strava_id, date, sport_type, name, distance_m, moving_time_s,
-                        elapsed_time_s, elevation_gain_m, average_hr, max_hr,
-                        average_cadence, average_speed_ms, description, private_note,
-                        garmin_workout_id, perceived_effort, raw)
-                       VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                       ON CONFLICT(strava_id) DO UPDATE SET
-                        date=excluded.date, sport_type=excluded.sport_type, name=excluded.name,
-                        distance_m=excluded.distance_m, moving_time_s=excluded.moving_time_s,
-                        elapsed_time_s=excluded.elapsed_time_s, elevation_gain_m=excluded.elevation_gain_m,
-                        average_hr=excluded.average_hr, max_hr=excluded.max_hr,
-                        average_cadence=excluded.average_cadence, average_speed_ms=excluded.average_speed_ms,
-                        description=excluded.description,
-                        private_note=COALESCE(excluded.private_note, activities.private_note),
-                        garmin_workout_id=excluded.garmin_workout_id,
-                        perceived_effort=excluded.perceived_effort, raw=excluded.raw
-                    """,
-                    (
-                        str(a["strava_id"]),
-                        a["date"],
-                        a["sport_type"],
-                        a.get("name"),
-                        a.get("distance_m"),
-                        a.get("moving_time_s"),
-                        a.get("elapsed_time_s"),
-                        a.get("elevation_gain_m"),
-                        a.get("average_hr"),
-                        a.get("max_hr"),
-                        a.get("average_cadence"),
-                        a.get("average_speed_ms"),
-                        a.get("description"),
-                        a.get("private_note"),
-                        a.get("garmin_workout_id"),
-                        a.get("perceived_effort"),
-                        json.dumps(a.get("raw")) if a.get("raw") else None,
-                    ),
-                )
-                count += 1
-        return count
+    def upsert_activities(self, activities: list[dict[str, Any]], chunk_size: int | None = None) -> UpsertResult:
+        """Insert or update activities by strava_id, keeping the load rollups in step.
+
+        The rollups are refreshed once, after every chunk, for the distinct dates the
+        batch touched; chunks committed before a failure are still refreshed.
+        """
+        rows = [
+            (
+                str(a["strava_id"]),
+                a["date"],
+                a["sport_type"],
+                a.get("name"),
+                a.get("distance_m"),
+                a.get("moving_time_s"),
+                a.get("elapsed_time_s"),
+                a.get("elevation_gain_m"),
+                a.get("average_hr"),
+                a.get("max_hr"),
+                a.get("average_cadence"),
+                a.get("average_speed_ms"),
+                a.get("description"),
+                a.get("private_note"),
+                a.get("garmin_workout_id"),
+                a.get("perceived_effort"),
+            )
+            for a in activities
+        ]
+        touched: set[str] = set()
+        try:
+            return self._bulk_upsert(
+                "activities",
+                ("strava_id",),
+                """INSERT INTO activities
+                   (strava_id, date, sport_type, name, distance_m, moving_time_s,
+                    elapsed_time_s, elevation_gain_m, average_hr, max_hr,
+                    average_cadence, average_speed_ms, description, private_note,
+                    garmin_workout_id, perceived_effort, content_hash)
+                   VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                   ON CONFLICT(strava_id) DO UPDATE SET
+                    date=excluded.date, sport_type=excluded.sport_type, name=excluded.name,
+                    distance_m=excluded.distance_m, moving_time_s=excluded.moving_time_s,
+                    elapsed_time_s=excluded.elapsed_time_s, elevation_gain_m=excluded.elevation_gain_m,
+                    average_hr=excluded.average_hr, max_hr=excluded.max_hr,
+                    average_cadence=excluded.average_cadence, average_speed_ms=excluded.average_speed_ms,
+                    description=excluded.description,
+                    private_note=COALESCE(excluded.private_note, activities.private_note),
+                    garmin_workout_id=excluded.garmin_workout_id,
+                    perceived_effort=excluded.perceived_effort, content_hash=excluded.content_hash
+                """,
+                rows,
+                chunk_size,
+                raw_table="activity_raw",
+                raw_rows=[(str(a["strava_id"]), _pack_raw(a.get("raw"))) for a in activities],
+                chunk_hook=functools.partial(_activity_chunk_upkeep, touched=touched),
+                date_index=1,
+                date_column="date",
+            )
+        finally:
+            if touched:
+                with self._connect() as conn:
+                    refresh_load_rollups(conn, touched)
 
     def get_activities(
         self,
         days: int | None = None,
         sport_type: str | None = None,
         limit: int = 100,
+        columns: Sequence[str] | None = None,
     ) -> list[dict[str, Any]]:
-        """Query activities with optional filters."""
+        """Query activities with optional filters.
+
+        ``columns`` restricts the projection to a subset of ``ACTIVITY_COLUMNS``.
+        The raw Strava payload is never included; use ``get_activity_raw``.
+        """
+        select = _projection(columns, ACTIVITY_COLUMNS)
         clauses: list[str] = []
         params: list[Any] = []
         if days is not None:
             clauses.append("date >= date('now', ?)")
             params.append(f"-{days} days")
         if sport_type is not None:
-            clauses.append("LOWER(sport_type) LIKE ?")
-            params.append(f"%{sport_type.lower()}%")
+            clause, param = _sport_filter(sport_type)
+            clauses.append(clause)
+            params.append(param)
         where = "WHERE " + " AND ".join(clauses) if clauses else ""
         params.append(limit)
-        with self._connect() as conn:
+        with self._read() as conn:
             rows = conn.execute(
-                f"SELECT * FROM activities {where} ORDER BY date DESC LIMIT ?",
+                f"SELECT {select} FROM activities {where} ORDER BY date DESC LIMIT ?",
                 params,
             ).fetchall()
         return [dict(r) for r in rows]
 
+    def get_activity_raw(self, strava_id: str) -> dict[str, Any] | None:
+        """Fetch and decompress the full Strava payload for one activity."""
+        with self._read() as conn:
+            row = conn.execute("SELECT payload FROM activity_raw WHERE strava_id = ?", (str(strava_id),)).fetchone()
+        return _unpack_raw(row[0]) if row else None
+
+    def activities_needing_detail(self, days: int) -> list[str]:
+        """Return strava_ids in the last ``days`` whose detail was never fetched, newest first."""
+        with self._read() as conn:
+            rows = conn.execute(
+                """SELECT strava_id FROM activities
+                   WHERE date >= date('now', ?) AND detail_fetched_at IS NULL
+                   ORDER BY date DESC""",
+                (f"-{days} days",),
+            ).fetchall()
+        return [row[0] for row in rows]
+
+    def save_activity_details(self, details: Mapping[str, dict[str, Any]], fetched_at: str | None = None) -> int:
+        """Store Strava detail payloads and mark their activities as detail-fetched.
+
+        The detail endpoint is authoritative for ``private_note``, so an empty note
+        clears the stored one. Payloads live compressed in ``activity_detail``.
+        Returns the number of activities updated.
+        """
+        if not details:
+            return 0
+        fetched_at = fetched_at or time.strftime("%Y-%m-%dT%H:%M:%SZ")
+        with self._connect() as conn:
+            updated = conn.executemany(
+                "UPDATE activities SET private_note = ?, detail_fetched_at = ? WHERE strava_id = ?",
+                [
+                    (d.get("private_note") if isinstance(d.get("private_note"), str) else None, fetched_at, str(k))
+                    for k, d in details.items()
+                ],
+            ).rowcount
+            conn.executemany(
+                "INSERT OR REPLACE INTO activity_detail (strava_id, fetched_at, payload) VALUES (?, ?, ?)",
+                [(str(k), fetched_at, _pack_raw(d) or _pack_raw("{}")) for k, d in details.items()],
+            )
+        return updated
+
+    def get_activity_detail(self, strava_id: str) -> dict[str, Any] | None:
+        """Fetch and decompress the stored Strava detail payload for one activity."""
+        with self._read() as conn:
+            row = conn.execute("SELECT payload FROM activity_detail WHERE strava_id = ?", (str(strava_id),)).fetchone()
+        return _unpack_raw(row[0]) if row else None
+
     def get_weekly_distances(
         self,
         weeks: int = 12,
         sport_type: str = "run",
     ) -> list[dict[str, Any]]:
         """Return weekly distance totals, oldest first."""
-        with self._connect() as conn:
+        sport_clause, sport_param = _sport_filter(sport_type)
+        # Known sport classes read the daily_load rollup; free-text filters still scan activities.
+        if sport_clause == "sport_class = ?":
+            source, count = "daily_load", "SUM(activity_count)"
+        else:
+            source, count = "activities", "COUNT(*)"
+        with self._read() as conn:
             rows = conn.execute(
-                """SELECT
+                f"""SELECT
                      strftime('%Y-W%W', date) AS week,
                      MIN(date) AS week_start,
                      SUM(distance_m) / 1000.0 AS distance_km,
-                     COUNT(*) AS activity_count
-                   FROM activities
-                   WHERE LOWER(sport_type) LIKE ?
+                     {count} AS activity_count
+                   FROM {source}
+                   WHERE {sport_clause}
                      AND date >= date('now', ?)
                    GROUP BY week
                    ORDER BY week ASC
                 """,
-                (f"%{sport_type.lower()}%", f"-{weeks * 7} days"),
+                (sport_param, f"-{weeks * 7} days"),
             ).fetchall()
         return [dict(r) for r in rows]
 
-    # ── Wellness ───────────────────────────────────────────────────────
+    # ── Training Load Rollups ──────────────────────────────────────────
 
-    def upsert_wellness(self, snapshots: list[dict[str, Any]]) -> int:
-        """Insert or update wellness snapshots by date. Returns count."""
-        count = 0
+    def rebuild_load_rollups(self) -> None:
+        """Recompute every daily and weekly rollup from the activities table."""
         with self._connect() as conn:
-            for s in snapshots:
-                conn.execute(
-                    """INSERT INTO wellness_snapshots
-                       (date, body_battery_max, body_battery_min, hrv_status, hrv_value,
-                        sleep_score, sleep_duration_s, sleep_deep_s, sleep_rem_s,
-                        stress_avg, stress_max, training_readiness, resting_hr,
-                        respiration_avg, raw)
-                       VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                       ON CONFLICT(date) DO UPDATE SET
-                        body_battery_max=excluded.body_battery_max, body_battery_min=excluded.body_battery_min,
-                        hrv_status=excluded.hrv_status, hrv_value=excluded.hrv_value,
-                        sleep_score=excluded.sleep_score, sleep_duration_s=excluded.sleep_duration_s,
-                        sleep_deep_s=excluded.sleep_deep_s, sleep_rem_s=excluded.sleep_rem_s,
-                        stress_avg=excluded.stress_avg, stress_max=excluded.stress_max,
-                        training_readiness=excluded.training_readiness, resting_hr=excluded.resting_hr,
-                        respiration_avg=excluded.respiration_avg, raw=excluded.raw
-                    """,
-                    (
-                        s["date"],
-                        s.get("body_battery_max"),
-                        s.get("body_battery_min"),
-                        s.get("hrv_status"),
-                        s.get("hrv_value"),
-                        s.get("sleep_score"),
-                        s.get("sleep_duration_s"),
-                        s.get("sleep_deep_s"),
-                        s.get("sleep_rem_s"),
-                        s.get("stress_avg"),
-                        s.get("stress_max"),
-                        s.get("training_readiness"),
-                        s.get("resting_hr"),
-                        s.get("respiration_avg"),
-                        json.dumps(s.get("raw")) if s.get("raw") else None,
-                    ),
-                )
-                count += 1
-        return count
+            refresh_load_rollups(conn)
 
-    def get_wellness(self, days: int = 14) -> list[dict[str, Any]]:
-        """Query recent wellness snapshots."""
-        with self._connect() as conn:
+    # ── Wellness ───────────────────────────────────────────────────────
+
+    def upsert_wellness(self, snapshots: list[dict[str, Any]], chunk_size: int | None = None) -> UpsertResult:
+        """Insert or update wellness snapshots by date."""
+        rows = [
+            (
+                w["date"],
+                w.get("body_battery_max"),
+                w.get("body_battery_min"),
+                w.get("hrv_status"),
+                w.get("hrv_value"),
+                w.get("sleep_score"),
+                w.get("sleep_duration_s"),
+                w.get("sleep_deep_s"),
+                w.get("sleep_rem_s"),
+                w.get("stress_avg"),
+                w.get("stress_max"),
+                w.get("training_readiness"),
+                w.get("resting_hr"),
+                w.get("respiration_avg"),
+            )
+            for w in snapshots
+        ]
+        return self._bulk_upsert(
+            "wellness_snapshots",
+            ("date",),
+            """INSERT INTO wellness_snapshots
+               (date, body_battery_max, body_battery_min, hrv_status, hrv_value,
+                sleep_score, sleep_duration_s, sleep_deep_s, sleep_rem_s,
+                stress_avg, stress_max, training_readiness, resting_hr,
+                respiration_avg, content_hash)
+               VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+               ON CONFLICT(date) DO UPDATE SET
+                body_battery_max=excluded.body_battery_max, body_battery_min=excluded.body_battery_min,
+                hrv_status=excluded.hrv_status, hrv_value=excluded.hrv_value,
+                sleep_score=excluded.sleep_score, sleep_duration_s=excluded.sleep_duration_s,
+                sleep_deep_s=excluded.sleep_deep_s, sleep_rem_s=excluded.sleep_rem_s,
+                stress_avg=excluded.stress_avg, stress_max=excluded.stress_max,
+                training_readiness=excluded.training_readiness, resting_hr=excluded.resting_hr,
+                respiration_avg=excluded.respiration_avg, content_hash=excluded.content_hash
+            """,
+            rows,
+            chunk_size,
+            raw_table="wellness_raw",
+            raw_rows=[(w["date"], _pack_raw(w.get("raw"))) for w in snapshots],
+            date_index=0,
+        )
+
+    def get_wellness(self, days: int = 14, columns: Sequence[str] | None = None) -> list[dict[str, Any]]:
+        """Query recent wellness snapshots, projected to ``columns`` (default ``WELLNESS_COLUMNS``)."""
+        select = _projection(columns, WELLNESS_COLUMNS)
+        with self._read() as conn:
             rows = conn.execute(
-                "SELECT * FROM wellness_snapshots WHERE date >= date('now', ?) ORDER BY date DESC",
+                f"SELECT {select} FROM wellness_snapshots WHERE date >= date('now', ?) ORDER BY date DESC",
                 (f"-{days} days",),
             ).fetchall()
         return [dict(r) for r in rows]
 
+    def get_wellness_raw(self, date: str) -> dict[str, Any] | None:
+        """Fetch and decompress the full Garmin payload for one wellness day."""
+        with self._read() as conn:
+            row = conn.execute("SELECT payload FROM wellness_raw WHERE date = ?", (date,)).fetchone()
+        return _unpack_raw(row[0]) if row else None
+
     # ── Body Measurements ──────────────────────────────────────────────
 
-    def upsert_body_measurements(self, measurements: list[dict[str, Any]]) -> int:
-        """Insert or update body measurements. Returns count."""
-        count = 0
-        with self._connect() as conn:
-            for m in measurements:
-                conn.execute(
-                    """INSERT INTO body_measurements
-                       (date, weight_kg, bmi, body_fat_pct, muscle_mass_kg,
-                        bone_mass_kg, water_pct, systolic_bp, diastolic_bp, raw)
-                       VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                       ON CONFLICT(date, weight_kg) DO UPDATE SET
-                        bmi=excluded.bmi, body_fat_pct=excluded.body_fat_pct,
-                        muscle_mass_kg=excluded.muscle_mass_kg, bone_mass_kg=excluded.bone_mass_kg,
-                        water_pct=excluded.water_pct, systolic_bp=excluded.systolic_bp,
-                        diastolic_bp=excluded.diastolic_bp, raw=excluded.raw
-                    """,
-                    (
-                        m["date"],
-                        m.get("weight_kg"),
-                        m.get("bmi"),
-                        m.get("body_fat_pct"),
-                        m.get("muscle_mass_kg"),
-                        m.get("bone_mass_kg"),
-                        m.get("water_pct"),
-                        m.get("systolic_bp"),
-                        m.get("diastolic_bp"),
-                        json.dumps(m.get("raw")) if m.get("raw") else None,
-                    ),
-                )
-                count += 1
-        return count
+    def upsert_body_measurements(
+        self, measurements: list[dict[str, Any]], chunk_size: int | None = None
+    ) -> UpsertResult:
+        """Insert or update body measurements by (date, weight_kg)."""
+        rows = [
+            (
+                m["date"],
+                m.get("weight_kg"),
+                m.get("bmi"),
+                m.get("body_fat_pct"),
+                m.get("muscle_mass_kg"),
+                m.get("bone_mass_kg"),
+                m.get("water_pct"),
+                m.get("systolic_bp"),
+                m.get("diastolic_bp"),
+                _json_or_none(m.get("raw")),
+            )
+            for m in measurements
+        ]
+        return self._bulk_upsert(
+            "body_measurements",
+            ("date", "weight_kg"),
+            """INSERT INTO body_measurements
+               (date, weight_kg, bmi, body_fat_pct, muscle_mass_kg,
+                bone_mass_kg, water_pct, systolic_bp, diastolic_bp, raw, content_hash)
+               VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+               ON CONFLICT(date, weight_kg) DO UPDATE SET
+                bmi=excluded.bmi, body_fat_pct=excluded.body_fat_pct,
+                muscle_mass_kg=excluded.muscle_mass_kg, bone_mass_kg=excluded.bone_mass_kg,
+                water_pct=excluded.water_pct, systolic_bp=excluded.systolic_bp,
+                diastolic_bp=excluded.diastolic_bp, raw=excluded.raw, content_hash=excluded.content_hash
+            """,
+            rows,
+            chunk_size,
+            date_index=0,
+        )
 
     def get_body_measurements(self, days: int = 90) -> list[dict[str, Any]]:
         """Query recent body measurements."""
-        with self._connect() as conn:
+        with self._read() as conn:
             rows = conn.execute(
                 "SELECT * FROM body_measurements WHERE date >= date('now', ?) ORDER BY date DESC",
                 (f"-{days} days",),
@@ -466,25 +1417,26 @@ class HistoryDB:
 
     # ── Diary Entries ──────────────────────────────────────────────────
 
-    def upsert_diary_entries(self, entries: list[dict[str, Any]]) -> int:
-        """Insert or update diary entries by date. Returns count."""
-        count = 0
-        with self._connect() as conn:
-            for e in entries:
-                conn.execute(
-                    """INSERT INTO diary_entries (date, stress_1_5, niggles, notes)
-                       VALUES (?, ?, ?, ?)
-                       ON CONFLICT(date) DO UPDATE SET
-                        stress_1_5=excluded.stress_1_5, niggles=excluded.niggles, notes=excluded.notes
-                    """,
-                    (e["date"], e.get("stress_1_5"), e.get("niggles"), e.get("notes")),
-                )
-                count += 1
-        return count
+    def upsert_diary_entries(self, entries: list[dict[str, Any]], chunk_size: int | None = None) -> UpsertResult:
+        """Insert or update diary entries by date."""
+        rows = [(e["date"], e.get("stress_1_5"), e.get("niggles"), e.get("notes")) for e in entries]
+        return self._bulk_upsert(
+            "diary_entries",
+            ("date",),
+            """INSERT INTO diary_entries (date, stress_1_5, niggles, notes, content_hash)
+               VALUES (?, ?, ?, ?, ?)
+               ON CONFLICT(date) DO UPDATE SET
+                stress_1_5=excluded.stress_1_5, niggles=excluded.niggles, notes=excluded.notes,
+                content_hash=excluded.content_hash
+            """,
+            rows,
+            chunk_size,
+            date_index=0,
+        )
 
     def get_diary_entries(self, days: int = 28) -> list[dict[str, Any]]:
         """Query recent diary entries."""
-        with self._connect() as conn:
+        with self._read() as conn:
             rows = conn.execute(
                 "SELECT * FROM diary_entries WHERE date >= date('now', ?) ORDER BY date DESC",
                 (f"-{days} days",),
@@ -493,40 +1445,48 @@ class HistoryDB:
 
     # ── Scheduled Workouts ─────────────────────────────────────────────
 
-    def upsert_scheduled_workouts(self, workouts: list[dict[str, Any]]) -> int:
-        """Insert or update scheduled workouts. Returns count."""
-        count = 0
-        with self._connect() as conn:
-            for w in workouts:
-                conn.execute(
-                    """INSERT INTO scheduled_workouts
-                       (garmin_workout_id, sport_type, scheduled_date, workout_name,
-                        workout_detail, created_at, completed, strava_activity_id, skipped_reason)
-                       VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-                       ON CONFLICT(garmin_workout_id) DO UPDATE SET
-                        sport_type=excluded.sport_type, scheduled_date=excluded.scheduled_date,
-                        workout_name=excluded.workout_name, workout_detail=excluded.workout_detail,
-                        completed=excluded.completed, strava_activity_id=excluded.strava_activity_id,
-                        skipped_reason=excluded.skipped_reason
-                    """,
-                    (
-                        str(w["garmin_workout_id"]),
-                        w["sport_type"],
-                        w.get("scheduled_date"),
-                        w.get("workout_name"),
-                        json.dumps(w.get("workout_detail")) if w.get("workout_detail") else None,
-                        w.get("created_at"),
-                        w.get("completed", 0),
-                        w.get("strava_activity_id"),
-                        w.get("skipped_reason"),
-                    ),
-                )
-                count += 1
-        return count
+    def upsert_scheduled_workouts(self, workouts: list[dict[str, Any]], chunk_size: int | None = None) -> UpsertResult:
+        """Insert or update scheduled workouts by garmin_workout_id."""
+        rows = [
+            (
+                str(w["garmin_workout_id"]),
+                w["sport_type"],
+                w.get("scheduled_date"),
+                w.get("workout_name"),
+                _json_or_none(w.get("workout_detail")),
+                w.get("created_at"),
+                w.get("completed", 0),
+                w.get("strava_activity_id"),
+                w.get("skipped_reason"),
+                w.get("planned_duration_s"),
+                w.get("planned_distance_m"),
+            )
+            for w in workouts
+        ]
+        return self._bulk_upsert(
+            "scheduled_workouts",
+            ("garmin_workout_id",),
+            """INSERT INTO scheduled_workouts
+               (garmin_workout_id, sport_type, scheduled_date, workout_name,
+                workout_detail, created_at, completed, strava_activity_id, skipped_reason,
+                planned_duration_s, planned_distance_m, content_hash)
+               VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+               ON CONFLICT(garmin_workout_id) DO UPDATE SET
+                sport_type=excluded.sport_type, scheduled_date=excluded.scheduled_date,
+                workout_name=excluded.workout_name, workout_detail=excluded.workout_detail,
+                completed=excluded.completed, strava_activity_id=excluded.strava_activity_id,
+                skipped_reason=excluded.skipped_reason,
+                planned_duration_s=excluded.planned_duration_s, planned_distance_m=excluded.planned_distance_m,
+                content_hash=excluded.content_hash
+            """,
+            rows,
+            chunk_size,
+            date_index=2,
+        )
 
     def get_scheduled_workouts(self, days: int = 28) -> list[dict[str, Any]]:
         """Query recent scheduled workouts."""
-        with self._connect() as conn:
+        with self._read() as conn:
             rows = conn.execute(
                 "SELECT * FROM scheduled_workouts WHERE scheduled_date >= date('now', ?) ORDER BY scheduled_date DESC",
                 (f"-{days} days",),
@@ -565,11 +1525,15 @@ class HistoryDB:
                 "SELECT * FROM race_results WHERE date = ? AND distance_m = ? AND time_s = ?",
                 (result["date"], result["distance_m"], result["time_s"]),
             ).fetchone()
+            conn.execute(
+                "INSERT INTO change_log (table_name, entity, date) VALUES ('race_results', ?, ?)",
+                (str(row["id"]), row["date"]),
+            )
         return dict(row)
 
     def get_race_results(self, limit: int = 10) -> list[dict[str, Any]]:
         """Query race results ordered by date desc."""
-        with self._connect() as conn:
+        with self._read() as conn:
             rows = conn.execute(
                 "SELECT * FROM race_results ORDER BY date DESC LIMIT ?",
                 (limit,),
@@ -578,7 +1542,7 @@ class HistoryDB:
 
     def get_pbs(self) -> list[dict[str, Any]]:
         """Return best time per distance label."""
-        with self._connect() as conn:
+        with self._read() as conn:
             rows = conn.execute(
                 """SELECT distance_label, MIN(time_s) AS best_time_s, date, event_name, vdot
                    FROM race_results
@@ -611,28 +1575,14 @@ class HistoryDB:
 
     def get_athlete_profile(self) -> dict[str, Any] | None:
         """Return the singleton athlete profile, or None if not yet created."""
-        with self._connect() as conn:
+        with self._read() as conn:
             row = conn.execute("SELECT * FROM athlete_profile WHERE id = 1").fetchone()
         return dict(row) if row else None
 
     def upsert_athlete_profile(self, fields: dict[str, Any]) -> dict[str, Any]:
         """Create or update the athlete profile (always id=1)."""
-        fields["updated_at"] = time.strftime("%Y-%m-%dT%H:%M:%SZ")
-        existing = self.get_athlete_profile()
-        if existing is None:
-            cols = ["id", *list(fields.keys())]
-            placeholders = ", ".join("?" for _ in cols)
-            vals = [1, *fields.values()]
-            with self._connect() as conn:
-                conn.execute(
-                    f"INSERT INTO athlete_profile ({', '.join(cols)}) VALUES ({placeholders})",
-                    vals,
-                )
-        else:
-            set_clause = ", ".join(f"{k} = ?" for k in fields)
-            vals = [*fields.values(), 1]
-            with self._connect() as conn:
-                conn.execute(f"UPDATE athlete_profile SET {set_clause} WHERE id = ?", vals)
+        with self._connect() as conn:
+            write_athlete_profile(conn, fields)
         return self.get_athlete_profile()
 
     # ── Sync Log ───────────────────────────────────────────────────────
@@ -663,9 +1613,154 @@ class HistoryDB:
                 ),
             )
 
+    def change_seq(self) -> int:
+        """Return the latest ``change_log`` sequence number (0 when nothing has been journalled)."""
+        with self._read() as conn:
+            # sqlite_sequence survives pruning, so the number never goes backwards.
+            row = conn.execute("SELECT seq FROM sqlite_sequence WHERE name = 'change_log'").fetchone()
+            return row[0] if row else 0
+
+    def open_change_cursor(self, consumer: str) -> int:
+        """Pin the journal for ``consumer`` and return the current sequence number.
+
+        Entries after the returned seq are not pruned until ``close_change_cursor``,
+        so a later ``changes_since(seq)`` sees every change made in between.
+        """
+        with self._connect() as conn:
+            row = conn.execute("SELECT seq FROM sqlite_sequence WHERE name = 'change_log'").fetchone()
+            seq = row[0] if row else 0
+            conn.execute(
+                "INSERT OR REPLACE INTO change_cursor (consumer, seq, opened_at) VALUES (?, ?, ?)",
+                (consumer, seq, time.time()),
+            )
+        return seq
+
+    def close_change_cursor(self, consumer: str) -> None:
+        """Release ``consumer``'s pin on the journal."""
+        with self._connect() as conn:
+            conn.execute("DELETE FROM change_cursor WHERE consumer = ?", (consumer,))
+
+    def changes_since(self, seq: int) -> dict[str, dict[str, str | None]]:
+        """Return rows changed by upserts after ``seq``, as ``{table: {entity key: date}}``."""
+        with self._read() as conn:
+            rows = conn.execute(
+                "SELECT table_name, entity, date FROM change_log WHERE seq > ? ORDER BY seq", (seq,)
+            ).fetchall()
+        changes: dict[str, dict[str, str | None]] = {}
+        for table, entity, day in rows:
+            changes.setdefault(table, {})[entity] = day
+        return changes
+
+    def get_sync_cursor(self, source: str) -> dict[str, Any] | None:
+        """Return a source's backfill cursor (``cursor``, ``complete``, ``updated_at``), if any."""
+        with self._read() as conn:
+            row = conn.execute(
+                "SELECT cursor, complete, updated_at FROM sync_cursor WHERE source = ?", (source,)
+            ).fetchone()
+        return (
+            {"cursor": row["cursor"], "complete": bool(row["complete"]), "updated_at": row["updated_at"]}
+            if row
+            else None
+        )
+
+    def set_sync_cursor(self, source: str, cursor: str, complete: bool = False) -> None:
+        """Record how far a source's backfill has got. The cursor format is up to the source."""
+        with self._connect() as conn:
+            conn.execute(
+                """INSERT INTO sync_cursor (source, cursor, complete, updated_at) VALUES (?, ?, ?, ?)
+                   ON CONFLICT(source) DO UPDATE SET
+                    cursor=excluded.cursor, complete=excluded.complete, updated_at=excluded.updated_at
+                """,
+                (source, cursor, int(complete), time.strftime("%Y-%m-%dT%H:%M:%SZ")),
+            )
+
+    # ── Sync Lease ───────────────────────────────────────────────────
+    #
+    # One row per lease name in sync_lease says which run holds it and until when;
+    # the holder keeps pushing expires_at forward while it works. sync_run keeps
+    # each run's result so callers that joined it can read what it produced.
+
+    def acquire_sync_lease(
+        self, name: str, run_id: str, holder: str, sources: Sequence[str], ttl: float
+    ) -> dict[str, Any]:
+        """Take the lease unless another run holds an unexpired one; return whichever lease is now current.
+
+        The caller holds the lease if the returned ``run_id`` is its own, in which case a
+        ``sync_run`` row is started for it.
+        """
+        now = time.time()
+        with self._connect() as conn:
+            conn.execute(
+                """INSERT INTO sync_lease (name, run_id, holder, sources, acquired_at, expires_at)
+                   VALUES (?, ?, ?, ?, ?, ?)
+                   ON CONFLICT(name) DO UPDATE SET
+                    run_id=excluded.run_id, holder=excluded.holder, sources=excluded.sources,
+                    acquired_at=excluded.acquired_at, expires_at=excluded.expires_at
+                   WHERE sync_lease.expires_at < excluded.acquired_at
+                """,
+                (name, run_id, holder, ",".join(sources), now, now + ttl),
+            )
+            row = conn.execute(
+                "SELECT run_id, holder, sources, acquired_at, expires_at FROM sync_lease WHERE name = ?", (name,)
+            ).fetchone()
+            if row["run_id"] == run_id:
+                conn.execute(
+                    "INSERT INTO sync_run (run_id, sources, started_at) VALUES (?, ?, ?)",
+                    (run_id, ",".join(sources), now),
+                )
+        return {**dict(row), "sources": row["sources"].split(",") if row["sources"] else []}
+
+    def get_sync_lease(self, name: str) -> dict[str, Any] | None:
+        """Return the current holder of a lease (possibly expired), if any."""
+        with self._read() as conn:
+            row = conn.execute(
+                "SELECT run_id, holder, sources, acquired_at, expires_at FROM sync_lease WHERE name = ?", (name,)
+            ).fetchone()
+        if row is None:
+            return None
+        return {**dict(row), "sources": row["sources"].split(",") if row["sources"] else []}
+
+    def renew_sync_lease(self, name: str, run_id: str, ttl: float) -> bool:
+        """Extend a held lease by ``ttl`` seconds from now. Returns False if ``run_id`` no longer holds it."""
+        with self._connect() as conn:
+            cur = conn.execute(
+                "UPDATE sync_lease SET expires_at = ? WHERE name = ? AND run_id = ?",
+                (time.time() + ttl, name, run_id),
+            )
+        return cur.rowcount == 1
+
+    def release_sync_lease(self, name: str, run_id: str, result: dict[str, Any] | None, keep_runs: int = 20) -> None:
+        """Record a run's result (None if it crashed), release its lease and prune old runs."""
+        with self._connect() as conn:
+            conn.execute(
+                "UPDATE sync_run SET finished_at = ?, result = ? WHERE run_id = ?",
+                (time.time(), json.dumps(result, default=str) if result is not None else None, run_id),
+            )
+            conn.execute("DELETE FROM sync_lease WHERE name = ? AND run_id = ?", (name, run_id))
+            conn.execute(
+                """DELETE FROM sync_run WHERE finished_at IS NOT NULL AND run_id NOT IN (
+                     SELECT run_id FROM sync_run ORDER BY started_at DESC, rowid DESC LIMIT ?
+                   )""",
+                (keep_runs,),
+            )
+
+    def get_sync_run(self, run_id: str) -> dict[str, Any] | None:
+        """Return a sync run's ``started_at``, ``finished_at`` and decoded ``result``, if it is still kept."""
+        with self._read() as conn:
+            row = conn.execute(
+                "SELECT started_at, finished_at, result FROM sync_run WHERE run_id = ?", (run_id,)
+            ).fetchone()
+        if row is None:
+            return None
+        return {
+            "started_at": row["started_at"],
+            "finished_at": row["finished_at"],
+            "result": json.loads(row["result"]) if row["result"] is not None else None,
+        }
+
     def get_sync_status(self) -> list[dict[str, Any]]:
         """Return most recent sync per source."""
-        with self._connect() as conn:
+        with self._read() as conn:
             rows = conn.execute(
                 """SELECT source, synced_at, records_added, earliest_date, latest_date, status, error
                    FROM sync_log
@@ -707,7 +1802,7 @@ class HistoryDB:
 
     def get_recent_coaching_log(self, limit: int = 5) -> list[dict[str, Any]]:
         """Return last N coaching log entries ordered by date desc."""
-        with self._connect() as conn:
+        with self._read() as conn:
             rows = conn.execute(
                 "SELECT * FROM coaching_log ORDER BY id DESC LIMIT ?",
                 (limit,),
@@ -715,22 +1810,60 @@ class HistoryDB:
         return [dict(r) for r in rows]
 
     def search_coaching_log(self, query: str, limit: int = 10) -> list[dict[str, Any]]:
-        """Search coaching log by text match across summary and prescriptions."""
-        pattern = f"%{query}%"
-        with self._connect() as conn:
+        """Full-text search of summary, prescriptions and follow-up; best match first, then newest."""
+        match = _fts_query(query)
+        if match is None:
+            return []
+        with self._read() as conn:
             rows = conn.execute(
-                """SELECT * FROM coaching_log
-                   WHERE summary LIKE ? OR prescriptions LIKE ?
-                   ORDER BY id DESC LIMIT ?""",
-                (pattern, pattern, limit),
+                """SELECT c.* FROM coaching_log_fts f
+                   JOIN coaching_log c ON c.id = f.rowid
+                   WHERE coaching_log_fts MATCH ?
+                   ORDER BY f.rank, c.id DESC LIMIT ?""",
+                (match, limit),
             ).fetchall()
         return [dict(r) for r in rows]
 
+    # ── Search ───────────────────────────────────────────────────────
+
+    def search_history(
+        self,
+        query: str,
+        sources: Sequence[str] | None = None,
+        limit: int = 20,
+    ) -> list[dict[str, Any]]:
+        """BM25-ranked full-text search across coaching log, diary, activity notes and facts.
+
+        Every word in ``query`` must match (as a word prefix, after stemming).
+        Returns hits best first, each with source, ref, date, title, a snippet
+        with matches in [brackets], and score (higher is better).
+        """
+        match = _fts_query(query)
+        if match is None:
+            return []
+        hits: list[dict[str, Any]] = []
+        with self._read() as conn:
+            for source in sources or SEARCH_SOURCES:
+                spec = _SEARCH_SOURCES[source]
+                fts = spec.fts_table
+                extra = f" AND {spec.where}" if spec.where else ""
+                rows = conn.execute(
+                    f"""SELECT ? AS source, {spec.ref} AS ref, {spec.date} AS date, {spec.title} AS title,
+                               snippet({fts}, -1, '[', ']', '…', 16) AS snippet, -bm25({fts}) AS score
+                        FROM {fts} JOIN {spec.content_table} c ON c.id = {fts}.rowid
+                        WHERE {fts} MATCH ?{extra}
+                        ORDER BY {fts}.rank LIMIT ?""",
+                    (source, match, limit),
+                ).fetchall()
+                hits.extend(dict(r) for r in rows)
+        hits.sort(key=lambda h: h["score"], reverse=True)
+        return hits[:limit]
+
     # ── Coaching Context ─────────────────────────────────────────────
 
     def get_coaching_context(self) -> dict[str, Any] | None:
         """Return current coaching context, or None if not yet set."""
-        with self._connect() as conn:
+        with self._read() as conn:
             row = conn.execute("SELECT * FROM coaching_context WHERE id = 1").fetchone()
         return dict(row) if row else None
 
@@ -763,7 +1896,7 @@ class HistoryDB:
 
     def get_athlete_facts(self, category: str | None = None) -> list[dict[str, Any]]:
         """Return all active athlete facts, optionally filtered by category."""
-        with self._connect() as conn:
+        with self._read() as conn:
             if category:
                 rows = conn.execute(
                     "SELECT * FROM athlete_facts WHERE active = 1 AND category = ? ORDER BY category, created_at",
@@ -796,3 +1929,22 @@ class HistoryDB:
             )
             row = conn.execute("SELECT * FROM athlete_facts WHERE id = ?", (fact_id,)).fetchone()
         return dict(row) if row else None
+
+
+class AsyncDB(Generic[DB]):
+    """Awaitable facade over a ``HistoryDB`` or ``GoalDB`` for async callers.
+
+    Calls run on a bounded thread pool instead of the event loop, so a slow
+    query or write never stalls other coroutines. Pool threads are long-lived,
+    so each keeps its own reader connection from the ``ConnectionManager``;
+    writes still serialise on the shared writer.
+    """
+
+    def __init__(self, db: DB, executor: Executor | None = None, max_workers: int = 4) -> None:
+        self.db = db
+        self._executor = executor or ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="pace-ai-db")
+
+    async def call(self, fn: Callable[..., T], /, *args: Any, **kwargs: Any) -> T:
+        """Run ``fn(db, *args, **kwargs)`` on the pool and await its result."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, functools.partial(fn, self.db, *args, **kwargs))
@@ -2,13 +2,15 @@
 
 from __future__ import annotations
 
+import asyncio
 import json
+from concurrent.futures import ThreadPoolExecutor
 from typing import Any
 
 from mcp.server.fastmcp import FastMCP
 
 from pace_ai.config import Settings
-from pace_ai.database import GoalDB, HistoryDB
+from pace_ai.database import AsyncDB, GoalDB, HistoryDB
 from pace_ai.prompts.coaching import (
     injury_risk_prompt,
     race_readiness_prompt,
@@ -30,6 +32,12 @@ settings = Settings.from_env()
 goal_db = GoalDB(settings.db_path)
 history_db = HistoryDB(settings.db_path)
 
+# Tools are async; every SQLite call goes through these facades so it runs on a
+# bounded pool of worker threads instead of blocking the event loop.
+_db_executor = ThreadPoolExecutor(max_workers=settings.db_workers, thread_name_prefix="pace-ai-db")
+goals = AsyncDB(goal_db, _db_executor)
+history = AsyncDB(history_db, _db_executor)
+
 
 def _parse_json(raw: str, name: str = "input") -> Any:
     """Parse a JSON string with a clear error message on failure."""
@@ -60,13 +68,13 @@ async def set_goal(race_type: str, target_time: str, race_date: str | None = Non
         race_date: Optional race date (YYYY-MM-DD).
         notes: Optional notes about the goal.
     """
-    return goals_mod.set_goal(goal_db, race_type, target_time, race_date, notes)
+    return await goals.call(goals_mod.set_goal, race_type, target_time, race_date, notes)
 
 
 @mcp.tool()
 async def get_goals() -> list[dict]:
     """List all current training goals."""
-    return goals_mod.get_goals(goal_db)
+    return await goals.call(goals_mod.get_goals)
 
 
 @mcp.tool()
@@ -86,7 +94,7 @@ async def update_goal(
         race_date: New race date (optional).
         notes: New notes (optional).
     """
-    result = goals_mod.update_goal(goal_db, goal_id, race_type, target_time, race_date, notes)
+    result = await goals.call(goals_mod.update_goal, goal_id, race_type, target_time, race_date, notes)
     if result is None:
         return f"Goal {goal_id} not found."
     return result
@@ -99,7 +107,7 @@ async def delete_goal(goal_id: int) -> str:
     Args:
         goal_id: The goal ID to delete.
     """
-    return goals_mod.delete_goal(goal_db, goal_id)
+    return await goals.call(goals_mod.delete_goal, goal_id)
 
 
 # ── Analysis Tools ─────────────────────────────────────────────────────
@@ -468,7 +476,7 @@ async def sync_strava(activities_json: str) -> dict:
     activities = _parse_json(activities_json, "activities_json")
     if isinstance(activities, dict) and activities.get("error") == "invalid_json":
         return activities
-    return sync_mod.sync_strava(history_db, activities)
+    return await history.call(sync_mod.sync_strava, activities)
 
 
 @mcp.tool()
@@ -481,7 +489,7 @@ async def sync_garmin_wellness(wellness_json: str) -> dict:
     data = _parse_json(wellness_json, "wellness_json")
     if isinstance(data, dict) and data.get("error") == "invalid_json":
         return data
-    return sync_mod.sync_garmin_wellness(history_db, data)
+    return await history.call(sync_mod.sync_garmin_wellness, data)
 
 
 @mcp.tool()
@@ -494,7 +502,7 @@ async def sync_withings(measurements_json: str) -> dict:
     data = _parse_json(measurements_json, "measurements_json")
     if isinstance(data, dict) and data.get("error") == "invalid_json":
         return data
-    return sync_mod.sync_withings(history_db, data)
+    return await history.call(sync_mod.sync_withings, data)
 
 
 @mcp.tool()
@@ -507,7 +515,7 @@ async def sync_notion(entries_json: str) -> dict:
     data = _parse_json(entries_json, "entries_json")
     if isinstance(data, dict) and data.get("error") == "invalid_json":
         return data
-    return sync_mod.sync_notion(history_db, data)
+    return await history.call(sync_mod.sync_notion, data)
 
 
 @mcp.tool()
@@ -522,13 +530,13 @@ async def sync_garmin_workouts(workouts_json: str) -> dict:
     data = _parse_json(workouts_json, "workouts_json")
     if isinstance(data, dict) and data.get("error") == "invalid_json":
         return data
-    return sync_mod.sync_garmin_workouts(history_db, data)
+    return await history.call(sync_mod.sync_garmin_workouts, data)
 
 
 @mcp.tool()
 async def get_sync_status() -> list[dict]:
     """Get sync status summary — last sync time and record counts per source."""
-    return sync_mod.get_sync_status(history_db)
+    return await history.call(sync_mod.get_sync_status)
 
 
 @mcp.tool()
@@ -539,7 +547,9 @@ async def sync_all() -> dict:
     Continues if any single source fails. Call at the start of each coaching session
     to ensure the history store is up to date.
     """
-    return await sync_mod.sync_all(history_db)
+    # sync_all still does short SQLite reads on its loop, so it gets its own event loop
+    # on a worker thread rather than running on the server's loop.
+    return await asyncio.to_thread(asyncio.run, sync_mod.sync_all(history.db))
 
 
 # ── Coaching Memory Tools ─────────────────────────────────────────────
@@ -559,7 +569,7 @@ async def append_coaching_log(entry_json: str) -> dict:
     entry = _parse_json(entry_json, "entry_json")
     if isinstance(entry, dict) and entry.get("error") == "invalid_json":
         return entry
-    return memory_mod.append_coaching_log(history_db, entry)
+    return await history.call(memory_mod.append_coaching_log, entry)
 
 
 @mcp.tool()
@@ -569,7 +579,7 @@ async def get_coaching_context() -> dict | None:
     Returns None if no context has been set yet. In that case, generate initial
     context from recent coaching log entries and athlete profile.
     """
-    return memory_mod.get_coaching_context(history_db)
+    return await history.call(memory_mod.get_coaching_context)
 
 
 @mcp.tool()
@@ -582,7 +592,7 @@ async def update_coaching_context(content: str) -> dict:
         content: Rich text summarising the current coaching situation.
     """
     try:
-        return memory_mod.update_coaching_context(history_db, content)
+        return await history.call(memory_mod.update_coaching_context, content)
     except ValueError as e:
         return {"error": "word_limit_exceeded", "message": str(e)}
 
@@ -592,13 +602,13 @@ async def search_coaching_log(query: str, limit: int = 10) -> list[dict]:
     """Search past coaching sessions by keyword.
 
     Use when recalling specific past discussions, protocols, or decisions.
-    Searches across summary and prescriptions fields.
+    Searches across summary, prescriptions and follow-up fields.
 
     Args:
         query: Search term (e.g. "eccentric heel drops", "achilles", "long run").
         limit: Max results (default 10).
     """
-    return memory_mod.search_coaching_log(history_db, query, limit)
+    return await history.call(memory_mod.search_coaching_log, query, limit)
 
 
 @mcp.tool()
@@ -610,7 +620,7 @@ async def get_recent_coaching_log(limit: int = 5) -> list[dict]:
     Args:
         limit: Number of entries to return (default 5).
     """
-    return memory_mod.get_recent_coaching_log(history_db, limit)
+    return await history.call(memory_mod.get_recent_coaching_log, limit)
 
 
 @mcp.tool()
@@ -626,7 +636,7 @@ async def add_athlete_fact(category: str, fact: str, source_log_id: int | None =
         source_log_id: Optional coaching_log id this fact came from.
     """
     try:
-        return memory_mod.add_athlete_fact(history_db, category, fact, source_log_id)
+        return await history.call(memory_mod.add_athlete_fact, category, fact, source_log_id)
     except ValueError as e:
         return {"error": "invalid_category", "message": str(e)}
 
@@ -641,7 +651,7 @@ async def get_athlete_facts(category: str | None = None) -> list[dict]:
         category: Optional filter — 'injury', 'training_response', 'goal', 'preference', 'nutrition', 'other'.
     """
     try:
-        return memory_mod.get_athlete_facts(history_db, category)
+        return await history.call(memory_mod.get_athlete_facts, category)
     except ValueError as e:
         return {"error": "invalid_category", "message": str(e)}
 
@@ -656,7 +666,7 @@ async def update_athlete_fact(fact_id: int, fact: str) -> dict:
         fact_id: ID of the fact to update.
         fact: New text for the fact.
     """
-    result = memory_mod.update_athlete_fact(history_db, fact_id, fact)
+    result = await history.call(memory_mod.update_athlete_fact, fact_id, fact)
     if result is None:
         return {"error": "not_found", "message": f"No athlete fact with id {fact_id}"}
     return result
@@ -675,7 +685,7 @@ async def get_weekly_distances(weeks: int = 12, sport_type: str = "run") -> list
         weeks: Number of weeks to look back (default 12).
         sport_type: Sport type filter (default "run").
     """
-    return history_mod.get_weekly_distances(history_db, weeks=weeks, sport_type=sport_type)
+    return await history.call(history_mod.get_weekly_distances, weeks=weeks, sport_type=sport_type)
 
 
 @mcp.tool()
@@ -688,7 +698,7 @@ async def get_recent_activities_local(days: int = 28, sport_type: str | None = N
         days: Number of days to look back (default 28).
         sport_type: Optional filter (e.g. "run", "ride").
     """
-    return history_mod.get_recent_activities(history_db, days=days, sport_type=sport_type)
+    return await history.call(history_mod.get_recent_activities, days=days, sport_type=sport_type)
 
 
 @mcp.tool()
@@ -698,7 +708,7 @@ async def get_recent_wellness(days: int = 14) -> list[dict]:
     Args:
         days: Number of days to look back (default 14).
     """
-    return history_mod.get_recent_wellness(history_db, days=days)
+    return await history.call(history_mod.get_recent_wellness, days=days)
 
 
 @mcp.tool()
@@ -708,7 +718,7 @@ async def get_recent_diary(days: int = 28) -> list[dict]:
     Args:
         days: Number of days to look back (default 28).
     """
-    return history_mod.get_recent_diary(history_db, days=days)
+    return await history.call(history_mod.get_recent_diary, days=days)
 
 
 @mcp.tool()
@@ -718,13 +728,33 @@ async def get_race_history(limit: int = 10) -> list[dict]:
     Args:
         limit: Max number of results (default 10).
     """
-    return history_mod.get_race_history(history_db, limit=limit)
+    return await history.call(history_mod.get_race_history, limit=limit)
 
 
 @mcp.tool()
 async def get_pbs() -> list[dict]:
     """Get personal bests — fastest time per distance label."""
-    return history_mod.get_pbs(history_db)
+    return await history.call(history_mod.get_pbs)
+
+
+@mcp.tool()
+async def search_history(query: str, sources: list[str] | None = None, limit: int = 20) -> list[dict] | dict:
+    """Search all written history — coaching log, diary notes and niggles, activity names,
+    descriptions and private notes, and athlete facts — ranked by relevance.
+
+    Use instead of pulling whole tables when looking for past mentions
+    (e.g. "achilles", "calf tight", "heel drops"). Returns short snippets with
+    matches in [brackets]; fetch full rows with the source-specific tools.
+
+    Args:
+        query: Words to find; every word must match (prefixes match, e.g. "achill").
+        sources: Optional subset of "coaching_log", "diary", "activities", "facts".
+        limit: Max hits across all sources (default 20).
+    """
+    try:
+        return await history.call(history_mod.search_history, query, sources=sources, limit=limit)
+    except ValueError as e:
+        return {"error": "invalid_source", "message": str(e)}
 
 
 # ── Profile Tools ──────────────────────────────────────────────────────
@@ -737,13 +767,13 @@ async def generate_athlete_profile() -> dict:
     Computes VDOT, weekly volume, easy pace, training age, weight trends,
     resting HR baseline, and HRV baseline. Call after syncing data sources.
     """
-    return profile_mod.generate_athlete_profile(history_db)
+    return await history.call(profile_mod.generate_athlete_profile)
 
 
 @mcp.tool()
 async def get_athlete_profile() -> dict | None:
     """Get the current athlete profile, or null if not yet generated."""
-    return profile_mod.get_athlete_profile(history_db)
+    return await history.call(profile_mod.get_athlete_profile)
 
 
 @mcp.tool()
@@ -760,7 +790,7 @@ async def update_athlete_profile_manual(fields_json: str) -> dict:
     fields = _parse_json(fields_json, "fields_json")
     if isinstance(fields, dict) and fields.get("error") == "invalid_json":
         return fields
-    return profile_mod.update_athlete_profile_manual(history_db, fields)
+    return await history.call(profile_mod.update_athlete_profile_manual, fields)
 
 
 # ── Prompts ────────────────────────────────────────────────────────────
@@ -0,0 +1,205 @@
+"""Background sync scheduler — keeps the history store fresh without anyone clicking Sync.
+
+``pace-ai-syncd`` runs each source in ``SYNC_SOURCES`` on its own ``Cadence``: how
+often it syncs, how much random jitter spreads those runs out, and optionally the
+local hours it is worth polling in (Garmin wellness only changes overnight). A
+failing source backs off exponentially without delaying the others, and goes back
+to its normal cadence after its next success.
+
+Due sources are synced together through ``sync_all(sources=...)``, which is single
+flight across processes. A manual sync from the UI or the MCP tool therefore never
+runs alongside a scheduled one: whichever starts second joins the first and
+records its outcome.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import contextlib
+import json
+import logging
+import random
+import signal
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from datetime import time as dtime
+from typing import TYPE_CHECKING, Any
+
+from pace_ai.config import Settings
+from pace_ai.database import HistoryDB
+from pace_ai.tools.sync import SYNC_SOURCES, sync_all
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+log = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class Cadence:
+    """When one source syncs.
+
+    Attributes:
+        every: Seconds between syncs after a success.
+        jitter: Random spread applied to every delay, as a fraction of it (0.1 = ±10%).
+        hours: Optional ``(start, end)`` local hours, end exclusive. A run that would
+            fall outside them moves to the next ``start`` instead.
+    """
+
+    every: float
+    jitter: float = 0.1
+    hours: tuple[int, int] | None = None
+
+
+CADENCES: dict[str, Cadence] = {
+    "strava": Cadence(every=30 * 60),
+    # Sleep, HRV and body battery land once the watch syncs after waking up.
+    "garmin_wellness": Cadence(every=60 * 60, hours=(5, 12)),
+    "garmin_workouts": Cadence(every=3 * 60 * 60),
+    "withings": Cadence(every=2 * 60 * 60),
+    "notion": Cadence(every=15 * 60),
+}
+
+# Failure backoff: BACKOFF_BASE seconds after the first failure, doubling up to BACKOFF_MAX.
+BACKOFF_BASE = 60.0
+BACKOFF_MAX = 6 * 60 * 60.0
+# Longest single sleep, so the schedule catches up promptly after a suspend or clock change.
+MAX_SLEEP = 60.0
+
+
+@dataclass
+class SourceState:
+    """Scheduling state for one source."""
+
+    next_run: datetime
+    failures: int = 0
+    last_error: str | None = None
+
+
+class SyncScheduler:
+    """Decides which sources are due and syncs them, tracking backoff per source.
+
+    Args:
+        db: History store to sync into.
+        cadences: Per-source overrides for ``CADENCES``.
+        timeouts: Per-source fetch timeouts passed through to ``sync_all``.
+        clock: Returns the current local time (injectable for tests).
+        rng: Source of jitter (injectable for tests).
+    """
+
+    def __init__(
+        self,
+        db: HistoryDB,
+        cadences: dict[str, Cadence] | None = None,
+        timeouts: dict[str, float] | None = None,
+        clock: Callable[[], datetime] = datetime.now,
+        rng: random.Random | None = None,
+    ) -> None:
+        self.db = db
+        self.cadences = {**CADENCES, **(cadences or {})}
+        self.timeouts = timeouts
+        self._clock = clock
+        self._rng = rng or random.Random()
+        now = clock()
+        self.state = {source: SourceState(next_run=self._within_hours(source, now)) for source in SYNC_SOURCES}
+
+    def _jittered(self, source: str, seconds: float) -> timedelta:
+        spread = self.cadences[source].jitter
+        return timedelta(seconds=seconds * (1 + self._rng.uniform(-spread, spread)))
+
+    def _within_hours(self, source: str, when: datetime) -> datetime:
+        """Move ``when`` to the start of the source's next active window if it falls outside it."""
+        cadence = self.cadences[source]
+        if cadence.hours is None:
+            return when
+        start, end = cadence.hours
+        if start <= when.hour < end:
+            return when
+        day = when.date() if when.hour < start else when.date() + timedelta(days=1)
+        offset = self._rng.uniform(0, cadence.jitter * cadence.every)
+        return datetime.combine(day, dtime(start)) + timedelta(seconds=offset)
+
+    def due(self, now: datetime | None = None) -> list[str]:
+        """Sources whose next run is at or before ``now``, in ``SYNC_SOURCES`` order."""
+        now = now or self._clock()
+        return [source for source in SYNC_SOURCES if self.state[source].next_run <= now]
+
+    def next_wakeup(self) -> datetime:
+        return min(state.next_run for state in self.state.values())
+
+    def record(self, source: str, error: str | None, now: datetime | None = None) -> datetime:
+        """Schedule a source's next run after a sync that succeeded or failed with ``error``."""
+        now = now or self._clock()
+        state = self.state[source]
+        if error is None:
+            state.failures = 0
+            state.last_error = None
+            delay = self.cadences[source].every
+        else:
+            state.failures += 1
+            state.last_error = error
+            delay = min(BACKOFF_MAX, BACKOFF_BASE * 2 ** (state.failures - 1))
+        state.next_run = self._within_hours(source, now + self._jittered(source, delay))
+        if error is not None:
+            log.warning(
+                "syncd: %s failed %d time(s) (%s); retrying at %s",
+                source,
+                state.failures,
+                error,
+                state.next_run.isoformat(timespec="seconds"),
+            )
+        return state.next_run
+
+    async def run_once(self) -> dict[str, Any] | None:
+        """Sync every due source in one ``sync_all`` call; returns its summary, or None if nothing was due."""
+        sources = self.due()
+        if not sources:
+            return None
+        log.info("syncd: syncing %s", ", ".join(sources))
+        try:
+            summary = await sync_all(self.db, self.timeouts, sources=sources)
+        except Exception as exc:
+            log.exception("syncd: sync_all failed")
+            summary = {"results": {}, "errors": dict.fromkeys(sources, str(exc))}
+        finished = self._clock()
+        errors = summary.get("errors", {})
+        for source in sources:
+            self.record(source, errors.get(source), finished)
+        return summary
+
+    async def run_forever(self, stop: asyncio.Event) -> None:
+        """Sync due sources until ``stop`` is set, sleeping until the next one is due."""
+        while not stop.is_set():
+            await self.run_once()
+            wait = (self.next_wakeup() - self._clock()).total_seconds()
+            with contextlib.suppress(asyncio.TimeoutError):
+                await asyncio.wait_for(stop.wait(), min(max(wait, 0.0), MAX_SLEEP))
+
+
+async def _serve(scheduler: SyncScheduler) -> None:
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        with contextlib.suppress(NotImplementedError):  # Windows event loops
+            loop.add_signal_handler(sig, stop.set)
+    log.info("syncd: scheduling %s", ", ".join(f"{s} every {c.every:g}s" for s, c in scheduler.cadences.items()))
+    await scheduler.run_forever(stop)
+
+
+def main(argv: list[str] | None = None) -> None:
+    """Entry point for ``pace-ai-syncd``."""
+    parser = argparse.ArgumentParser(prog="pace-ai-syncd", description="Background sync scheduler for pace-ai.")
+    parser.add_argument("--once", action="store_true", help="sync every source once, print the summary and exit")
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+
+    db = HistoryDB(Settings.from_env().db_path)
+    if args.once:
+        print(json.dumps(asyncio.run(sync_all(db)), indent=2, default=str))
+        return
+    asyncio.run(_serve(SyncScheduler(db)))
+
+
+if __name__ == "__main__":
+    main()
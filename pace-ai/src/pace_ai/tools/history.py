@@ -4,7 +4,11 @@ from __future__ import annotations
 
 from typing import TYPE_CHECKING, Any
 
+from pace_ai.database import SEARCH_SOURCES
+
 if TYPE_CHECKING:
+    from collections.abc import Sequence
+
     from pace_ai.database import HistoryDB
 
 
@@ -37,6 +41,7 @@ def get_recent_activities(
     db: HistoryDB,
     days: int = 28,
     sport_type: str | None = None,
+    columns: Sequence[str] | None = None,
 ) -> list[dict[str, Any]]:
     """Return activities from the local store with computed mile/pace fields.
 
@@ -46,11 +51,13 @@ def get_recent_activities(
         db: HistoryDB instance.
         days: Number of days to look back (default 28).
         sport_type: Optional sport type filter (e.g. "run", "ride").
+        columns: Optional column projection (see ``ACTIVITY_COLUMNS``). The
+            computed fields need ``distance_m`` and ``average_speed_ms``.
 
     Returns:
         List of activity dicts, most recent first.
     """
-    activities = db.get_activities(days=days, sport_type=sport_type)
+    activities = db.get_activities(days=days, sport_type=sport_type, columns=columns)
     for a in activities:
         dist_m = a.get("distance_m") or 0
         speed = a.get("average_speed_ms") or 0
@@ -116,3 +123,30 @@ def get_pbs(db: HistoryDB) -> list[dict[str, Any]]:
         List of PB dicts with distance_label, best_time_s, date, event_name, vdot.
     """
     return db.get_pbs()
+
+
+def search_history(
+    db: HistoryDB,
+    query: str,
+    sources: Sequence[str] | None = None,
+    limit: int = 20,
+) -> list[dict[str, Any]]:
+    """Full-text search across coaching log, diary, activity notes and athlete facts.
+
+    Args:
+        db: HistoryDB instance.
+        query: Words to find (e.g. "achilles", "calf tight"). Every word must match.
+        sources: Subset of "coaching_log", "diary", "activities", "facts" (default all).
+        limit: Max hits across all sources (default 20).
+
+    Returns:
+        BM25-ranked hits, best first, each with source, ref, date, title, snippet, score.
+
+    Raises:
+        ValueError: If a source is not recognised.
+    """
+    unknown = sorted(set(sources or ()) - set(SEARCH_SOURCES))
+    if unknown:
+        msg = f"Unknown source(s) {unknown}. Must be among: {list(SEARCH_SOURCES)}"
+        raise ValueError(msg)
+    return db.search_history(query, sources=sources, limit=limit)
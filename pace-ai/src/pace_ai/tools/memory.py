@@ -72,7 +72,7 @@ def update_coaching_context(db: HistoryDB, content: str) -> dict[str, Any]:
 
 
 def search_coaching_log(db: HistoryDB, query: str, limit: int = 10) -> list[dict[str, Any]]:
-    """Search coaching log by text match across summary and prescriptions.
+    """Full-text search of the coaching log across summary, prescriptions and follow-up.
 
     Args:
         db: HistoryDB instance.
@@ -80,7 +80,7 @@ def search_coaching_log(db: HistoryDB, query: str, limit: int = 10) -> list[dict
         limit: Max results (default 10).
 
     Returns:
-        Matching log entries ordered by date desc.
+        Matching log entries, best match first (newest first on ties).
     """
     return db.search_coaching_log(query, limit)
 
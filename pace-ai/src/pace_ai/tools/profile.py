@@ -4,9 +4,16 @@ from __future__ import annotations
 
 import json
 import statistics
+from dataclasses import dataclass
+from datetime import date, timedelta
 from typing import TYPE_CHECKING, Any
 
+from pace_ai.database import prune_change_log, write_athlete_profile
+
 if TYPE_CHECKING:
+    import sqlite3
+    from collections.abc import Callable
+
     from pace_ai.database import HistoryDB
 
 # Fields that can only be set manually, not overwritten by auto-derivation
@@ -41,208 +48,367 @@ _AUTO_FIELDS = {
 }
 
 
-def generate_athlete_profile(db: HistoryDB) -> dict[str, Any]:
-    """Compute auto-derived fields from all history tables and upsert the profile.
+# ── Incremental profile engine ────────────────────────────────────────
+#
+# Auto-derived fields are computed in groups. Each group declares the history tables
+# it reads and how far back it looks, so a refresh recomputes only the groups that a
+# ``change_log`` entry since their last run can affect. Groups that read a window
+# relative to today are also recomputed once per day as the window slides.
 
-    Reads from activities, race_results, wellness_snapshots, and body_measurements
-    to compute:
-    - estimated_vdot: from best race result in last 12 months
-    - typical_weekly_km: median weekly total over last 12 weeks (running)
-    - typical_long_run_km: median longest run per week over last 12 weeks
-    - typical_easy_pace_min_per_km: median pace of bottom 30% effort runs
-    - max_weekly_km_ever: max weekly total across all history
-    - current_weekly_km: last 4 week average
-    - training_age_years: years since first activity
-    - weight_kg_current: most recent measurement
-    - weight_kg_trend: compare last 4 weeks vs prior 4 weeks
-    - resting_hr_baseline: 30-day median from wellness
-    - hrv_baseline: 30-day median from wellness
 
-    Returns:
-        The complete athlete profile dict.
+@dataclass(frozen=True)
+class ProfileGroup:
+    """Auto-derived profile fields computed together from the same inputs.
+
+    ``compute(conn, state, changed)`` returns the group's field values. ``changed``
+    holds the dates of relevant rows changed since the last run, or None for a full
+    computation. ``state`` is the group's persisted JSON state, which it may update
+    to carry running aggregates between runs.
     """
-    fields: dict[str, Any] = {}
 
-    # ── VDOT from best recent race ────────────────────────────────────
-    with db._connect() as conn:
-        race = conn.execute(
-            """SELECT vdot FROM race_results
-               WHERE vdot IS NOT NULL AND date >= date('now', '-12 months')
-               ORDER BY vdot DESC LIMIT 1
-            """,
-        ).fetchone()
-    fields["estimated_vdot"] = race["vdot"] if race else None
+    name: str
+    fields: tuple[str, ...]
+    tables: tuple[str, ...]
+    window_days: int | None  # None: the fields depend on all of history
+    daily: bool  # recompute at least once a day (sliding window or age)
+    compute: Callable[[sqlite3.Connection, dict[str, Any], list[str | None] | None], dict[str, Any]]
 
-    # ── VDOT peak (all-time best) ─────────────────────────────────────
-    with db._connect() as conn:
-        peak = conn.execute(
-            """SELECT vdot, date, event_name FROM race_results
-               WHERE vdot IS NOT NULL
-               ORDER BY vdot DESC LIMIT 1
-            """,
-        ).fetchone()
-    fields["vdot_peak"] = peak["vdot"] if peak else None
-    fields["vdot_peak_date"] = peak["date"] if peak else None
 
-    # ── VDOT current (most recent race/time-trial in last 3 months) ───
+def _window_days(
+    conn: sqlite3.Connection, state: dict[str, Any], changed: list[str | None] | None, sql: str, window_days: int
+) -> dict[str, list[list[Any]]]:
+    """Keep ``state["days"]``: the rows ``sql`` selects in the last ``window_days``, grouped by date.
+
+    ``sql`` selects ``date`` first and has a ``{dates}`` placeholder for the date
+    condition. Only the changed dates are re-read and days that left the window
+    are dropped, so a refresh reads just what moved. For tables keyed by date a
+    changed date identifies every row to re-read.
+    """
+    cutoff = (date.today() - timedelta(days=window_days)).isoformat()
+    days = state.get("days")
+    if changed is None or None in changed or days is None:
+        days = {}
+        rows = conn.execute(sql.format(dates="date >= ?"), (cutoff,)).fetchall()
+    else:
+        dates = sorted({d for d in changed if d and d >= cutoff})
+        for d in dates:
+            days.pop(d, None)
+        in_dates = "date IN (SELECT value FROM json_each(?))"
+        rows = conn.execute(sql.format(dates=in_dates), (json.dumps(dates),)).fetchall() if dates else []
+    for row in rows:
+        days.setdefault(row[0], []).append(list(row[1:]))
+    state["days"] = {d: values for d, values in days.items() if d >= cutoff}
+    return state["days"]
+
+
+def _vdot(conn: sqlite3.Connection, state: dict[str, Any], changed: list[str | None] | None) -> dict[str, Any]:
+    race = conn.execute(
+        """SELECT vdot FROM race_results
+           WHERE vdot IS NOT NULL AND date >= date('now', '-12 months')
+           ORDER BY vdot DESC LIMIT 1
+        """,
+    ).fetchone()
+    peak = conn.execute(
+        """SELECT vdot, date, event_name FROM race_results
+           WHERE vdot IS NOT NULL
+           ORDER BY vdot DESC LIMIT 1
+        """,
+    ).fetchone()
     # Only populated from actual race performances, not training pace estimates.
     # 3-month window ensures stale race data doesn't misrepresent current fitness.
-    with db._connect() as conn:
-        recent_race = conn.execute(
-            """SELECT vdot FROM race_results
-               WHERE vdot IS NOT NULL AND date >= date('now', '-3 months')
-               ORDER BY date DESC LIMIT 1
+    recent_race = conn.execute(
+        """SELECT vdot FROM race_results
+           WHERE vdot IS NOT NULL AND date >= date('now', '-3 months')
+           ORDER BY date DESC LIMIT 1
+        """,
+    ).fetchone()
+    return {
+        "estimated_vdot": race["vdot"] if race else None,
+        "vdot_peak": peak["vdot"] if peak else None,
+        "vdot_peak_date": peak["date"] if peak else None,
+        "vdot_current": recent_race["vdot"] if recent_race else None,
+    }
+
+
+def _weekly_volume(conn: sqlite3.Connection, state: dict[str, Any], changed: list[str | None] | None) -> dict[str, Any]:
+    # The all-time max is a running aggregate: only the weeks that changed are read,
+    # unless the current record week itself changed (it may have shrunk) or a
+    # changed row has no date.
+    weeks = None if changed is None or None in changed else {date.fromisoformat(d).strftime("%Y-W%W") for d in changed}
+    if weeks is None or "max_week" not in state or state["max_week"] in weeks:
+        best = conn.execute(
+            """SELECT week, distance_m / 1000.0 AS km FROM weekly_load
+               WHERE sport_class = 'run' AND distance_m > 0
+               ORDER BY distance_m DESC LIMIT 1
             """,
         ).fetchone()
-    fields["vdot_current"] = recent_race["vdot"] if recent_race else None
-
-    # ── Weekly distances (running) ────────────────────────────────────
-    with db._connect() as conn:
-        weeks = conn.execute(
-            """SELECT strftime('%Y-W%W', date) AS week,
-                      SUM(distance_m) / 1000.0 AS km
-               FROM activities
-               WHERE LOWER(sport_type) LIKE '%run%'
-               GROUP BY week
-               ORDER BY week ASC
-            """,
-        ).fetchall()
-
-    weekly_kms = [w["km"] for w in weeks if w["km"]]
-    if weekly_kms:
-        fields["max_weekly_km_ever"] = round(max(weekly_kms), 1)
-        recent_12 = weekly_kms[-12:] if len(weekly_kms) >= 12 else weekly_kms
-        fields["typical_weekly_km"] = round(statistics.median(recent_12), 1)
-        recent_4 = weekly_kms[-4:] if len(weekly_kms) >= 4 else weekly_kms
-        fields["current_weekly_km"] = round(statistics.mean(recent_4), 1)
+        state.clear()
+        if best:
+            state.update(max_week=best["week"], max_km=best["km"])
     else:
-        fields["max_weekly_km_ever"] = None
-        fields["typical_weekly_km"] = None
-        fields["current_weekly_km"] = None
-
-    # ── Longest run per week (last 12 weeks) ──────────────────────────
-    with db._connect() as conn:
-        long_runs = conn.execute(
-            """SELECT strftime('%Y-W%W', date) AS week,
-                      MAX(distance_m) / 1000.0 AS longest_km
-               FROM activities
-               WHERE LOWER(sport_type) LIKE '%run%'
-                 AND date >= date('now', '-84 days')
-               GROUP BY week
-               ORDER BY week ASC
+        rows = conn.execute(
+            """SELECT week, distance_m / 1000.0 AS km FROM weekly_load
+               WHERE sport_class = 'run' AND week IN (SELECT value FROM json_each(?))
             """,
+            (json.dumps(sorted(weeks)),),
         ).fetchall()
+        for row in rows:
+            if row["km"] and row["km"] > state["max_km"]:
+                state.update(max_week=row["week"], max_km=row["km"])
+
+    recent = conn.execute(
+        """SELECT distance_m / 1000.0 AS km FROM weekly_load
+           WHERE sport_class = 'run' AND distance_m > 0
+           ORDER BY week DESC LIMIT 12
+        """,
+    ).fetchall()
+    weekly_kms = [r["km"] for r in reversed(recent)]
+    if not weekly_kms:
+        return dict.fromkeys(("max_weekly_km_ever", "typical_weekly_km", "current_weekly_km"))
+    return {
+        "max_weekly_km_ever": round(state["max_km"], 1),
+        "typical_weekly_km": round(statistics.median(weekly_kms), 1),
+        "current_weekly_km": round(statistics.mean(weekly_kms[-4:]), 1),
+    }
+
+
+def _long_run(conn: sqlite3.Connection, state: dict[str, Any], changed: list[str | None] | None) -> dict[str, Any]:
+    long_runs = conn.execute(
+        """SELECT strftime('%Y-W%W', date) AS week,
+                  MAX(longest_m) / 1000.0 AS longest_km
+           FROM daily_load
+           WHERE sport_class = 'run'
+             AND date >= date('now', '-84 days')
+           GROUP BY week
+           ORDER BY week ASC
+        """,
+    ).fetchall()
     long_run_kms = [r["longest_km"] for r in long_runs if r["longest_km"]]
-    fields["typical_long_run_km"] = round(statistics.median(long_run_kms), 1) if long_run_kms else None
-
-    # ── Easy pace (bottom 30% by average speed) ───────────────────────
-    with db._connect() as conn:
-        paced_runs = conn.execute(
-            """SELECT average_speed_ms FROM activities
-               WHERE LOWER(sport_type) LIKE '%run%'
-                 AND average_speed_ms > 0
-                 AND date >= date('now', '-84 days')
-               ORDER BY average_speed_ms ASC
-            """,
-        ).fetchall()
-    if paced_runs:
-        n_easy = max(1, len(paced_runs) * 30 // 100)
-        easy_speeds = [r["average_speed_ms"] for r in paced_runs[:n_easy]]
-        median_speed = statistics.median(easy_speeds)
-        if median_speed > 0:
-            pace_min_per_km = (1000.0 / median_speed) / 60.0
-            fields["typical_easy_pace_min_per_km"] = round(pace_min_per_km, 2)
-        else:
-            fields["typical_easy_pace_min_per_km"] = None
-    else:
-        fields["typical_easy_pace_min_per_km"] = None
-
-    # ── Training age (from earliest race or activity, whichever is older) ─
-    with db._connect() as conn:
+    return {"typical_long_run_km": round(statistics.median(long_run_kms), 1) if long_run_kms else None}
+
+
+def _easy_pace(conn: sqlite3.Connection, state: dict[str, Any], changed: list[str | None] | None) -> dict[str, Any]:
+    # Easy pace: median of the bottom 30% of runs by average speed
+    paced_runs = conn.execute(
+        """SELECT average_speed_ms FROM activities
+           WHERE sport_class = 'run'
+             AND average_speed_ms > 0
+             AND date >= date('now', '-84 days')
+           ORDER BY average_speed_ms ASC
+        """,
+    ).fetchall()
+    if not paced_runs:
+        return {"typical_easy_pace_min_per_km": None}
+    n_easy = max(1, len(paced_runs) * 30 // 100)
+    median_speed = statistics.median(r["average_speed_ms"] for r in paced_runs[:n_easy])
+    pace_min_per_km = (1000.0 / median_speed) / 60.0
+    return {"typical_easy_pace_min_per_km": round(pace_min_per_km, 2)}
+
+
+def _training_age(conn: sqlite3.Connection, state: dict[str, Any], changed: list[str | None] | None) -> dict[str, Any]:
+    # From the earliest race or activity, whichever is older. The earliest date is a
+    # running minimum, so new rows only need comparing against it.
+    dates = [d for d in changed or () if d]
+    if changed is None or None in changed or "first" not in state:
         first_activity = conn.execute("SELECT MIN(date) AS d FROM activities").fetchone()
         first_race = conn.execute("SELECT MIN(date) AS d FROM race_results").fetchone()
-    candidates = [r["d"] for r in [first_activity, first_race] if r and r["d"]]
-    if candidates:
-        from datetime import date, datetime
-
-        earliest = min(candidates)
-        first_date = datetime.strptime(earliest[:10], "%Y-%m-%d").date()
-        delta = date.today() - first_date
-        fields["training_age_years"] = round(delta.days / 365.25, 1)
-    else:
-        fields["training_age_years"] = None
-
-    # ── Weight ────────────────────────────────────────────────────────
-    with db._connect() as conn:
-        latest_weight = conn.execute(
-            "SELECT weight_kg FROM body_measurements WHERE weight_kg IS NOT NULL ORDER BY date DESC LIMIT 1",
-        ).fetchone()
-    fields["weight_kg_current"] = latest_weight["weight_kg"] if latest_weight else None
-
+        dates = [r["d"] for r in (first_activity, first_race) if r["d"]]
+    elif state["first"]:
+        dates.append(state["first"])
+    state["first"] = min(dates)[:10] if dates else None
+    if state["first"] is None:
+        return {"training_age_years": None}
+    delta = date.today() - date.fromisoformat(state["first"])
+    return {"training_age_years": round(delta.days / 365.25, 1)}
+
+
+def _weight(conn: sqlite3.Connection, state: dict[str, Any], changed: list[str | None] | None) -> dict[str, Any]:
+    latest_weight = conn.execute(
+        "SELECT weight_kg FROM body_measurements WHERE weight_kg IS NOT NULL ORDER BY date DESC LIMIT 1",
+    ).fetchone()
     # Weight trend: compare last 4 weeks vs prior 4 weeks
-    with db._connect() as conn:
-        recent_weights = conn.execute(
-            """SELECT weight_kg FROM body_measurements
-               WHERE weight_kg IS NOT NULL AND date >= date('now', '-28 days')
-               ORDER BY date DESC
-            """,
-        ).fetchall()
-        prior_weights = conn.execute(
-            """SELECT weight_kg FROM body_measurements
-               WHERE weight_kg IS NOT NULL AND date >= date('now', '-56 days') AND date < date('now', '-28 days')
-               ORDER BY date DESC
-            """,
-        ).fetchall()
-
+    days = _window_days(
+        conn,
+        state,
+        changed,
+        "SELECT date, weight_kg FROM body_measurements WHERE weight_kg IS NOT NULL AND {dates}",
+        56,
+    )
+    split = (date.today() - timedelta(days=28)).isoformat()
+    recent_weights = [w for d, rows in days.items() if d >= split for (w,) in rows]
+    prior_weights = [w for d, rows in days.items() if d < split for (w,) in rows]
+    trend = None
     if recent_weights and prior_weights:
-        recent_avg = statistics.mean(r["weight_kg"] for r in recent_weights)
-        prior_avg = statistics.mean(r["weight_kg"] for r in prior_weights)
-        diff = recent_avg - prior_avg
+        diff = statistics.mean(recent_weights) - statistics.mean(prior_weights)
         if abs(diff) < 0.5:
-            fields["weight_kg_trend"] = "stable"
+            trend = "stable"
         elif diff > 0:
-            fields["weight_kg_trend"] = "increasing"
+            trend = "increasing"
         else:
-            fields["weight_kg_trend"] = "decreasing"
-    else:
-        fields["weight_kg_trend"] = None
+            trend = "decreasing"
+    return {"weight_kg_current": latest_weight["weight_kg"] if latest_weight else None, "weight_kg_trend": trend}
+
+
+def _wellness_baselines(
+    conn: sqlite3.Connection, state: dict[str, Any], changed: list[str | None] | None
+) -> dict[str, Any]:
+    # 30-day medians over the days kept in state.
+    sql = "SELECT date, resting_hr, hrv_value FROM wellness_snapshots WHERE {dates}"
+    days = _window_days(conn, state, changed, sql, 30)
+    rows = [row for day in days.values() for row in day]
+    hr = [resting_hr for resting_hr, _ in rows if resting_hr is not None]
+    hrv = [hrv_value for _, hrv_value in rows if hrv_value is not None]
+    return {
+        "resting_hr_baseline": round(statistics.median(hr), 1) if hr else None,
+        "hrv_baseline": round(statistics.median(hrv), 1) if hrv else None,
+    }
+
+
+def _blood_pressure(
+    conn: sqlite3.Connection, state: dict[str, Any], changed: list[str | None] | None
+) -> dict[str, Any]:
+    latest_bp = conn.execute(
+        """SELECT systolic_bp, diastolic_bp FROM body_measurements
+           WHERE systolic_bp IS NOT NULL AND diastolic_bp IS NOT NULL
+           ORDER BY date DESC LIMIT 1
+        """,
+    ).fetchone()
+    return {
+        "systolic_bp": latest_bp["systolic_bp"] if latest_bp else None,
+        "diastolic_bp": latest_bp["diastolic_bp"] if latest_bp else None,
+    }
+
+
+PROFILE_GROUPS: tuple[ProfileGroup, ...] = (
+    ProfileGroup(
+        "vdot",
+        ("estimated_vdot", "vdot_peak", "vdot_peak_date", "vdot_current"),
+        ("race_results",),
+        None,
+        daily=True,
+        compute=_vdot,
+    ),
+    ProfileGroup(
+        "weekly_volume",
+        ("max_weekly_km_ever", "typical_weekly_km", "current_weekly_km"),
+        ("activities",),
+        None,
+        daily=False,
+        compute=_weekly_volume,
+    ),
+    ProfileGroup("long_run", ("typical_long_run_km",), ("activities",), 84, daily=True, compute=_long_run),
+    ProfileGroup("easy_pace", ("typical_easy_pace_min_per_km",), ("activities",), 84, daily=True, compute=_easy_pace),
+    ProfileGroup(
+        "training_age",
+        ("training_age_years",),
+        ("activities", "race_results"),
+        None,
+        daily=True,
+        compute=_training_age,
+    ),
+    ProfileGroup(
+        "weight", ("weight_kg_current", "weight_kg_trend"), ("body_measurements",), None, daily=True, compute=_weight
+    ),
+    ProfileGroup(
+        "wellness_baselines",
+        ("resting_hr_baseline", "hrv_baseline"),
+        ("wellness_snapshots",),
+        30,
+        daily=True,
+        compute=_wellness_baselines,
+    ),
+    ProfileGroup(
+        "blood_pressure",
+        ("systolic_bp", "diastolic_bp"),
+        ("body_measurements",),
+        None,
+        daily=False,
+        compute=_blood_pressure,
+    ),
+)
+
+
+def refresh_athlete_profile(db: HistoryDB, full: bool = False) -> list[str]:
+    """Recompute the auto-derived profile fields whose inputs changed, and upsert them.
+
+    A group is recomputed when it has never run, when ``change_log`` has an entry
+    for one of its tables (inside its window) since its last run, or, for daily
+    groups, when it last ran on an earlier day. ``full`` recomputes every group.
+    Journal entries every group, and every open change cursor, has already seen
+    are pruned.
 
-    # ── Resting HR baseline (30-day median) ───────────────────────────
+    Returns:
+        Names of the groups recomputed, in ``PROFILE_GROUPS`` order.
+    """
+    today = date.today()
+    recomputed: list[str] = []
+    fields: dict[str, Any] = {}
     with db._connect() as conn:
-        hr_rows = conn.execute(
-            """SELECT resting_hr FROM wellness_snapshots
-               WHERE resting_hr IS NOT NULL AND date >= date('now', '-30 days')
+        seq = conn.execute("SELECT COALESCE(MAX(seq), 0) FROM change_log").fetchone()[0]
+        states = {row["name"]: row for row in conn.execute("SELECT name, seq, computed_on, state FROM profile_state")}
+        updates = []
+        for group in PROFILE_GROUPS:
+            previous = None if full else states.get(group.name)
+            state = json.loads(previous["state"]) if previous and previous["state"] else {}
+            changed: list[str | None] | None = None
+            if previous is not None:
+                cutoff = (today - timedelta(days=group.window_days)).isoformat() if group.window_days else ""
+                changed = [
+                    row[0]
+                    for row in conn.execute(
+                        f"""SELECT DISTINCT date FROM change_log
+                            WHERE seq > ? AND table_name IN ({", ".join("?" * len(group.tables))})
+                              AND (date IS NULL OR date >= ?)""",
+                        (previous["seq"], *group.tables, cutoff),
+                    )
+                ]
+                stale = group.daily and previous["computed_on"] != today.isoformat()
+                if not changed and not stale:
+                    continue
+            fields.update(group.compute(conn, state, changed))
+            updates.append((group.name, seq, today.isoformat(), json.dumps(state)))
+            recomputed.append(group.name)
+
+        if fields:
+            write_athlete_profile(conn, fields)
+        conn.executemany(
+            """INSERT INTO profile_state (name, seq, computed_on, state) VALUES (?, ?, ?, ?)
+               ON CONFLICT(name) DO UPDATE SET
+                seq=excluded.seq, computed_on=excluded.computed_on, state=excluded.state
             """,
-        ).fetchall()
-    if hr_rows:
-        fields["resting_hr_baseline"] = round(statistics.median(r["resting_hr"] for r in hr_rows), 1)
-    else:
-        fields["resting_hr_baseline"] = None
+            updates,
+        )
+        # Groups skipped above had no journal entries they read, so they have seen up to seq too.
+        conn.execute("UPDATE profile_state SET seq = ?", (seq,))
+        if all(group.name in states or group.name in recomputed for group in PROFILE_GROUPS):
+            prune_change_log(conn)
+    return recomputed
 
-    # ── HRV baseline (30-day median) ──────────────────────────────────
-    with db._connect() as conn:
-        hrv_rows = conn.execute(
-            """SELECT hrv_value FROM wellness_snapshots
-               WHERE hrv_value IS NOT NULL AND date >= date('now', '-30 days')
-            """,
-        ).fetchall()
-    if hrv_rows:
-        fields["hrv_baseline"] = round(statistics.median(r["hrv_value"] for r in hrv_rows), 1)
-    else:
-        fields["hrv_baseline"] = None
 
-    # ── Blood pressure (most recent reading) ───────────────────────────
-    with db._connect() as conn:
-        latest_bp = conn.execute(
-            """SELECT systolic_bp, diastolic_bp FROM body_measurements
-               WHERE systolic_bp IS NOT NULL AND diastolic_bp IS NOT NULL
-               ORDER BY date DESC LIMIT 1
-            """,
-        ).fetchone()
-    fields["systolic_bp"] = latest_bp["systolic_bp"] if latest_bp else None
-    fields["diastolic_bp"] = latest_bp["diastolic_bp"] if latest_bp else None
+def generate_athlete_profile(db: HistoryDB) -> dict[str, Any]:
+    """Compute every auto-derived field from all history tables and upsert the profile.
 
-    return db.upsert_athlete_profile(fields)
+    Reads from activities, race_results, wellness_snapshots, and body_measurements
+    to compute:
+    - estimated_vdot: from best race result in last 12 months
+    - typical_weekly_km: median weekly total over last 12 weeks (running)
+    - typical_long_run_km: median longest run per week over last 12 weeks
+    - typical_easy_pace_min_per_km: median pace of bottom 30% effort runs
+    - max_weekly_km_ever: max weekly total across all history
+    - current_weekly_km: last 4 week average
+    - training_age_years: years since first activity
+    - weight_kg_current: most recent measurement
+    - weight_kg_trend: compare last 4 weeks vs prior 4 weeks
+    - resting_hr_baseline: 30-day median from wellness
+    - hrv_baseline: 30-day median from wellness
+
+    Use ``refresh_athlete_profile`` to recompute only what changed.
+
+    Returns:
+        The complete athlete profile dict.
+    """
+    refresh_athlete_profile(db, full=True)
+    return db.get_athlete_profile()
 
 
 def get_athlete_profile(db: HistoryDB) -> dict[str, Any] | None:
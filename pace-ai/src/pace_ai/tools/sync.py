@@ -2,15 +2,27 @@
 
 from __future__ import annotations
 
+import asyncio
+import functools
 import logging
+import os
 import re
+import socket
+import threading
 import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 from datetime import date, datetime, timedelta
 from typing import TYPE_CHECKING, Any
 
+from pace_ai.database import UpsertResult
 from pace_ai.tools.analysis import _vdot_from_time
 
 if TYPE_CHECKING:
+    from collections.abc import Awaitable, Callable, Iterable
+    from concurrent.futures import Executor, Future
+
     from pace_ai.database import HistoryDB
 
 log = logging.getLogger(__name__)
@@ -58,15 +70,26 @@ def sync_strava(db: HistoryDB, activities: list[dict[str, Any]]) -> dict[str, An
     detects race results, calculates VDOT, and marks PBs.
 
     Returns:
-        Summary with counts of synced activities and detected races.
+        Summary with synced activity counts (inserted vs updated) and detected races.
     """
+    result = _store_strava(db, activities)
+    earliest, latest = _strava_date_span(activities)
+    db.log_sync("strava", result["activities_synced"], "success", earliest_date=earliest, latest_date=latest)
+    return result
+
+
+def _strava_date_span(activities: list[dict[str, Any]]) -> tuple[str | None, str | None]:
+    """Earliest and latest start date (YYYY-MM-DD) among ``activities``, or Nones if none have one."""
+    dates = [d for a in activities if (d := a.get("start_date_local", a.get("start_date", ""))[:10])]
+    return (min(dates), max(dates)) if dates else (None, None)
+
+
+def _store_strava(db: HistoryDB, activities: list[dict[str, Any]]) -> dict[str, Any]:
+    """Upsert Strava activities and their detected races, without writing the sync log."""
     # Map Strava fields to our schema
     mapped = []
-    dates = []
     for a in activities:
         date = a.get("start_date_local", a.get("start_date", ""))[:10]
-        if date:
-            dates.append(date)
         mapped.append(
             {
                 "strava_id": str(a.get("id", "")),
@@ -88,11 +111,13 @@ def sync_strava(db: HistoryDB, activities: list[dict[str, Any]]) -> dict[str, An
             }
         )
 
-    activity_count = db.upsert_activities(mapped)
+    upserted = db.upsert_activities(mapped)
 
-    # Detect races and create race results
+    # Detect races and create race results (an unchanged activity cannot add or move a race)
     race_count = 0
     for a in activities:
+        if str(a.get("id", "")) not in upserted.changed:
+            continue
         if _is_likely_race(a) and a.get("distance") and a.get("moving_time"):
             distance_m = a["distance"]
             time_s = a["moving_time"]
@@ -116,14 +141,50 @@ def sync_strava(db: HistoryDB, activities: list[dict[str, Any]]) -> dict[str, An
     if race_count > 0:
         db.mark_pbs()
 
+    return {
+        "source": "strava",
+        "activities_synced": upserted.total,
+        "inserted": upserted.inserted,
+        "updated": upserted.updated,
+        "unchanged": upserted.unchanged,
+        "races_detected": race_count,
+    }
+
+
+def _wellness_row(w: dict[str, Any]) -> dict[str, Any]:
+    """Map one flattened Garmin wellness record to a ``wellness_snapshots`` row."""
+    return {
+        "date": w.get("date", ""),
+        "body_battery_max": w.get("body_battery_max"),
+        "body_battery_min": w.get("body_battery_min"),
+        "hrv_status": w.get("hrv_status"),
+        "hrv_value": w.get("hrv_value"),
+        "sleep_score": w.get("sleep_score"),
+        "sleep_duration_s": w.get("sleep_duration_s"),
+        "sleep_deep_s": w.get("sleep_deep_s"),
+        "sleep_rem_s": w.get("sleep_rem_s"),
+        "stress_avg": w.get("stress_avg"),
+        "stress_max": w.get("stress_max"),
+        "training_readiness": w.get("training_readiness"),
+        "resting_hr": w.get("resting_hr"),
+        "respiration_avg": w.get("respiration_avg"),
+        "raw": w,
+    }
+
+
+def _log_wellness_sync(db: HistoryDB, dates: list[str], upserted: UpsertResult) -> dict[str, Any]:
+    """Record a successful Garmin wellness sync covering ``dates`` and summarise it."""
+    dates = [d for d in dates if d]
     earliest = min(dates) if dates else None
     latest = max(dates) if dates else None
-    db.log_sync("strava", activity_count, "success", earliest_date=earliest, latest_date=latest)
+    db.log_sync("garmin_wellness", upserted.total, "success", earliest_date=earliest, latest_date=latest)
 
     return {
-        "source": "strava",
-        "activities_synced": activity_count,
-        "races_detected": race_count,
+        "source": "garmin_wellness",
+        "records_synced": upserted.total,
+        "inserted": upserted.inserted,
+        "updated": upserted.updated,
+        "unchanged": upserted.unchanged,
     }
 
 
@@ -131,47 +192,17 @@ def sync_garmin_wellness(db: HistoryDB, wellness_data: list[dict[str, Any]]) ->
     """Sync Garmin wellness snapshots into the history store.
 
     Returns:
-        Summary with count of synced records.
+        Summary with synced record count, split into inserted and updated.
     """
-    mapped = []
-    dates = []
-    for w in wellness_data:
-        date = w.get("date", "")
-        if date:
-            dates.append(date)
-        mapped.append(
-            {
-                "date": date,
-                "body_battery_max": w.get("body_battery_max"),
-                "body_battery_min": w.get("body_battery_min"),
-                "hrv_status": w.get("hrv_status"),
-                "hrv_value": w.get("hrv_value"),
-                "sleep_score": w.get("sleep_score"),
-                "sleep_duration_s": w.get("sleep_duration_s"),
-                "sleep_deep_s": w.get("sleep_deep_s"),
-                "sleep_rem_s": w.get("sleep_rem_s"),
-                "stress_avg": w.get("stress_avg"),
-                "stress_max": w.get("stress_max"),
-                "training_readiness": w.get("training_readiness"),
-                "resting_hr": w.get("resting_hr"),
-                "respiration_avg": w.get("respiration_avg"),
-                "raw": w,
-            }
-        )
-
-    count = db.upsert_wellness(mapped)
-    earliest = min(dates) if dates else None
-    latest = max(dates) if dates else None
-    db.log_sync("garmin_wellness", count, "success", earliest_date=earliest, latest_date=latest)
-
-    return {"source": "garmin_wellness", "records_synced": count}
+    upserted = db.upsert_wellness([_wellness_row(w) for w in wellness_data])
+    return _log_wellness_sync(db, [w.get("date", "") for w in wellness_data], upserted)
 
 
 def sync_withings(db: HistoryDB, measurements: list[dict[str, Any]]) -> dict[str, Any]:
     """Sync Withings body measurements into the history store.
 
     Returns:
-        Summary with count of synced records.
+        Summary with synced record count, split into inserted and updated.
     """
     mapped = []
     dates = []
@@ -194,19 +225,25 @@ def sync_withings(db: HistoryDB, measurements: list[dict[str, Any]]) -> dict[str
             }
         )
 
-    count = db.upsert_body_measurements(mapped)
+    upserted = db.upsert_body_measurements(mapped)
     earliest = min(dates) if dates else None
     latest = max(dates) if dates else None
-    db.log_sync("withings", count, "success", earliest_date=earliest, latest_date=latest)
+    db.log_sync("withings", upserted.total, "success", earliest_date=earliest, latest_date=latest)
 
-    return {"source": "withings", "records_synced": count}
+    return {
+        "source": "withings",
+        "records_synced": upserted.total,
+        "inserted": upserted.inserted,
+        "updated": upserted.updated,
+        "unchanged": upserted.unchanged,
+    }
 
 
 def sync_notion(db: HistoryDB, entries: list[dict[str, Any]]) -> dict[str, Any]:
     """Sync Notion diary entries into the history store.
 
     Returns:
-        Summary with count of synced records.
+        Summary with synced record count, split into inserted and updated.
     """
     mapped = []
     dates = []
@@ -223,21 +260,29 @@ def sync_notion(db: HistoryDB, entries: list[dict[str, Any]]) -> dict[str, Any]:
             }
         )
 
-    count = db.upsert_diary_entries(mapped)
+    upserted = db.upsert_diary_entries(mapped)
     earliest = min(dates) if dates else None
     latest = max(dates) if dates else None
-    db.log_sync("notion", count, "success", earliest_date=earliest, latest_date=latest)
+    db.log_sync("notion", upserted.total, "success", earliest_date=earliest, latest_date=latest)
 
-    return {"source": "notion", "records_synced": count}
+    return {
+        "source": "notion",
+        "records_synced": upserted.total,
+        "inserted": upserted.inserted,
+        "updated": upserted.updated,
+        "unchanged": upserted.unchanged,
+    }
 
 
 def sync_garmin_workouts(db: HistoryDB, workouts: list[dict[str, Any]]) -> dict[str, Any]:
     """Sync Garmin scheduled workouts into the history store.
 
-    Attempts to match completed workouts against activities by date and sport type.
+    Then matches open workouts against activities by date and sport class (see
+    ``_match_workouts``).
 
     Returns:
-        Summary with count of synced records.
+        Summary with synced record count, split into inserted and updated, and the
+        matched/ambiguous/unmatched counts under ``matching``.
     """
     mapped = []
     dates = []
@@ -256,36 +301,87 @@ def sync_garmin_workouts(db: HistoryDB, workouts: list[dict[str, Any]]) -> dict[
                 "completed": w.get("completed", 0),
                 "strava_activity_id": w.get("strava_activity_id"),
                 "skipped_reason": w.get("skipped_reason"),
+                "planned_duration_s": w.get("planned_duration_s"),
+                "planned_distance_m": w.get("planned_distance_m"),
             }
         )
 
-    count = db.upsert_scheduled_workouts(mapped)
-
-    # Try to match unmatched workouts to activities by date + sport_type
-    with db._connect() as conn:
-        unmatched = conn.execute(
-            "SELECT id, scheduled_date, sport_type FROM scheduled_workouts"
-            " WHERE completed = 0 AND scheduled_date IS NOT NULL",
-        ).fetchall()
-        for row in unmatched:
-            # Match "running" to "Run", "cycling" to "Ride", etc.
-            sport = row["sport_type"].lower()
-            sport_match = sport[:3]  # "run" from "running", "rid" from "ride"
-            activity = conn.execute(
-                "SELECT strava_id FROM activities WHERE date = ? AND LOWER(sport_type) LIKE ? LIMIT 1",
-                (row["scheduled_date"], f"%{sport_match}%"),
-            ).fetchone()
-            if activity:
-                conn.execute(
-                    "UPDATE scheduled_workouts SET completed = 1, strava_activity_id = ? WHERE id = ?",
-                    (activity["strava_id"], row["id"]),
-                )
+    upserted = db.upsert_scheduled_workouts(mapped)
+    # Unchanged workouts keep their matches; new activities are matched by sync_all.
+    matching = _match_workouts(db) if upserted.total else None
 
     earliest = min(dates) if dates else None
     latest = max(dates) if dates else None
-    db.log_sync("garmin_workouts", count, "success", earliest_date=earliest, latest_date=latest)
-
-    return {"source": "garmin_workouts", "records_synced": count}
+    db.log_sync("garmin_workouts", upserted.total, "success", earliest_date=earliest, latest_date=latest)
+
+    result = {
+        "source": "garmin_workouts",
+        "records_synced": upserted.total,
+        "inserted": upserted.inserted,
+        "updated": upserted.updated,
+        "unchanged": upserted.unchanged,
+    }
+    if matching is not None:
+        result["matching"] = matching
+    return result
+
+
+# Two candidates for the same workout scoring within this margin make its match ambiguous.
+WORKOUT_MATCH_MARGIN = 0.1
+
+# One row per open workout and each same-day activity of the same sport class (or a
+# single NULL-activity row when there is none), best first. The score is the mean
+# closeness, 0..1, of moving time and distance to whichever plan targets are set, so a
+# workout without targets scores every candidate 0 and ties go to the longest activity.
+# Activities already credited to a completed workout are never candidates.
+_WORKOUT_CANDIDATES_SQL = """
+    SELECT w.id AS workout_id, a.strava_id,
+           (COALESCE(MAX(0.0, 1.0 - ABS(a.moving_time_s - w.planned_duration_s) * 1.0 / w.planned_duration_s), 0.0)
+            + COALESCE(MAX(0.0, 1.0 - ABS(a.distance_m - w.planned_distance_m) / w.planned_distance_m), 0.0))
+           / MAX(1, COALESCE(w.planned_duration_s > 0, 0) + COALESCE(w.planned_distance_m > 0, 0)) AS score
+    FROM scheduled_workouts w
+    LEFT JOIN activities a
+      ON a.sport_class = w.sport_class AND a.date = w.scheduled_date
+     AND a.strava_id NOT IN (
+         SELECT strava_activity_id FROM scheduled_workouts
+         WHERE completed = 1 AND strava_activity_id IS NOT NULL
+     )
+    WHERE w.completed = 0 AND w.scheduled_date IS NOT NULL
+    ORDER BY score DESC, a.moving_time_s DESC, a.strava_id
+"""
+
+
+def _match_workouts(db: HistoryDB) -> dict[str, int]:
+    """Mark open scheduled workouts completed by the activity that best fits each one.
+
+    Candidates come from one join (``_WORKOUT_CANDIDATES_SQL``) and are claimed best
+    score first, so an activity completes at most one workout. A match is ambiguous
+    when another candidate for the same workout scored within ``WORKOUT_MATCH_MARGIN``
+    of it; it is still applied. Returns matched, ambiguous and unmatched counts.
+    """
+    with db._connect() as conn:
+        rows = conn.execute(_WORKOUT_CANDIDATES_SQL).fetchall()
+        scores: dict[int, list[float]] = {}
+        matches: dict[int, tuple[str, float]] = {}
+        taken: set[str] = set()
+        for workout_id, strava_id, score in rows:
+            options = scores.setdefault(workout_id, [])
+            if strava_id is None:
+                continue
+            options.append(score)
+            if workout_id not in matches and strava_id not in taken:
+                matches[workout_id] = (strava_id, score)
+                taken.add(strava_id)
+        conn.executemany(
+            "UPDATE scheduled_workouts SET completed = 1, strava_activity_id = ? WHERE id = ?",
+            [(strava_id, workout_id) for workout_id, (strava_id, _) in matches.items()],
+        )
+    ambiguous = sum(
+        1
+        for workout_id, (_, best) in matches.items()
+        if sum(1 for score in scores[workout_id] if best - score <= WORKOUT_MATCH_MARGIN) > 1
+    )
+    return {"matched": len(matches), "ambiguous": ambiguous, "unmatched": len(scores) - len(matches)}
 
 
 def get_sync_status(db: HistoryDB) -> list[dict[str, Any]]:
@@ -295,7 +391,7 @@ def get_sync_status(db: HistoryDB) -> list[dict[str, Any]]:
 
 def _last_sync_time(db: HistoryDB, source: str) -> str | None:
     """Return the synced_at timestamp from the most recent successful sync for a source."""
-    with db._connect() as conn:
+    with db._read() as conn:
         row = conn.execute(
             "SELECT synced_at FROM sync_log WHERE source = ? AND status = 'success' ORDER BY id DESC LIMIT 1",
             (source,),
@@ -315,298 +411,686 @@ def _to_timestamp(d: str) -> int:
     return int(datetime.strptime(d[:10], "%Y-%m-%d").timestamp())
 
 
-async def _enrich_private_notes(db: HistoryDB, strava_client: Any, days: int = 28) -> int:
-    """Fetch detail for recent activities missing private_note and backfill them.
-
-    Only fetches detail for activities where private_note is NULL, to minimise
-    API calls. Returns count of activities enriched.
+# Activity detail enrichment (private notes + full payload). At most this many detail
+# requests are in flight, and each Strava rate-limit window keeps a reserve of requests
+# unspent so the strava-mcp tools still work straight after a sync.
+DETAIL_MAX_CONCURRENCY = 4
+DETAIL_RESERVE_FIFTEEN_MIN = 10
+DETAIL_RESERVE_DAILY = 100
+
+
+def _strava_budget(rate_limits: Any) -> int | None:
+    """Requests left before the tighter Strava window reaches its reserve, or None if unknown."""
+    windows = (
+        (getattr(rate_limits, "fifteen_min_limit", None), getattr(rate_limits, "fifteen_min_usage", None)),
+        (getattr(rate_limits, "daily_limit", None), getattr(rate_limits, "daily_usage", None)),
+    )
+    if not all(isinstance(v, int) for window in windows for v in window):
+        return None
+    (fifteen_limit, fifteen_usage), (daily_limit, daily_usage) = windows
+    return min(
+        fifteen_limit - fifteen_usage - DETAIL_RESERVE_FIFTEEN_MIN,
+        daily_limit - daily_usage - DETAIL_RESERVE_DAILY,
+    )
+
+
+async def _fetch_activity_details(
+    db: HistoryDB, strava_client: Any, activities: list[dict[str, Any]], days: int = 28
+) -> dict[str, dict[str, Any]]:
+    """Fetch the detail payload for recent activities whose detail was never fetched.
+
+    Candidates are activities in the window without a ``detail_fetched_at`` marker:
+    rows already in the history store plus activities fetched in this run (the list
+    endpoint carries neither private notes nor best efforts). Requests run
+    concurrently, newest first, under a semaphore sized from the client's live
+    ``rate_limits``. Every request re-checks the budget, counting the ones still in
+    flight, and once it is spent the rest are left for the next sync. Returns the
+    payloads fetched, keyed by strava_id.
     """
-    with db._connect() as conn:
-        rows = conn.execute(
-            """SELECT strava_id FROM activities
-               WHERE private_note IS NULL AND date >= date('now', ?)
-               ORDER BY date DESC""",
-            (f"-{days} days",),
-        ).fetchall()
-
-    enriched = 0
-    for row in rows:
-        strava_id = row["strava_id"]
+    since = (date.today() - timedelta(days=days)).isoformat()
+    pending = db.activities_needing_detail(days)
+    with db._read() as conn:
+        done = {
+            row[0]
+            for row in conn.execute(
+                "SELECT strava_id FROM activities WHERE date >= ? AND detail_fetched_at IS NOT NULL", (since,)
+            )
+        }
+    fetched = sorted(
+        (a for a in activities if a.get("start_date_local", a.get("start_date", ""))[:10] >= since),
+        key=lambda a: a.get("start_date_local", a.get("start_date", "")),
+        reverse=True,
+    )
+    candidates = [
+        strava_id
+        for strava_id in dict.fromkeys([*(str(a.get("id", "")) for a in fetched), *pending])
+        if strava_id not in done
+    ]
+    if not candidates:
+        return {}
+
+    budget = _strava_budget(strava_client.rate_limits)
+    limit = DETAIL_MAX_CONCURRENCY if budget is None else max(1, min(DETAIL_MAX_CONCURRENCY, budget))
+    semaphore = asyncio.Semaphore(limit)
+    in_flight = 0
+    details: dict[str, dict[str, Any]] = {}
+    deferred: list[str] = []
+
+    async def fetch(strava_id: str) -> None:
+        nonlocal in_flight
+        async with semaphore:
+            left = _strava_budget(strava_client.rate_limits)
+            if left is not None and left - in_flight <= 0:
+                deferred.append(strava_id)
+                return
+            in_flight += 1
+            try:
+                detail = await strava_client.get_activity(int(strava_id))
+            except Exception:
+                log.warning("Failed to fetch detail for activity %s", strava_id)
+                return
+            finally:
+                in_flight -= 1
+        if isinstance(detail, dict):
+            details[strava_id] = detail
+
+    await asyncio.gather(*(fetch(strava_id) for strava_id in candidates))
+    if deferred:
+        log.info("Strava rate-limit budget spent; deferring detail for %d activities", len(deferred))
+    return details
+
+
+# Garmin wellness metrics sync_all stores (see _garmin_wellness_record).
+_SYNC_WELLNESS_METRICS = ("body_battery", "sleep", "stress", "resting_hr")
+
+
+def _garmin_wellness_record(d: str, metrics: dict[str, Any]) -> dict[str, Any]:
+    """Flatten one day of fetched Garmin wellness metrics. Unparseable metrics are skipped."""
+    record: dict[str, Any] = {"date": d}
+    for metric in _SYNC_WELLNESS_METRICS:
+        data = metrics.get(metric)
         try:
-            detail = await strava_client.get_activity(int(strava_id))
+            if metric == "body_battery" and data:
+                levels = None
+                if isinstance(data, list):
+                    levels = data
+                elif isinstance(data, dict):
+                    levels = data.get("bodyBatteryValuesArray") or data.get("bodyBatteryStatList")
+                if levels:
+                    vals = [v[-1] if isinstance(v, list) else v.get("batteryLevel", 0) for v in levels if v]
+                    vals = [v for v in vals if v and v > 0]
+                    record["body_battery_max"] = max(vals) if vals else None
+                    record["body_battery_min"] = min(vals) if vals else None
+                else:
+                    charged = data.get("charged") if isinstance(data, dict) else None
+                    drained = data.get("drained") if isinstance(data, dict) else None
+                    if charged or drained:
+                        record["body_battery_max"] = charged
+                        record["body_battery_min"] = drained
+            elif metric == "sleep" and data:
+                if isinstance(data, dict):
+                    record["sleep_duration_s"] = data.get("sleepTimeSeconds")
+                    record["sleep_deep_s"] = data.get("deepSleepSeconds")
+                    record["sleep_rem_s"] = data.get("remSleepSeconds")
+            elif metric == "stress" and data:
+                if isinstance(data, dict):
+                    record["stress_avg"] = data.get("overallStressLevel") or data.get("avgStressLevel")
+                    record["stress_max"] = data.get("maxStressLevel")
+            elif metric == "resting_hr" and data:
+                if isinstance(data, dict):
+                    # Navigate nested Garmin resting HR response
+                    metrics_map = data.get("allMetrics", {}).get("metricsMap", {})
+                    rhr_list = metrics_map.get("WELLNESS_RESTING_HEART_RATE", [])
+                    if rhr_list and isinstance(rhr_list[0], dict):
+                        val = rhr_list[0].get("value")
+                        if val and 30 <= val <= 120:
+                            record["resting_hr"] = int(val)
+                    elif data.get("restingHeartRate"):
+                        record["resting_hr"] = data["restingHeartRate"]
         except Exception:
-            log.warning("Failed to fetch detail for activity %s", strava_id)
-            continue
-        note = detail.get("private_note")
-        if note:
-            with db._connect() as conn:
-                conn.execute(
-                    "UPDATE activities SET private_note = ? WHERE strava_id = ?",
-                    (note, strava_id),
-                )
-            enriched += 1
-    return enriched
+            pass  # Individual metric failure — continue
+    return record
+
+
+# ── sync_all pipeline ────────────────────────────────────────────────
+#
+# Every source runs in two stages. The fetch stage talks to the upstream API and
+# returns a write callable; async clients are awaited on the loop and blocking
+# clients run on a thread pool, so all sources fetch concurrently, each under its
+# own timeout. The write stage then applies those callables one at a time, in
+# SYNC_SOURCES order, on a single writer thread: Strava activities always land
+# before the Garmin workout matcher reads them, and a source that timed out can
+# never write late. Garmin wellness is the exception that streams: each day is
+# handed to the writer thread as soon as its metrics are in (see _WriteStream),
+# since those rows don't depend on any other source.
+
+SYNC_SOURCES = ("strava", "garmin_wellness", "garmin_workouts", "withings", "notion")
+
+# Seconds each source's fetch stage may run before it is abandoned and logged as an error.
+SOURCE_TIMEOUTS: dict[str, float] = {
+    "strava": 300.0,
+    "garmin_wellness": 180.0,
+    "garmin_workouts": 60.0,
+    "withings": 60.0,
+    "notion": 120.0,
+}
 
 
-async def sync_all(db: HistoryDB) -> dict[str, Any]:
-    """Incremental sync from all 5 external sources.
+# Cross-process single flight. The sync_lease row named SYNC_LEASE says which run
+# is syncing; its holder renews it every SYNC_LEASE_HEARTBEAT seconds, and anyone
+# may take it over once it is SYNC_LEASE_TTL seconds stale (the holder crashed).
+# Callers that find it held poll every SYNC_JOIN_POLL seconds for the run's result.
+SYNC_LEASE = "sync_all"
+SYNC_LEASE_TTL = 60.0
+SYNC_LEASE_HEARTBEAT = 15.0
+SYNC_JOIN_POLL = 0.5
 
-    Fetches only data newer than the last successful sync per source.
-    Continues if any single source fails. Calls external client libraries directly.
 
-    Returns:
-        Summary dict with per-source results and any errors.
+@dataclass
+class _Fetched:
+    """Outcome of one source's fetch stage."""
+
+    write: Callable[[], dict[str, Any]] | None = None
+    error: str | None = None
+    seconds: float = 0.0
+
+
+class _WriteStream:
+    """Hands a fetch stage's partial writes to the writer thread as they become ready.
+
+    Closed when the source fails or times out, after which ``submit`` refuses new work.
     """
-    results: dict[str, Any] = {}
-    errors: dict[str, str] = {}
 
-    # ── 1. Strava ────────────────────────────────────────────────────
-    try:
-        from strava_mcp.auth import TokenStore
-        from strava_mcp.client import StravaClient
-        from strava_mcp.config import Settings as StravaSettings
+    def __init__(self, writer: Executor) -> None:
+        self._writer = writer
+        self._lock = threading.Lock()
+        self._closed = False
+        self.futures: list[Future[Any]] = []
+
+    def submit(self, fn: Callable[..., Any], *args: Any) -> bool:
+        with self._lock:
+            if self._closed:
+                return False
+            self.futures.append(self._writer.submit(fn, *args))
+            return True
+
+    def close(self) -> None:
+        with self._lock:
+            self._closed = True
+
+
+class _SharedClient:
+    """Build a blocking client once, on first use, for sources that share it across threads."""
+
+    def __init__(self, factory: Callable[[], Any]) -> None:
+        self._factory = factory
+        self._lock = threading.Lock()
+        self._client: Any = None
+
+    def get(self) -> Any:
+        with self._lock:
+            if self._client is None:
+                self._client = self._factory()
+            return self._client
+
 
-        strava_settings = StravaSettings.from_env()
-        token_store = TokenStore(strava_settings.db_path)
-        strava_client = StravaClient(strava_settings, token_store)
+def _garmin_client() -> Any:
+    from garmin_mcp.client import GarminClient
+    from garmin_mcp.config import Settings as GarminSettings
 
-        last = _last_sync_time(db, "strava")
-        after_ts = _to_timestamp(last) if last else None
-        activities = await strava_client.get_all_activities(after=after_ts)
-        results["strava"] = sync_strava(db, activities)
+    return GarminClient(GarminSettings.from_env())
 
-        # Enrich recent activities with private_note (only available from detail endpoint)
-        enriched = await _enrich_private_notes(db, strava_client, days=28)
+
+# Strava backfill page size (the API maximum). Backfill pages walk forward in time
+# from the persisted ``sync_cursor``, so each one needs a single request.
+STRAVA_BACKFILL_PAGE_SIZE = 200
+_STRAVA_TOTALS = ("activities_synced", "inserted", "updated", "races_detected")
+
+
+def _strava_epoch(activity: dict[str, Any]) -> int:
+    """Unix start time of a Strava activity (``start_date`` is UTC)."""
+    return int(datetime.fromisoformat(activity["start_date"].replace("Z", "+00:00")).timestamp())
+
+
+def _write_backfill_page(db: HistoryDB, page: list[dict[str, Any]], after: int, complete: bool) -> dict[str, Any]:
+    """Store one backfill page, then move the Strava cursor past it.
+
+    The result carries the page's start-date span for the backfill's sync log entry.
+    """
+    result = _store_strava(db, page) if page else dict.fromkeys(_STRAVA_TOTALS, 0)
+    db.set_sync_cursor("strava", str(after), complete=complete)
+    result["earliest"], result["latest"] = _strava_date_span(page)
+    return result
+
+
+async def _backfill_strava(
+    db: HistoryDB, strava_client: Any, stream: _WriteStream, days: int = 28
+) -> tuple[dict[str, Any], list[dict[str, Any]]]:
+    """Page through Strava history, oldest first, from the persisted cursor.
+
+    Each page goes to the writer with the cursor that follows it, so an interrupted
+    backfill loses at most the pages not yet written and the next sync resumes from
+    there (re-writing a page is a harmless upsert). Paging stops early, leaving the
+    cursor incomplete, once the rate-limit budget (see ``_strava_budget``) is spent;
+    a long history is imported over several syncs without refetching anything.
+
+    Returns a progress summary and the fetched activities from the last ``days``
+    days, for detail enrichment.
+    """
+    cursor = db.get_sync_cursor("strava")
+    after = int(cursor["cursor"]) if cursor else 0
+    since = (date.today() - timedelta(days=days)).isoformat()
+    recent: list[dict[str, Any]] = []
+    pages = 0
+    complete = False
+    while True:
+        budget = _strava_budget(strava_client.rate_limits)
+        if budget is not None and budget <= 0:
+            log.info("Strava rate-limit budget spent; pausing backfill after %d pages", pages)
+            break
+        page = await strava_client.get_activities(after=after, per_page=STRAVA_BACKFILL_PAGE_SIZE)
+        complete = len(page) < STRAVA_BACKFILL_PAGE_SIZE
+        if page:
+            after = max(after, max(_strava_epoch(a) for a in page))
+        if not stream.submit(_write_backfill_page, db, page, after, complete):
+            break  # source timed out; stop writing
+        pages += 1
+        recent.extend(a for a in page if a.get("start_date_local", a.get("start_date", ""))[:10] >= since)
+        if complete:
+            break
+    return {"pages": pages, "complete": complete, "cursor": after}, recent
+
+
+def _save_strava_details(db: HistoryDB, details: dict[str, dict[str, Any]], result: dict[str, Any]) -> None:
+    if db.save_activity_details(details):
+        result["details_fetched"] = len(details)
+        enriched = sum(1 for d in details.values() if d.get("private_note") and isinstance(d["private_note"], str))
         if enriched:
-            results["strava"]["private_notes_enriched"] = enriched
-    except Exception as exc:
-        log.exception("sync_all: strava failed")
-        errors["strava"] = str(exc)
-        db.log_sync("strava", 0, "error", error=str(exc))
+            result["private_notes_enriched"] = enriched
+
+
+async def _fetch_strava(db: HistoryDB, stream: _WriteStream) -> Callable[[], dict[str, Any]]:
+    from strava_mcp.auth import TokenStore
+    from strava_mcp.client import StravaClient
+    from strava_mcp.config import Settings as StravaSettings
+
+    strava_settings = StravaSettings.from_env()
+    token_store = TokenStore(strava_settings.db_path)
+    # Sync is bulk work: it leaves the governor's interactive reserve to strava-mcp tool calls.
+    strava_client = StravaClient(strava_settings, token_store, lane="background")
+
+    last = _last_sync_time(db, "strava")
+    cursor = db.get_sync_cursor("strava")
+    if last is None or (cursor is not None and not cursor["complete"]):
+        # First sync, or a backfill an earlier sync did not finish.
+        backfill, activities = await _backfill_strava(db, strava_client, stream)
+        details = await _fetch_activity_details(db, strava_client, activities, days=28)
+
+        def write_backfill() -> dict[str, Any]:
+            pages = [future.result() for future in stream.futures]
+            result = {"source": "strava", **{key: sum(p[key] for p in pages) for key in _STRAVA_TOTALS}}
+            result["backfill"] = backfill
+            earliest = min((p["earliest"] for p in pages if p["earliest"]), default=None)
+            latest = max((p["latest"] for p in pages if p["latest"]), default=None)
+            db.log_sync("strava", result["activities_synced"], "success", earliest_date=earliest, latest_date=latest)
+            _save_strava_details(db, details, result)
+            return result
+
+        return write_backfill
+
+    activities = await strava_client.get_all_activities(after=_to_timestamp(last))
+    # Enrich recent activities from the detail endpoint (private_note is only available there)
+    details = await _fetch_activity_details(db, strava_client, activities, days=28)
+
+    def write() -> dict[str, Any]:
+        result = sync_strava(db, activities)
+        _save_strava_details(db, details, result)
+        return result
+
+    return write
+
+
+def _fetch_garmin_wellness(db: HistoryDB, garmin: _SharedClient, stream: _WriteStream) -> Callable[[], dict[str, Any]]:
+    from garmin_mcp.wellness import fetch_wellness_days
+
+    garmin_client = garmin.get()
+
+    last = _last_sync_time(db, "garmin_wellness")
+    # Garmin wellness is per-day, so sync from the day of last sync (to catch same-day updates)
+    # Always re-sync yesterday (sleep/resting HR may not have been available at previous sync)
+    if last:
+        sync_date = datetime.strptime(last, "%Y-%m-%dT%H:%M:%SZ").date()
+        start_date = min(sync_date, date.today() - timedelta(days=1))
+    else:
+        start_date = date.today() - timedelta(days=14)
+    end_date = date.today()
+    dates = [(start_date + timedelta(days=i)).isoformat() for i in range((end_date - start_date).days + 1)]
+
+    # The (day, metric) requests fan out on their own worker pool; each day is written
+    # as soon as its metrics are in rather than after the whole window.
+    synced: list[str] = []
+    for d, metrics in fetch_wellness_days(garmin_client, dates, _SYNC_WELLNESS_METRICS):
+        if not stream.submit(db.upsert_wellness, [_wellness_row(_garmin_wellness_record(d, metrics))]):
+            break  # source timed out; stop writing
+        synced.append(d)
+
+    if not synced:
+        return lambda: {"source": "garmin_wellness", "records_synced": 0, "message": "up to date"}
+
+    def write() -> dict[str, Any]:
+        upserted = sum((future.result() for future in stream.futures), UpsertResult())
+        return _log_wellness_sync(db, synced, upserted)
+
+    return write
+
+
+def _fetch_garmin_workouts(db: HistoryDB, garmin: _SharedClient) -> Callable[[], dict[str, Any]]:
+    garmin_client = garmin.get()
+
+    last_workout_sync = _last_sync_time(db, "garmin_workouts")
+    last_workout_ts = _to_timestamp(last_workout_sync) if last_workout_sync else 0
+
+    raw_workouts = garmin_client.get_workouts(start=0, limit=100)
+    if not raw_workouts:
+        return lambda: {"source": "garmin_workouts", "records_synced": 0}
+
+    # Filter to workouts created/updated since last sync
+    new_workouts = []
+    for w in raw_workouts:
+        updated = w.get("updatedDate") or w.get("createdDate") or ""
+        if updated and last_workout_ts:
+            # Garmin dates: "2026-03-08T10:00:00.0" or epoch millis
+            try:
+                w_ts = _to_timestamp(updated[:19].replace(".0", "").replace(" ", "T") + "Z")
+            except (ValueError, IndexError):
+                w_ts = 0
+            if w_ts <= last_workout_ts:
+                continue
+        new_workouts.append(w)
+
+    if not new_workouts:
+        return lambda: {"source": "garmin_workouts", "records_synced": 0, "message": "up to date"}
+
+    workout_mapped = []
+    for w in new_workouts:
+        sport = w.get("sportType", {})
+        workout_mapped.append(
+            {
+                "garmin_workout_id": str(w.get("workoutId", "")),
+                "sport_type": (sport.get("sportTypeKey", "running") if isinstance(sport, dict) else "running"),
+                "scheduled_date": w.get("createdDate", "")[:10] if w.get("createdDate") else "",
+                "workout_name": w.get("workoutName"),
+                "planned_duration_s": w.get("estimatedDurationInSecs"),
+                "planned_distance_m": w.get("estimatedDistanceInMeters"),
+            }
+        )
+    return functools.partial(sync_garmin_workouts, db, workout_mapped)
 
-    # ── 2. Garmin Wellness ───────────────────────────────────────────
-    try:
-        from garmin_mcp.client import GarminClient
-        from garmin_mcp.config import Settings as GarminSettings
-
-        garmin_settings = GarminSettings.from_env()
-        garmin_client = GarminClient(garmin_settings)
-
-        last = _last_sync_time(db, "garmin_wellness")
-        # Garmin wellness is per-day, so sync from the day of last sync (to catch same-day updates)
-        # Always re-sync yesterday (sleep/resting HR may not have been available at previous sync)
-        if last:
-            sync_date = datetime.strptime(last, "%Y-%m-%dT%H:%M:%SZ").date()
-            start_date = min(sync_date, date.today() - timedelta(days=1))
-        else:
-            start_date = date.today() - timedelta(days=14)
-        end_date = date.today()
-
-        wellness_records: list[dict[str, Any]] = []
-        current = start_date
-        while current <= end_date:
-            d = current.isoformat()
-            record: dict[str, Any] = {"date": d}
-            for metric, fetch in [
-                ("body_battery", garmin_client.get_body_battery),
-                ("sleep", garmin_client.get_sleep),
-                ("stress", garmin_client.get_stress),
-                ("resting_hr", garmin_client.get_resting_hr),
-            ]:
-                try:
-                    data = fetch(d)
-                    if metric == "body_battery" and data:
-                        levels = None
-                        if isinstance(data, list):
-                            levels = data
-                        elif isinstance(data, dict):
-                            levels = data.get("bodyBatteryValuesArray") or data.get("bodyBatteryStatList")
-                        if levels:
-                            vals = [v[-1] if isinstance(v, list) else v.get("batteryLevel", 0) for v in levels if v]
-                            vals = [v for v in vals if v and v > 0]
-                            record["body_battery_max"] = max(vals) if vals else None
-                            record["body_battery_min"] = min(vals) if vals else None
-                        else:
-                            charged = data.get("charged") if isinstance(data, dict) else None
-                            drained = data.get("drained") if isinstance(data, dict) else None
-                            if charged or drained:
-                                record["body_battery_max"] = charged
-                                record["body_battery_min"] = drained
-                    elif metric == "sleep" and data:
-                        if isinstance(data, dict):
-                            record["sleep_duration_s"] = data.get("sleepTimeSeconds")
-                            record["sleep_deep_s"] = data.get("deepSleepSeconds")
-                            record["sleep_rem_s"] = data.get("remSleepSeconds")
-                    elif metric == "stress" and data:
-                        if isinstance(data, dict):
-                            record["stress_avg"] = data.get("overallStressLevel") or data.get("avgStressLevel")
-                            record["stress_max"] = data.get("maxStressLevel")
-                    elif metric == "resting_hr" and data:
-                        if isinstance(data, dict):
-                            # Navigate nested Garmin resting HR response
-                            metrics_map = data.get("allMetrics", {}).get("metricsMap", {})
-                            rhr_list = metrics_map.get("WELLNESS_RESTING_HEART_RATE", [])
-                            if rhr_list and isinstance(rhr_list[0], dict):
-                                val = rhr_list[0].get("value")
-                                if val and 30 <= val <= 120:
-                                    record["resting_hr"] = int(val)
-                            elif data.get("restingHeartRate"):
-                                record["resting_hr"] = data["restingHeartRate"]
-                except Exception:
-                    pass  # Individual metric failure — continue
-            wellness_records.append(record)
-            current += timedelta(days=1)
-
-        if wellness_records:
-            results["garmin_wellness"] = sync_garmin_wellness(db, wellness_records)
-        else:
-            results["garmin_wellness"] = {"source": "garmin_wellness", "records_synced": 0, "message": "up to date"}
-    except Exception as exc:
-        log.exception("sync_all: garmin_wellness failed")
-        errors["garmin_wellness"] = str(exc)
-        db.log_sync("garmin_wellness", 0, "error", error=str(exc))
 
-    # ── 3. Garmin Workouts ───────────────────────────────────────────
-    try:
-        # Reuse garmin_client from above if available, otherwise create new
-        if "garmin_client" not in dir():
-            from garmin_mcp.client import GarminClient
-            from garmin_mcp.config import Settings as GarminSettings
-
-            garmin_settings = GarminSettings.from_env()
-            garmin_client = GarminClient(garmin_settings)
-
-        last_workout_sync = _last_sync_time(db, "garmin_workouts")
-        last_workout_ts = _to_timestamp(last_workout_sync) if last_workout_sync else 0
-
-        raw_workouts = garmin_client.get_workouts(start=0, limit=100)
-        if raw_workouts:
-            # Filter to workouts created/updated since last sync
-            new_workouts = []
-            for w in raw_workouts:
-                updated = w.get("updatedDate") or w.get("createdDate") or ""
-                if updated and last_workout_ts:
-                    # Garmin dates: "2026-03-08T10:00:00.0" or epoch millis
-                    try:
-                        w_ts = _to_timestamp(updated[:19].replace(".0", "").replace(" ", "T") + "Z")
-                    except (ValueError, IndexError):
-                        w_ts = 0
-                    if w_ts <= last_workout_ts:
-                        continue
-                new_workouts.append(w)
-
-            if new_workouts:
-                workout_mapped = []
-                for w in new_workouts:
-                    sport = w.get("sportType", {})
-                    workout_mapped.append(
-                        {
-                            "garmin_workout_id": str(w.get("workoutId", "")),
-                            "sport_type": (
-                                sport.get("sportTypeKey", "running") if isinstance(sport, dict) else "running"
-                            ),
-                            "scheduled_date": w.get("createdDate", "")[:10] if w.get("createdDate") else "",
-                            "workout_name": w.get("workoutName"),
-                        }
-                    )
-                results["garmin_workouts"] = sync_garmin_workouts(db, workout_mapped)
-            else:
-                results["garmin_workouts"] = {
-                    "source": "garmin_workouts",
-                    "records_synced": 0,
-                    "message": "up to date",
-                }
-        else:
-            results["garmin_workouts"] = {"source": "garmin_workouts", "records_synced": 0}
-    except Exception as exc:
-        log.exception("sync_all: garmin_workouts failed")
-        errors["garmin_workouts"] = str(exc)
-        db.log_sync("garmin_workouts", 0, "error", error=str(exc))
+def _fetch_withings(db: HistoryDB) -> Callable[[], dict[str, Any]]:
+    from withings_mcp.client import WithingsClient
+    from withings_mcp.config import Settings as WithingsSettings
 
-    # ── 4. Withings ──────────────────────────────────────────────────
-    try:
-        from withings_mcp.client import WithingsClient
-        from withings_mcp.config import Settings as WithingsSettings
+    withings_settings = WithingsSettings.from_env()
+    withings_client = WithingsClient(withings_settings)
 
-        withings_settings = WithingsSettings.from_env()
-        withings_client = WithingsClient(withings_settings)
+    last = _last_sync_time(db, "withings")
+    start_ts = _to_timestamp(last) if last else int(time.time()) - 14 * 86400
+    end_ts = int(time.time())
+    measurements = withings_client.get_measurements(startdate=start_ts, enddate=end_ts)
 
-        last = _last_sync_time(db, "withings")
-        start_ts = _to_timestamp(last) if last else int(time.time()) - 14 * 86400
-        end_ts = int(time.time())
-        measurements = withings_client.get_measurements(startdate=start_ts, enddate=end_ts)
+    # Convert timestamps to YYYY-MM-DD in datetime field
+    for m in measurements:
+        if "datetime" in m and isinstance(m["datetime"], str):
+            m["date"] = m["datetime"][:10]
+        elif "date" in m and isinstance(m["date"], (int, float)):
+            m["date"] = datetime.fromtimestamp(m["date"]).strftime("%Y-%m-%d")
 
-        # Convert timestamps to YYYY-MM-DD in datetime field
-        for m in measurements:
-            if "datetime" in m and isinstance(m["datetime"], str):
-                m["date"] = m["datetime"][:10]
-            elif "date" in m and isinstance(m["date"], (int, float)):
-                m["date"] = datetime.fromtimestamp(m["date"]).strftime("%Y-%m-%d")
+    return functools.partial(sync_withings, db, measurements)
 
-        results["withings"] = sync_withings(db, measurements)
-    except Exception as exc:
-        log.exception("sync_all: withings failed")
-        errors["withings"] = str(exc)
-        db.log_sync("withings", 0, "error", error=str(exc))
 
-    # ── 5. Notion ────────────────────────────────────────────────────
-    try:
-        from notion_mcp.client import NotionClient, parse_diary_entry
-        from notion_mcp.config import Settings as NotionSettings
+async def _fetch_notion(db: HistoryDB) -> Callable[[], dict[str, Any]]:
+    from notion_mcp.client import NotionClient, parse_diary_entry
+    from notion_mcp.config import Settings as NotionSettings
 
-        last_notion_sync = _last_sync_time(db, "notion")
-        last_notion_ts = _to_timestamp(last_notion_sync) if last_notion_sync else 0
+    last_notion_sync = _last_sync_time(db, "notion")
+    last_notion_ts = _to_timestamp(last_notion_sync) if last_notion_sync else 0
 
-        notion_settings = NotionSettings.from_env()
-        notion_client = NotionClient(notion_settings)
+    notion_settings = NotionSettings.from_env()
+    notion_client = NotionClient(notion_settings)
 
-        raw_pages = await notion_client.fetch_all_entries()
+    raw_pages = await notion_client.fetch_all_entries()
 
-        # Filter to pages edited since last sync
-        new_pages = []
-        for p in raw_pages:
-            edited = p.get("last_edited_time", "")
-            if edited and last_notion_ts:
-                try:
-                    p_ts = _to_timestamp(edited.rstrip("Z")[:19] + "Z")
-                except (ValueError, IndexError):
-                    p_ts = 0
-                if p_ts <= last_notion_ts:
-                    continue
-            new_pages.append(p)
-
-        entries = [parse_diary_entry(p) for p in new_pages]
-        entries = [e for e in entries if e is not None]
-
-        mapped_entries = []
-        for e in entries:
-            mapped_entries.append(
-                {
-                    "date": e.get("date", ""),
-                    "stress_1_5": e.get("stress"),
-                    "niggles": e.get("niggles"),
-                    "notes": e.get("notes"),
-                }
-            )
+    # Filter to pages edited since last sync
+    new_pages = []
+    for p in raw_pages:
+        edited = p.get("last_edited_time", "")
+        if edited and last_notion_ts:
+            try:
+                p_ts = _to_timestamp(edited.rstrip("Z")[:19] + "Z")
+            except (ValueError, IndexError):
+                p_ts = 0
+            if p_ts <= last_notion_ts:
+                continue
+        new_pages.append(p)
+
+    entries = [parse_diary_entry(p) for p in new_pages]
+    entries = [e for e in entries if e is not None]
+
+    mapped_entries = []
+    for e in entries:
+        mapped_entries.append(
+            {
+                "date": e.get("date", ""),
+                "stress_1_5": e.get("stress"),
+                "niggles": e.get("niggles"),
+                "notes": e.get("notes"),
+            }
+        )
+
+    return functools.partial(sync_notion, db, mapped_entries)
+
+
+async def _fetch_stage(
+    source: str,
+    fetch: Awaitable[Callable[[], dict[str, Any]]],
+    timeout: float,
+    stream: _WriteStream | None = None,
+) -> _Fetched:
+    """Await one source's fetch under its timeout, capturing failures instead of raising.
 
-        results["notion"] = sync_notion(db, mapped_entries)
+    A failed source's write stream is closed so it stops writing partial results.
+    """
+    started = time.perf_counter()
+    try:
+        write = await asyncio.wait_for(fetch, timeout)
+    except asyncio.TimeoutError:
+        log.error("sync_all: %s timed out after %gs", source, timeout)
+        if stream is not None:
+            stream.close()
+        return _Fetched(error=f"timed out after {timeout:g}s", seconds=time.perf_counter() - started)
     except Exception as exc:
-        log.exception("sync_all: notion failed")
-        errors["notion"] = str(exc)
-        db.log_sync("notion", 0, "error", error=str(exc))
+        log.exception("sync_all: %s failed", source)
+        if stream is not None:
+            stream.close()
+        return _Fetched(error=str(exc), seconds=time.perf_counter() - started)
+    return _Fetched(write=write, seconds=time.perf_counter() - started)
+
+
+async def sync_all(
+    db: HistoryDB,
+    timeouts: dict[str, float] | None = None,
+    sources: Iterable[str] | None = None,
+) -> dict[str, Any]:
+    """Incremental sync from all 5 external sources, fetched concurrently.
 
-    # ── Regenerate athlete profile from fresh data ─────────────────
+    Fetches only data newer than the last successful sync per source.
+    Continues if any single source fails or exceeds its timeout. Calls external
+    client libraries directly.
+
+    Args:
+        db: History store to sync into.
+        timeouts: Per-source overrides for ``SOURCE_TIMEOUTS``, in seconds.
+        sources: Subset of ``SYNC_SOURCES`` to sync (default: all of them). The
+            subset still writes in ``SYNC_SOURCES`` order.
+
+    Only one sync runs per database at a time, across processes (see
+    ``SYNC_LEASE``). A call made while another sync of the same sources is in
+    flight waits for it and returns its summary, marked ``joined`` with that
+    run's id, instead of fetching everything a second time.
+
+    Derived data is only recomputed when a write changed something: workouts are
+    re-matched if activities changed and the workout sync did not already match
+    them, and ``refresh_athlete_profile`` recomputes only the profile field groups
+    whose inputs changed.
+
+    Returns:
+        Summary dict with per-source results, any errors, the number of changed
+        rows per table, the profile groups recomputed, and per-source wall time
+        (fetch plus write, in seconds).
+    """
+    wanted = set(SYNC_SOURCES if sources is None else sources)
+    unknown = wanted - set(SYNC_SOURCES)
+    if unknown:
+        raise ValueError(f"Unknown sync source(s): {', '.join(sorted(unknown))}")
+    selected = tuple(source for source in SYNC_SOURCES if source in wanted)
+    limits = {**SOURCE_TIMEOUTS, **(timeouts or {})}
+    run_id = uuid.uuid4().hex
+    holder = f"{socket.gethostname()}:{os.getpid()}"
+    while True:
+        lease = db.acquire_sync_lease(SYNC_LEASE, run_id, holder, selected, SYNC_LEASE_TTL)
+        if lease["run_id"] == run_id:
+            break
+        log.info("sync_all: waiting on in-flight sync %s held by %s", lease["run_id"], lease["holder"])
+        joined = await _await_sync_run(db, lease["run_id"])
+        if joined is not None and set(selected) <= set(lease["sources"]):
+            return {**joined, "joined": lease["run_id"]}
+        # The holder died, or synced other sources than these: contend for the lease again.
+
+    heartbeat = asyncio.ensure_future(_heartbeat_sync_lease(db, run_id))
+    summary = None
     try:
-        from pace_ai.tools.profile import generate_athlete_profile
+        summary = await _sync_sources(db, run_id, selected, limits)
+        return summary
+    finally:
+        heartbeat.cancel()
+        db.release_sync_lease(SYNC_LEASE, run_id, summary)
+
+
+async def _heartbeat_sync_lease(db: HistoryDB, run_id: str) -> None:
+    """Keep pushing a held lease's expiry forward until cancelled."""
+    loop = asyncio.get_running_loop()
+    while True:
+        await asyncio.sleep(SYNC_LEASE_HEARTBEAT)
+        try:
+            held = await loop.run_in_executor(None, db.renew_sync_lease, SYNC_LEASE, run_id, SYNC_LEASE_TTL)
+        except Exception:
+            log.exception("sync_all: lease heartbeat failed")
+            continue
+        if not held:
+            log.warning("sync_all: lost the sync lease for run %s; another sync may start", run_id)
+            return
+
+
+async def _await_sync_run(db: HistoryDB, run_id: str) -> dict[str, Any] | None:
+    """Wait for another process's sync run to finish and return its summary.
+
+    Returns None if the run ended without a summary or its holder stopped
+    heartbeating, so the caller can run the sync itself.
+    """
+    while True:
+        run = db.get_sync_run(run_id)
+        if run is not None and run["finished_at"] is not None:
+            return run["result"]
+        lease = db.get_sync_lease(SYNC_LEASE)
+        if lease is None or lease["run_id"] != run_id or lease["expires_at"] < time.time():
+            run = db.get_sync_run(run_id)  # it may have finished since the first read
+            return run["result"] if run is not None and run["finished_at"] is not None else None
+        await asyncio.sleep(SYNC_JOIN_POLL)
+
+
+async def _sync_sources(
+    db: HistoryDB, run_id: str, sources: tuple[str, ...], limits: dict[str, float]
+) -> dict[str, Any]:
+    """Run ``sync_all``'s fetch and write stages for ``sources`` while holding the sync lease.
+
+    A change cursor named after the run keeps the journal entries this sync writes
+    from being pruned (by a profile refresh elsewhere) before it reads them back.
+    """
+    started = time.perf_counter()
+    loop = asyncio.get_running_loop()
+    fetch_pool = ThreadPoolExecutor(max_workers=3, thread_name_prefix="pace-ai-sync")
+    writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="pace-ai-sync-write")
+    garmin = _SharedClient(_garmin_client)
+    streams = {"strava": _WriteStream(writer), "garmin_wellness": _WriteStream(writer)}
+    cursor = f"sync_all:{run_id}"
+    seq = db.open_change_cursor(cursor)
+
+    fetches: dict[str, Callable[[], Awaitable[Callable[[], dict[str, Any]]]]] = {
+        "strava": lambda: _fetch_strava(db, streams["strava"]),
+        "garmin_wellness": lambda: loop.run_in_executor(
+            fetch_pool, _fetch_garmin_wellness, db, garmin, streams["garmin_wellness"]
+        ),
+        "garmin_workouts": lambda: loop.run_in_executor(fetch_pool, _fetch_garmin_workouts, db, garmin),
+        "withings": lambda: loop.run_in_executor(fetch_pool, _fetch_withings, db),
+        "notion": lambda: _fetch_notion(db),
+    }
+    stages = {
+        source: asyncio.ensure_future(_fetch_stage(source, fetches[source](), limits[source], streams.get(source)))
+        for source in sources
+    }
+
+    results: dict[str, Any] = {}
+    errors: dict[str, str] = {}
+    wall_time: dict[str, float] = {}
+    try:
+        for source in sources:
+            fetched = await stages[source]
+            write_started = time.perf_counter()
+            error = fetched.error
+            if fetched.write is not None:
+                try:
+                    results[source] = await loop.run_in_executor(writer, fetched.write)
+                except Exception as exc:
+                    log.exception("sync_all: %s write failed", source)
+                    error = str(exc)
+            if error is not None:
+                errors[source] = error
+                await loop.run_in_executor(writer, functools.partial(db.log_sync, source, 0, "error", error=error))
+            wall_time[source] = round(fetched.seconds + time.perf_counter() - write_started, 3)
+
+        # ── Recompute only what this sync's changed rows feed ─────────
+        changes = await loop.run_in_executor(writer, db.changes_since, seq)
+        await loop.run_in_executor(writer, db.close_change_cursor, cursor)
+        matching = None
+        if "activities" in changes and "matching" not in results.get("garmin_workouts", {}):
+            try:
+                matching = await loop.run_in_executor(writer, _match_workouts, db)
+            except Exception:
+                log.exception("sync_all: workout matching failed")
+        profile_recomputed: list[str] = []
+        try:
+            from pace_ai.tools.profile import refresh_athlete_profile
 
-        generate_athlete_profile(db)
-        log.info("sync_all: athlete profile regenerated")
-    except Exception:
-        log.exception("sync_all: profile regeneration failed")
+            profile_recomputed = await loop.run_in_executor(writer, refresh_athlete_profile, db)
+            log.info("sync_all: athlete profile refreshed (%s)", ", ".join(profile_recomputed) or "nothing changed")
+        except Exception:
+            log.exception("sync_all: profile refresh failed")
+    finally:
+        # Timed-out blocking fetches cannot be interrupted; let them finish in the background.
+        fetch_pool.shutdown(wait=False, cancel_futures=True)
+        writer.shutdown(wait=True)
+        db.close_change_cursor(cursor)  # already closed unless a stage raised
 
     summary: dict[str, Any] = {"results": results}
     if errors:
         summary["errors"] = errors
+    summary["changed"] = {table: len(keys) for table, keys in changes.items()}
+    if matching is not None:
+        summary["matching"] = matching
+    summary["profile_recomputed"] = profile_recomputed
     summary["sources_synced"] = len(results)
     summary["sources_failed"] = len(errors)
+    summary["wall_time_s"] = wall_time
+    summary["total_wall_time_s"] = round(time.perf_counter() - started, 3)
     return summary
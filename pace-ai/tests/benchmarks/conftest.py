@@ -0,0 +1,30 @@
+"""Pytest configuration for benchmarks.
+
+Benchmarks are slow and print timings rather than asserting on them, so they
+are skipped unless ``--benchmark`` is passed:
+
+    pytest tests/benchmarks --benchmark -s
+"""
+
+from __future__ import annotations
+
+import pytest
+
+
+def pytest_addoption(parser: pytest.Parser) -> None:
+    """Add the benchmark flag to pytest."""
+    parser.addoption(
+        "--benchmark",
+        action="store_true",
+        default=False,
+        help="Run benchmarks in tests/benchmarks.",
+    )
+
+
+def pytest_collection_modifyitems(config: pytest.Config, items: list[pytest.Item]) -> None:
+    if config.getoption("--benchmark"):
+        return
+    skip = pytest.mark.skip(reason="benchmark: pass --benchmark to run")
+    for item in items:
+        if "benchmarks" in item.nodeid.split("/"):
+            item.add_marker(skip)
@@ -0,0 +1,170 @@
+"""Throughput of the HistoryDB bulk upsert path on a multi-year backfill."""
+
+from __future__ import annotations
+
+import json
+import random
+import time
+from datetime import date, timedelta
+from typing import TYPE_CHECKING, Any
+
+from pace_ai.database import HistoryDB, UpsertResult, _content_hash, _pack_raw, refresh_load_rollups
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+N_ACTIVITIES = 50_000
+
+
+def _synthetic_activities(n: int, seed: int = 42) -> list[dict[str, Any]]:
+    rng = random.Random(seed)
+    start = date(2012, 1, 1)
+    activities = []
+    for i in range(n):
+        distance = rng.uniform(3000, 30000)
+        moving = int(distance / rng.uniform(2.5, 4.5))
+        raw = {"id": i, "name": f"Activity {i}", "distance": distance, "moving_time": moving, "kudos_count": 3}
+        activities.append(
+            {
+                "strava_id": str(i),
+                "date": (start + timedelta(days=i // 3)).isoformat(),
+                "sport_type": rng.choice(["Run", "Run", "TrailRun", "Ride", "Swim"]),
+                "name": raw["name"],
+                "distance_m": distance,
+                "moving_time_s": moving,
+                "elapsed_time_s": moving + 60,
+                "average_hr": rng.uniform(120, 175),
+                "raw": raw,
+            }
+        )
+    return activities
+
+
+# The per-row search-index trigger that migration 17 replaced with a batched insert.
+_FTS_INSERT_TRIGGER = """
+    CREATE TRIGGER IF NOT EXISTS activity_notes_fts_ai AFTER INSERT ON activities BEGIN
+        INSERT INTO activity_notes_fts(rowid, name, description, private_note)
+        VALUES (new.id, new.name, new.description, new.private_note);
+    END
+"""
+
+
+_PER_ROW_SQL = """INSERT INTO activities
+   (strava_id, date, sport_type, name, distance_m, moving_time_s,
+    elapsed_time_s, elevation_gain_m, average_hr, max_hr,
+    average_cadence, average_speed_ms, description, private_note,
+    garmin_workout_id, perceived_effort, {extra})
+   VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+   ON CONFLICT(strava_id) DO UPDATE SET
+    date=excluded.date, sport_type=excluded.sport_type, name=excluded.name,
+    distance_m=excluded.distance_m, moving_time_s=excluded.moving_time_s,
+    elapsed_time_s=excluded.elapsed_time_s, elevation_gain_m=excluded.elevation_gain_m,
+    average_hr=excluded.average_hr, max_hr=excluded.max_hr,
+    average_cadence=excluded.average_cadence, average_speed_ms=excluded.average_speed_ms,
+    description=excluded.description,
+    private_note=COALESCE(excluded.private_note, activities.private_note),
+    garmin_workout_id=excluded.garmin_workout_id,
+    perceived_effort=excluded.perceived_effort, {extra}=excluded.{extra}
+"""
+
+
+def _row(a: dict[str, Any]) -> tuple[Any, ...]:
+    return (
+        str(a["strava_id"]),
+        a["date"],
+        a["sport_type"],
+        a.get("name"),
+        a.get("distance_m"),
+        a.get("moving_time_s"),
+        a.get("elapsed_time_s"),
+        a.get("elevation_gain_m"),
+        a.get("average_hr"),
+        a.get("max_hr"),
+        a.get("average_cadence"),
+        a.get("average_speed_ms"),
+        a.get("description"),
+        a.get("private_note"),
+        a.get("garmin_workout_id"),
+        a.get("perceived_effort"),
+    )
+
+
+def _per_row_original(db: HistoryDB, activities: list[dict[str, Any]]) -> None:
+    """The original write path: one execute per record in a single transaction.
+
+    Search indexing runs per row through the insert trigger. Raw JSON stays inline
+    and no rollups, change journal or content hashes are maintained, so this is a
+    lower bound for the per-row approach rather than an equal-work comparison.
+    """
+    sql = _PER_ROW_SQL.format(extra="raw")
+    with db._connect() as conn:
+        conn.execute(_FTS_INSERT_TRIGGER)
+        for a in activities:
+            conn.execute(sql, (*_row(a), json.dumps(a.get("raw")) if a.get("raw") else None))
+
+
+def _per_row_upsert(db: HistoryDB, activities: list[dict[str, Any]]) -> None:
+    """The bulk path's work done one execute per record, in a single transaction.
+
+    Each record is hashed, written with its packed raw payload and journalled, the
+    search index is fed by the insert trigger, and the rollups are refreshed once
+    at the end: the same result ``upsert_activities`` produces on a fresh database.
+    """
+    sql = _PER_ROW_SQL.format(extra="content_hash")
+    with db._connect() as conn:
+        conn.execute(_FTS_INSERT_TRIGGER)
+        for a in activities:
+            row, raw = _row(a), _pack_raw(a.get("raw"))
+            conn.execute(sql, (*row, _content_hash(row, raw)))
+            if raw is not None:
+                conn.execute("INSERT OR REPLACE INTO activity_raw VALUES (?, ?)", (row[0], raw))
+            conn.execute("INSERT INTO change_log (table_name, entity, date) VALUES (?, ?, ?)", ("activities", *row[:2]))
+        refresh_load_rollups(conn, {a["date"] for a in activities})
+
+
+def _best_of(runs: int, fn: Callable[[], Any]) -> float:
+    best = float("inf")
+    for _ in range(runs):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def _report(label: str, n: int, elapsed: float) -> None:
+    print(f"{label:<28} {n:>7} rows  {elapsed:6.2f}s  {n / elapsed:>9,.0f} rows/s")
+
+
+class TestBulkUpsertThroughput:
+    def test_50k_activities(self, tmp_path):
+        activities = _synthetic_activities(N_ACTIVITIES)
+        dbs = iter(range(100))
+
+        def fresh_db() -> HistoryDB:
+            return HistoryDB(str(tmp_path / f"bench_{next(dbs)}.db"))
+
+        elapsed = _best_of(3, lambda: _per_row_original(fresh_db(), activities))
+        _report("per-row original (insert)", N_ACTIVITIES, elapsed)
+
+        per_row = _best_of(3, lambda: _per_row_upsert(fresh_db(), activities))
+        _report("per-row execute (insert)", N_ACTIVITIES, per_row)
+
+        bulk = _best_of(3, lambda: fresh_db().upsert_activities(activities))
+        _report("bulk executemany (insert)", N_ACTIVITIES, bulk)
+        assert bulk <= per_row, f"bulk upsert ({bulk:.2f}s) is slower than per-row ({per_row:.2f}s) for the same work"
+
+        db = fresh_db()
+        assert db.upsert_activities(activities) == UpsertResult(inserted=N_ACTIVITIES)
+        elapsed = _best_of(3, lambda: db.upsert_activities(activities))
+        _report("bulk executemany (unchanged)", N_ACTIVITIES, elapsed)
+        assert db.upsert_activities(activities) == UpsertResult(unchanged=N_ACTIVITIES)
+
+        # Every pass sends new distances, so the content hash changes and each row is rewritten.
+        edits = iter([[{**a, "distance_m": a["distance_m"] + bump} for a in activities] for bump in range(1, 5)])
+        elapsed = _best_of(3, lambda: db.upsert_activities(next(edits)))
+        _report("bulk executemany (update)", N_ACTIVITIES, elapsed)
+        assert db.upsert_activities(next(edits)) == UpsertResult(updated=N_ACTIVITIES)
+
+        for chunk_size in (100, 1000, 10_000):
+            elapsed = _best_of(3, lambda size=chunk_size: fresh_db().upsert_activities(activities, chunk_size=size))
+            _report(f"bulk chunk_size={chunk_size}", N_ACTIVITIES, elapsed)
@@ -0,0 +1,51 @@
+"""Latency of incremental athlete-profile refreshes versus full regeneration."""
+
+from __future__ import annotations
+
+import random
+from datetime import date, timedelta
+
+from pace_ai.database import HistoryDB
+from pace_ai.tools.profile import generate_athlete_profile, refresh_athlete_profile
+from tests.benchmarks.test_bulk_upsert import _best_of, _synthetic_activities
+
+N_ACTIVITIES = 20_000  # about 18 years at three activities a day
+N_DAYS = 5 * 365
+
+
+def _report(label: str, elapsed: float) -> None:
+    print(f"{label:<36} {elapsed * 1000:8.2f} ms")
+
+
+def _seed(db: HistoryDB) -> None:
+    rng = random.Random(7)
+    db.upsert_activities(_synthetic_activities(N_ACTIVITIES))
+    today = date.today()
+    days = [(today - timedelta(days=i)).isoformat() for i in range(N_DAYS)]
+    db.upsert_wellness([{"date": d, "resting_hr": rng.randint(44, 56), "hrv_value": rng.randint(40, 80)} for d in days])
+    db.upsert_body_measurements([{"date": d, "weight_kg": round(rng.uniform(70, 74), 1)} for d in days[::3]])
+
+
+class TestProfileRefreshLatency:
+    def test_multi_year_history(self, tmp_path):
+        db = HistoryDB(str(tmp_path / "bench.db"))
+        _seed(db)
+        generate_athlete_profile(db)
+
+        _report("full regeneration", _best_of(5, lambda: generate_athlete_profile(db)))
+        _report("refresh, nothing changed", _best_of(5, lambda: refresh_athlete_profile(db)))
+
+        new_ids = iter(range(N_ACTIVITIES, N_ACTIVITIES + 100))
+
+        def one_new_run() -> None:
+            run = {"strava_id": str(next(new_ids)), "date": date.today().isoformat(), "sport_type": "Run"}
+            db.upsert_activities([{**run, "distance_m": 8000, "moving_time_s": 2400, "average_speed_ms": 3.3}])
+            refresh_athlete_profile(db)
+
+        _report("upsert one run + refresh", _best_of(5, one_new_run))
+
+        def one_wellness_day() -> None:
+            db.upsert_wellness([{"date": date.today().isoformat(), "resting_hr": random.randint(44, 56)}])
+            refresh_athlete_profile(db)
+
+        _report("upsert one wellness day + refresh", _best_of(5, one_wellness_day))
@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+from datetime import date, datetime, timedelta
 from typing import Any
 
 import pytest
@@ -166,6 +167,21 @@ def sample_strava_activities() -> list[dict]:
     ]
 
 
+def recent_strava_activities(newest_days_ago: int = 2) -> list[dict]:
+    """``sample_strava_activities`` moved so the newest starts ``newest_days_ago`` days before today.
+
+    For tests that read through rolling windows such as ``days=30``.
+    """
+    activities = sample_strava_activities()
+    newest = max(date.fromisoformat(a["start_date_local"][:10]) for a in activities)
+    shift = date.today() - timedelta(days=newest_days_ago) - newest
+    for a in activities:
+        for key in ("start_date", "start_date_local"):
+            moved = datetime.fromisoformat(a[key].removesuffix("Z")) + shift
+            a[key] = moved.isoformat() + ("Z" if a[key].endswith("Z") else "")
+    return activities
+
+
 def sample_wellness_data() -> list[dict]:
     """Factory for Garmin wellness snapshots."""
     return [
@@ -5,7 +5,7 @@ from __future__ import annotations
 import pytest
 
 from pace_ai.config import Settings
-from pace_ai.database import GoalDB, HistoryDB
+from pace_ai.database import AsyncDB, GoalDB, HistoryDB
 
 
 @pytest.fixture()
@@ -16,8 +16,11 @@ def _wired(tmp_path, monkeypatch):
     db = str(tmp_path / "integration.db")
     settings = Settings(db_path=db)
     monkeypatch.setattr(srv, "settings", settings)
-    monkeypatch.setattr(srv, "goal_db", GoalDB(db))
-    monkeypatch.setattr(srv, "history_db", HistoryDB(db))
+    goal_db, history_db = GoalDB(db), HistoryDB(db)
+    monkeypatch.setattr(srv, "goal_db", goal_db)
+    monkeypatch.setattr(srv, "history_db", history_db)
+    monkeypatch.setattr(srv, "goals", AsyncDB(goal_db, srv._db_executor))
+    monkeypatch.setattr(srv, "history", AsyncDB(history_db, srv._db_executor))
 
 
 @pytest.mark.usefixtures("_wired")
@@ -271,7 +274,7 @@ class TestSyncAll:
         from tests.conftest import sample_strava_activities
 
         mock_strava = AsyncMock()
-        mock_strava.get_all_activities.return_value = sample_strava_activities()
+        mock_strava.get_activities.return_value = sample_strava_activities()
 
         mock_garmin = MagicMock()
         mock_garmin.get_body_battery.return_value = None
@@ -388,3 +391,68 @@ class TestCoachingMemory:
         # Not found
         result = await update_athlete_fact(999, "nope")
         assert result["error"] == "not_found"
+
+
+@pytest.mark.usefixtures("_wired")
+class TestSearchHistory:
+    @pytest.mark.asyncio()
+    async def test_search_across_sources(self):
+        import json
+
+        from pace_ai.server import append_coaching_log, search_history, sync_notion, sync_strava
+
+        await append_coaching_log(json.dumps({"summary": "Achilles flared after hills, cut volume"}))
+        await sync_notion(json.dumps([{"date": "2026-03-01", "niggles": "left achilles tight", "notes": "easy day"}]))
+        await sync_strava(
+            json.dumps([{"id": 1, "name": "Recovery jog", "start_date_local": "2026-03-02T07:00:00Z",
+                         "sport_type": "Run", "private_note": "achilles fine today"}])
+        )  # fmt: skip
+
+        hits = await search_history("achilles")
+        assert {h["source"] for h in hits} == {"coaching_log", "diary", "activities"}
+        assert all("[" in h["snippet"] for h in hits)
+
+        diary_only = await search_history("achilles", sources=["diary"])
+        assert [h["ref"] for h in diary_only] == ["2026-03-01"]
+
+        error = await search_history("achilles", sources=["emails"])
+        assert error["error"] == "invalid_source"
+
+
+@pytest.mark.usefixtures("_wired")
+class TestConcurrency:
+    @pytest.mark.asyncio()
+    async def test_reads_progress_during_long_sync(self, monkeypatch):
+        import asyncio
+        import time
+
+        import pace_ai.server as srv
+        from pace_ai.server import get_athlete_facts, get_pbs, get_recent_activities_local, search_history, sync_all
+
+        async def slow_sync_all(db):
+            # Blocking client calls inside open write transactions, like a large backfill.
+            for i in range(20):
+                with db._connect() as conn:
+                    conn.execute(
+                        "INSERT INTO activities (strava_id, date, sport_type) VALUES (?, date('now'), 'Run')",
+                        (str(i),),
+                    )
+                    time.sleep(0.1)
+            return {"results": {"strava": {"activities_synced": 20}}}
+
+        monkeypatch.setattr(srv.sync_mod, "sync_all", slow_sync_all)
+
+        sync_task = asyncio.create_task(sync_all())
+        await asyncio.sleep(0.02)
+
+        reads = await asyncio.gather(
+            *[
+                call()
+                for _ in range(10)
+                for call in (get_recent_activities_local, get_pbs, get_athlete_facts, lambda: search_history("run"))
+            ]
+        )
+
+        assert len(reads) == 40
+        assert not sync_task.done(), "reads should finish while the sync is still running"
+        assert (await sync_task)["results"]["strava"]["activities_synced"] == 20
@@ -0,0 +1,69 @@
+"""Integration test: concurrent sync_all calls from separate processes share one sync."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import multiprocessing
+import os
+
+from pace_ai.database import HistoryDB
+from pace_ai.tools.sync import SYNC_LEASE, SYNC_SOURCES
+
+N_PROCESSES = 4
+
+
+def _sync_in_child(db_path: str, calls_path: str, barrier, results) -> None:
+    """Run sync_all against quiet clients whose Strava fetch is slow and counted."""
+    from unittest.mock import patch
+
+    from pace_ai.tools.sync import sync_all
+    from tests.unit.test_sync import _patched_clients, _quiet_clients
+
+    async def slow_activities(*args, **kwargs):
+        with open(calls_path, "a") as f:
+            f.write(f"{os.getpid()}\n")
+        await asyncio.sleep(1.0)
+        return []
+
+    strava, garmin, withings, notion = _quiet_clients()
+    strava.get_activities.side_effect = slow_activities
+    db = HistoryDB(db_path)
+    barrier.wait(60)
+    with _patched_clients(strava, garmin, withings, notion), patch("pace_ai.tools.sync.SYNC_JOIN_POLL", 0.05):
+        summary = asyncio.run(sync_all(db))
+    results.put(json.dumps(summary))
+
+
+class TestCrossProcessSingleFlight:
+    def test_concurrent_processes_join_one_sync(self, tmp_path):
+        db_path = str(tmp_path / "shared.db")
+        calls_path = str(tmp_path / "strava_calls.txt")
+        db = HistoryDB(db_path)
+
+        ctx = multiprocessing.get_context("spawn")
+        barrier = ctx.Barrier(N_PROCESSES)
+        results = ctx.Queue()
+        procs = [
+            ctx.Process(target=_sync_in_child, args=(db_path, calls_path, barrier, results)) for _ in range(N_PROCESSES)
+        ]
+        for p in procs:
+            p.start()
+        summaries = [json.loads(results.get(timeout=120)) for _ in procs]
+        for p in procs:
+            p.join(30)
+            assert p.exitcode == 0
+
+        with open(calls_path) as f:
+            assert len(f.read().split()) == 1  # Strava was fetched once, not once per process
+        leaders = [s for s in summaries if "joined" not in s]
+        followers = [s for s in summaries if "joined" in s]
+        assert len(leaders) == 1
+        assert len(followers) == N_PROCESSES - 1
+        assert len({s["joined"] for s in followers}) == 1
+        assert all(s["results"] == leaders[0]["results"] for s in followers)
+        assert leaders[0]["sources_synced"] == len(SYNC_SOURCES)
+        # At most one sync_log row per source, not one per process.
+        with db._read() as conn:
+            assert conn.execute("SELECT source FROM sync_log GROUP BY source HAVING COUNT(*) > 1").fetchall() == []
+        assert db.get_sync_lease(SYNC_LEASE) is None
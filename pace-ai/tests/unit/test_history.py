@@ -2,6 +2,8 @@
 
 from __future__ import annotations
 
+import pytest
+
 from pace_ai.tools.history import (
     get_pbs,
     get_race_history,
@@ -9,9 +11,11 @@ from pace_ai.tools.history import (
     get_recent_diary,
     get_recent_wellness,
     get_weekly_distances,
+    search_history,
 )
 from pace_ai.tools.sync import sync_garmin_wellness, sync_notion, sync_strava
 from tests.conftest import (
+    recent_strava_activities,
     sample_diary_entries,
     sample_strava_activities,
     sample_wellness_data,
@@ -55,6 +59,16 @@ class TestGetRecentActivities:
         runs = get_recent_activities(history_db, days=30, sport_type="run")
         assert all("Run" in a["sport_type"] for a in runs)
 
+    def test_column_projection_keeps_computed_fields(self, history_db):
+        sync_strava(history_db, recent_strava_activities())
+        activities = get_recent_activities(history_db, days=30, columns=("date", "distance_m", "average_speed_ms"))
+        assert len(activities) == 3
+        for a in activities:
+            assert "name" not in a
+            assert "raw" not in a
+            assert a["distance_km"] > 0
+            assert a["pace_min_per_km"]
+
     def test_empty_when_no_data(self, history_db):
         assert get_recent_activities(history_db, days=30) == []
 
@@ -98,3 +112,16 @@ class TestGetPBs:
 
     def test_empty_when_no_data(self, history_db):
         assert get_pbs(history_db) == []
+
+
+class TestSearchHistory:
+    def test_ranks_across_sources(self, history_db):
+        sync_notion(history_db, [{"date": "2026-03-01", "niggles": "achilles", "notes": "achilles achilles sore"}])
+        history_db.add_athlete_fact("injury", "History of achilles tendinopathy", None)
+        hits = search_history(history_db, "achilles")
+        assert [h["source"] for h in hits] == ["diary", "facts"]
+        assert hits[0]["score"] >= hits[1]["score"]
+
+    def test_unknown_source_rejected(self, history_db):
+        with pytest.raises(ValueError, match="Unknown source"):
+            search_history(history_db, "achilles", sources=["emails"])
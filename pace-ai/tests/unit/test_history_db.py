@@ -2,6 +2,29 @@
 
 from __future__ import annotations
 
+import asyncio
+import json
+import random
+import sqlite3
+import threading
+import time
+from datetime import date, timedelta
+
+import pytest
+
+from pace_ai.database import (
+    _HISTORY_BASELINE_SCHEMA,
+    HISTORY_MIGRATIONS,
+    AsyncDB,
+    ConnectionManager,
+    GoalDB,
+    HistoryDB,
+    UpsertResult,
+    _unpack_raw,
+    explain_query_plan,
+    migrate_history_schema,
+    schema_version,
+)
 from tests.conftest import (
     sample_diary_entries,
     sample_garmin_workouts,
@@ -10,6 +33,10 @@ from tests.conftest import (
 )
 
 
+def _days_ago(days: int) -> str:
+    return (date.today() - timedelta(days=days)).isoformat()
+
+
 class TestActivities:
     def test_upsert_and_query(self, history_db):
         activities = [
@@ -23,7 +50,7 @@ class TestActivities:
             },
         ]
         count = history_db.upsert_activities(activities)
-        assert count == 1
+        assert count == UpsertResult(inserted=1)
 
         result = history_db.get_activities(days=30, sport_type="run")
         assert len(result) == 1
@@ -40,7 +67,7 @@ class TestActivities:
         }
         history_db.upsert_activities([activity])
         activity["name"] = "Updated Name"
-        history_db.upsert_activities([activity])
+        assert history_db.upsert_activities([activity]) == UpsertResult(updated=1)
 
         result = history_db.get_activities(days=30)
         assert len(result) == 1
@@ -75,7 +102,7 @@ class TestWellness:
     def test_upsert_and_query(self, history_db):
         data = sample_wellness_data()
         count = history_db.upsert_wellness(data)
-        assert count == 2
+        assert count == UpsertResult(inserted=2)
 
         result = history_db.get_wellness(days=7)
         assert len(result) == 2
@@ -95,7 +122,7 @@ class TestBodyMeasurements:
     def test_upsert_and_query(self, history_db):
         data = sample_withings_measurements()
         count = history_db.upsert_body_measurements(data)
-        assert count == 2
+        assert count == UpsertResult(inserted=2)
 
         result = history_db.get_body_measurements(days=30)
         assert len(result) == 2
@@ -115,7 +142,7 @@ class TestDiaryEntries:
     def test_upsert_and_query(self, history_db):
         data = sample_diary_entries()
         count = history_db.upsert_diary_entries(data)
-        assert count == 2
+        assert count == UpsertResult(inserted=2)
 
         result = history_db.get_diary_entries(days=7)
         assert len(result) == 2
@@ -135,7 +162,7 @@ class TestScheduledWorkouts:
     def test_upsert_and_query(self, history_db):
         data = sample_garmin_workouts()
         count = history_db.upsert_scheduled_workouts(data)
-        assert count == 2
+        assert count == UpsertResult(inserted=2)
 
         result = history_db.get_scheduled_workouts(days=30)
         assert len(result) == 2
@@ -254,3 +281,547 @@ class TestSyncLog:
         status = history_db.get_sync_status()
         assert len(status) == 1
         assert status[0]["records_added"] == 10
+
+
+class TestSyncLease:
+    def test_held_lease_blocks_until_released(self, history_db):
+        first = history_db.acquire_sync_lease("sync_all", "run-1", "host:1", ["strava", "notion"], ttl=60)
+        second = history_db.acquire_sync_lease("sync_all", "run-2", "host:2", ["strava"], ttl=60)
+
+        assert first["run_id"] == second["run_id"] == "run-1"
+        assert second["sources"] == ["strava", "notion"]
+        assert history_db.get_sync_run("run-2") is None
+
+        history_db.release_sync_lease("sync_all", "run-1", {"results": {"strava": {"inserted": 1}}})
+        assert history_db.get_sync_lease("sync_all") is None
+        run = history_db.get_sync_run("run-1")
+        assert run["finished_at"] >= run["started_at"]
+        assert run["result"] == {"results": {"strava": {"inserted": 1}}}
+        assert history_db.acquire_sync_lease("sync_all", "run-2", "host:2", ["strava"], ttl=60)["run_id"] == "run-2"
+
+    def test_expired_lease_can_be_taken_over(self, history_db):
+        history_db.acquire_sync_lease("sync_all", "run-1", "host:1", ["strava"], ttl=-1)
+        assert not history_db.renew_sync_lease("sync_all", "run-2", ttl=60)
+
+        lease = history_db.acquire_sync_lease("sync_all", "run-2", "host:2", ["strava"], ttl=60)
+        assert lease["run_id"] == "run-2"
+        assert not history_db.renew_sync_lease("sync_all", "run-1", ttl=60)
+        assert history_db.renew_sync_lease("sync_all", "run-2", ttl=60)
+
+    def test_old_runs_are_pruned(self, history_db):
+        for i in range(5):
+            history_db.acquire_sync_lease("sync_all", f"run-{i}", "host:1", ["strava"], ttl=60)
+            history_db.release_sync_lease("sync_all", f"run-{i}", {}, keep_runs=2)
+
+        kept = [i for i in range(5) if history_db.get_sync_run(f"run-{i}") is not None]
+        assert kept == [3, 4]
+
+
+class TestConnectionManager:
+    def test_wal_and_pragmas(self, history_db):
+        with history_db._connect() as conn:
+            assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+            assert conn.execute("PRAGMA synchronous").fetchone()[0] == 1  # NORMAL
+        with history_db._read() as conn:
+            assert conn.execute("PRAGMA query_only").fetchone()[0] == 1
+
+    def test_instances_share_manager(self, tmp_db, history_db):
+        other = HistoryDB(tmp_db)
+        goals = GoalDB(tmp_db)
+        assert other._pool is history_db._pool
+        assert goals._pool is history_db._pool
+
+    def test_schema_setup_runs_once(self, tmp_db, history_db):
+        calls = []
+        pool = ConnectionManager.for_path(tmp_db)
+        pool.ensure_schema("history", lambda conn: calls.append(conn))
+        HistoryDB(tmp_db)
+        assert calls == []
+
+    def test_reader_per_thread(self, history_db):
+        seen = []
+
+        def grab():
+            with history_db._read() as conn:
+                seen.append(conn)
+
+        threads = [threading.Thread(target=grab) for _ in range(2)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        with history_db._read() as main_conn:
+            pass
+        assert len({id(c) for c in [*seen, main_conn]}) == 3
+
+    def test_reads_not_blocked_by_open_write(self, history_db):
+        history_db.upsert_activities([{"strava_id": "1", "date": "2026-03-01", "sport_type": "Run"}])
+        writing = threading.Event()
+        release = threading.Event()
+
+        def long_write():
+            with history_db._connect() as conn:
+                conn.execute("UPDATE activities SET name = 'pending' WHERE strava_id = '1'")
+                writing.set()
+                release.wait(5)
+
+        writer = threading.Thread(target=long_write)
+        writer.start()
+        writing.wait(5)
+        try:
+            # The reader sees the last committed state immediately rather than waiting on the lock
+            with history_db._read() as conn:
+                row = conn.execute("SELECT name FROM activities WHERE strava_id = '1'").fetchone()
+            assert row["name"] is None
+        finally:
+            release.set()
+            writer.join()
+
+        with history_db._read() as conn:
+            row = conn.execute("SELECT name FROM activities WHERE strava_id = '1'").fetchone()
+        assert row["name"] == "pending"
+
+    def test_close_closes_every_threads_reader(self, history_db):
+        opened = []
+
+        def grab():
+            with history_db._read() as conn:
+                opened.append(conn)
+
+        thread = threading.Thread(target=grab)
+        thread.start()
+        thread.join()
+        with history_db._read() as conn:
+            opened.append(conn)
+
+        history_db._pool.close()
+        for conn in opened:
+            with pytest.raises(sqlite3.ProgrammingError, match="closed"):
+                conn.execute("SELECT 1")
+        assert history_db.get_sync_status() == []
+
+    def test_close_reopens(self, tmp_db, history_db):
+        history_db.log_sync("strava", 1, "success")
+        history_db._pool.close()
+        db = HistoryDB(tmp_db)
+        assert len(db.get_sync_status()) == 1
+
+
+class TestBulkUpsert:
+    @staticmethod
+    def _activities(ids, distance_m=5000):
+        return [{"strava_id": str(i), "date": "2026-03-01", "sport_type": "Run", "distance_m": distance_m} for i in ids]
+
+    def test_counts_inserted_and_updated_across_chunks(self, history_db):
+        history_db.upsert_activities(self._activities(range(5)))
+        result = history_db.upsert_activities(self._activities(range(3, 10), distance_m=6000), chunk_size=2)
+        assert result == UpsertResult(inserted=5, updated=2)
+        assert result.total == 7
+        assert len(history_db.get_activities(limit=50)) == 10
+
+    def test_unchanged_rows_are_skipped(self, history_db):
+        first = history_db.upsert_activities(self._activities(range(3)))
+        assert first.changed == {"0", "1", "2"}
+        seq = history_db.change_seq()
+
+        result = history_db.upsert_activities([*self._activities(range(2)), *self._activities([2], distance_m=6000)])
+        assert result == UpsertResult(updated=1, unchanged=2)
+        assert result.changed == {"2"}
+        assert history_db.changes_since(seq) == {"activities": {"2": "2026-03-01"}}
+        assert history_db.upsert_activities(self._activities(range(2))).total == 0
+        assert history_db.changes_since(seq) == {"activities": {"2": "2026-03-01"}}
+
+    def test_moved_date_journals_both_dates(self, history_db):
+        history_db.upsert_activities(self._activities([1]))
+        seq = history_db.change_seq()
+        history_db.upsert_activities([{**self._activities([1])[0], "date": "2026-03-09"}])
+        with history_db._read() as conn:
+            days = [r[0] for r in conn.execute("SELECT date FROM change_log WHERE seq > ? ORDER BY seq", (seq,))]
+        assert days == ["2026-03-01", "2026-03-09"]
+        assert history_db.changes_since(seq) == {"activities": {"1": "2026-03-09"}}
+
+    def test_repeated_key_counts_once(self, history_db):
+        result = history_db.upsert_activities(self._activities([1, 1, 2, 1]), chunk_size=2)
+        assert result == UpsertResult(inserted=2)
+
+    def test_composite_key(self, history_db):
+        history_db.upsert_body_measurements([{"date": "2026-03-01", "weight_kg": 80.0}])
+        result = history_db.upsert_body_measurements(
+            [
+                {"date": "2026-03-01", "weight_kg": 80.0, "bmi": 24.0},
+                {"date": "2026-03-01", "weight_kg": 79.5},
+            ]
+        )
+        assert result == UpsertResult(inserted=1, updated=1)
+
+    def test_null_key_rows_matched_by_content(self, history_db):
+        reading = {"date": "2026-03-01", "systolic_bp": 120, "diastolic_bp": 80}
+        assert history_db.upsert_body_measurements([reading, reading]) == UpsertResult(inserted=1)
+        seq = history_db.change_seq()
+        assert history_db.upsert_body_measurements([reading]) == UpsertResult(unchanged=1)
+        assert history_db.changes_since(seq) == {}
+
+        result = history_db.upsert_body_measurements([reading, {**reading, "systolic_bp": 118}])
+        assert result == UpsertResult(inserted=1, unchanged=1)
+        with history_db._read() as conn:
+            assert conn.execute("SELECT COUNT(*) FROM body_measurements").fetchone()[0] == 2
+
+    def test_failed_chunk_rolls_back_only_itself(self, history_db):
+        rows = self._activities(range(4))
+        rows[3]["date"] = None  # violates NOT NULL
+        with pytest.raises(sqlite3.IntegrityError):
+            history_db.upsert_activities(rows, chunk_size=2)
+        assert {a["strava_id"] for a in history_db.get_activities(limit=50)} == {"0", "1"}
+
+
+class TestRawPayloads:
+    def test_raw_moves_to_side_table(self, history_db):
+        raw = {"id": 100, "name": "Easy Run", "splits_metric": [{"split": 1}] * 20}
+        history_db.upsert_activities([{"strava_id": "100", "date": _days_ago(3), "sport_type": "Run", "raw": raw}])
+        (activity,) = history_db.get_activities(days=30)
+        assert "raw" not in activity
+        assert history_db.get_activity_raw("100") == raw
+        assert history_db.get_activity_raw("missing") is None
+
+        with history_db._read() as conn:
+            stored = conn.execute("SELECT raw FROM activities WHERE strava_id = '100'").fetchone()[0]
+            payload = conn.execute("SELECT payload FROM activity_raw WHERE strava_id = '100'").fetchone()[0]
+        assert stored is None
+        assert len(payload) < len(json.dumps(raw))
+
+    def test_small_raw_stored_uncompressed(self, history_db):
+        history_db.upsert_activities(
+            [{"strava_id": "100", "date": _days_ago(3), "sport_type": "Run", "raw": {"id": 1}}]
+        )
+        with history_db._read() as conn:
+            payload = conn.execute("SELECT payload FROM activity_raw WHERE strava_id = '100'").fetchone()[0]
+        assert payload == b'{"id": 1}'
+        assert history_db.get_activity_raw("100") == {"id": 1}
+
+    def test_update_without_raw_keeps_payload(self, history_db):
+        activity = {"strava_id": "100", "date": "2026-03-01", "sport_type": "Run", "raw": {"id": 100}}
+        history_db.upsert_activities([activity])
+        history_db.upsert_activities([{**activity, "raw": None, "name": "Renamed"}])
+        assert history_db.get_activity_raw("100") == {"id": 100}
+
+    def test_activity_detail_marks_and_stores_payload(self, history_db):
+        history_db.upsert_activities(
+            [
+                {"strava_id": "1", "date": _days_ago(7), "sport_type": "Run", "private_note": "old"},
+                {"strava_id": "2", "date": _days_ago(6), "sport_type": "Run"},
+            ]
+        )
+        assert set(history_db.activities_needing_detail(days=28)) == {"1", "2"}
+
+        detail = {"id": 2, "private_note": "calf tight", "best_efforts": [{"name": "1k"}]}
+        assert history_db.save_activity_details({"1": {"id": 1, "private_note": None}, "2": detail}) == 2
+        assert history_db.activities_needing_detail(days=28) == []
+        assert history_db.get_activity_detail("2") == detail
+        assert history_db.get_activity_detail("missing") is None
+        notes = {a["strava_id"]: a["private_note"] for a in history_db.get_activities(days=28)}
+        assert notes == {"1": None, "2": "calf tight"}
+
+    def test_wellness_raw(self, history_db):
+        day = _days_ago(3)
+        history_db.upsert_wellness([{"date": day, "resting_hr": 48, "raw": {"date": day}}])
+        (snapshot,) = history_db.get_wellness(days=30)
+        assert "raw" not in snapshot
+        assert history_db.get_wellness_raw(day) == {"date": day}
+
+    def test_column_projection(self, history_db):
+        day = _days_ago(3)
+        history_db.upsert_activities(
+            [{"strava_id": "1", "date": day, "sport_type": "Run", "name": "Easy", "distance_m": 5000}]
+        )
+        (activity,) = history_db.get_activities(days=30, columns=("date", "distance_m"))
+        assert activity == {"date": day, "distance_m": 5000}
+
+        history_db.upsert_wellness([{"date": day, "resting_hr": 48}])
+        assert history_db.get_wellness(days=30, columns=["resting_hr"]) == [{"resting_hr": 48}]
+
+    @pytest.mark.parametrize("columns", [("raw",), ("date; DROP TABLE activities",), ()])
+    def test_projection_rejects_unknown_columns(self, history_db, columns):
+        with pytest.raises(ValueError, match="column projection"):
+            history_db.get_activities(columns=columns)
+
+    def test_migration_moves_existing_raw(self):
+        conn = sqlite3.connect(":memory:")
+        conn.executescript(_HISTORY_BASELINE_SCHEMA)
+        migrate_history_schema(conn, target_version=7)
+        conn.execute(
+            "INSERT INTO activities (strava_id, date, sport_type, raw) VALUES ('7', '2026-03-01', 'Run', ?)",
+            (json.dumps({"id": 7}),),
+        )
+        conn.commit()
+
+        assert migrate_history_schema(conn, target_version=8) == [8]
+        assert conn.execute("SELECT raw FROM activities").fetchone()[0] is None
+        (payload,) = conn.execute("SELECT payload FROM activity_raw WHERE strava_id = '7'").fetchone()
+        assert _unpack_raw(payload) == {"id": 7}
+
+
+class TestLoadRollups:
+    @staticmethod
+    def _rollup(db, table, sport_class="run"):
+        order = "date" if table == "daily_load" else "week"
+        with db._read() as conn:
+            rows = conn.execute(f"SELECT * FROM {table} WHERE sport_class = ? ORDER BY {order}", (sport_class,))
+            return [dict(r) for r in rows]
+
+    @staticmethod
+    def _snapshot(db):
+        with db._read() as conn:
+            daily = conn.execute("SELECT * FROM daily_load ORDER BY date, sport_class").fetchall()
+            weekly = conn.execute("SELECT * FROM weekly_load ORDER BY week, sport_class").fetchall()
+
+        # Round floats: SUM order differs between incremental and full rebuilds.
+        def norm(rows):
+            return [tuple(round(v, 6) if isinstance(v, float) else v for v in r) for r in rows]
+
+        return norm(daily), norm(weekly)
+
+    def test_daily_and_weekly_totals(self, history_db):
+        today = date.today()
+        monday = (today - timedelta(days=today.weekday() + 14)).isoformat()
+        thursday = (today - timedelta(days=today.weekday() + 11)).isoformat()
+        history_db.upsert_activities(
+            [
+                {"strava_id": "1", "date": monday, "sport_type": "Run", "distance_m": 8000,
+                 "moving_time_s": 2400, "elevation_gain_m": 50, "average_hr": 150},
+                {"strava_id": "2", "date": monday, "sport_type": "TrailRun", "distance_m": 12000,
+                 "moving_time_s": 4200, "elevation_gain_m": 300},
+                {"strava_id": "3", "date": thursday, "sport_type": "Run", "distance_m": 5000,
+                 "moving_time_s": 1500, "average_hr": 160},
+                {"strava_id": "4", "date": thursday, "sport_type": "Ride", "distance_m": 40000,
+                 "moving_time_s": 5400},
+            ]
+        )  # fmt: skip
+        (first, second) = self._rollup(history_db, "daily_load")
+        assert first["date"] == monday
+        assert first["distance_m"] == 20000
+        assert first["activity_count"] == 2
+        assert first["longest_m"] == 12000
+        assert first["elevation_gain_m"] == 350
+        assert first["hr_time_s"] == 2400
+        assert first["hr_load"] == pytest.approx(40 * 150)
+        assert second["date"] == thursday
+        assert second["distance_m"] == 5000
+
+        (week,) = self._rollup(history_db, "weekly_load")
+        assert week["week_start"] == monday
+        assert week["distance_m"] == 25000
+        assert week["activity_count"] == 3
+        assert week["longest_m"] == 12000
+        assert week["hr_load"] == pytest.approx(40 * 150 + 25 * 160)
+        assert self._rollup(history_db, "weekly_load", "ride")[0]["distance_m"] == 40000
+
+    def test_committed_chunks_refreshed_when_later_chunk_fails(self, history_db):
+        good = {"strava_id": "1", "date": _days_ago(3), "sport_type": "Run", "distance_m": 5000}
+        bad = {"strava_id": "2", "date": _days_ago(2), "sport_type": None}
+        with pytest.raises(sqlite3.IntegrityError):
+            history_db.upsert_activities([good, bad], chunk_size=1)
+
+        (day,) = self._rollup(history_db, "daily_load")
+        assert day["date"] == _days_ago(3)
+        assert day["distance_m"] == 5000
+
+    def test_update_moves_old_day(self, history_db):
+        activity = {"strava_id": "1", "date": _days_ago(14), "sport_type": "Run", "distance_m": 8000}
+        history_db.upsert_activities([activity])
+        history_db.upsert_activities([{**activity, "date": _days_ago(6), "sport_type": "Ride"}])
+
+        assert self._rollup(history_db, "daily_load") == []
+        (ride,) = self._rollup(history_db, "daily_load", "ride")
+        assert ride["date"] == _days_ago(6)
+        assert self._rollup(history_db, "weekly_load") == []
+
+    def test_incremental_matches_full_rebuild(self, history_db):
+        rng = random.Random(7)
+        sports = ["Run", "TrailRun", "Ride", "Swim", "WeightTraining"]
+
+        def batch(ids):
+            return [
+                {
+                    "strava_id": str(i),
+                    "date": f"2026-{rng.randint(1, 3):02d}-{rng.randint(1, 28):02d}",
+                    "sport_type": rng.choice(sports),
+                    "distance_m": rng.choice([None, rng.uniform(1000, 30000)]),
+                    "moving_time_s": rng.randint(600, 9000),
+                    "average_hr": rng.choice([None, rng.uniform(110, 180)]),
+                }
+                for i in ids
+            ]
+
+        history_db.upsert_activities(batch(range(200)), chunk_size=37)
+        history_db.upsert_activities(batch(rng.sample(range(300), 120)), chunk_size=25)
+        incremental = self._snapshot(history_db)
+        history_db.rebuild_load_rollups()
+        assert self._snapshot(history_db) == incremental
+
+        with history_db._read() as conn:
+            scanned = conn.execute(
+                """SELECT strftime('%Y-W%W', date) AS week, MIN(date) AS week_start,
+                          SUM(distance_m) / 1000.0 AS distance_km, COUNT(*) AS activity_count
+                   FROM activities WHERE sport_class = 'run' AND date >= date('now', '-84 days')
+                   GROUP BY week ORDER BY week""",
+            ).fetchall()
+        rolled = history_db.get_weekly_distances(weeks=12, sport_type="run")
+        assert [r["week"] for r in rolled] == [r["week"] for r in scanned]
+        for r, expected in zip(rolled, scanned, strict=True):
+            assert r["week_start"] == expected["week_start"]
+            assert r["activity_count"] == expected["activity_count"]
+            assert r["distance_km"] == pytest.approx(expected["distance_km"])
+
+    def test_migration_backfills_existing_activities(self):
+        conn = sqlite3.connect(":memory:")
+        conn.executescript(_HISTORY_BASELINE_SCHEMA)
+        migrate_history_schema(conn, target_version=8)
+        conn.execute(
+            "INSERT INTO activities (strava_id, date, sport_type, distance_m) VALUES ('1', '2026-03-02', 'Run', 5000)"
+        )
+        conn.commit()
+        migrate_history_schema(conn, target_version=9)
+        assert conn.execute("SELECT date, sport_class, distance_m FROM daily_load").fetchall() == [
+            ("2026-03-02", "run", 5000)
+        ]
+        assert conn.execute("SELECT week, week_start FROM weekly_load").fetchall() == [("2026-W09", "2026-03-02")]
+
+
+class TestFullTextSearch:
+    def test_activity_notes_follow_updates_and_deletes(self, history_db):
+        activity = {"strava_id": "1", "date": "2026-03-01", "sport_type": "Run", "private_note": "calf tight"}
+        history_db.upsert_activities([activity])
+        assert [h["ref"] for h in history_db.search_history("calf")] == ["1"]
+
+        history_db.upsert_activities([{**activity, "private_note": "felt great"}])
+        assert history_db.search_history("calf") == []
+        assert [h["title"] for h in history_db.search_history("great")] == [None]
+
+        with history_db._connect() as conn:
+            conn.execute("DELETE FROM activities")
+        assert history_db.search_history("great") == []
+
+    def test_stemming_prefix_and_all_words(self, history_db):
+        history_db.upsert_diary_entries([{"date": "2026-03-01", "notes": "Achilles niggling on the hills"}])
+        assert len(history_db.search_history("achill")) == 1
+        assert len(history_db.search_history("hill achilles")) == 1
+        assert history_db.search_history("achilles knee") == []
+
+    @pytest.mark.parametrize("query", ['"', "achilles OR", "NEAR(", "-", "*", "   "])
+    def test_fts_syntax_is_not_interpreted(self, history_db, query):
+        history_db.upsert_diary_entries([{"date": "2026-03-01", "notes": "achilles"}])
+        history_db.search_history(query)  # must not raise
+
+    def test_inactive_facts_excluded(self, history_db):
+        fact = history_db.add_athlete_fact("injury", "achilles tendinopathy", None)
+        with history_db._connect() as conn:
+            conn.execute("UPDATE athlete_facts SET active = 0 WHERE id = ?", (fact["id"],))
+        assert history_db.search_history("achilles", sources=["facts"]) == []
+
+    def test_migration_indexes_existing_rows(self):
+        conn = sqlite3.connect(":memory:")
+        conn.executescript(_HISTORY_BASELINE_SCHEMA)
+        migrate_history_schema(conn, target_version=9)
+        conn.execute("INSERT INTO coaching_log (summary) VALUES ('Discussed achilles rehab')")
+        conn.commit()
+        migrate_history_schema(conn, target_version=10)
+        hits = conn.execute("SELECT rowid FROM coaching_log_fts WHERE coaching_log_fts MATCH 'achilles'").fetchall()
+        assert hits == [(1,)]
+
+
+class TestAsyncDB:
+    async def test_calls_run_on_worker_threads(self, history_db):
+        facade = AsyncDB(history_db, max_workers=2)
+        loop_thread = threading.get_ident()
+
+        def which_thread(db, value):
+            assert db is history_db
+            return threading.get_ident(), value
+
+        thread_id, value = await facade.call(which_thread, 7)
+        assert value == 7
+        assert thread_id != loop_thread
+
+    async def test_pool_is_bounded(self, history_db):
+        facade = AsyncDB(history_db, max_workers=2)
+        running = peak = 0
+        lock = threading.Lock()
+
+        def work(_db):
+            nonlocal running, peak
+            with lock:
+                running += 1
+                peak = max(peak, running)
+            time.sleep(0.02)
+            with lock:
+                running -= 1
+
+        await asyncio.gather(*(facade.call(work) for _ in range(8)))
+        assert peak == 2
+
+
+class TestMigrations:
+    def test_fresh_db_at_latest_version(self, history_db):
+        with history_db._read() as conn:
+            assert schema_version(conn) == HISTORY_MIGRATIONS[-1].version
+
+    def test_rerun_is_noop(self, history_db):
+        with history_db._connect() as conn:
+            assert migrate_history_schema(conn) == []
+
+    def test_upgrades_legacy_db(self, tmp_db):
+        legacy = sqlite3.connect(tmp_db)
+        legacy.executescript(_HISTORY_BASELINE_SCHEMA.replace("private_note TEXT,", ""))
+        legacy.execute("INSERT INTO activities (strava_id, date, sport_type) VALUES ('1', '2026-03-01', 'TrailRun')")
+        legacy.commit()
+        legacy.close()
+
+        db = HistoryDB(tmp_db)
+        with db._read() as conn:
+            columns = {row[1] for row in conn.execute("PRAGMA table_xinfo(activities)")}
+            assert {"private_note", "sport_class"} <= columns
+            assert conn.execute("SELECT sport_class FROM activities").fetchone()[0] == "run"
+
+    def test_sport_class_matches_like_filter(self, history_db):
+        history_db.upsert_activities(
+            [
+                {"strava_id": "1", "date": _days_ago(3), "sport_type": "Run"},
+                {"strava_id": "2", "date": _days_ago(3), "sport_type": "VirtualRun"},
+                {"strava_id": "3", "date": _days_ago(3), "sport_type": "EBikeRide"},
+                {"strava_id": "4", "date": _days_ago(3), "sport_type": "WeightTraining"},
+            ]
+        )
+        assert {a["strava_id"] for a in history_db.get_activities(days=30, sport_type="run")} == {"1", "2"}
+        assert {a["strava_id"] for a in history_db.get_activities(days=30, sport_type="ride")} == {"3"}
+        assert {a["strava_id"] for a in history_db.get_activities(days=30, sport_type="weight")} == {"4"}
+
+    @pytest.mark.parametrize(
+        ("version", "sql", "index"),
+        [
+            (4, "SELECT * FROM activities WHERE date >= date('now', '-28 days')", "idx_activities_date"),
+            (
+                5,
+                "SELECT SUM(distance_m) FROM activities WHERE sport_class = 'run' AND date >= date('now', '-84 days')",
+                "idx_activities_sport_class_date",
+            ),
+            (
+                6,
+                "SELECT synced_at FROM sync_log WHERE source = 'strava' AND status = 'success'"
+                " ORDER BY id DESC LIMIT 1",
+                "idx_sync_log_source_status",
+            ),
+            (
+                7,
+                "SELECT id FROM scheduled_workouts WHERE completed = 0 AND scheduled_date IS NOT NULL",
+                "idx_scheduled_workouts_completed_date",
+            ),
+        ],
+    )
+    def test_index_migration_changes_query_plan(self, version, sql, index):
+        conn = sqlite3.connect(":memory:")
+        conn.executescript(_HISTORY_BASELINE_SCHEMA)
+        migrate_history_schema(conn, target_version=version - 1)
+        assert not any(index in line for line in explain_query_plan(conn, sql))
+
+        assert migrate_history_schema(conn, target_version=version) == [version]
+        assert any(index in line for line in explain_query_plan(conn, sql))
@@ -2,11 +2,16 @@
 
 from __future__ import annotations
 
+from datetime import date, timedelta
+
 import pytest
 
+from pace_ai.database import CHANGE_CURSOR_TTL
 from pace_ai.tools.profile import (
+    PROFILE_GROUPS,
     generate_athlete_profile,
     get_athlete_profile,
+    refresh_athlete_profile,
     update_athlete_profile_manual,
 )
 from pace_ai.tools.sync import (
@@ -15,6 +20,7 @@ from pace_ai.tools.sync import (
     sync_withings,
 )
 from tests.conftest import (
+    recent_strava_activities,
     sample_strava_activities,
     sample_wellness_data,
     sample_withings_measurements,
@@ -116,6 +122,121 @@ class TestGenerateAthleteProfile:
         assert profile["experience_level"] == "advanced"
 
 
+def _runs(days_km: dict[str, float], start_id: int = 0) -> list[dict]:
+    return [
+        {"strava_id": str(start_id + i), "date": d, "sport_type": "Run", "distance_m": km * 1000, "moving_time_s": 3600}
+        for i, (d, km) in enumerate(days_km.items())
+    ]
+
+
+def _auto_fields(profile: dict) -> dict:
+    return {field: profile[field] for group in PROFILE_GROUPS for field in group.fields}
+
+
+class TestRefreshAthleteProfile:
+    def test_first_refresh_computes_everything_then_nothing(self, history_db):
+        sync_strava(history_db, sample_strava_activities())
+        assert refresh_athlete_profile(history_db) == [group.name for group in PROFILE_GROUPS]
+        assert refresh_athlete_profile(history_db) == []
+
+    def test_only_groups_reading_changed_tables_recompute(self, history_db):
+        generate_athlete_profile(history_db)
+        yesterday = (date.today() - timedelta(days=1)).isoformat()
+        history_db.upsert_wellness([{"date": yesterday, "resting_hr": 47, "hrv_value": 60}])
+        assert refresh_athlete_profile(history_db) == ["wellness_baselines"]
+        assert history_db.get_athlete_profile()["resting_hr_baseline"] == 47
+
+    def test_changes_outside_window_are_ignored(self, history_db):
+        generate_athlete_profile(history_db)
+        history_db.upsert_wellness([{"date": "2025-01-01", "resting_hr": 47}])
+        assert refresh_athlete_profile(history_db) == []
+
+    def test_daily_groups_recompute_on_a_new_day(self, history_db):
+        generate_athlete_profile(history_db)
+        with history_db._connect() as conn:
+            conn.execute("UPDATE profile_state SET computed_on = '2026-03-11'")
+        daily = [group.name for group in PROFILE_GROUPS if group.daily]
+        assert refresh_athlete_profile(history_db) == daily
+        assert "weekly_volume" not in daily
+
+    def test_weekly_max_is_maintained_incrementally(self, history_db):
+        history_db.upsert_activities(_runs({"2026-01-05": 30, "2026-02-02": 50}))
+        assert generate_athlete_profile(history_db)["max_weekly_km_ever"] == 50
+
+        history_db.upsert_activities(_runs({"2026-03-02": 60}, start_id=10))
+        refresh_athlete_profile(history_db)
+        assert history_db.get_athlete_profile()["max_weekly_km_ever"] == 60
+
+        # Shrinking the record week forces a rescan for the runner-up.
+        history_db.upsert_activities(_runs({"2026-03-02": 20}, start_id=10))
+        refresh_athlete_profile(history_db)
+        incremental = _auto_fields(history_db.get_athlete_profile())
+        assert incremental["max_weekly_km_ever"] == 50
+        assert incremental == _auto_fields(generate_athlete_profile(history_db))
+
+    def test_moving_the_record_week_run_rescans(self, history_db):
+        history_db.upsert_activities(_runs({"2026-01-05": 30, "2026-02-02": 50}))
+        assert generate_athlete_profile(history_db)["max_weekly_km_ever"] == 50
+
+        # Only the old date's week lost distance; the journal must still name it.
+        history_db.upsert_activities([{**_runs({"2026-02-23": 20})[0], "strava_id": "1"}])
+        refresh_athlete_profile(history_db)
+        incremental = _auto_fields(history_db.get_athlete_profile())
+        assert incremental["max_weekly_km_ever"] == 30
+        assert incremental == _auto_fields(generate_athlete_profile(history_db))
+
+    def test_training_age_tracks_earlier_race(self, history_db):
+        sync_strava(history_db, recent_strava_activities())
+        generate_athlete_profile(history_db)
+        ten_years_ago = (date.today() - timedelta(days=round(10 * 365.25))).isoformat()
+        history_db.upsert_race_result({"date": ten_years_ago, "distance_m": 5000, "time_s": 1200, "vdot": 50.0})
+        assert refresh_athlete_profile(history_db) == ["vdot", "training_age"]
+        assert history_db.get_athlete_profile()["training_age_years"] == 10.0
+
+    def test_windowed_baselines_are_maintained_incrementally(self, history_db):
+        def days_ago(n: int) -> str:
+            return (date.today() - timedelta(days=n)).isoformat()
+
+        history_db.upsert_wellness([{"date": days_ago(n), "resting_hr": 50 + n, "hrv_value": 40} for n in range(1, 8)])
+        history_db.upsert_body_measurements(
+            [{"date": days_ago(40), "weight_kg": 80.0}, {"date": days_ago(10), "weight_kg": 78.0}]
+        )
+        generate_athlete_profile(history_db)
+
+        history_db.upsert_wellness([{"date": days_ago(3), "resting_hr": 40, "hrv_value": 70}])
+        history_db.upsert_body_measurements([{"date": days_ago(2), "weight_kg": 77.0}])
+        assert refresh_athlete_profile(history_db) == ["weight", "wellness_baselines", "blood_pressure"]
+        incremental = _auto_fields(history_db.get_athlete_profile())
+        assert incremental["weight_kg_trend"] == "decreasing"
+        assert incremental == _auto_fields(generate_athlete_profile(history_db))
+
+    def test_journal_pruned_once_every_group_has_seen_it(self, history_db):
+        sync_strava(history_db, sample_strava_activities())
+        assert history_db.changes_since(0)
+        refresh_athlete_profile(history_db)
+        assert history_db.changes_since(0) == {}
+
+    def test_open_change_cursor_holds_back_pruning(self, history_db):
+        generate_athlete_profile(history_db)
+        seq = history_db.open_change_cursor("reader")
+        history_db.upsert_activities(_runs({"2026-03-02": 10}))
+        refresh_athlete_profile(history_db)
+        assert history_db.changes_since(seq) == {"activities": {"0": "2026-03-02"}}
+
+        history_db.close_change_cursor("reader")
+        refresh_athlete_profile(history_db)
+        assert history_db.changes_since(seq) == {}
+
+    def test_stale_change_cursor_is_ignored(self, history_db):
+        generate_athlete_profile(history_db)
+        history_db.open_change_cursor("crashed")
+        with history_db._connect() as conn:
+            conn.execute("UPDATE change_cursor SET opened_at = opened_at - ?", (CHANGE_CURSOR_TTL + 1,))
+        history_db.upsert_activities(_runs({"2026-03-02": 10}))
+        refresh_athlete_profile(history_db)
+        assert history_db.changes_since(0) == {}
+
+
 class TestUpdateAthleteProfileManual:
     def test_update_manual_fields(self, history_db):
         profile = update_athlete_profile_manual(
@@ -2,11 +2,23 @@
 
 from __future__ import annotations
 
+import asyncio
+import threading
+from contextlib import contextmanager
+from datetime import date, datetime, timedelta
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
+from strava_mcp.client import RateLimitInfo
 
+from pace_ai.database import explain_query_plan
+from pace_ai.tools.profile import PROFILE_GROUPS
 from pace_ai.tools.sync import (
+    _WORKOUT_CANDIDATES_SQL,
+    DETAIL_MAX_CONCURRENCY,
+    SYNC_LEASE,
+    SYNC_SOURCES,
+    _fetch_activity_details,
     get_sync_status,
     sync_all,
     sync_garmin_wellness,
@@ -16,6 +28,7 @@ from pace_ai.tools.sync import (
     sync_withings,
 )
 from tests.conftest import (
+    recent_strava_activities,
     sample_diary_entries,
     sample_garmin_workouts,
     sample_strava_activities,
@@ -150,6 +163,124 @@ class TestSyncGarminWorkouts:
             ).fetchall()
         assert len(matched) >= 1
 
+    @staticmethod
+    def _workout(workout_id, sport="running", **plan):
+        return {"garmin_workout_id": workout_id, "sport_type": sport, "scheduled_date": "2026-03-10", **plan}
+
+    @staticmethod
+    def _matches(history_db):
+        with history_db._read() as conn:
+            rows = conn.execute("SELECT garmin_workout_id, strava_activity_id FROM scheduled_workouts").fetchall()
+        return {r["garmin_workout_id"]: r["strava_activity_id"] for r in rows}
+
+    def test_plan_targets_pick_closest_activity(self, history_db):
+        run = {"date": "2026-03-10", "sport_type": "Run"}
+        history_db.upsert_activities(
+            [
+                {**run, "strava_id": "1", "distance_m": 3000, "moving_time_s": 900},
+                {**run, "strava_id": "2", "distance_m": 9800, "moving_time_s": 3000},
+                {**run, "strava_id": "3", "sport_type": "Ride", "distance_m": 10000},
+            ]
+        )
+        workout = self._workout("WK1", planned_distance_m=10000, planned_duration_s=3000)
+        result = sync_garmin_workouts(history_db, [workout])
+        assert result["matching"] == {"matched": 1, "ambiguous": 0, "unmatched": 0}
+        assert self._matches(history_db) == {"WK1": "2"}
+
+    def test_no_targets_is_ambiguous_and_takes_longest(self, history_db):
+        history_db.upsert_activities(
+            [
+                {"strava_id": "1", "date": "2026-03-10", "sport_type": "Run", "moving_time_s": 600},
+                {"strava_id": "2", "date": "2026-03-10", "sport_type": "TrailRun", "moving_time_s": 4000},
+            ]
+        )
+        result = sync_garmin_workouts(history_db, [self._workout("WK1")])
+        assert result["matching"] == {"matched": 1, "ambiguous": 1, "unmatched": 0}
+        assert self._matches(history_db) == {"WK1": "2"}
+
+    def test_activity_completes_one_workout(self, history_db):
+        history_db.upsert_activities(
+            [{"strava_id": "1", "date": "2026-03-10", "sport_type": "Ride", "moving_time_s": 3600}]
+        )
+        workouts = [
+            self._workout("WK1", "road_biking", planned_duration_s=1800),
+            self._workout("WK2", "cycling", planned_duration_s=3600),
+            self._workout("WK3", "lap_swimming"),
+        ]
+        result = sync_garmin_workouts(history_db, workouts)
+        assert result["matching"] == {"matched": 1, "ambiguous": 0, "unmatched": 2}
+        assert self._matches(history_db) == {"WK1": None, "WK2": "1", "WK3": None}
+
+    def test_candidate_join_uses_sport_class_index(self, history_db):
+        with history_db._read() as conn:
+            plan = explain_query_plan(conn, _WORKOUT_CANDIDATES_SQL)
+        assert any("a USING" in line and "idx_activities_sport_class_date" in line for line in plan)
+
+
+def _detail_client(notes: dict[int, str | None], fifteen_min_usage: int = 0) -> AsyncMock:
+    """Strava client whose detail calls count against a real RateLimitInfo, like responses do."""
+    client = AsyncMock()
+    client.rate_limits = RateLimitInfo()
+    client.rate_limits.fifteen_min_usage = fifteen_min_usage
+    client.in_flight = client.max_in_flight = 0
+
+    async def get_activity(activity_id):
+        client.in_flight += 1
+        client.max_in_flight = max(client.max_in_flight, client.in_flight)
+        await asyncio.sleep(0.01)
+        client.in_flight -= 1
+        client.rate_limits.fifteen_min_usage += 1
+        return {"id": activity_id, "private_note": notes.get(activity_id)}
+
+    client.get_activity.side_effect = get_activity
+    return client
+
+
+class TestActivityDetails:
+    @pytest.fixture()
+    def recent(self, history_db):
+        history_db.upsert_activities(
+            [
+                {"strava_id": str(i), "date": (date.today() - timedelta(days=11 - i)).isoformat(), "sport_type": "Run"}
+                for i in range(1, 11)
+            ]
+        )
+
+    @pytest.mark.asyncio()
+    async def test_fetches_concurrently_under_cap(self, history_db, recent):
+        client = _detail_client({3: "calf tight"})
+        details = await _fetch_activity_details(history_db, client, [])
+        assert set(details) == {str(i) for i in range(1, 11)}
+        assert 1 < client.max_in_flight <= DETAIL_MAX_CONCURRENCY
+        # Newest first, so a budget cut-off drops the oldest activities.
+        assert client.get_activity.await_args_list[0].args == (10,)
+
+    @pytest.mark.asyncio()
+    async def test_marker_stops_refetching_empty_notes(self, history_db, recent):
+        client = _detail_client({3: "calf tight"})
+        history_db.save_activity_details(await _fetch_activity_details(history_db, client, []))
+        notes = {a["strava_id"]: a["private_note"] for a in history_db.get_activities(days=28)}
+        assert notes["3"] == "calf tight"
+        assert notes["4"] is None
+        client.get_activity.reset_mock()
+        assert await _fetch_activity_details(history_db, client, []) == {}
+        client.get_activity.assert_not_awaited()
+
+    @pytest.mark.asyncio()
+    async def test_stops_at_rate_limit_reserve(self, history_db, recent):
+        # 100/15min limit, 87 used, 10 held in reserve: three requests left.
+        client = _detail_client({}, fifteen_min_usage=87)
+        details = await _fetch_activity_details(history_db, client, [])
+        assert set(details) == {"10", "9", "8"}
+        assert client.rate_limits.fifteen_min_usage == 90
+        assert len(history_db.activities_needing_detail(days=28)) == 10
+
+    @pytest.mark.asyncio()
+    async def test_includes_activities_fetched_this_run(self, history_db):
+        client = _detail_client({1002: "windy"})
+        details = await _fetch_activity_details(history_db, client, recent_strava_activities())
+        assert details["1002"]["private_note"] == "windy"
+
 
 class TestGetSyncStatus:
     def test_multiple_sources(self, history_db):
@@ -169,7 +300,7 @@ class TestSyncAll:
     async def test_sync_all_success(self, history_db):
         """sync_all calls all sources and reports results."""
         mock_strava_client = AsyncMock()
-        mock_strava_client.get_all_activities.return_value = sample_strava_activities()
+        mock_strava_client.get_activities.return_value = sample_strava_activities()
 
         mock_garmin_client = MagicMock()
         mock_garmin_client.get_body_battery.return_value = [{"batteryLevel": 80}]
@@ -206,7 +337,7 @@ class TestSyncAll:
     async def test_sync_all_continues_on_failure(self, history_db):
         """If one source fails, others still sync."""
         mock_strava_client = AsyncMock()
-        mock_strava_client.get_all_activities.side_effect = RuntimeError("Strava down")
+        mock_strava_client.get_activities.side_effect = RuntimeError("Strava down")
 
         mock_garmin_client = MagicMock()
         mock_garmin_client.get_body_battery.return_value = None
@@ -238,3 +369,413 @@ class TestSyncAll:
         assert "strava" in result["errors"]
         # Other sources should still have synced
         assert result["sources_synced"] >= 2
+
+
+@contextmanager
+def _patched_clients(strava, garmin, withings, notion):
+    with (
+        patch("strava_mcp.client.StravaClient", return_value=strava),
+        patch("strava_mcp.config.Settings.from_env", return_value=MagicMock(db_path=":memory:")),
+        patch("strava_mcp.auth.TokenStore", return_value=MagicMock()),
+        patch("garmin_mcp.client.GarminClient", return_value=garmin),
+        patch("garmin_mcp.config.Settings.from_env", return_value=MagicMock()),
+        patch("withings_mcp.client.WithingsClient", return_value=withings),
+        patch("withings_mcp.config.Settings.from_env", return_value=MagicMock()),
+        patch("notion_mcp.client.NotionClient", return_value=notion),
+        patch("notion_mcp.config.Settings.from_env", return_value=MagicMock()),
+    ):
+        yield
+
+
+def _quiet_clients(activities: list[dict] | None = None, workouts: list[dict] | None = None):
+    """Strava/Notion async and Garmin/Withings blocking clients with nothing new upstream."""
+    strava = AsyncMock()
+    strava.get_activities.return_value = activities or []
+    garmin = MagicMock()
+    for metric in ("get_body_battery", "get_sleep", "get_stress", "get_resting_hr"):
+        getattr(garmin, metric).return_value = None
+    garmin.get_workouts.return_value = workouts or []
+    withings = MagicMock()
+    withings.get_measurements.return_value = []
+    notion = AsyncMock()
+    notion.fetch_all_entries.return_value = []
+    return strava, garmin, withings, notion
+
+
+def _history(n: int) -> list[dict]:
+    """n daily runs in February, oldest first."""
+    return [
+        {
+            "id": 5000 + i,
+            "name": "Easy Run",
+            "sport_type": "Run",
+            "start_date": f"2026-02-{i + 1:02d}T06:00:00Z",
+            "start_date_local": f"2026-02-{i + 1:02d}T07:00:00",
+        }
+        for i in range(n)
+    ]
+
+
+def _paged_strava(history: list[dict], fail_on_call: int | None = None) -> AsyncMock:
+    """Strava client whose list endpoint pages forward from ``after``, like the real API."""
+    strava = AsyncMock()
+    strava.rate_limits = RateLimitInfo()
+    calls: list[int] = []
+
+    async def get_activities(*, after=None, per_page=50, **kwargs):
+        calls.append(after)
+        strava.rate_limits.fifteen_min_usage += 1
+        if fail_on_call == len(calls):
+            raise RuntimeError("network dropped")
+        return [a for a in history if _epoch(a) > (after or 0)][:per_page]
+
+    strava.get_activities.side_effect = get_activities
+    strava.calls = calls
+    return strava
+
+
+def _epoch(activity: dict) -> int:
+    return int(datetime.fromisoformat(activity["start_date"].replace("Z", "+00:00")).timestamp())
+
+
+class TestStravaBackfill:
+    @pytest.fixture(autouse=True)
+    def _small_pages(self, monkeypatch):
+        monkeypatch.setattr("pace_ai.tools.sync.STRAVA_BACKFILL_PAGE_SIZE", 2)
+
+    async def _sync(self, history_db, strava):
+        _, garmin, withings, notion = _quiet_clients()
+        with _patched_clients(strava, garmin, withings, notion):
+            return await sync_all(history_db)
+
+    @pytest.mark.asyncio()
+    async def test_first_sync_pages_to_completion(self, history_db):
+        history = _history(5)
+        strava = _paged_strava(history)
+        result = await self._sync(history_db, strava)
+
+        assert result["results"]["strava"]["activities_synced"] == 5
+        assert result["results"]["strava"]["backfill"] == {"pages": 3, "complete": True, "cursor": _epoch(history[-1])}
+        assert history_db.get_sync_cursor("strava")["complete"] is True
+        assert len(history_db.get_activities(limit=50)) == 5
+        (status,) = [s for s in history_db.get_sync_status() if s["source"] == "strava"]
+        assert (status["earliest_date"], status["latest_date"]) == ("2026-02-01", "2026-02-05")
+        with history_db._read() as conn:
+            assert conn.execute("SELECT COUNT(*) FROM change_cursor").fetchone()[0] == 0
+
+    @pytest.mark.asyncio()
+    async def test_failure_resumes_from_cursor(self, history_db):
+        history = _history(5)
+        result = await self._sync(history_db, _paged_strava(history, fail_on_call=2))
+        assert "strava" in result["errors"]
+        cursor = history_db.get_sync_cursor("strava")
+        assert cursor == {**cursor, "cursor": str(_epoch(history[1])), "complete": False}
+
+        strava = _paged_strava(history)
+        result = await self._sync(history_db, strava)
+        assert strava.calls == [_epoch(history[1]), _epoch(history[3])]
+        assert result["results"]["strava"]["activities_synced"] == 3
+        assert len(history_db.get_activities(limit=50)) == 5
+
+    @pytest.mark.asyncio()
+    async def test_pauses_when_rate_limit_budget_is_spent(self, history_db):
+        history = _history(5)
+        strava = _paged_strava(history)
+        # 100/15min limit with 10 held in reserve: one page, then stop.
+        strava.rate_limits.fifteen_min_usage = 89
+        result = await self._sync(history_db, strava)
+
+        assert result["results"]["strava"]["backfill"]["complete"] is False
+        assert len(strava.calls) == 1
+        assert history_db.get_sync_cursor("strava")["complete"] is False
+
+        # The next sync carries on with the backfill, not an incremental fetch.
+        strava = _paged_strava(history)
+        await self._sync(history_db, strava)
+        assert strava.calls[0] == _epoch(history[1])
+        strava.get_all_activities.assert_not_awaited()
+        assert history_db.get_sync_cursor("strava")["complete"] is True
+
+    @pytest.mark.asyncio()
+    async def test_completed_backfill_switches_to_incremental(self, history_db):
+        await self._sync(history_db, _paged_strava(_history(1)))
+        strava = _paged_strava([])
+        strava.get_all_activities.return_value = []
+        await self._sync(history_db, strava)
+        strava.get_all_activities.assert_awaited_once()
+        assert strava.calls == []
+
+
+class TestChangeDetection:
+    def test_resync_skips_unchanged_activities_and_races(self, history_db):
+        activities = sample_strava_activities()
+        sync_strava(history_db, activities)
+        with patch.object(history_db, "upsert_race_result") as upsert_race:
+            result = sync_strava(history_db, activities)
+        assert result["activities_synced"] == 0
+        assert result["unchanged"] == 3
+        upsert_race.assert_not_called()
+
+    @pytest.mark.asyncio()
+    async def test_quiet_sync_skips_profile(self, history_db):
+        run = {**sample_strava_activities()[0], "start_date_local": "2026-03-10T08:00:00"}
+        strava, garmin, withings, notion = _quiet_clients()
+        strava.get_activities.return_value = [run]
+        with _patched_clients(strava, garmin, withings, notion):
+            first = await sync_all(history_db)
+            assert first["changed"]["activities"] == 1
+            assert first["profile_recomputed"] == [group.name for group in PROFILE_GROUPS]
+
+            # Later syncs are incremental; Strava re-sends the same activity.
+            strava.get_all_activities.return_value = [run]
+            quiet = await sync_all(history_db)
+        assert quiet["changed"] == {}
+        assert quiet["results"]["strava"]["unchanged"] == 1
+        assert quiet["profile_recomputed"] == []
+
+    @pytest.mark.asyncio()
+    async def test_new_activity_matches_unchanged_workout(self, history_db):
+        sync_garmin_workouts(history_db, sample_garmin_workouts())
+        run = {**sample_strava_activities()[0], "start_date_local": "2026-03-10T08:00:00"}
+        strava, garmin, withings, notion = _quiet_clients()
+        strava.get_activities.return_value = [run]
+        with _patched_clients(strava, garmin, withings, notion):
+            result = await sync_all(history_db)
+        assert result["matching"]["matched"] == 1
+
+
+class TestSyncAllPipeline:
+    @pytest.mark.asyncio()
+    async def test_sources_fetch_concurrently(self, history_db):
+        """Each list call waits until all four are in flight; run one at a time, the first would time out."""
+        arrived: list[int] = []
+        all_in = threading.Event()
+
+        def arrive():
+            arrived.append(1)
+            if len(arrived) == 4:
+                all_in.set()
+
+        def blocking_fetch(*args, **kwargs):
+            arrive()
+            if not all_in.wait(5):
+                raise TimeoutError("fetches ran one at a time")
+            return []
+
+        async def async_fetch(*args, **kwargs):
+            arrive()
+            for _ in range(500):
+                if all_in.is_set():
+                    return []
+                await asyncio.sleep(0.01)
+            raise TimeoutError("fetches ran one at a time")
+
+        strava, garmin, withings, notion = _quiet_clients()
+        strava.get_activities.side_effect = async_fetch
+        garmin.get_workouts.side_effect = blocking_fetch
+        withings.get_measurements.side_effect = blocking_fetch
+        notion.fetch_all_entries.side_effect = async_fetch
+        with _patched_clients(strava, garmin, withings, notion):
+            result = await sync_all(history_db)
+
+        assert result["sources_failed"] == 0
+        assert result["sources_synced"] == len(SYNC_SOURCES)
+        assert set(result["wall_time_s"]) == set(SYNC_SOURCES)
+        assert all(isinstance(t, float) for t in result["wall_time_s"].values())
+        assert result["total_wall_time_s"] >= max(result["wall_time_s"].values())
+
+    @pytest.mark.asyncio()
+    async def test_source_timeout_is_isolated(self, history_db):
+        release = threading.Event()
+        finished = threading.Event()
+
+        def stuck_measurements(startdate, enddate):
+            release.wait(5)
+            finished.set()
+            return [{"date": date.today().isoformat(), "weight_kg": 80.0}]
+
+        strava, garmin, withings, notion = _quiet_clients()
+        withings.get_measurements.side_effect = stuck_measurements
+        with _patched_clients(strava, garmin, withings, notion):
+            result = await sync_all(history_db, timeouts={"withings": 0.1})
+
+        # sync_all returned while the Withings call was still blocked.
+        assert not finished.is_set()
+        assert result["errors"] == {"withings": "timed out after 0.1s"}
+        assert result["sources_synced"] == 4
+        status = {s["source"]: s for s in history_db.get_sync_status()}
+        assert status["withings"]["status"] == "error"
+
+        # The abandoned fetch completes in the background but never reaches the write stage.
+        release.set()
+        assert finished.wait(5)
+        await asyncio.sleep(0.05)
+        assert history_db.get_body_measurements() == []
+
+    @pytest.mark.asyncio()
+    async def test_writes_apply_in_source_order(self, history_db):
+        """Strava lands before the workout matcher runs, even when its fetch finishes last."""
+        run = {**sample_strava_activities()[0], "start_date_local": "2026-03-10T08:00:00"}
+        workout = {
+            "workoutId": 7,
+            "workoutName": "Easy",
+            "sportType": {"sportTypeKey": "running"},
+            "createdDate": "2026-03-10T07:00:00.0",
+        }
+
+        async def slow_activities(**kwargs):
+            await asyncio.sleep(0.3)
+            return [run]
+
+        strava, garmin, withings, notion = _quiet_clients(workouts=[workout])
+        strava.get_activities.side_effect = slow_activities
+        with _patched_clients(strava, garmin, withings, notion):
+            result = await sync_all(history_db)
+
+        assert result["sources_failed"] == 0
+        with history_db._read() as conn:
+            sources = [r["source"] for r in conn.execute("SELECT source FROM sync_log ORDER BY id")]
+            matched = conn.execute("SELECT strava_activity_id FROM scheduled_workouts").fetchone()
+        assert sources == list(SYNC_SOURCES)
+        assert matched["strava_activity_id"] == str(run["id"])
+
+    @pytest.mark.asyncio()
+    async def test_wellness_days_stream_to_writer(self, history_db):
+        """Completed days are written while a slow day is still being fetched."""
+        today = date.today().isoformat()
+        release = threading.Event()
+
+        def body_battery(d):
+            if d == today:
+                release.wait(5)
+            return [{"batteryLevel": 70}]
+
+        strava, garmin, withings, notion = _quiet_clients()
+        garmin.get_body_battery.side_effect = body_battery
+        with _patched_clients(strava, garmin, withings, notion):
+            sync = asyncio.ensure_future(sync_all(history_db))
+            written = 0
+            for _ in range(200):
+                with history_db._read() as conn:
+                    written = conn.execute("SELECT COUNT(*) FROM wellness_snapshots").fetchone()[0]
+                if written == 14:
+                    break
+                await asyncio.sleep(0.01)
+            assert not sync.done()
+            release.set()
+            result = await sync
+
+        assert written == 14
+        assert result["results"]["garmin_wellness"]["records_synced"] == 15
+        with history_db._read() as conn:
+            assert conn.execute("SELECT COUNT(*) FROM wellness_snapshots").fetchone()[0] == 15
+
+    @pytest.mark.asyncio()
+    async def test_wellness_timeout_stops_streaming(self, history_db):
+        """A timed-out wellness fetch can't write its late days while other sources are still syncing."""
+        today = date.today().isoformat()
+        release_today = threading.Event()
+        release_withings = threading.Event()
+
+        def body_battery(d):
+            if d == today:
+                release_today.wait(5)
+            return [{"batteryLevel": 70}]
+
+        def measurements(startdate, enddate):
+            release_withings.wait(5)
+            return []
+
+        strava, garmin, withings, notion = _quiet_clients()
+        garmin.get_body_battery.side_effect = body_battery
+        withings.get_measurements.side_effect = measurements
+        with _patched_clients(strava, garmin, withings, notion):
+            sync = asyncio.ensure_future(sync_all(history_db, timeouts={"garmin_wellness": 0.5}))
+            for _ in range(500):
+                status = {s["source"]: s["status"] for s in history_db.get_sync_status()}
+                if status.get("garmin_wellness") == "error":
+                    break
+                await asyncio.sleep(0.01)
+            release_today.set()
+            for _ in range(500):
+                if not any(t.name.startswith("garmin-wellness") for t in threading.enumerate()):
+                    break
+                await asyncio.sleep(0.01)
+            with history_db._read() as conn:
+                dates = [r[0] for r in conn.execute("SELECT date FROM wellness_snapshots")]
+            assert not sync.done()
+            release_withings.set()
+            result = await sync
+
+        assert "garmin_wellness" in result["errors"]
+        # Days that finished in time may be kept, but the late day is never written.
+        assert today not in dates
+        assert len(dates) <= 14
+
+    @pytest.mark.asyncio()
+    async def test_syncs_only_requested_sources(self, history_db):
+        strava, garmin, withings, notion = _quiet_clients()
+        with _patched_clients(strava, garmin, withings, notion):
+            result = await sync_all(history_db, sources=["notion", "strava"])
+
+        assert list(result["results"]) == ["strava", "notion"]
+        garmin.get_workouts.assert_not_called()
+        withings.get_measurements.assert_not_called()
+
+    @pytest.mark.asyncio()
+    async def test_unknown_source_is_rejected(self, history_db):
+        with pytest.raises(ValueError, match="strava_typo"):
+            await sync_all(history_db, sources=["strava_typo"])
+
+    @pytest.mark.asyncio()
+    async def test_concurrent_call_joins_in_flight_sync(self, history_db):
+        started = asyncio.Event()
+        release = asyncio.Event()
+
+        async def slow_activities(*args, **kwargs):
+            started.set()
+            await release.wait()
+            return []
+
+        strava, garmin, withings, notion = _quiet_clients()
+        strava.get_activities.side_effect = slow_activities
+        with _patched_clients(strava, garmin, withings, notion), patch("pace_ai.tools.sync.SYNC_JOIN_POLL", 0.01):
+            first = asyncio.ensure_future(sync_all(history_db))
+            await asyncio.wait_for(started.wait(), 10)
+            second = asyncio.ensure_future(sync_all(history_db, sources=["strava"]))
+            await asyncio.sleep(0.05)
+            release.set()
+            leader, follower = await asyncio.gather(first, second)
+
+        assert strava.get_activities.await_count == 1
+        assert "joined" not in leader
+        assert follower["joined"]
+        assert follower["results"] == leader["results"]
+        assert history_db.get_sync_lease(SYNC_LEASE) is None
+
+    @pytest.mark.asyncio()
+    async def test_expired_lease_is_taken_over(self, history_db):
+        history_db.acquire_sync_lease(SYNC_LEASE, "dead-run", "elsewhere:1", SYNC_SOURCES, ttl=-1)
+        strava, garmin, withings, notion = _quiet_clients()
+        with _patched_clients(strava, garmin, withings, notion):
+            result = await sync_all(history_db)
+
+        assert "joined" not in result
+        assert result["sources_synced"] == len(SYNC_SOURCES)
+
+    @pytest.mark.asyncio()
+    async def test_follower_runs_itself_when_leader_syncs_other_sources(self, history_db):
+        history_db.acquire_sync_lease(SYNC_LEASE, "notion-run", "elsewhere:1", ["notion"], ttl=60)
+        history_db.release_sync_lease(SYNC_LEASE, "notion-run", {"results": {"notion": {}}})
+        history_db.acquire_sync_lease(SYNC_LEASE, "notion-run-2", "elsewhere:1", ["notion"], ttl=60)
+        strava, garmin, withings, notion = _quiet_clients()
+        with _patched_clients(strava, garmin, withings, notion), patch("pace_ai.tools.sync.SYNC_JOIN_POLL", 0.01):
+            follower = asyncio.ensure_future(sync_all(history_db, sources=["strava"]))
+            await asyncio.sleep(0.05)
+            assert not follower.done()
+            history_db.release_sync_lease(SYNC_LEASE, "notion-run-2", {"results": {"notion": {}}})
+            result = await asyncio.wait_for(follower, 10)
+
+        assert "joined" not in result
+        assert list(result["results"]) == ["strava"]
+        strava.get_activities.assert_awaited()
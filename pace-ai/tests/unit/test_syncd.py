@@ -0,0 +1,139 @@
+"""Unit tests for the background sync scheduler."""
+
+from __future__ import annotations
+
+import asyncio
+import random
+from datetime import datetime, timedelta
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from pace_ai.syncd import BACKOFF_BASE, BACKOFF_MAX, Cadence, SyncScheduler
+from pace_ai.tools.sync import SYNC_SOURCES
+
+# One cadence per source, no jitter, so schedules are exact.
+_FLAT = {source: Cadence(every=600, jitter=0) for source in SYNC_SOURCES}
+
+
+class _Clock:
+    def __init__(self, now: datetime) -> None:
+        self.now = now
+
+    def __call__(self) -> datetime:
+        return self.now
+
+    def advance(self, seconds: float) -> None:
+        self.now += timedelta(seconds=seconds)
+
+
+def _summary(sources: list[str], errors: dict[str, str] | None = None) -> dict:
+    errors = errors or {}
+    return {
+        "results": {s: {"source": s} for s in sources if s not in errors},
+        **({"errors": errors} if errors else {}),
+    }
+
+
+def _scheduler(history_db, clock: _Clock, **cadences: Cadence) -> SyncScheduler:
+    return SyncScheduler(history_db, cadences={**_FLAT, **cadences}, clock=clock, rng=random.Random(1))
+
+
+class TestSchedule:
+    def test_everything_is_due_at_start(self, history_db):
+        scheduler = _scheduler(history_db, _Clock(datetime(2026, 3, 12, 9, 0)))
+        assert scheduler.due() == list(SYNC_SOURCES)
+
+    def test_each_source_keeps_its_own_cadence(self, history_db):
+        clock = _Clock(datetime(2026, 3, 12, 9, 0))
+        scheduler = _scheduler(history_db, clock, notion=Cadence(every=900, jitter=0))
+        for source in SYNC_SOURCES:
+            scheduler.record(source, None)
+
+        clock.advance(600)
+        assert "notion" not in scheduler.due()
+        assert "strava" in scheduler.due()
+        clock.advance(300)
+        assert "notion" in scheduler.due()
+
+    def test_jitter_spreads_runs(self, history_db):
+        clock = _Clock(datetime(2026, 3, 12, 9, 0))
+        scheduler = _scheduler(history_db, clock, strava=Cadence(every=1000, jitter=0.1))
+        runs = {scheduler.record("strava", None) for _ in range(20)}
+
+        assert len(runs) > 1
+        for run in runs:
+            assert 900 <= (run - clock.now).total_seconds() <= 1100
+
+    def test_runs_outside_active_hours_move_to_next_window(self, history_db):
+        clock = _Clock(datetime(2026, 3, 12, 11, 30))
+        scheduler = _scheduler(history_db, clock, garmin_wellness=Cadence(every=3600, jitter=0, hours=(5, 12)))
+        assert "garmin_wellness" in scheduler.due()
+
+        assert scheduler.record("garmin_wellness", None) == datetime(2026, 3, 13, 5, 0)
+
+    def test_start_outside_active_hours_waits_for_window(self, history_db):
+        clock = _Clock(datetime(2026, 3, 12, 2, 0))
+        scheduler = _scheduler(history_db, clock, garmin_wellness=Cadence(every=3600, jitter=0, hours=(5, 12)))
+
+        assert "garmin_wellness" not in scheduler.due()
+        assert scheduler.state["garmin_wellness"].next_run == datetime(2026, 3, 12, 5, 0)
+
+    def test_failures_back_off_exponentially_then_reset(self, history_db):
+        clock = _Clock(datetime(2026, 3, 12, 9, 0))
+        scheduler = _scheduler(history_db, clock)
+
+        delays = [(scheduler.record("withings", "boom") - clock.now).total_seconds() for _ in range(3)]
+        assert delays == [BACKOFF_BASE, BACKOFF_BASE * 2, BACKOFF_BASE * 4]
+        assert scheduler.state["withings"].failures == 3
+
+        for _ in range(20):
+            scheduler.record("withings", "boom")
+        assert (scheduler.state["withings"].next_run - clock.now).total_seconds() == BACKOFF_MAX
+
+        scheduler.record("withings", None)
+        assert scheduler.state["withings"].failures == 0
+        assert (scheduler.state["withings"].next_run - clock.now).total_seconds() == 600
+
+
+class TestRunOnce:
+    @pytest.mark.asyncio()
+    async def test_syncs_only_due_sources(self, history_db):
+        clock = _Clock(datetime(2026, 3, 12, 9, 0))
+        scheduler = _scheduler(history_db, clock, notion=Cadence(every=60, jitter=0))
+        mock_sync = AsyncMock(side_effect=lambda db, timeouts, sources: _summary(sources))
+        with patch("pace_ai.syncd.sync_all", mock_sync):
+            await scheduler.run_once()
+            clock.advance(60)
+            await scheduler.run_once()
+            assert await scheduler.run_once() is None
+
+        assert mock_sync.await_args_list[0].kwargs["sources"] == list(SYNC_SOURCES)
+        assert mock_sync.await_args_list[1].kwargs["sources"] == ["notion"]
+        assert mock_sync.await_count == 2
+
+    @pytest.mark.asyncio()
+    async def test_failing_source_backs_off_alone(self, history_db):
+        clock = _Clock(datetime(2026, 3, 12, 9, 0))
+        scheduler = _scheduler(history_db, clock)
+        mock_sync = AsyncMock(side_effect=lambda db, timeouts, sources: _summary(sources, {"strava": "401"}))
+        with patch("pace_ai.syncd.sync_all", mock_sync):
+            await scheduler.run_once()
+
+        assert scheduler.state["strava"].failures == 1
+        assert scheduler.state["strava"].last_error == "401"
+        clock.advance(BACKOFF_BASE)
+        assert scheduler.due() == ["strava"]
+
+    @pytest.mark.asyncio()
+    async def test_run_forever_stops_on_event(self, history_db):
+        scheduler = _scheduler(history_db, _Clock(datetime(2026, 3, 12, 9, 0)))
+        stop = asyncio.Event()
+
+        async def fake_sync(db, timeouts, sources):
+            stop.set()
+            return _summary(sources)
+
+        with patch("pace_ai.syncd.sync_all", AsyncMock(side_effect=fake_sync)):
+            await asyncio.wait_for(scheduler.run_forever(stop), 5)
+        assert scheduler.due() == []
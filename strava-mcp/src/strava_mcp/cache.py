@@ -1,28 +1,92 @@
-"""SQLite-based activity cache to respect Strava rate limits."""
+"""Two-tier activity cache to respect Strava rate limits.
+
+A bounded in-process LRU sits in front of an SQLite table. How long an entry lives
+depends on its key class (``TTL_POLICIES``). Details and streams of a finished
+activity never change, so they are kept until evicted. Lists that grow with new
+activities expire within minutes. Both tiers are size-bounded, and the oldest
+entries are evicted first.
+
+``get`` treats an expired entry as a miss. ``get_entry`` still returns it, with
+its timestamps, so a caller can serve it stale while it refreshes.
+"""
 
 from __future__ import annotations
 
 import json
 import sqlite3
+import threading
 import time
+from collections import OrderedDict
 from typing import Any
 
+# Key prefix -> seconds an entry stays fresh (None: never expires). First match wins;
+# keys matching no prefix use the cache's default TTL.
+TTL_POLICIES: tuple[tuple[str, float | None], ...] = (
+    ("activity_", None),
+    ("streams_", None),
+    ("athlete_zones", 24 * 3600),
+    ("recent_activities_", 10 * 60),
+    ("weekly_summary_", 15 * 60),
+)
+
 
 class ActivityCache:
-    """Cache Strava activity data in SQLite."""
+    """Cache Strava activity data in memory and SQLite.
+
+    Values returned from the memory tier are shared between callers, so treat
+    them as read-only.
+    """
 
     DEFAULT_TTL = 3600  # 1 hour
+    MEMORY_ENTRIES = 256
+    MEMORY_BYTES = 16 * 1024 * 1024
+    DISK_BYTES = 256 * 1024 * 1024
 
-    def __init__(self, db_path: str, ttl: int = DEFAULT_TTL) -> None:
+    def __init__(
+        self,
+        db_path: str,
+        ttl: int = DEFAULT_TTL,
+        policies: tuple[tuple[str, float | None], ...] = TTL_POLICIES,
+        memory_entries: int = MEMORY_ENTRIES,
+        memory_bytes: int = MEMORY_BYTES,
+        disk_bytes: int = DISK_BYTES,
+    ) -> None:
         self._db_path = db_path
         self._ttl = ttl
+        self._policies = policies
+        self._memory_entries = memory_entries
+        self._memory_bytes = memory_bytes
+        self._disk_bytes = disk_bytes
+        # key -> (value, expires_at, size, cached_at); most recently used last
+        self._memory: OrderedDict[str, tuple[Any, float | None, int, float]] = OrderedDict()
+        self._memory_size = 0
+        self._disk_size = 0
+        self._lock = threading.RLock()
+        self._conn: sqlite3.Connection | None = None
+        self._counters = dict.fromkeys(
+            (
+                "memory_hits",
+                "disk_hits",
+                "stale_hits",
+                "misses",
+                "expired",
+                "sets",
+                "memory_evictions",
+                "disk_evictions",
+            ),
+            0,
+        )
         self._ensure_table()
 
     def _connect(self) -> sqlite3.Connection:
-        return sqlite3.connect(self._db_path)
+        """Return the cache's long-lived connection, opening it on first use."""
+        if self._conn is None:
+            self._conn = sqlite3.connect(self._db_path, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+        return self._conn
 
     def _ensure_table(self) -> None:
-        with self._connect() as conn:
+        with self._lock, self._connect() as conn:
             conn.execute("""
                 CREATE TABLE IF NOT EXISTS activity_cache (
                     cache_key TEXT PRIMARY KEY,
@@ -30,41 +94,184 @@ class ActivityCache:
                     cached_at REAL NOT NULL
                 )
             """)
+            columns = {row[1] for row in conn.execute("PRAGMA table_info(activity_cache)")}
+            if "expires_at" not in columns:
+                # Rows from before per-class TTLs keep the old global TTL.
+                conn.execute("ALTER TABLE activity_cache ADD COLUMN expires_at REAL")
+                conn.execute("ALTER TABLE activity_cache ADD COLUMN size INTEGER NOT NULL DEFAULT 0")
+                conn.execute("UPDATE activity_cache SET expires_at = cached_at + ?, size = LENGTH(data)", (self._ttl,))
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_activity_cache_cached_at ON activity_cache(cached_at)")
+            self._disk_size = conn.execute("SELECT COALESCE(SUM(size), 0) FROM activity_cache").fetchone()[0]
+
+    def ttl_for(self, key: str) -> float | None:
+        """Seconds an entry under ``key`` stays fresh, or None if it never expires."""
+        for prefix, ttl in self._policies:
+            if key.startswith(prefix):
+                return ttl
+        return self._ttl
+
+    # ── Memory tier ──────────────────────────────────────────────────
+
+    def _remember(self, key: str, value: Any, expires_at: float | None, size: int, cached_at: float) -> None:
+        self._forget(key)
+        if size > self._memory_bytes:
+            return
+        self._memory[key] = (value, expires_at, size, cached_at)
+        self._memory_size += size
+        while len(self._memory) > self._memory_entries or self._memory_size > self._memory_bytes:
+            _, (_, _, evicted, _) = self._memory.popitem(last=False)
+            self._memory_size -= evicted
+            self._counters["memory_evictions"] += 1
+
+    def _forget(self, key: str) -> None:
+        entry = self._memory.pop(key, None)
+        if entry is not None:
+            self._memory_size -= entry[2]
+
+    # ── Public API ───────────────────────────────────────────────────
 
     def get(self, key: str) -> Any | None:
-        with self._connect() as conn:
-            row = conn.execute(
-                "SELECT data, cached_at FROM activity_cache WHERE cache_key = ?",
-                (key,),
-            ).fetchone()
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                value, expires_at, _, _ = entry
+                if expires_at is None or now <= expires_at:
+                    self._memory.move_to_end(key)
+                    self._counters["memory_hits"] += 1
+                    return value
+                self._counters["expired"] += 1
+                self.delete(key)
+                return None
 
-        if row is None:
-            return None
+            row = (
+                self._connect()
+                .execute("SELECT data, expires_at, size, cached_at FROM activity_cache WHERE cache_key = ?", (key,))
+                .fetchone()
+            )
+            if row is None:
+                self._counters["misses"] += 1
+                return None
+            data, expires_at, size, cached_at = row
+            if expires_at is not None and now > expires_at:
+                self._counters["expired"] += 1
+                self.delete(key)
+                return None
+
+            value = json.loads(data)
+            self._remember(key, value, expires_at, size, cached_at)
+            self._counters["disk_hits"] += 1
+            return value
 
-        cached_at = row[1]
-        if time.time() - cached_at > self._ttl:
-            self.delete(key)
-            return None
+    def get_entry(self, key: str) -> tuple[Any, float, float | None] | None:
+        """Return ``(value, cached_at, expires_at)`` for ``key``, even if it has expired.
 
-        return json.loads(row[0])
+        Unlike ``get``, an expired entry is left in place, so it can be served stale
+        until it is refreshed or evicted.
+        """
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                value, expires_at, _, cached_at = entry
+                self._memory.move_to_end(key)
+            else:
+                row = (
+                    self._connect()
+                    .execute("SELECT data, expires_at, size, cached_at FROM activity_cache WHERE cache_key = ?", (key,))
+                    .fetchone()
+                )
+                if row is None:
+                    self._counters["misses"] += 1
+                    return None
+                data, expires_at, size, cached_at = row
+                value = json.loads(data)
+                self._remember(key, value, expires_at, size, cached_at)
+            if expires_at is not None and now > expires_at:
+                self._counters["stale_hits"] += 1
+            else:
+                self._counters["memory_hits" if entry is not None else "disk_hits"] += 1
+            return value, cached_at, expires_at
 
     def set(self, key: str, data: Any) -> None:
+        now = time.time()
+        ttl = self.ttl_for(key)
+        expires_at = None if ttl is None else now + ttl
+        payload = json.dumps(data)
+        size = len(payload)
+        with self._lock:
+            with self._connect() as conn:
+                old = conn.execute("SELECT size FROM activity_cache WHERE cache_key = ?", (key,)).fetchone()
+                conn.execute(
+                    """INSERT OR REPLACE INTO activity_cache (cache_key, data, cached_at, expires_at, size)
+                       VALUES (?, ?, ?, ?, ?)""",
+                    (key, payload, now, expires_at, size),
+                )
+            self._disk_size += size - (old[0] if old else 0)
+            self._remember(key, data, expires_at, size, now)
+            self._counters["sets"] += 1
+            if self._disk_size > self._disk_bytes:
+                self._evict_disk(now)
+
+    def _evict_disk(self, now: float) -> None:
+        """Drop expired rows, then the oldest rows, until the table is back under ``disk_bytes``."""
         with self._connect() as conn:
-            conn.execute(
-                "INSERT OR REPLACE INTO activity_cache (cache_key, data, cached_at) VALUES (?, ?, ?)",
-                (key, json.dumps(data), time.time()),
-            )
+            self._counters["disk_evictions"] += conn.execute(
+                "DELETE FROM activity_cache WHERE expires_at < ?", (now,)
+            ).rowcount
+            self._disk_size = conn.execute("SELECT COALESCE(SUM(size), 0) FROM activity_cache").fetchone()[0]
+            if self._disk_size <= self._disk_bytes:
+                return
+            # Trim to 90% of the bound so the next few sets don't each trigger a pass.
+            excess = self._disk_size - int(self._disk_bytes * 0.9)
+            victims, freed = [], 0
+            for key, size in conn.execute("SELECT cache_key, size FROM activity_cache ORDER BY cached_at"):
+                if freed >= excess:
+                    break
+                victims.append((key,))
+                freed += size
+            conn.executemany("DELETE FROM activity_cache WHERE cache_key = ?", victims)
+        for (key,) in victims:
+            self._forget(key)
+        self._disk_size -= freed
+        self._counters["disk_evictions"] += len(victims)
 
     def delete(self, key: str) -> None:
-        with self._connect() as conn:
-            conn.execute("DELETE FROM activity_cache WHERE cache_key = ?", (key,))
+        with self._lock:
+            self._forget(key)
+            with self._connect() as conn:
+                row = conn.execute("SELECT size FROM activity_cache WHERE cache_key = ?", (key,)).fetchone()
+                conn.execute("DELETE FROM activity_cache WHERE cache_key = ?", (key,))
+            if row:
+                self._disk_size -= row[0]
 
     def clear(self) -> None:
-        with self._connect() as conn:
-            conn.execute("DELETE FROM activity_cache")
+        with self._lock:
+            self._memory.clear()
+            self._memory_size = 0
+            with self._connect() as conn:
+                conn.execute("DELETE FROM activity_cache")
+            self._disk_size = 0
 
     def clear_expired(self) -> int:
-        cutoff = time.time() - self._ttl
-        with self._connect() as conn:
-            cursor = conn.execute("DELETE FROM activity_cache WHERE cached_at < ?", (cutoff,))
+        now = time.time()
+        with self._lock:
+            stale = [key for key, (_, expires_at, _, _) in self._memory.items() if expires_at and expires_at < now]
+            for key in stale:
+                self._forget(key)
+            with self._connect() as conn:
+                cursor = conn.execute("DELETE FROM activity_cache WHERE expires_at < ?", (now,))
+                self._disk_size = conn.execute("SELECT COALESCE(SUM(size), 0) FROM activity_cache").fetchone()[0]
             return cursor.rowcount
+
+    def stats(self) -> dict[str, Any]:
+        """Hit/miss/eviction counters and current size of each tier."""
+        with self._lock:
+            hits = self._counters["memory_hits"] + self._counters["disk_hits"]
+            lookups = hits + self._counters["stale_hits"] + self._counters["misses"] + self._counters["expired"]
+            return {
+                **self._counters,
+                "hit_ratio": round(hits / lookups, 3) if lookups else None,
+                "memory": {"entries": len(self._memory), "bytes": self._memory_size, "max_bytes": self._memory_bytes},
+                "disk": {"bytes": self._disk_size, "max_bytes": self._disk_bytes},
+            }
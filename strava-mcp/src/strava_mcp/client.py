@@ -4,12 +4,15 @@ from __future__ import annotations
 
 import asyncio
 import logging
+import math
 import time
 from typing import TYPE_CHECKING, Any
 
 import httpx
 
 from strava_mcp.auth import TokenStore, refresh_access_token
+from strava_mcp.governor import LANE_MAX_WAIT, RateLimitGovernor
+from strava_mcp.transport import SingleFlight, ValidatorStore, build_http_client, validator_key
 
 if TYPE_CHECKING:
     from strava_mcp.config import Settings
@@ -71,22 +74,46 @@ class RateLimitInfo:
 
 
 class StravaClient:
-    """Async Strava API client with token management."""
+    """Async Strava API client with token management.
 
-    def __init__(self, settings: Settings, token_store: TokenStore) -> None:
+    Every request first takes a token from the shared ``RateLimitGovernor`` in this
+    client's ``lane``: ``"interactive"`` for tool calls, ``"background"`` for bulk
+    work such as sync enrichment. Endpoints whose responses rarely change (athlete,
+    stats, zones, gear) are revalidated with the ``ValidatorStore`` instead of being
+    downloaded again. Identical GETs that overlap, e.g. from parallel tool calls, are
+    sent once.
+    """
+
+    def __init__(
+        self,
+        settings: Settings,
+        token_store: TokenStore,
+        governor: RateLimitGovernor | None = None,
+        lane: str = "interactive",
+        validators: ValidatorStore | None = None,
+        base_url: str = STRAVA_API_BASE,
+    ) -> None:
         self._settings = settings
         self._token_store = token_store
+        self._base_url = base_url
         self._http: httpx.AsyncClient | None = None
         self.rate_limits = RateLimitInfo()
+        self._owns_governor = governor is None
+        self.governor = governor or RateLimitGovernor(settings.db_path)
+        self.validators = validators or ValidatorStore(settings.db_path)
+        self.flights = SingleFlight()
+        self.lane = lane
 
     async def _get_http(self) -> httpx.AsyncClient:
         if self._http is None or self._http.is_closed:
-            self._http = httpx.AsyncClient(base_url=STRAVA_API_BASE, timeout=30.0)
+            self._http = build_http_client(self._base_url, http2=self._settings.http2)
         return self._http
 
     async def close(self) -> None:
         if self._http and not self._http.is_closed:
             await self._http.aclose()
+        if self._owns_governor:
+            self.governor.close()
 
     async def _get_access_token(self) -> str:
         """Get a valid access token, refreshing if expired."""
@@ -117,22 +144,55 @@ class StravaClient:
         msg = "No access token available. Run the authenticate tool first."
         raise RuntimeError(msg)
 
-    async def _request(self, method: str, path: str, **kwargs: Any) -> Any:
-        """Make an authenticated API request with retry on transient failures."""
+    async def _take_rate_token(self) -> None:
+        """Wait until the governor grants this client's lane a request, up to ``LANE_MAX_WAIT``."""
+        waited = 0.0
+        while True:
+            wait = await asyncio.to_thread(self.governor.try_acquire, self.lane)
+            if wait <= 0:
+                return
+            if waited + wait > LANE_MAX_WAIT[self.lane]:
+                raise StravaAPIError(
+                    code="rate_limited",
+                    message=f"Strava API rate limit budget for {self.lane} requests is used up.",
+                    action=(f"Wait {math.ceil(wait / 60)} minute(s) or check strava://rate-limits for current usage."),
+                    status_code=429,
+                )
+            logger.info("Strava %s budget used up. Waiting %.0fs for the window to roll over.", self.lane, wait)
+            await asyncio.sleep(wait)
+            waited += wait
+
+    async def _request(self, method: str, path: str, *, revalidate: bool = False, **kwargs: Any) -> Any:
+        """Make an API request, sharing one upstream call between identical concurrent GETs."""
+        if method != "GET":
+            return await self._send(method, path, revalidate=revalidate, **kwargs)
+        key = validator_key(method, path, kwargs.get("params"))
+        return await self.flights.do(key, lambda: self._send(method, path, revalidate=revalidate, **kwargs))
+
+    async def _send(self, method: str, path: str, *, revalidate: bool = False, **kwargs: Any) -> Any:
+        """Make an authenticated API request with retry on transient failures.
+
+        Rate limits are handled by the governor: a 429 marks the budget as spent,
+        and the retry waits for the window to roll over (or fails, for lanes that
+        can't wait that long).
+
+        With ``revalidate``, a stored response for the same request is revalidated
+        and a 304 is answered from the store.
+        """
         max_retries = 3
         base_delay = 1.0
+        key = validator_key(method, path, kwargs.get("params")) if revalidate else None
 
         for attempt in range(max_retries + 1):
+            await self._take_rate_token()
             token = await self._get_access_token()
             http = await self._get_http()
+            headers = {"Authorization": f"Bearer {token}"}
+            if key is not None:
+                headers.update(self.validators.conditional_headers(key))
 
             try:
-                resp = await http.request(
-                    method,
-                    path,
-                    headers={"Authorization": f"Bearer {token}"},
-                    **kwargs,
-                )
+                resp = await http.request(method, path, headers=headers, **kwargs)
             except (httpx.ConnectError, httpx.ReadTimeout, httpx.WriteTimeout) as e:
                 if attempt < max_retries:
                     delay = base_delay * (2**attempt)
@@ -153,17 +213,12 @@ class StravaClient:
                 ) from e
 
             self.rate_limits.update_from_headers(resp.headers)
+            await asyncio.to_thread(self.governor.observe, resp.headers)
 
             if resp.status_code == 429:
                 if attempt < max_retries:
-                    delay = base_delay * (2**attempt)
-                    logger.warning(
-                        "Rate limited (attempt %d/%d). Retrying in %.1fs.",
-                        attempt + 1,
-                        max_retries + 1,
-                        delay,
-                    )
-                    await asyncio.sleep(delay)
+                    logger.warning("Rate limited (attempt %d/%d).", attempt + 1, max_retries + 1)
+                    await asyncio.to_thread(self.governor.exhaust)
                     continue
                 raise StravaAPIError(
                     code="rate_limited",
@@ -224,20 +279,31 @@ class StravaClient:
                     status_code=resp.status_code,
                 )
 
-            return resp.json()
+            if resp.status_code == 304 and key is not None:
+                body = self.validators.not_modified(key)
+                if body is not None:
+                    return body
+                logger.warning("Got 304 for %s %s with nothing stored. Retrying unconditionally.", method, path)
+                key = None
+                continue
+
+            body = resp.json()
+            if key is not None:
+                self.validators.store(key, resp, body)
+            return body
 
         # Should not reach here, but safety fallback
         msg = "Request failed after all retry attempts."
         raise RuntimeError(msg)
 
     async def get_athlete(self) -> dict[str, Any]:
-        return await self._request("GET", "/athlete")
+        return await self._request("GET", "/athlete", revalidate=True)
 
     async def get_athlete_stats(self, athlete_id: int) -> dict[str, Any]:
-        return await self._request("GET", f"/athletes/{athlete_id}/stats")
+        return await self._request("GET", f"/athletes/{athlete_id}/stats", revalidate=True)
 
     async def get_athlete_zones(self) -> dict[str, Any]:
-        return await self._request("GET", "/athlete/zones")
+        return await self._request("GET", "/athlete/zones", revalidate=True)
 
     async def get_activities(
         self,
@@ -282,7 +348,7 @@ class StravaClient:
         return all_activities
 
     async def get_gear(self, gear_id: str) -> dict[str, Any]:
-        return await self._request("GET", f"/gear/{gear_id}")
+        return await self._request("GET", f"/gear/{gear_id}", revalidate=True)
 
     async def get_activity_streams(self, activity_id: int, stream_types: list[str]) -> dict[str, Any]:
         keys = ",".join(stream_types)
@@ -3,7 +3,7 @@
 from __future__ import annotations
 
 import os
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from pathlib import Path
 
 from dotenv import load_dotenv
@@ -28,6 +28,21 @@ def _parse_port(value: str) -> int:
         raise ValueError(msg) from None
 
 
+def _parse_max_staleness(value: str) -> dict[str, float]:
+    """Parse ``"tool=seconds,tool=seconds"`` into per-tool maximum staleness."""
+    result: dict[str, float] = {}
+    for item in filter(None, (part.strip() for part in value.split(","))):
+        tool, sep, seconds = item.partition("=")
+        try:
+            if not sep:
+                raise ValueError
+            result[tool.strip()] = float(seconds)
+        except ValueError:
+            msg = f"STRAVA_MCP_MAX_STALENESS entries must look like tool=seconds, got: {item!r}"
+            raise ValueError(msg) from None
+    return result
+
+
 @dataclass(frozen=True)
 class Settings:
     client_id: str
@@ -37,6 +52,9 @@ class Settings:
     host: str = "127.0.0.1"
     port: int = 8001
     db_path: str = "strava_mcp.db"
+    http2: bool = False
+    # Per-tool overrides of the server's MAX_STALENESS defaults.
+    max_staleness: dict[str, float] = field(default_factory=dict)
 
     @classmethod
     def from_env(cls) -> Settings:
@@ -65,4 +83,6 @@ class Settings:
             host=os.environ.get("STRAVA_MCP_HOST", "127.0.0.1"),
             port=_parse_port(os.environ.get("STRAVA_MCP_PORT", "8001")),
             db_path=raw_db,
+            http2=os.environ.get("STRAVA_MCP_HTTP2", "").lower() in ("1", "true", "yes"),
+            max_staleness=_parse_max_staleness(os.environ.get("STRAVA_MCP_MAX_STALENESS", "")),
         )
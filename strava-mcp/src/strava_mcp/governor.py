@@ -0,0 +1,208 @@
+"""Proactive Strava rate-limit governor shared through SQLite.
+
+Strava meters reads in two fixed windows: 15 minutes (aligned to :00, :15, :30 and
+:45) and one UTC day. The governor keeps one token bucket per window in the
+``rate_limit_buckets`` table of the strava-mcp database. Every process that talks
+to Strava with the same database takes a token before each request: the MCP server
+and pace-ai's sync both do. Together they stay inside the budget instead of finding
+out from a 429. Buckets refill when their window rolls over, and each response's
+``X-ReadRateLimit-*``/``X-RateLimit-*`` headers re-seed them with Strava's own
+count. That count includes requests made by anything that isn't governed.
+
+Callers take tokens in a lane. ``background`` requests (sync enrichment, backfill)
+must leave ``LANE_RESERVE`` tokens in each bucket, so interactive tool calls can
+still get through when a background job has used up the rest.
+"""
+
+from __future__ import annotations
+
+import math
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterator
+
+    import httpx
+
+# Bucket name -> window length in seconds. Windows start at multiples of their length (UTC).
+WINDOWS: dict[str, int] = {"fifteen_min": 15 * 60, "daily": 24 * 60 * 60}
+# Strava's default read limits, used until a response reports the real ones.
+DEFAULT_CAPACITY: dict[str, int] = {"fifteen_min": 100, "daily": 1000}
+# Tokens per bucket that a lane may not touch; they are held back for higher-priority lanes.
+LANE_RESERVE: dict[str, dict[str, int]] = {
+    "interactive": {"fifteen_min": 0, "daily": 0},
+    "background": {"fifteen_min": 20, "daily": 100},
+}
+# Longest a lane waits for a token before the request fails as rate limited.
+LANE_MAX_WAIT: dict[str, float] = {"interactive": 30.0, "background": 15 * 60.0}
+# Seconds to wait on another process's bucket transaction. They run a few statements,
+# so anything longer means the database is wedged, not busy.
+BUSY_TIMEOUT = 2.0
+
+
+def _header_pair(headers: httpx.Headers, *names: str) -> tuple[int, int] | None:
+    """Parse the first present ``"<fifteen_min>,<daily>"`` header, ignoring malformed values."""
+    for name in names:
+        value = headers.get(name)
+        if not value:
+            continue
+        parts = value.split(",")
+        if len(parts) != 2:
+            return None
+        try:
+            return int(parts[0].strip()), int(parts[1].strip())
+        except ValueError:
+            return None
+    return None
+
+
+class RateLimitGovernor:
+    """Token buckets for Strava's 15-minute and daily read limits, shared across processes.
+
+    Each governor keeps one connection, guarded by a lock so any thread may use it.
+    Every method does blocking SQLite I/O: async callers run them in a worker thread.
+    """
+
+    def __init__(
+        self,
+        db_path: str,
+        reserves: dict[str, dict[str, int]] | None = None,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self._db_path = db_path
+        self._reserves = reserves or LANE_RESERVE
+        self._clock = clock
+        self._conn: sqlite3.Connection | None = None
+        self._lock = threading.Lock()
+        self._ensure_table()
+
+    def close(self) -> None:
+        """Close the connection; the next call reopens it."""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        """Run statements in one ``BEGIN IMMEDIATE`` transaction so concurrent processes serialise."""
+        with self._lock:
+            if self._conn is None:
+                self._conn = sqlite3.connect(
+                    self._db_path, isolation_level=None, timeout=BUSY_TIMEOUT, check_same_thread=False
+                )
+            conn = self._conn
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield conn
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            conn.execute("COMMIT")
+
+    def _ensure_table(self) -> None:
+        with self._transaction() as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS rate_limit_buckets (
+                    name TEXT PRIMARY KEY,
+                    window_start REAL NOT NULL,
+                    used INTEGER NOT NULL,
+                    capacity INTEGER NOT NULL
+                )
+            """)
+
+    def _load(self, conn: sqlite3.Connection, now: float) -> dict[str, list[Any]]:
+        """Read every bucket as ``[window_start, used, capacity]``, refilled if its window rolled over."""
+        stored = {
+            name: [start, used, capacity]
+            for name, start, used, capacity in conn.execute(
+                "SELECT name, window_start, used, capacity FROM rate_limit_buckets"
+            )
+        }
+        buckets = {}
+        for name, length in WINDOWS.items():
+            start = now - now % length
+            bucket = stored.get(name)
+            if bucket is None:
+                bucket = [start, 0, DEFAULT_CAPACITY[name]]
+            elif bucket[0] != start:
+                bucket = [start, 0, bucket[2]]
+            buckets[name] = bucket
+        return buckets
+
+    @staticmethod
+    def _save(conn: sqlite3.Connection, buckets: dict[str, list[Any]]) -> None:
+        conn.executemany(
+            "INSERT OR REPLACE INTO rate_limit_buckets (name, window_start, used, capacity) VALUES (?, ?, ?, ?)",
+            [(name, *bucket) for name, bucket in buckets.items()],
+        )
+
+    def try_acquire(self, lane: str = "interactive") -> float:
+        """Take one token from every bucket for ``lane``.
+
+        Returns 0 if the request may go ahead, otherwise the seconds until the
+        blocking window rolls over. Nothing is taken in that case.
+        """
+        reserve = self._reserves[lane]
+        now = self._clock()
+        with self._transaction() as conn:
+            buckets = self._load(conn, now)
+            waits = [
+                start + WINDOWS[name] - now
+                for name, (start, used, capacity) in buckets.items()
+                if used >= capacity - reserve[name]
+            ]
+            if not waits:
+                for bucket in buckets.values():
+                    bucket[1] += 1
+            self._save(conn, buckets)
+        return max(waits, default=0.0)
+
+    def observe(self, headers: httpx.Headers) -> None:
+        """Re-seed the buckets from a response's rate-limit headers.
+
+        Strava's usage count never goes down within a window, so the bucket keeps
+        whichever is higher: its own count, which includes requests still in
+        flight, or Strava's.
+        """
+        usage = _header_pair(headers, "X-ReadRateLimit-Usage", "X-RateLimit-Usage")
+        limit = _header_pair(headers, "X-ReadRateLimit-Limit", "X-RateLimit-Limit")
+        if usage is None and limit is None:
+            return
+        with self._transaction() as conn:
+            buckets = self._load(conn, self._clock())
+            for i, name in enumerate(WINDOWS):
+                if usage is not None:
+                    buckets[name][1] = max(buckets[name][1], usage[i])
+                if limit is not None:
+                    buckets[name][2] = limit[i]
+            self._save(conn, buckets)
+
+    def exhaust(self) -> None:
+        """Mark the 15-minute bucket empty after a 429 that the headers didn't explain."""
+        with self._transaction() as conn:
+            buckets = self._load(conn, self._clock())
+            bucket = buckets["fifteen_min"]
+            bucket[1] = max(bucket[1], bucket[2])
+            self._save(conn, buckets)
+
+    def snapshot(self) -> dict[str, Any]:
+        """Current usage, capacity and seconds until refill for each bucket, plus the lane reserves."""
+        now = self._clock()
+        with self._transaction() as conn:
+            buckets = self._load(conn, now)
+        return {
+            **{
+                name: {
+                    "used": used,
+                    "capacity": capacity,
+                    "resets_in_s": math.ceil(start + WINDOWS[name] - now),
+                }
+                for name, (start, used, capacity) in buckets.items()
+            },
+            "lane_reserve": self._reserves,
+        }
@@ -0,0 +1,445 @@
+"""Permanent local mirror of Strava activities, with indexes extracted at ingest.
+
+Activity summaries are kept in the ``activities`` table, indexed on date, type and
+distance. The mirror records the span of time it covers, so callers only fetch
+activities newer than the newest one mirrored, plus any older span a query reaches
+back into for the first time.
+
+A detailed activity is fetched once and stored zlib-compressed in ``activity_detail``.
+Its best efforts and segment efforts are written to the indexed ``best_efforts`` and
+``segment_efforts`` tables in the same transaction. Tools that scan many activities
+then query the indexes and only fetch details that have never been mirrored.
+"""
+
+from __future__ import annotations
+
+import json
+import sqlite3
+import threading
+import time
+import zlib
+from datetime import datetime
+from typing import Any
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS activity_detail (
+    activity_id INTEGER PRIMARY KEY,
+    name TEXT,
+    sport_type TEXT,
+    start_date TEXT,
+    fetched_at REAL NOT NULL,
+    payload BLOB NOT NULL
+);
+CREATE TABLE IF NOT EXISTS best_efforts (
+    activity_id INTEGER NOT NULL,
+    distance_name TEXT NOT NULL,
+    distance_m REAL,
+    elapsed_time INTEGER NOT NULL,
+    date TEXT NOT NULL,
+    PRIMARY KEY (activity_id, distance_name)
+);
+CREATE INDEX IF NOT EXISTS idx_best_efforts_distance_time ON best_efforts(distance_name, elapsed_time, date);
+CREATE INDEX IF NOT EXISTS idx_best_efforts_date ON best_efforts(date);
+"""
+
+_SEGMENT_SCHEMA = """
+CREATE TABLE IF NOT EXISTS segment_efforts (
+    activity_id INTEGER NOT NULL,
+    position INTEGER NOT NULL,
+    segment_id INTEGER NOT NULL,
+    segment_name TEXT,
+    distance_m REAL,
+    elapsed_time INTEGER NOT NULL,
+    date TEXT NOT NULL,
+    average_heartrate REAL,
+    PRIMARY KEY (activity_id, position)
+);
+CREATE INDEX IF NOT EXISTS idx_segment_efforts_segment_date ON segment_efforts(segment_id, date);
+CREATE INDEX IF NOT EXISTS idx_segment_efforts_date ON segment_efforts(date);
+"""
+
+_ACTIVITY_SCHEMA = """
+CREATE TABLE IF NOT EXISTS activities (
+    activity_id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL DEFAULT '',
+    type TEXT NOT NULL DEFAULT '' COLLATE NOCASE,
+    sport_type TEXT NOT NULL DEFAULT '' COLLATE NOCASE,
+    start_date TEXT NOT NULL,
+    start_ts INTEGER NOT NULL,
+    iso_week TEXT NOT NULL,
+    distance REAL NOT NULL DEFAULT 0,
+    moving_time INTEGER NOT NULL DEFAULT 0,
+    total_elevation_gain REAL NOT NULL DEFAULT 0,
+    average_speed REAL NOT NULL DEFAULT 0,
+    average_heartrate REAL
+);
+CREATE INDEX IF NOT EXISTS idx_activities_start ON activities(start_ts);
+CREATE INDEX IF NOT EXISTS idx_activities_type_start ON activities(type, start_ts);
+CREATE INDEX IF NOT EXISTS idx_activities_sport_type_start ON activities(sport_type, start_ts);
+CREATE INDEX IF NOT EXISTS idx_activities_distance ON activities(distance);
+CREATE TABLE IF NOT EXISTS activity_sync (
+    name TEXT PRIMARY KEY,
+    covered_from INTEGER NOT NULL,
+    synced_at REAL NOT NULL
+);
+"""
+
+_ACTIVITY_COLUMNS = (
+    "activity_id, name, type, sport_type, start_date, distance, moving_time, total_elevation_gain, "
+    "average_speed, average_heartrate"
+)
+
+# Sport types whose segment efforts count towards segment analysis.
+RUN_SPORT_TYPES = ("Run", "TrailRun", "VirtualRun")
+# Matches a run in the ``activities`` table; takes ``RUN_SPORT_TYPES`` as parameters.
+_IS_RUN = f"(type = 'Run' OR sport_type IN ({','.join('?' * len(RUN_SPORT_TYPES))}))"
+
+# Fastest effort per distance since a date. The (distance_name, elapsed_time) index
+# feeds the window in order, so each partition's first row is its best.
+_BEST_EFFORTS_SQL = """
+SELECT distance_name, distance_m, elapsed_time, activity_id, name, start_date FROM (
+    SELECT e.distance_name, e.distance_m, e.elapsed_time, e.activity_id, d.name, d.start_date,
+           ROW_NUMBER() OVER (PARTITION BY e.distance_name ORDER BY e.elapsed_time, e.date) AS rank
+    FROM best_efforts e JOIN activity_detail d ON d.activity_id = e.activity_id
+    WHERE e.date >= ?
+)
+WHERE rank = 1
+ORDER BY distance_m
+"""
+
+# Per-segment effort count, best/worst time and trend: the average time of the later
+# half of the efforts (by date) against the earlier half. A single effort is its own
+# trend baseline, so its trend is 0.
+_SEGMENT_STATS_SQL = f"""
+WITH ranked AS (
+    SELECT e.segment_id, e.segment_name, e.distance_m, e.elapsed_time,
+           ROW_NUMBER() OVER (PARTITION BY e.segment_id ORDER BY e.date, e.activity_id, e.position) AS n,
+           COUNT(*) OVER (PARTITION BY e.segment_id) AS total
+    FROM segment_efforts e JOIN activity_detail d ON d.activity_id = e.activity_id
+    WHERE e.date >= ? AND d.sport_type IN ({",".join("?" * len(RUN_SPORT_TYPES))})
+),
+halves AS (
+    SELECT segment_id, MAX(segment_name) AS segment_name, MAX(distance_m) AS distance_m,
+           COUNT(*) AS effort_count, MIN(elapsed_time) AS best, MAX(elapsed_time) AS worst,
+           COALESCE(AVG(CASE WHEN n <= total / 2 THEN elapsed_time END), AVG(elapsed_time)) AS first_avg,
+           AVG(CASE WHEN n > total / 2 THEN elapsed_time END) AS second_avg
+    FROM ranked
+    GROUP BY segment_id
+    HAVING COUNT(*) >= ?
+)
+SELECT segment_id, segment_name, distance_m, effort_count, best, worst,
+       CASE WHEN first_avg > 0 THEN ROUND((second_avg - first_avg) * 100.0 / first_avg, 1) ELSE 0.0 END
+FROM halves
+ORDER BY effort_count DESC, segment_id
+"""
+
+_SEGMENT_EFFORTS_SQL = f"""
+SELECT e.segment_id, e.elapsed_time, e.activity_id, d.name, e.date, e.average_heartrate
+FROM segment_efforts e JOIN activity_detail d ON d.activity_id = e.activity_id
+WHERE e.date >= ? AND d.sport_type IN ({",".join("?" * len(RUN_SPORT_TYPES))})
+ORDER BY e.segment_id, e.date, e.activity_id, e.position
+"""
+
+
+def _segment_rows(detail: dict[str, Any]) -> list[tuple[Any, ...]]:
+    """Rows for ``segment_efforts`` from a detailed activity."""
+    activity_id = detail["id"]
+    rows = []
+    for position, effort in enumerate(detail.get("segment_efforts") or []):
+        segment = effort.get("segment") or {}
+        if not segment.get("id"):
+            continue
+        rows.append(
+            (
+                activity_id,
+                position,
+                segment["id"],
+                segment.get("name", "Unknown"),
+                segment.get("distance", 0),
+                effort.get("elapsed_time", 0),
+                effort.get("start_date") or detail.get("start_date", ""),
+                effort.get("average_heartrate"),
+            )
+        )
+    return rows
+
+
+_INSERT_SEGMENT_EFFORTS = """INSERT OR REPLACE INTO segment_efforts
+    (activity_id, position, segment_id, segment_name, distance_m, elapsed_time, date, average_heartrate)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?)"""
+
+
+class ActivityMirror:
+    """SQLite mirror of detailed activities and the efforts extracted from them."""
+
+    def __init__(self, db_path: str) -> None:
+        self._db_path = db_path
+        self._lock = threading.RLock()
+        self._conn: sqlite3.Connection | None = None
+        with self._lock, self._connect() as conn:
+            conn.executescript(_SCHEMA)
+            backfill = not conn.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'segment_efforts'"
+            ).fetchone()
+            conn.executescript(_SEGMENT_SCHEMA)
+            conn.executescript(_ACTIVITY_SCHEMA)
+            if backfill:
+                # Details mirrored before the segment index existed already hold their efforts.
+                for (payload,) in conn.execute("SELECT payload FROM activity_detail").fetchall():
+                    conn.executemany(_INSERT_SEGMENT_EFFORTS, _segment_rows(json.loads(zlib.decompress(payload))))
+
+    def _connect(self) -> sqlite3.Connection:
+        """Return the mirror's long-lived connection, opening it on first use."""
+        if self._conn is None:
+            self._conn = sqlite3.connect(self._db_path, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+        return self._conn
+
+    # ── Activity summaries ───────────────────────────────────────────
+
+    def activity_sync_state(self) -> dict[str, float] | None:
+        """Earliest start time the summaries cover and when they were last brought up to date."""
+        with self._lock:
+            row = (
+                self._connect()
+                .execute("SELECT covered_from, synced_at FROM activity_sync WHERE name = 'activities'")
+                .fetchone()
+            )
+        return {"covered_from": row[0], "synced_at": row[1]} if row else None
+
+    def newest_activity_start(self) -> int | None:
+        """Start time (epoch seconds) of the newest mirrored activity."""
+        with self._lock:
+            return self._connect().execute("SELECT MAX(start_ts) FROM activities").fetchone()[0]
+
+    def upsert_activities(
+        self,
+        activities: list[dict[str, Any]],
+        covered_from: int | None = None,
+        synced_at: float | None = None,
+    ) -> None:
+        """Store activity summaries and extend the recorded coverage in one transaction.
+
+        ``covered_from`` widens the covered span back to that start time. ``synced_at``
+        records that everything up to that moment has been fetched. The first call
+        that records coverage must give ``covered_from``.
+        """
+        rows = []
+        for a in activities:
+            start = datetime.fromisoformat(a["start_date"].replace("Z", "+00:00"))
+            rows.append(
+                (
+                    a["id"],
+                    a.get("name") or "",
+                    a.get("type") or "",
+                    a.get("sport_type") or a.get("type") or "",
+                    a["start_date"],
+                    int(start.timestamp()),
+                    start.strftime("%G-W%V"),
+                    a.get("distance") or 0,
+                    a.get("moving_time") or 0,
+                    a.get("total_elevation_gain") or 0,
+                    a.get("average_speed") or 0,
+                    a.get("average_heartrate"),
+                )
+            )
+        with self._lock, self._connect() as conn:
+            conn.executemany(
+                """INSERT OR REPLACE INTO activities (activity_id, name, type, sport_type, start_date, start_ts,
+                   iso_week, distance, moving_time, total_elevation_gain, average_speed, average_heartrate)
+                   VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
+                rows,
+            )
+            if covered_from is None and synced_at is None:
+                return
+            updated = conn.execute(
+                """UPDATE activity_sync SET covered_from = MIN(covered_from, COALESCE(?, covered_from)),
+                                            synced_at = MAX(synced_at, COALESCE(?, synced_at))
+                   WHERE name = 'activities'""",
+                (covered_from, synced_at),
+            ).rowcount
+            if not updated:
+                conn.execute(
+                    "INSERT INTO activity_sync (name, covered_from, synced_at) VALUES ('activities', ?, ?)",
+                    (covered_from, synced_at or 0),
+                )
+
+    def search_activities(
+        self,
+        after: int,
+        activity_type: str | None = None,
+        min_distance_m: float | None = None,
+        max_distance_m: float | None = None,
+        name_contains: str | None = None,
+    ) -> list[dict[str, Any]]:
+        """Mirrored activities starting after ``after`` that match every given filter, oldest first.
+
+        ``activity_type`` matches either ``type`` or ``sport_type``; it and ``name_contains``
+        are case-insensitive.
+        """
+        clauses, params = ["start_ts >= ?"], [after]
+        if activity_type:
+            clauses.append("(type = ? OR sport_type = ?)")
+            params += [activity_type, activity_type]
+        if min_distance_m is not None:
+            clauses.append("distance >= ?")
+            params.append(min_distance_m)
+        if max_distance_m is not None:
+            clauses.append("distance <= ?")
+            params.append(max_distance_m)
+        if name_contains:
+            escaped = name_contains.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+            clauses.append("name LIKE ? ESCAPE '\\'")
+            params.append(f"%{escaped}%")
+        sql = f"SELECT {_ACTIVITY_COLUMNS} FROM activities WHERE {' AND '.join(clauses)} ORDER BY start_ts"
+        with self._lock:
+            conn = self._connect()
+            cursor = conn.execute(sql, params)
+            columns = [c[0] for c in cursor.description]
+            return [dict(zip(columns, row, strict=True)) for row in cursor]
+
+    def run_ids(self, after: int) -> list[int]:
+        """IDs of mirrored runs starting after ``after``, oldest first."""
+        with self._lock:
+            rows = self._connect().execute(
+                f"SELECT activity_id FROM activities WHERE start_ts >= ? AND {_IS_RUN} ORDER BY start_ts",
+                (after, *RUN_SPORT_TYPES),
+            )
+            return [row[0] for row in rows]
+
+    def weekly_run_totals(self, after: int) -> list[dict[str, Any]]:
+        """Run totals per ISO week (``YYYY-Www``) for runs starting after ``after``, oldest week first."""
+        with self._lock:
+            rows = (
+                self._connect()
+                .execute(
+                    f"""SELECT iso_week, COUNT(*), SUM(distance), SUM(moving_time), SUM(total_elevation_gain),
+                               MAX(distance)
+                        FROM activities
+                        WHERE start_ts >= ?
+                          AND {_IS_RUN}
+                        GROUP BY iso_week
+                        ORDER BY iso_week""",
+                    (after, *RUN_SPORT_TYPES),
+                )
+                .fetchall()
+            )
+        return [
+            {
+                "week": week,
+                "run_count": count,
+                "total_distance_m": distance,
+                "total_time_s": moving_time,
+                "total_elevation_m": elevation,
+                "longest_run_m": longest,
+            }
+            for week, count, distance, moving_time, elevation, longest in rows
+        ]
+
+    # ── Activity details ─────────────────────────────────────────────
+
+    def ingest(self, detail: dict[str, Any]) -> None:
+        """Store a detailed activity and replace its extracted efforts."""
+        activity_id = detail["id"]
+        start_date = detail.get("start_date", "")
+        efforts = [
+            (activity_id, e["name"], e.get("distance"), e["elapsed_time"], e.get("start_date") or start_date)
+            for e in detail.get("best_efforts") or []
+            if e.get("name") and e.get("elapsed_time")
+        ]
+        with self._lock, self._connect() as conn:
+            conn.execute(
+                """INSERT OR REPLACE INTO activity_detail
+                   (activity_id, name, sport_type, start_date, fetched_at, payload) VALUES (?, ?, ?, ?, ?, ?)""",
+                (
+                    activity_id,
+                    detail.get("name", ""),
+                    detail.get("sport_type") or detail.get("type"),
+                    start_date,
+                    time.time(),
+                    zlib.compress(json.dumps(detail).encode()),
+                ),
+            )
+            conn.execute("DELETE FROM best_efforts WHERE activity_id = ?", (activity_id,))
+            conn.executemany(
+                """INSERT OR REPLACE INTO best_efforts (activity_id, distance_name, distance_m, elapsed_time, date)
+                   VALUES (?, ?, ?, ?, ?)""",
+                efforts,
+            )
+            conn.execute("DELETE FROM segment_efforts WHERE activity_id = ?", (activity_id,))
+            conn.executemany(_INSERT_SEGMENT_EFFORTS, _segment_rows(detail))
+
+    def get(self, activity_id: int) -> dict[str, Any] | None:
+        """Return a mirrored detailed activity, or None if it was never fetched."""
+        with self._lock:
+            row = (
+                self._connect()
+                .execute("SELECT payload FROM activity_detail WHERE activity_id = ?", (activity_id,))
+                .fetchone()
+            )
+        return json.loads(zlib.decompress(row[0])) if row else None
+
+    def missing(self, activity_ids: list[int]) -> list[int]:
+        """The subset of ``activity_ids`` not mirrored yet, in the order given."""
+        have: set[int] = set()
+        with self._lock:
+            conn = self._connect()
+            for i in range(0, len(activity_ids), 500):
+                chunk = activity_ids[i : i + 500]
+                marks = ",".join("?" * len(chunk))
+                sql = f"SELECT activity_id FROM activity_detail WHERE activity_id IN ({marks})"
+                have.update(row[0] for row in conn.execute(sql, chunk))
+        return [i for i in activity_ids if i not in have]
+
+    def best_efforts(self, since: str) -> list[dict[str, Any]]:
+        """Fastest mirrored effort per distance on or after ``since`` (ISO date), shortest distance first."""
+        with self._lock:
+            rows = self._connect().execute(_BEST_EFFORTS_SQL, (since,)).fetchall()
+        return [
+            {
+                "distance_name": name,
+                "distance_m": distance_m or 0,
+                "elapsed_time": elapsed,
+                "activity_id": activity_id,
+                "activity_name": activity_name or "",
+                "activity_date": activity_date or "",
+            }
+            for name, distance_m, elapsed, activity_id, activity_name, activity_date in rows
+        ]
+
+    def segment_stats(self, since: str, min_efforts: int = 2) -> list[dict[str, Any]]:
+        """Run segments with at least ``min_efforts`` efforts on or after ``since``, most-run first.
+
+        Each segment carries its efforts in date order.
+        """
+        with self._lock:
+            conn = self._connect()
+            stats = conn.execute(_SEGMENT_STATS_SQL, (since, *RUN_SPORT_TYPES, min_efforts)).fetchall()
+            wanted = {row[0] for row in stats}
+            efforts: dict[int, list[dict[str, Any]]] = {}
+            for segment_id, elapsed, activity_id, name, date, heartrate in conn.execute(
+                _SEGMENT_EFFORTS_SQL, (since, *RUN_SPORT_TYPES)
+            ):
+                if segment_id in wanted:
+                    efforts.setdefault(segment_id, []).append(
+                        {
+                            "elapsed_time": elapsed,
+                            "activity_id": activity_id,
+                            "activity_name": name or "",
+                            "date": date,
+                            "average_heartrate": heartrate,
+                        }
+                    )
+        return [
+            {
+                "segment_id": segment_id,
+                "segment_name": name,
+                "distance_m": distance_m or 0,
+                "effort_count": count,
+                "best_time_seconds": best,
+                "worst_time_seconds": worst,
+                "trend_pct": trend or 0.0,
+                "efforts": efforts[segment_id],
+            }
+            for segment_id, name, distance_m, count, best, worst, trend in stats
+        ]
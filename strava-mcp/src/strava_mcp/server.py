@@ -2,19 +2,45 @@
 
 from __future__ import annotations
 
+import asyncio
+import logging
 import time
 from datetime import datetime, timedelta, timezone
+from typing import TYPE_CHECKING, Any
 
 from mcp.server.fastmcp import FastMCP
 
 from strava_mcp.auth import TokenStore, run_oauth_flow
 from strava_mcp.cache import ActivityCache
-from strava_mcp.client import StravaClient
+from strava_mcp.client import StravaAPIError, StravaClient
 from strava_mcp.config import Settings
+from strava_mcp.mirror import ActivityMirror
+
+if TYPE_CHECKING:
+    from collections.abc import Awaitable, Callable
+
+logger = logging.getLogger(__name__)
 
 settings = Settings.from_env()
 token_store = TokenStore(settings.db_path)
 cache = ActivityCache(settings.db_path)
+mirror = ActivityMirror(settings.db_path)
+
+# Detail fetches in flight at once when filling the activity mirror.
+DETAIL_CONCURRENCY = 4
+# Seconds between checks for activities newer than the newest one mirrored.
+ACTIVITY_SYNC_INTERVAL = 60
+# Tool -> seconds past expiry that its cached answer may still be served while it is
+# refreshed in the background. Override per tool with STRAVA_MCP_MAX_STALENESS.
+MAX_STALENESS: dict[str, float] = {
+    "get_recent_activities": 3600,
+    "get_athlete_stats": 24 * 3600,
+    "get_athlete_zones": 7 * 24 * 3600,
+    "get_weekly_summary": 6 * 3600,
+    "get_shoe_mileage": 24 * 3600,
+}
+# Cache key -> background refresh in progress.
+_refreshing: dict[str, asyncio.Task] = {}
 strava = StravaClient(settings, token_store)
 
 mcp = FastMCP(
@@ -58,18 +84,20 @@ async def get_athlete() -> dict:
 
 
 @mcp.tool()
-async def get_recent_activities(days: int = 30) -> list[dict]:
+async def get_recent_activities(days: int = 30, fresh: bool = False) -> list[dict]:
     """List recent activities with summary stats.
 
     Args:
         days: Number of days to look back (default 30).
+        fresh: Skip any cached answer and fetch from Strava now (default False).
     """
-    after = int((datetime.now(tz=timezone.utc) - timedelta(days=days)).timestamp())
-    cache_key = f"recent_activities_{days}d_{after // 3600}"
-    cached = cache.get(cache_key)
-    if cached:
-        return cached
+    return await _serve_cached(
+        "get_recent_activities", f"recent_activities_{days}d", lambda: _recent_activities(days), fresh
+    )
+
 
+async def _recent_activities(days: int) -> list[dict]:
+    after = int((datetime.now(tz=timezone.utc) - timedelta(days=days)).timestamp())
     activities = await strava.get_activities(after=after)
     result = [
         {
@@ -93,7 +121,6 @@ async def get_recent_activities(days: int = 30) -> list[dict]:
         }
         for a in activities
     ]
-    cache.set(cache_key, result)
     return result
 
 
@@ -108,7 +135,10 @@ async def get_activity(activity_id: int) -> dict:
     cached = cache.get(cache_key)
     if cached:
         return cached
-    data = await strava.get_activity(activity_id)
+    data = mirror.get(activity_id)
+    if data is None:
+        data = await strava.get_activity(activity_id)
+        mirror.ingest(data)
     cache.set(cache_key, data)
     return data
 
@@ -141,31 +171,32 @@ async def get_activity_streams(activity_id: int, stream_types: list[str] | None
 
 
 @mcp.tool()
-async def get_athlete_stats() -> dict:
-    """Get year-to-date and all-time athlete statistics."""
-    athlete = await strava.get_athlete()
-    athlete_id = athlete["id"]
+async def get_athlete_stats(fresh: bool = False) -> dict:
+    """Get year-to-date and all-time athlete statistics.
 
-    cache_key = f"athlete_stats_{athlete_id}_{int(time.time()) // 3600}"
-    cached = cache.get(cache_key)
-    if cached:
-        return cached
+    Args:
+        fresh: Skip any cached answer and fetch from Strava now (default False).
+    """
+    return await _serve_cached("get_athlete_stats", "athlete_stats", _athlete_stats, fresh)
 
-    data = await strava.get_athlete_stats(athlete_id)
-    cache.set(cache_key, data)
-    return data
+
+async def _athlete_stats() -> dict:
+    athlete = await strava.get_athlete()
+    return await strava.get_athlete_stats(athlete["id"])
 
 
 @mcp.tool()
-async def get_athlete_zones() -> dict:
-    """Get heart rate and power zone definitions for the athlete."""
-    cache_key = "athlete_zones"
-    cached = cache.get(cache_key)
-    if cached:
-        return cached
-    data = await strava.get_athlete_zones()
-    cache.set(cache_key, data)
-    return data
+async def get_athlete_zones(fresh: bool = False) -> dict:
+    """Get heart rate and power zone definitions for the athlete.
+
+    Args:
+        fresh: Skip any cached answer and fetch from Strava now (default False).
+    """
+    return await _serve_cached("get_athlete_zones", "athlete_zones", _athlete_zones, fresh)
+
+
+async def _athlete_zones() -> dict:
+    return await strava.get_athlete_zones()
 
 
 @mcp.tool()
@@ -184,40 +215,22 @@ async def get_best_efforts(days: int = 365) -> list[dict]:
     if cached:
         return cached
 
-    activities = await strava.get_all_activities(after=after)
+    await _sync_activities(after)
+    # best_efforts only exist on DetailedActivity; fetch the ones never mirrored.
+    rate_limited = await _mirror_details(mirror.missing(mirror.run_ids(after)))
 
-    # Collect best efforts from detailed activities (best_efforts only on DetailedActivity)
-    bests: dict[str, dict] = {}
-    for a in activities:
-        if a.get("type") != "Run" and a.get("sport_type") not in ("Run", "TrailRun", "VirtualRun"):
-            continue
-        try:
-            detail = await strava.get_activity(a["id"])
-        except Exception:
-            continue
-        for effort in detail.get("best_efforts", []):
-            name = effort.get("name", "")
-            elapsed = effort.get("elapsed_time", 0)
-            if not name or not elapsed:
-                continue
-            if name not in bests or elapsed < bests[name]["elapsed_time"]:
-                bests[name] = {
-                    "distance_name": name,
-                    "distance_m": effort.get("distance", 0),
-                    "elapsed_time": elapsed,
-                    "elapsed_time_formatted": _format_seconds(elapsed),
-                    "activity_id": a["id"],
-                    "activity_name": a.get("name", ""),
-                    "activity_date": a.get("start_date", ""),
-                }
-
-    result = sorted(bests.values(), key=lambda x: x["distance_m"])
-    cache.set(cache_key, result)
+    since = datetime.fromtimestamp(after, tz=timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+    result = [
+        {**effort, "elapsed_time_formatted": _format_seconds(effort["elapsed_time"])}
+        for effort in mirror.best_efforts(since)
+    ]
+    if not rate_limited:  # a partial scan is retried on the next call instead of cached
+        cache.set(cache_key, result)
     return result
 
 
 @mcp.tool()
-async def get_weekly_summary(weeks: int = 8) -> list[dict]:
+async def get_weekly_summary(weeks: int = 8, fresh: bool = False) -> list[dict]:
     """Aggregate activities into rolling weekly summaries.
 
     Returns per-week totals: distance, time, elevation, run count, average pace,
@@ -225,43 +238,32 @@ async def get_weekly_summary(weeks: int = 8) -> list[dict]:
 
     Args:
         weeks: Number of weeks to summarise (default 8).
+        fresh: Skip any cached answer and fetch from Strava now (default False).
     """
-    days = weeks * 7
-    after = int((datetime.now(tz=timezone.utc) - timedelta(days=days)).timestamp())
-    cache_key = f"weekly_summary_{weeks}w_{after // 86400}"
-    cached = cache.get(cache_key)
-    if cached:
-        return cached
+    return await _serve_cached("get_weekly_summary", f"weekly_summary_{weeks}w", lambda: _weekly_summary(weeks), fresh)
 
-    activities = await strava.get_all_activities(after=after)
-    runs = [a for a in activities if a.get("type") == "Run" or a.get("sport_type") in ("Run", "TrailRun", "VirtualRun")]
 
-    # Bucket into ISO weeks
-    week_buckets: dict[str, list[dict]] = {}
-    for r in runs:
-        dt = datetime.fromisoformat(r["start_date"].replace("Z", "+00:00"))
-        week_key = dt.strftime("%G-W%V")
-        week_buckets.setdefault(week_key, []).append(r)
+async def _weekly_summary(weeks: int) -> list[dict]:
+    days = weeks * 7
+    after = int((datetime.now(tz=timezone.utc) - timedelta(days=days)).timestamp())
+    await _sync_activities(after)
 
-    # Build sorted weekly summaries
     summaries: list[dict] = []
-    for week_key in sorted(week_buckets):
-        bucket = week_buckets[week_key]
-        total_distance = sum(a.get("distance", 0) for a in bucket)
-        total_time = sum(a.get("moving_time", 0) for a in bucket)
-        total_elevation = sum(a.get("total_elevation_gain", 0) for a in bucket)
-        longest_run = max((a.get("distance", 0) for a in bucket), default=0)
+    for week in mirror.weekly_run_totals(after):
+        total_distance = week["total_distance_m"]
+        total_time = week["total_time_s"]
+        longest_run = week["longest_run_m"]
         avg_speed = total_distance / total_time if total_time > 0 else 0
 
         summaries.append(
             {
-                "week": week_key,
-                "run_count": len(bucket),
+                "week": week["week"],
+                "run_count": week["run_count"],
                 "total_distance_km": round(total_distance / 1000, 2),
                 "total_distance_miles": round(total_distance / 1609.34, 2),
                 "total_time_s": total_time,
                 "total_time_formatted": _format_seconds(total_time),
-                "total_elevation_m": round(total_elevation, 1),
+                "total_elevation_m": round(week["total_elevation_m"], 1),
                 "longest_run_km": round(longest_run / 1000, 2),
                 "longest_run_miles": round(longest_run / 1609.34, 2),
                 "average_pace_per_km": _speed_to_pace(avg_speed),
@@ -277,22 +279,23 @@ async def get_weekly_summary(weeks: int = 8) -> list[dict]:
         else:
             s["week_over_week_change_pct"] = None
 
-    cache.set(cache_key, summaries)
     return summaries
 
 
 @mcp.tool()
-async def get_shoe_mileage() -> list[dict]:
+async def get_shoe_mileage(fresh: bool = False) -> list[dict]:
     """Get mileage for all shoes/gear linked to running activities.
 
     Returns each shoe with total distance, activity count, and retirement warnings
     (>500 km and >800 km thresholds).
+
+    Args:
+        fresh: Skip any cached answer and fetch from Strava now (default False).
     """
-    cache_key = f"shoe_mileage_{int(time.time()) // 3600}"
-    cached = cache.get(cache_key)
-    if cached:
-        return cached
+    return await _serve_cached("get_shoe_mileage", "shoe_mileage", _shoe_mileage, fresh)
+
 
+async def _shoe_mileage() -> list[dict]:
     athlete = await strava.get_athlete()
     shoes_raw = athlete.get("shoes", [])
 
@@ -312,7 +315,6 @@ async def get_shoe_mileage() -> list[dict]:
         )
 
     result.sort(key=lambda x: x["distance_km"], reverse=True)
-    cache.set(cache_key, result)
     return result
 
 
@@ -334,44 +336,32 @@ async def search_activities(
         name_contains: Filter by name substring (case-insensitive).
     """
     after = int((datetime.now(tz=timezone.utc) - timedelta(days=days)).timestamp())
-    activities = await strava.get_all_activities(after=after)
+    await _sync_activities(after)
+    activities = mirror.search_activities(
+        after,
+        activity_type=activity_type,
+        min_distance_m=None if min_distance_km is None else min_distance_km * 1000,
+        max_distance_m=None if max_distance_km is None else max_distance_km * 1000,
+        name_contains=name_contains,
+    )
 
     results = []
     for a in activities:
-        # Type filter: check both type and sport_type fields
-        if (
-            activity_type
-            and a.get("type", "").lower() != activity_type.lower()
-            and a.get("sport_type", "").lower() != activity_type.lower()
-        ):
-            continue
-
-        dist_km = a.get("distance", 0) / 1000
-
-        # Distance filters
-        if min_distance_km is not None and dist_km < min_distance_km:
-            continue
-        if max_distance_km is not None and dist_km > max_distance_km:
-            continue
-
-        # Name filter
-        if name_contains and name_contains.lower() not in a.get("name", "").lower():
-            continue
-
+        dist_km = a["distance"] / 1000
         results.append(
             {
-                "id": a["id"],
-                "name": a.get("name", ""),
-                "type": a.get("type", ""),
-                "start_date": a.get("start_date", ""),
+                "id": a["activity_id"],
+                "name": a["name"],
+                "type": a["type"],
+                "start_date": a["start_date"],
                 "distance_km": round(dist_km, 2),
                 "distance_miles": round(dist_km / 1.60934, 2),
-                "moving_time_s": a.get("moving_time", 0),
-                "moving_time_formatted": _format_seconds(a.get("moving_time", 0)),
-                "pace_min_per_km": _speed_to_pace(a.get("average_speed", 0)),
-                "pace_min_per_mile": _speed_to_pace_mile(a.get("average_speed", 0)),
-                "average_heartrate": a.get("average_heartrate"),
-                "total_elevation_gain_m": a.get("total_elevation_gain", 0),
+                "moving_time_s": a["moving_time"],
+                "moving_time_formatted": _format_seconds(a["moving_time"]),
+                "pace_min_per_km": _speed_to_pace(a["average_speed"]),
+                "pace_min_per_mile": _speed_to_pace_mile(a["average_speed"]),
+                "average_heartrate": a["average_heartrate"],
+                "total_elevation_gain_m": a["total_elevation_gain"],
             }
         )
 
@@ -395,78 +385,33 @@ async def get_segment_analysis(days: int = 180, min_efforts: int = 2) -> list[di
     if cached:
         return cached
 
-    activities = await strava.get_all_activities(after=after)
-    runs = [a for a in activities if a.get("type") == "Run" or a.get("sport_type") in ("Run", "TrailRun")]
+    await _sync_activities(after)
+    rate_limited = await _mirror_details(mirror.missing(mirror.run_ids(after)))
 
-    # Collect segment efforts from detailed activities
-    segment_efforts: dict[int, list[dict]] = {}
-    segment_info: dict[int, dict] = {}
-
-    for a in runs:
-        try:
-            detail = await strava.get_activity(a["id"])
-        except Exception:
-            continue
-
-        for effort in detail.get("segment_efforts", []):
-            seg = effort.get("segment", {})
-            seg_id = seg.get("id")
-            if not seg_id:
-                continue
-
-            if seg_id not in segment_info:
-                segment_info[seg_id] = {
-                    "name": seg.get("name", "Unknown"),
-                    "distance_m": seg.get("distance", 0),
-                }
-
-            segment_efforts.setdefault(seg_id, []).append(
-                {
-                    "elapsed_time": effort.get("elapsed_time", 0),
-                    "elapsed_time_formatted": _format_seconds(effort.get("elapsed_time", 0)),
-                    "activity_id": a["id"],
-                    "activity_name": a.get("name", ""),
-                    "date": effort.get("start_date", a.get("start_date", "")),
-                    "average_heartrate": effort.get("average_heartrate"),
-                }
-            )
-
-    # Filter to segments with enough efforts and build result
+    since = datetime.fromtimestamp(after, tz=timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
     result = []
-    for seg_id, efforts in segment_efforts.items():
-        if len(efforts) < min_efforts:
-            continue
-
-        efforts_sorted = sorted(efforts, key=lambda e: e["date"])
-        times = [e["elapsed_time"] for e in efforts_sorted]
-        best_time = min(times)
-        worst_time = max(times)
-
-        # Trend: compare first half avg to second half avg
-        mid = len(times) // 2
-        first_avg = sum(times[:mid]) / mid if mid > 0 else times[0]
-        second_avg = sum(times[mid:]) / (len(times) - mid) if len(times) - mid > 0 else times[-1]
-        trend_pct = round((second_avg - first_avg) / first_avg * 100, 1) if first_avg > 0 else 0.0
-
-        info = segment_info[seg_id]
+    for segment in mirror.segment_stats(since, min_efforts):
+        best_time = segment.pop("best_time_seconds")
+        worst_time = segment.pop("worst_time_seconds")
+        trend_pct = segment.pop("trend_pct")
+        efforts = segment.pop("efforts")
+        for effort in efforts:
+            effort["elapsed_time_formatted"] = _format_seconds(effort["elapsed_time"])
         result.append(
             {
-                "segment_id": seg_id,
-                "segment_name": info["name"],
-                "distance_m": info["distance_m"],
-                "effort_count": len(efforts_sorted),
+                **segment,
                 "best_time": _format_seconds(best_time),
                 "best_time_seconds": best_time,
                 "worst_time": _format_seconds(worst_time),
                 "improvement_pct": round((worst_time - best_time) / worst_time * 100, 1) if worst_time > 0 else 0,
                 "trend_pct": trend_pct,
                 "trend_direction": "improving" if trend_pct < -3 else "declining" if trend_pct > 3 else "stable",
-                "efforts": efforts_sorted,
+                "efforts": efforts,
             }
         )
 
-    result.sort(key=lambda x: x["effort_count"], reverse=True)
-    cache.set(cache_key, result)
+    if not rate_limited:
+        cache.set(cache_key, result)
     return result
 
 
@@ -481,8 +426,21 @@ async def athlete_profile_resource() -> dict:
 
 @mcp.resource("strava://rate-limits")
 async def rate_limits_resource() -> dict:
-    """Current Strava API rate limit status."""
-    return strava.rate_limits.to_dict()
+    """Current Strava API rate limit status, as last reported and as budgeted by the shared governor.
+
+    ``single_flight`` counts requests that shared an identical in-flight request instead of calling Strava.
+    """
+    return {
+        **strava.rate_limits.to_dict(),
+        "governor": await asyncio.to_thread(strava.governor.snapshot),
+        "single_flight": strava.flights.stats(),
+    }
+
+
+@mcp.resource("strava://cache-stats")
+async def cache_stats_resource() -> dict:
+    """Response cache hit/miss/eviction counters, tier sizes, and conditional-request counters."""
+    return {**cache.stats(), "conditional": strava.validators.stats()}
 
 
 # ── Helpers ────────────────────────────────────────────────────────────
@@ -508,6 +466,105 @@ def _speed_to_pace_mile(speed_mps: float) -> str | None:
     return f"{minutes}:{seconds:02d}"
 
 
+async def _serve_cached(tool: str, key: str, fetch: Callable[[], Awaitable[Any]], fresh: bool = False) -> Any:
+    """Answer ``tool`` from the cache entry ``key``, serving it stale while it refreshes.
+
+    An entry that has expired, but by no more than the tool's maximum staleness, is
+    returned at once, tagged with ``stale_age_s``, and refetched in the background.
+    A miss, an older entry, or ``fresh`` waits for ``fetch``.
+    """
+    if not fresh:
+        entry = cache.get_entry(key)
+        if entry is not None:
+            value, cached_at, expires_at = entry
+            now = time.time()
+            if expires_at is None or now <= expires_at:
+                return value
+            if now - expires_at <= settings.max_staleness.get(tool, MAX_STALENESS.get(tool, 0)):
+                _refresh_in_background(key, fetch)
+                return _tag_stale(value, now - cached_at)
+    value = await fetch()
+    cache.set(key, value)
+    return value
+
+
+def _refresh_in_background(key: str, fetch: Callable[[], Awaitable[Any]]) -> None:
+    """Refetch ``key`` into the cache without making the caller wait; one refresh per key at a time."""
+    if key in _refreshing:
+        return
+
+    async def refresh() -> None:
+        try:
+            cache.set(key, await fetch())
+        except Exception:
+            logger.warning("Background refresh of %s failed; the stale entry stays in place.", key, exc_info=True)
+        finally:
+            _refreshing.pop(key, None)
+
+    _refreshing[key] = asyncio.ensure_future(refresh())
+
+
+def _tag_stale(value: Any, age: float) -> Any:
+    """Mark a stale answer with its age in seconds: on a dict itself, on each dict of a list."""
+    age_s = int(age)
+    if isinstance(value, dict):
+        return {**value, "stale_age_s": age_s}
+    if isinstance(value, list):
+        return [{**item, "stale_age_s": age_s} if isinstance(item, dict) else item for item in value]
+    return value
+
+
+async def _sync_activities(after: int) -> None:
+    """Bring the activity mirror up to date for queries reaching back to ``after``.
+
+    The first query fetches its whole window. A query reaching further back than the
+    mirror covers fetches only the older span. New activities are picked up by
+    fetching everything since the newest mirrored one, at most every
+    ``ACTIVITY_SYNC_INTERVAL`` seconds.
+    """
+    now = time.time()
+    state = mirror.activity_sync_state()
+    if state is None:
+        mirror.upsert_activities(await strava.get_all_activities(after=after), covered_from=after, synced_at=now)
+        return
+    if after < state["covered_from"]:
+        older = await strava.get_all_activities(after=after, before=int(state["covered_from"]))
+        mirror.upsert_activities(older, covered_from=after)
+    if now - state["synced_at"] >= ACTIVITY_SYNC_INTERVAL:
+        newest = mirror.newest_activity_start()
+        since = int(state["covered_from"]) if newest is None else newest - 1
+        mirror.upsert_activities(await strava.get_all_activities(after=since), synced_at=now)
+
+
+async def _mirror_details(activity_ids: list[int]) -> bool:
+    """Fetch and mirror detailed activities, ``DETAIL_CONCURRENCY`` at a time.
+
+    A detail that fails to fetch is skipped and retried on a later call. Once
+    Strava reports the rate limit spent, the remaining fetches are abandoned.
+    Returns True in that case.
+    """
+    semaphore = asyncio.Semaphore(DETAIL_CONCURRENCY)
+    rate_limited = False
+
+    async def fetch(activity_id: int) -> None:
+        nonlocal rate_limited
+        async with semaphore:
+            if rate_limited:
+                return
+            try:
+                detail = await strava.get_activity(activity_id)
+            except StravaAPIError as e:
+                rate_limited = rate_limited or e.code == "rate_limited"
+                return
+            except Exception:
+                return
+        if isinstance(detail, dict):
+            mirror.ingest(detail)
+
+    await asyncio.gather(*(fetch(activity_id) for activity_id in activity_ids))
+    return rate_limited
+
+
 def _format_seconds(total_seconds: int) -> str:
     """Format seconds as H:MM:SS or M:SS."""
     h, remainder = divmod(total_seconds, 3600)
@@ -0,0 +1,162 @@
+"""HTTP transport for the Strava client: pooled connections, request coalescing and
+conditional requests.
+
+Identical GET requests that overlap in time share one upstream call (``SingleFlight``).
+
+Responses that carry an ``ETag`` or ``Last-Modified`` header are stored with their
+body in the ``http_validators`` table of the strava-mcp database. The next request
+for the same URL sends ``If-None-Match``/``If-Modified-Since``; a ``304 Not
+Modified`` reply has no body, and the stored one is returned instead.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import copy
+import json
+import logging
+import sqlite3
+import threading
+import time
+from typing import TYPE_CHECKING, Any, TypeVar
+
+import httpx
+
+if TYPE_CHECKING:
+    from collections.abc import Awaitable, Callable, Hashable
+
+T = TypeVar("T")
+
+logger = logging.getLogger(__name__)
+
+# Tool calls fan out to a handful of concurrent detail fetches (``DETAIL_CONCURRENCY``);
+# keep a few more connections warm than that, and long enough to span a conversation turn.
+POOL_LIMITS = httpx.Limits(max_connections=10, max_keepalive_connections=8, keepalive_expiry=120.0)
+TIMEOUT = httpx.Timeout(30.0, connect=10.0)
+
+
+def build_http_client(base_url: str, http2: bool = False) -> httpx.AsyncClient:
+    """Create the pooled client, using HTTP/2 when asked for and ``h2`` is installed."""
+    if http2:
+        try:
+            return httpx.AsyncClient(base_url=base_url, timeout=TIMEOUT, limits=POOL_LIMITS, http2=True)
+        except ImportError:
+            logger.warning("HTTP/2 requested but the 'h2' package is not installed. Using HTTP/1.1.")
+    return httpx.AsyncClient(base_url=base_url, timeout=TIMEOUT, limits=POOL_LIMITS)
+
+
+def validator_key(method: str, path: str, params: dict[str, Any] | None = None) -> str:
+    """Key a stored response by method, path and sorted query parameters."""
+    query = "&".join(f"{k}={v}" for k, v in sorted((params or {}).items()))
+    return f"{method} {path}?{query}" if query else f"{method} {path}"
+
+
+class SingleFlight:
+    """Collapse concurrent identical calls into one.
+
+    The first caller for a key starts the call. Callers that arrive while it is in
+    flight wait for the same call and get a copy of its result, or its exception.
+    The call runs as its own task, so it still completes for the waiting callers if
+    the first caller is cancelled.
+    """
+
+    def __init__(self) -> None:
+        self._flights: dict[Hashable, asyncio.Task[Any]] = {}
+        self._counters = dict.fromkeys(("calls", "collapsed"), 0)
+
+    async def do(self, key: Hashable, call: Callable[[], Awaitable[T]]) -> T:
+        self._counters["calls"] += 1
+        flight = self._flights.get(key)
+        if flight is not None:
+            self._counters["collapsed"] += 1
+            return copy.deepcopy(await asyncio.shield(flight))
+
+        flight = asyncio.ensure_future(call())
+        self._flights[key] = flight
+        flight.add_done_callback(lambda done: self._landed(key, done))
+        return await asyncio.shield(flight)
+
+    def _landed(self, key: Hashable, flight: asyncio.Task[Any]) -> None:
+        if self._flights.get(key) is flight:
+            del self._flights[key]
+        if not flight.cancelled():
+            flight.exception()  # retrieved here so a flight nobody awaited any more doesn't warn
+
+    def stats(self) -> dict[str, int]:
+        """Calls made through the layer, how many of them joined one already in flight, and flights open now."""
+        return {**self._counters, "in_flight": len(self._flights)}
+
+
+class ValidatorStore:
+    """ETag/Last-Modified validators and the bodies they validate, kept in SQLite."""
+
+    def __init__(self, db_path: str) -> None:
+        self._db_path = db_path
+        self._lock = threading.RLock()
+        self._conn: sqlite3.Connection | None = None
+        self._counters = dict.fromkeys(("conditional_requests", "not_modified", "stored"), 0)
+        with self._lock, self._connect() as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS http_validators (
+                    request_key TEXT PRIMARY KEY,
+                    etag TEXT,
+                    last_modified TEXT,
+                    body TEXT NOT NULL,
+                    stored_at REAL NOT NULL
+                )
+            """)
+
+    def _connect(self) -> sqlite3.Connection:
+        """Return the store's long-lived connection, opening it on first use."""
+        if self._conn is None:
+            self._conn = sqlite3.connect(self._db_path, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+        return self._conn
+
+    def conditional_headers(self, key: str) -> dict[str, str]:
+        """Headers that revalidate the stored response for ``key``, if there is one."""
+        with self._lock:
+            row = (
+                self._connect()
+                .execute("SELECT etag, last_modified FROM http_validators WHERE request_key = ?", (key,))
+                .fetchone()
+            )
+            if row is None:
+                return {}
+            self._counters["conditional_requests"] += 1
+        etag, last_modified = row
+        headers = {}
+        if etag:
+            headers["If-None-Match"] = etag
+        if last_modified:
+            headers["If-Modified-Since"] = last_modified
+        return headers
+
+    def not_modified(self, key: str) -> Any:
+        """The stored body for ``key`` after a 304, or None if it has gone missing."""
+        with self._lock:
+            row = self._connect().execute("SELECT body FROM http_validators WHERE request_key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            self._counters["not_modified"] += 1
+        return json.loads(row[0])
+
+    def store(self, key: str, response: httpx.Response, body: Any) -> None:
+        """Keep ``body`` if the response carries a validator to revalidate it with later."""
+        etag = response.headers.get("ETag")
+        last_modified = response.headers.get("Last-Modified")
+        if not etag and not last_modified:
+            return
+        with self._lock:
+            with self._connect() as conn:
+                conn.execute(
+                    """INSERT OR REPLACE INTO http_validators (request_key, etag, last_modified, body, stored_at)
+                       VALUES (?, ?, ?, ?, ?)""",
+                    (key, etag, last_modified, json.dumps(body), time.time()),
+                )
+            self._counters["stored"] += 1
+
+    def stats(self) -> dict[str, int]:
+        """Conditional requests sent, 304s answered from the store, and responses stored."""
+        with self._lock:
+            return dict(self._counters)
@@ -0,0 +1,130 @@
+"""Integration tests: conditional requests against a local fake Strava server."""
+
+from __future__ import annotations
+
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from strava_mcp.client import StravaClient
+
+from ..conftest import sample_athlete, sample_zones
+
+
+class _FakeStrava(ThreadingHTTPServer):
+    """Serves /api/v3/athlete and /api/v3/athlete/zones with an ETag, counting what it sends."""
+
+    def __init__(self) -> None:
+        super().__init__(("127.0.0.1", 0), _Handler)
+        self.resources = {"/api/v3/athlete": sample_athlete(), "/api/v3/athlete/zones": sample_zones()}
+        self.versions = dict.fromkeys(self.resources, 1)
+        self.requests: list[tuple[str, str | None]] = []
+        self.body_bytes = 0
+
+    @property
+    def base_url(self) -> str:
+        return f"http://127.0.0.1:{self.server_address[1]}/api/v3"
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server: _FakeStrava
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self) -> None:
+        path = self.path.split("?")[0]
+        self.server.requests.append((path, self.headers.get("If-None-Match")))
+        if path not in self.server.resources:
+            self.send_response(404)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        etag = f'"{path}-v{self.server.versions[path]}"'
+        if self.headers.get("If-None-Match") == etag:
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.end_headers()
+            return
+        body = json.dumps(self.server.resources[path]).encode()
+        self.server.body_bytes += len(body)
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("ETag", etag)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args) -> None:
+        pass
+
+
+@pytest.fixture()
+def fake_strava():
+    server = _FakeStrava()
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture()
+def client(settings, token_store, fake_strava):
+    return StravaClient(settings, token_store, base_url=fake_strava.base_url)
+
+
+class TestConditionalRequests:
+    @pytest.mark.asyncio()
+    async def test_unchanged_resource_is_revalidated_not_downloaded(self, client, fake_strava):
+        first = await client.get_athlete()
+        sent_after_first = fake_strava.body_bytes
+
+        for _ in range(3):
+            assert await client.get_athlete() == first
+
+        assert fake_strava.body_bytes == sent_after_first  # the 304s carried no body
+        assert [etag for _, etag in fake_strava.requests] == [None, *['"/api/v3/athlete-v1"'] * 3]
+        assert client.validators.stats() == {"conditional_requests": 3, "not_modified": 3, "stored": 1}
+        await client.close()
+
+    @pytest.mark.asyncio()
+    async def test_changed_resource_is_downloaded_again(self, client, fake_strava):
+        await client.get_athlete_zones()
+        fake_strava.resources["/api/v3/athlete/zones"] = {"heart_rate": {"custom_zones": True, "zones": []}}
+        fake_strava.versions["/api/v3/athlete/zones"] = 2
+
+        zones = await client.get_athlete_zones()
+        assert zones["heart_rate"]["custom_zones"] is True
+        assert await client.get_athlete_zones() == zones
+        assert client.validators.stats()["not_modified"] == 1
+        await client.close()
+
+    @pytest.mark.asyncio()
+    async def test_validators_survive_a_new_client(self, settings, token_store, fake_strava):
+        first = StravaClient(settings, token_store, base_url=fake_strava.base_url)
+        athlete = await first.get_athlete()
+        await first.close()
+
+        second = StravaClient(settings, token_store, base_url=fake_strava.base_url)
+        assert await second.get_athlete() == athlete
+        assert second.validators.stats()["not_modified"] == 1
+        await second.close()
+
+    @pytest.mark.asyncio()
+    async def test_connections_are_reused(self, client, fake_strava):
+        connections = set()
+        original = _Handler.setup
+
+        def setup(handler):
+            connections.add(handler.client_address)
+            original(handler)
+
+        _Handler.setup = setup
+        try:
+            for _ in range(5):
+                await client.get_athlete()
+        finally:
+            _Handler.setup = original
+        assert len(connections) == 1
+        await client.close()
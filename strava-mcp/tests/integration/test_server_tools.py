@@ -2,6 +2,8 @@
 
 from __future__ import annotations
 
+import asyncio
+
 import httpx
 import pytest
 import respx
@@ -10,6 +12,7 @@ from strava_mcp.auth import TokenStore
 from strava_mcp.cache import ActivityCache
 from strava_mcp.client import STRAVA_API_BASE, StravaClient
 from strava_mcp.config import Settings
+from strava_mcp.mirror import ActivityMirror
 
 from ..conftest import (
     sample_activity,
@@ -36,6 +39,7 @@ def _wired(tmp_path, monkeypatch):
     monkeypatch.setattr(srv, "settings", settings)
     monkeypatch.setattr(srv, "token_store", TokenStore(db))
     monkeypatch.setattr(srv, "cache", ActivityCache(db))
+    monkeypatch.setattr(srv, "mirror", ActivityMirror(db))
     monkeypatch.setattr(srv, "strava", StravaClient(settings, TokenStore(db)))
 
 
@@ -146,3 +150,274 @@ class TestGetAthleteZonesTool:
         result = await get_athlete_zones()
         assert "heart_rate" in result
         assert len(result["heart_rate"]["zones"]) == 5
+
+
+@pytest.mark.usefixtures("_wired")
+class TestGetBestEffortsTool:
+    @respx.mock
+    @pytest.mark.asyncio()
+    async def test_fetches_each_detail_once(self):
+        import strava_mcp.server as srv
+
+        ride = sample_activity(2, type="Ride", sport_type="Ride")
+        activities = respx.get(f"{STRAVA_API_BASE}/athlete/activities").mock(
+            return_value=httpx.Response(200, json=[sample_activity(1), ride])
+        )
+        detail = respx.get(f"{STRAVA_API_BASE}/activities/1").mock(
+            return_value=httpx.Response(200, json=sample_activity_detail(1))
+        )
+
+        result = await srv.get_best_efforts(days=3650)
+        assert [e["distance_name"] for e in result] == ["1k", "5k"]
+        assert result[0]["elapsed_time_formatted"] == "4:30"
+        assert result[0]["activity_id"] == 1
+
+        srv.cache.clear()
+        assert await srv.get_best_efforts(days=3650) == result
+        assert activities.call_count == 1  # the run list comes from the activity mirror between syncs
+        assert detail.call_count == 1  # answered from the mirror; rides are never fetched
+
+    @respx.mock
+    @pytest.mark.asyncio()
+    async def test_only_new_activities_are_fetched(self):
+        import strava_mcp.server as srv
+
+        srv.mirror.ingest(sample_activity_detail(1))
+        respx.get(f"{STRAVA_API_BASE}/athlete/activities").mock(
+            return_value=httpx.Response(200, json=[sample_activity(1), sample_activity(2)])
+        )
+        old = respx.get(f"{STRAVA_API_BASE}/activities/1").mock(
+            return_value=httpx.Response(200, json=sample_activity_detail(1))
+        )
+        new_detail = sample_activity_detail(2)
+        new_detail["best_efforts"] = [{"name": "1k", "elapsed_time": 255, "distance": 1000}]
+        new = respx.get(f"{STRAVA_API_BASE}/activities/2").mock(return_value=httpx.Response(200, json=new_detail))
+
+        result = await srv.get_best_efforts(days=3650)
+        assert not old.called
+        assert new.call_count == 1
+        assert [(e["distance_name"], e["activity_id"]) for e in result] == [("1k", 2), ("5k", 1)]
+
+    @respx.mock
+    @pytest.mark.asyncio()
+    async def test_get_activity_reads_through_mirror(self):
+        import strava_mcp.server as srv
+
+        srv.mirror.ingest(sample_activity_detail(9))
+        route = respx.get(f"{STRAVA_API_BASE}/activities/9").mock(
+            return_value=httpx.Response(200, json=sample_activity_detail(9))
+        )
+
+        result = await srv.get_activity(9)
+        assert result["id"] == 9
+        assert not route.called
+
+
+@pytest.mark.usefixtures("_wired")
+class TestGetSegmentAnalysisTool:
+    @respx.mock
+    @pytest.mark.asyncio()
+    async def test_answers_from_segment_index(self):
+        import strava_mcp.server as srv
+
+        segment = {"id": 77, "name": "Climb", "distance": 800}
+        details = {}
+        for activity_id, elapsed in ((1, 130), (2, 120)):
+            detail = sample_activity_detail(activity_id)
+            detail["segment_efforts"] = [{"elapsed_time": elapsed, "segment": segment}]
+            details[activity_id] = detail
+        srv.mirror.ingest(details[1])
+        respx.get(f"{STRAVA_API_BASE}/athlete/activities").mock(
+            return_value=httpx.Response(200, json=[sample_activity(1), sample_activity(2)])
+        )
+        old = respx.get(f"{STRAVA_API_BASE}/activities/1").mock(return_value=httpx.Response(200, json=details[1]))
+        new = respx.get(f"{STRAVA_API_BASE}/activities/2").mock(return_value=httpx.Response(200, json=details[2]))
+
+        [result] = await srv.get_segment_analysis(days=3650)
+        assert not old.called
+        assert new.call_count == 1
+        assert result["segment_name"] == "Climb"
+        assert result["effort_count"] == 2
+        assert result["best_time"] == "2:00"
+        assert result["improvement_pct"] == 7.7
+        assert result["trend_direction"] == "improving"
+        assert [e["elapsed_time_formatted"] for e in result["efforts"]] == ["2:10", "2:00"]
+
+
+@pytest.mark.usefixtures("_wired")
+class TestActivityMirrorSync:
+    @respx.mock
+    @pytest.mark.asyncio()
+    async def test_search_answers_locally_between_syncs(self):
+        from strava_mcp.server import search_activities
+
+        route = respx.get(f"{STRAVA_API_BASE}/athlete/activities").mock(
+            return_value=httpx.Response(200, json=[sample_activity(1), sample_activity(2, distance=21100.0)])
+        )
+
+        result = await search_activities(days=3650, min_distance_km=20)
+        assert [a["id"] for a in result] == [2]
+        assert result[0]["distance_km"] == 21.1
+
+        assert [a["id"] for a in await search_activities(days=3650, activity_type="run")] == [1, 2]
+        assert route.call_count == 1
+
+    @respx.mock
+    @pytest.mark.asyncio()
+    async def test_fetches_only_the_delta_after_the_newest_activity(self, monkeypatch):
+        import strava_mcp.server as srv
+
+        monkeypatch.setattr(srv, "ACTIVITY_SYNC_INTERVAL", 0)
+        route = respx.get(f"{STRAVA_API_BASE}/athlete/activities").mock(
+            side_effect=[
+                httpx.Response(200, json=[sample_activity(1)]),
+                httpx.Response(200, json=[sample_activity(2, start_date="2024-12-02T06:00:00Z")]),
+            ]
+        )
+
+        await srv.search_activities(days=3650)
+        result = await srv.search_activities(days=3650)
+        assert [a["id"] for a in result] == [1, 2]
+        assert route.calls[1].request.url.params["after"] == str(1_733_032_800 - 1)
+
+    @respx.mock
+    @pytest.mark.asyncio()
+    async def test_wider_window_backfills_only_the_older_span(self):
+        import strava_mcp.server as srv
+
+        route = respx.get(f"{STRAVA_API_BASE}/athlete/activities").mock(
+            side_effect=[
+                httpx.Response(200, json=[sample_activity(1)]),
+                httpx.Response(200, json=[sample_activity(3, start_date="2020-06-01T06:00:00Z")]),
+            ]
+        )
+
+        await srv.search_activities(days=3650)
+        covered_from = srv.mirror.activity_sync_state()["covered_from"]
+        result = await srv.search_activities(days=5000)
+
+        assert [a["id"] for a in result] == [3, 1]
+        assert route.calls[1].request.url.params["before"] == str(covered_from)
+
+    @respx.mock
+    @pytest.mark.asyncio()
+    async def test_weekly_summary_from_mirror(self):
+        from strava_mcp.server import get_weekly_summary
+
+        respx.get(f"{STRAVA_API_BASE}/athlete/activities").mock(
+            return_value=httpx.Response(
+                200,
+                json=[
+                    sample_activity(1, start_date="2024-12-02T06:00:00Z"),
+                    sample_activity(2, start_date="2024-12-04T06:00:00Z", distance=5000.0),
+                    sample_activity(3, start_date="2024-12-09T06:00:00Z", distance=12000.0),
+                    sample_activity(4, start_date="2024-12-10T06:00:00Z", type="Ride", sport_type="Ride"),
+                ],
+            )
+        )
+
+        result = await get_weekly_summary(weeks=520)
+        assert [(w["week"], w["run_count"], w["total_distance_km"]) for w in result] == [
+            ("2024-W49", 2, 15.0),
+            ("2024-W50", 1, 12.0),
+        ]
+        assert result[0]["week_over_week_change_pct"] is None
+        assert result[1]["week_over_week_change_pct"] == -20.0
+
+
+@pytest.fixture()
+def _expired_on_write(monkeypatch):
+    """Cache whose athlete_zones entries are already 10 seconds past expiry when written."""
+    import strava_mcp.server as srv
+
+    monkeypatch.setattr(srv, "cache", ActivityCache(srv.settings.db_path, policies=(("athlete_zones", -10),)))
+
+
+@pytest.mark.usefixtures("_wired", "_expired_on_write")
+class TestServeStale:
+    @respx.mock
+    @pytest.mark.asyncio()
+    async def test_expired_answer_served_tagged_and_refreshed(self):
+        import strava_mcp.server as srv
+
+        updated = {"heart_rate": {"custom_zones": True, "zones": []}}
+        release = asyncio.Event()
+
+        async def slow_zones(request):
+            await release.wait()
+            return httpx.Response(200, json=updated)
+
+        srv.cache.set("athlete_zones", sample_zones())
+        route = respx.get(f"{STRAVA_API_BASE}/athlete/zones").mock(side_effect=slow_zones)
+
+        result = await srv.get_athlete_zones()  # returns while Strava is still answering
+        assert result["stale_age_s"] == 0
+        assert result["heart_rate"]["custom_zones"] is False
+        assert "stale_age_s" not in srv.cache.get_entry("athlete_zones")[0]
+
+        await srv.get_athlete_zones()  # the refresh already in flight is not started again
+        release.set()
+        await asyncio.gather(*srv._refreshing.values())
+        assert route.call_count == 1
+        assert srv.cache.get_entry("athlete_zones")[0] == updated
+
+    @respx.mock
+    @pytest.mark.asyncio()
+    async def test_fresh_bypasses_cache(self):
+        import strava_mcp.server as srv
+
+        srv.cache.set("athlete_zones", {"old": True})
+        respx.get(f"{STRAVA_API_BASE}/athlete/zones").mock(return_value=httpx.Response(200, json=sample_zones()))
+
+        result = await srv.get_athlete_zones(fresh=True)
+        assert "stale_age_s" not in result
+        assert len(result["heart_rate"]["zones"]) == 5
+        assert srv._refreshing == {}
+
+    @respx.mock
+    @pytest.mark.asyncio()
+    async def test_too_stale_waits_for_strava(self, monkeypatch):
+        import dataclasses
+
+        import strava_mcp.server as srv
+
+        monkeypatch.setattr(srv, "settings", dataclasses.replace(srv.settings, max_staleness={"get_athlete_zones": 5}))
+        srv.cache.set("athlete_zones", {"old": True})
+        respx.get(f"{STRAVA_API_BASE}/athlete/zones").mock(return_value=httpx.Response(200, json=sample_zones()))
+
+        result = await srv.get_athlete_zones()
+        assert "old" not in result
+        assert "stale_age_s" not in result
+
+    @respx.mock
+    @pytest.mark.asyncio()
+    async def test_stale_list_items_are_tagged(self, monkeypatch):
+        import strava_mcp.server as srv
+
+        monkeypatch.setattr(srv, "cache", ActivityCache(srv.settings.db_path, policies=(("recent_activities_", -10),)))
+        srv.cache.set("recent_activities_30d", [{"id": 1}, {"id": 2}])
+        respx.get(f"{STRAVA_API_BASE}/athlete/activities").mock(return_value=httpx.Response(200, json=[]))
+
+        result = await srv.get_recent_activities(days=30)
+        assert [a["stale_age_s"] for a in result] == [0, 0]
+        await asyncio.gather(*srv._refreshing.values())
+        assert srv.cache.get_entry("recent_activities_30d")[0] == []
+
+
+@pytest.mark.usefixtures("_wired")
+class TestCacheStatsResource:
+    @respx.mock
+    @pytest.mark.asyncio()
+    async def test_reports_hits_and_misses(self):
+        from strava_mcp.server import cache_stats_resource, get_activity
+
+        respx.get(f"{STRAVA_API_BASE}/activities/1").mock(
+            return_value=httpx.Response(200, json=sample_activity_detail(1))
+        )
+        await get_activity(1)
+        await get_activity(1)
+
+        stats = await cache_stats_resource()
+        assert stats["misses"] == 1
+        assert stats["memory_hits"] == 1
+        assert stats["memory"]["entries"] == 1
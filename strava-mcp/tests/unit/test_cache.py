@@ -67,3 +67,122 @@ class TestActivityCache:
         data = [1, 2, 3, "four"]
         cache.set("list", data)
         assert cache.get("list") == data
+
+
+class TestGetEntry:
+    def test_fresh_entry_with_timestamps(self, cache):
+        cache.set("athlete_zones", {"z": 1})
+        value, cached_at, expires_at = cache.get_entry("athlete_zones")
+        assert value == {"z": 1}
+        assert expires_at - cached_at == 24 * 3600
+
+    def test_expired_entry_is_returned_and_kept(self, cache):
+        cache.set("recent_activities_30d", [{"id": 1}])
+
+        with patch("strava_mcp.cache.time") as mock_time:
+            mock_time.time.return_value = time.time() + 11 * 60
+            value, _, expires_at = cache.get_entry("recent_activities_30d")
+            assert value == [{"id": 1}]
+            assert expires_at < mock_time.time.return_value
+            assert cache.get_entry("recent_activities_30d") is not None
+        assert cache.stats()["stale_hits"] == 2
+
+    def test_expired_entry_is_read_back_from_disk(self, tmp_db):
+        ActivityCache(tmp_db).set("recent_activities_30d", [{"id": 1}])
+        reopened = ActivityCache(tmp_db)
+
+        with patch("strava_mcp.cache.time") as mock_time:
+            mock_time.time.return_value = time.time() + 11 * 60
+            assert reopened.get_entry("recent_activities_30d")[0] == [{"id": 1}]
+
+    def test_missing_entry(self, cache):
+        assert cache.get_entry("nope") is None
+        assert cache.stats()["misses"] == 1
+
+
+class TestTtlPolicies:
+    def test_activity_detail_and_streams_never_expire(self, cache):
+        assert cache.ttl_for("activity_123") is None
+        assert cache.ttl_for("streams_123_heartrate_time") is None
+        cache.set("activity_123", {"id": 123})
+
+        with patch("strava_mcp.cache.time") as mock_time:
+            mock_time.time.return_value = time.time() + 365 * 86400
+            assert cache.get("activity_123") == {"id": 123}
+            assert cache.clear_expired() == 0
+
+    def test_recent_lists_expire_quickly(self, cache):
+        cache.set("recent_activities_30d_1", [{"id": 1}])
+        cache.set("athlete_stats_1_1", {"x": 1})
+
+        with patch("strava_mcp.cache.time") as mock_time:
+            mock_time.time.return_value = time.time() + 11 * 60
+            assert cache.get("recent_activities_30d_1") is None
+            assert cache.get("athlete_stats_1_1") == {"x": 1}  # default 1-hour TTL
+
+    def test_legacy_rows_keep_global_ttl(self, tmp_path):
+        import sqlite3
+
+        db = str(tmp_path / "legacy.db")
+        with sqlite3.connect(db) as conn:
+            conn.execute("CREATE TABLE activity_cache (cache_key TEXT PRIMARY KEY, data TEXT NOT NULL, cached_at REAL)")
+            conn.execute("INSERT INTO activity_cache VALUES ('activity_1', '{\"id\": 1}', ?)", (time.time() - 7200,))
+            conn.execute("INSERT INTO activity_cache VALUES ('activity_2', '{\"id\": 2}', ?)", (time.time(),))
+
+        legacy = ActivityCache(db, ttl=3600)
+        assert legacy.get("activity_1") is None
+        assert legacy.get("activity_2") == {"id": 2}
+
+
+class TestTiers:
+    def test_memory_tier_serves_repeat_reads(self, cache):
+        cache.set("k", {"v": 1})
+        assert cache.get("k") == {"v": 1}
+        assert cache.get("k") == {"v": 1}
+
+        stats = cache.stats()
+        assert stats["memory_hits"] == 2
+        assert stats["disk_hits"] == 0
+        assert stats["hit_ratio"] == 1.0
+
+    def test_disk_tier_survives_restart_and_warms_memory(self, tmp_db, cache):
+        cache.set("k", {"v": 1})
+        fresh = ActivityCache(tmp_db)
+        assert fresh.get("k") == {"v": 1}
+        assert fresh.get("k") == {"v": 1}
+        assert fresh.get("missing") is None
+
+        stats = fresh.stats()
+        assert (stats["disk_hits"], stats["memory_hits"], stats["misses"]) == (1, 1, 1)
+
+    def test_memory_tier_is_bounded_lru(self, tmp_db):
+        small = ActivityCache(tmp_db, memory_entries=2)
+        small.set("a", 1)
+        small.set("b", 2)
+        small.get("a")
+        small.set("c", 3)  # evicts b, the least recently used
+
+        assert small.stats()["memory"]["entries"] == 2
+        assert small.stats()["memory_evictions"] == 1
+        assert small.get("b") == 2  # still on disk
+        assert small.stats()["disk_hits"] == 1
+
+    def test_disk_tier_evicts_oldest_beyond_byte_bound(self, tmp_db):
+        small = ActivityCache(tmp_db, disk_bytes=1000)
+        payload = "x" * 200
+        for i in range(10):
+            small.set(f"activity_{i}", payload)
+
+        stats = small.stats()
+        assert stats["disk"]["bytes"] <= 1000
+        assert stats["disk_evictions"] > 0
+        fresh = ActivityCache(tmp_db)
+        assert fresh.get("activity_0") is None
+        assert fresh.get("activity_9") == payload
+
+    def test_delete_removes_both_tiers(self, tmp_db, cache):
+        cache.set("k", {"v": 1})
+        cache.delete("k")
+        assert cache.get("k") is None
+        assert ActivityCache(tmp_db).get("k") is None
+        assert cache.stats()["disk"]["bytes"] == 0
@@ -92,6 +92,27 @@ class TestStravaClient:
         assert "splits_metric" in result
         await strava_client.close()
 
+    @respx.mock
+    @pytest.mark.asyncio()
+    async def test_concurrent_identical_gets_share_one_request(self, strava_client):
+        import asyncio
+
+        async def slow_detail(request):
+            await asyncio.sleep(0.02)
+            return httpx.Response(200, json=sample_activity_detail(42))
+
+        route = respx.get(f"{STRAVA_API_BASE}/activities/42").mock(side_effect=slow_detail)
+        other = respx.get(f"{STRAVA_API_BASE}/activities/43").mock(
+            return_value=httpx.Response(200, json=sample_activity_detail(43))
+        )
+
+        results = await asyncio.gather(*(strava_client.get_activity(i) for i in (42, 42, 42, 43)))
+        assert [r["id"] for r in results] == [42, 42, 42, 43]
+        assert route.call_count == 1
+        assert other.call_count == 1
+        assert strava_client.flights.stats()["collapsed"] == 2
+        await strava_client.close()
+
     @respx.mock
     @pytest.mark.asyncio()
     async def test_get_activity_streams(self, strava_client):
@@ -24,6 +24,20 @@ class TestSettings:
         assert s.refresh_token == "ref456"
         assert s.host == "0.0.0.0"
         assert s.port == 9000
+        assert s.http2 is False
+
+    def test_from_env_max_staleness(self, monkeypatch):
+        monkeypatch.setenv("STRAVA_MCP_MAX_STALENESS", "get_weekly_summary=600, get_athlete_stats=0")
+        assert Settings.from_env().max_staleness == {"get_weekly_summary": 600.0, "get_athlete_stats": 0.0}
+
+    def test_from_env_malformed_max_staleness_raises(self, monkeypatch):
+        monkeypatch.setenv("STRAVA_MCP_MAX_STALENESS", "get_weekly_summary")
+        with pytest.raises(ValueError, match="tool=seconds"):
+            Settings.from_env()
+
+    def test_from_env_http2(self, monkeypatch):
+        monkeypatch.setenv("STRAVA_MCP_HTTP2", "true")
+        assert Settings.from_env().http2 is True
 
     def test_from_env_missing_client_id_raises(self, monkeypatch):
         monkeypatch.setattr("strava_mcp.config._find_env_file", lambda: None)
@@ -0,0 +1,207 @@
+"""Unit tests for the shared Strava rate-limit governor."""
+
+from __future__ import annotations
+
+import httpx
+import pytest
+import respx
+
+from strava_mcp.client import STRAVA_API_BASE, StravaAPIError, StravaClient
+from strava_mcp.governor import LANE_RESERVE, RateLimitGovernor
+
+from ..conftest import sample_athlete
+
+# 10:07:30 UTC: 450s into a 15-minute window, 36450s into the day.
+T0 = 1_773_310_050.0
+
+
+class _Clock:
+    def __init__(self, now: float = T0) -> None:
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture()
+def clock():
+    return _Clock()
+
+
+@pytest.fixture()
+def governor(tmp_db, clock):
+    return RateLimitGovernor(tmp_db, clock=clock)
+
+
+def _headers(usage: str, limit: str = "100, 1000") -> httpx.Headers:
+    return httpx.Headers({"X-RateLimit-Usage": usage, "X-RateLimit-Limit": limit})
+
+
+class TestRateLimitGovernor:
+    def test_acquire_counts_against_both_buckets(self, governor):
+        assert governor.try_acquire() == 0
+        assert governor.try_acquire() == 0
+
+        snap = governor.snapshot()
+        assert snap["fifteen_min"] == {"used": 2, "capacity": 100, "resets_in_s": 450}
+        assert snap["daily"]["used"] == 2
+        assert snap["daily"]["capacity"] == 1000
+
+    def test_seeded_from_headers(self, governor):
+        governor.observe(_headers("99, 500", "100, 1000"))
+        assert governor.try_acquire("interactive") == 0
+        assert governor.try_acquire("interactive") == 450  # seconds until the 15-minute window rolls over
+
+    def test_read_limit_headers_take_precedence(self, governor):
+        governor.observe(
+            httpx.Headers(
+                {
+                    "X-RateLimit-Usage": "10, 10",
+                    "X-RateLimit-Limit": "200, 2000",
+                    "X-ReadRateLimit-Usage": "7, 7",
+                    "X-ReadRateLimit-Limit": "100, 1000",
+                }
+            )
+        )
+        snap = governor.snapshot()
+        assert snap["fifteen_min"]["used"] == 7
+        assert snap["fifteen_min"]["capacity"] == 100
+
+    def test_headers_never_lower_the_local_count(self, governor):
+        for _ in range(5):
+            governor.try_acquire()
+        governor.observe(_headers("3, 3"))
+        assert governor.snapshot()["fifteen_min"]["used"] == 5
+
+    def test_malformed_headers_are_ignored(self, governor):
+        governor.observe(_headers("lots, more"))
+        assert governor.snapshot()["fifteen_min"]["used"] == 0
+
+    def test_bucket_refills_when_window_rolls_over(self, governor, clock):
+        governor.observe(_headers("100, 500"))
+        assert governor.try_acquire() == 450
+
+        clock.now += 450
+        assert governor.try_acquire() == 0
+        snap = governor.snapshot()
+        assert snap["fifteen_min"]["used"] == 1
+        assert snap["daily"]["used"] == 501
+
+    def test_daily_bucket_blocks_until_midnight(self, governor):
+        governor.observe(_headers("5, 1000"))
+        assert governor.try_acquire() == 86400 - 36450
+
+    def test_background_lane_leaves_reserve_for_interactive(self, governor):
+        reserve = LANE_RESERVE["background"]["fifteen_min"]
+        governor.observe(_headers(f"{100 - reserve}, 0"))
+
+        assert governor.try_acquire("background") == 450
+        assert governor.try_acquire("interactive") == 0
+
+    def test_shared_between_instances(self, tmp_db, clock):
+        server = RateLimitGovernor(tmp_db, clock=clock)
+        sync = RateLimitGovernor(tmp_db, clock=clock)
+        server.observe(_headers("98, 0"))
+
+        assert sync.try_acquire("interactive") == 0
+        assert server.try_acquire("interactive") == 0
+        assert sync.try_acquire("interactive") > 0
+
+    def test_keeps_one_connection_until_closed(self, tmp_db, clock, monkeypatch):
+        import sqlite3
+
+        opened = []
+        connect = sqlite3.connect
+        monkeypatch.setattr(sqlite3, "connect", lambda *a, **kw: opened.append(a) or connect(*a, **kw))
+        governor = RateLimitGovernor(tmp_db, clock=clock)
+        governor.try_acquire()
+        governor.observe(_headers("3, 3"))
+        governor.snapshot()
+        assert len(opened) == 1
+
+        governor.close()
+        assert governor.snapshot()["fifteen_min"]["used"] == 3
+        assert len(opened) == 2
+
+    def test_exhaust_empties_fifteen_minute_bucket(self, governor):
+        governor.exhaust()
+        assert governor.try_acquire() == 450
+        assert governor.snapshot()["daily"]["used"] == 0
+
+
+class TestClientGovernance:
+    @pytest.fixture()
+    def slept(self, monkeypatch, clock):
+        """Patch asyncio.sleep to advance the governor's clock instead of waiting."""
+        import asyncio
+
+        calls: list[float] = []
+
+        async def _sleep(seconds):
+            calls.append(seconds)
+            clock.now += seconds
+
+        monkeypatch.setattr(asyncio, "sleep", _sleep)
+        return calls
+
+    @respx.mock
+    @pytest.mark.asyncio()
+    async def test_interactive_fails_fast_without_calling_strava(self, settings, token_store, governor, slept):
+        route = respx.get(f"{STRAVA_API_BASE}/athlete").mock(return_value=httpx.Response(200, json=sample_athlete()))
+        governor.observe(_headers("100, 100"))
+        client = StravaClient(settings, token_store, governor=governor)
+
+        with pytest.raises(StravaAPIError, match="rate limit") as exc:
+            await client.get_athlete()
+        assert exc.value.status_code == 429
+        assert not route.called
+        assert slept == []
+        await client.close()
+
+    @respx.mock
+    @pytest.mark.asyncio()
+    async def test_governor_runs_off_the_event_loop(self, settings, token_store, governor):
+        import threading
+
+        respx.get(f"{STRAVA_API_BASE}/athlete").mock(
+            return_value=httpx.Response(200, json=sample_athlete(), headers=_headers("1, 1"))
+        )
+        threads = []
+        for name in ("try_acquire", "observe"):
+            method = getattr(governor, name)
+            setattr(governor, name, lambda *a, _m=method: threads.append(threading.current_thread()) or _m(*a))
+        client = StravaClient(settings, token_store, governor=governor)
+
+        await client.get_athlete()
+        assert len(threads) == 2
+        assert threading.main_thread() not in threads
+        await client.close()
+
+    @respx.mock
+    @pytest.mark.asyncio()
+    async def test_background_waits_for_window_then_proceeds(self, settings, token_store, governor, slept):
+        respx.get(f"{STRAVA_API_BASE}/athlete").mock(return_value=httpx.Response(200, json=sample_athlete()))
+        governor.observe(_headers("80, 100"))
+        client = StravaClient(settings, token_store, governor=governor, lane="background")
+
+        result = await client.get_athlete()
+        assert result["id"] == 123456
+        assert slept == [450]
+        await client.close()
+
+    @respx.mock
+    @pytest.mark.asyncio()
+    async def test_429_waits_on_governor_before_retrying(self, settings, token_store, governor, slept):
+        respx.get(f"{STRAVA_API_BASE}/athlete").mock(
+            side_effect=[
+                httpx.Response(429, json={"message": "Rate Limit Exceeded"}),
+                httpx.Response(200, json=sample_athlete(), headers=_headers("1, 101")),
+            ]
+        )
+        client = StravaClient(settings, token_store, governor=governor, lane="background")
+
+        result = await client.get_athlete()
+        assert result["id"] == 123456
+        assert slept == [450]
+        assert governor.snapshot()["fifteen_min"]["used"] == 1
+        await client.close()
@@ -0,0 +1,190 @@
+"""Unit tests for the local activity-detail mirror."""
+
+from __future__ import annotations
+
+import json
+import sqlite3
+import zlib
+
+import pytest
+
+from strava_mcp.mirror import ActivityMirror
+
+from ..conftest import sample_activity, sample_activity_detail
+
+
+def _detail(activity_id: int, start_date: str, **efforts: int) -> dict:
+    detail = sample_activity_detail(activity_id)
+    detail["start_date"] = start_date
+    detail["best_efforts"] = [
+        {"name": name, "elapsed_time": elapsed, "distance": {"1k": 1000, "5k": 5000}[name]}
+        for name, elapsed in efforts.items()
+    ]
+    return detail
+
+
+def _segment_detail(activity_id: int, start_date: str, *times: int, sport_type: str = "Run") -> dict:
+    detail = sample_activity_detail(activity_id)
+    detail.update(start_date=start_date, sport_type=sport_type)
+    detail["segment_efforts"] = [
+        {"elapsed_time": t, "average_heartrate": 160, "segment": {"id": 10 + i, "name": f"Hill {i}", "distance": 400}}
+        for i, t in enumerate(times)
+    ]
+    return detail
+
+
+@pytest.fixture()
+def mirror(tmp_db):
+    return ActivityMirror(tmp_db)
+
+
+class TestActivityMirror:
+    def test_ingest_and_get_round_trip(self, mirror):
+        detail = sample_activity_detail(7)
+        mirror.ingest(detail)
+        assert mirror.get(7) == detail
+
+    def test_get_unknown_activity(self, mirror):
+        assert mirror.get(404) is None
+
+    def test_missing_preserves_order(self, mirror):
+        mirror.ingest(sample_activity_detail(2))
+        assert mirror.missing([3, 2, 1]) == [3, 1]
+        assert mirror.missing([]) == []
+
+    def test_best_effort_per_distance(self, mirror):
+        mirror.ingest(_detail(1, "2025-01-01T06:00:00Z", **{"1k": 280, "5k": 1500}))
+        mirror.ingest(_detail(2, "2025-02-01T06:00:00Z", **{"1k": 265, "5k": 1520}))
+
+        result = mirror.best_efforts("2024-01-01T00:00:00Z")
+        assert [(e["distance_name"], e["elapsed_time"], e["activity_id"]) for e in result] == [
+            ("1k", 265, 2),
+            ("5k", 1500, 1),
+        ]
+        assert result[0]["activity_name"] == "Morning Run #2"
+        assert result[0]["activity_date"] == "2025-02-01T06:00:00Z"
+
+    def test_best_efforts_respects_since(self, mirror):
+        mirror.ingest(_detail(1, "2024-06-01T06:00:00Z", **{"1k": 250}))
+        mirror.ingest(_detail(2, "2025-06-01T06:00:00Z", **{"1k": 290}))
+
+        result = mirror.best_efforts("2025-01-01T00:00:00Z")
+        assert [(e["elapsed_time"], e["activity_id"]) for e in result] == [(290, 2)]
+
+    def test_reingest_replaces_efforts(self, mirror):
+        mirror.ingest(_detail(1, "2025-01-01T06:00:00Z", **{"1k": 280, "5k": 1500}))
+        mirror.ingest(_detail(1, "2025-01-01T06:00:00Z", **{"1k": 300}))
+
+        result = mirror.best_efforts("2024-01-01T00:00:00Z")
+        assert [(e["distance_name"], e["elapsed_time"]) for e in result] == [("1k", 300)]
+
+    def test_persists_across_instances(self, tmp_db):
+        ActivityMirror(tmp_db).ingest(sample_activity_detail(5))
+        assert ActivityMirror(tmp_db).missing([5, 6]) == [6]
+
+
+class TestSegmentStats:
+    def test_trend_compares_later_half_to_earlier_half(self, mirror):
+        for i, t in enumerate([120, 110, 100, 90]):
+            mirror.ingest(_segment_detail(i + 1, f"2025-0{i + 1}-01T06:00:00Z", t))
+
+        [segment] = mirror.segment_stats("2025-01-01T00:00:00Z")
+        assert segment["segment_id"] == 10
+        assert segment["segment_name"] == "Hill 0"
+        assert segment["effort_count"] == 4
+        assert segment["best_time_seconds"] == 90
+        assert segment["worst_time_seconds"] == 120
+        assert segment["trend_pct"] == -17.4  # (95 - 115) / 115
+        assert [e["elapsed_time"] for e in segment["efforts"]] == [120, 110, 100, 90]
+        assert segment["efforts"][0]["activity_name"] == "Morning Run #1"
+
+    def test_min_efforts_and_window(self, mirror):
+        mirror.ingest(_segment_detail(1, "2024-06-01T06:00:00Z", 100, 200))
+        mirror.ingest(_segment_detail(2, "2025-06-01T06:00:00Z", 110, 210))
+        mirror.ingest(_segment_detail(3, "2025-07-01T06:00:00Z", 105))
+
+        result = mirror.segment_stats("2025-01-01T00:00:00Z", min_efforts=2)
+        assert [(s["segment_id"], s["effort_count"]) for s in result] == [(10, 2)]
+        assert result[0]["trend_pct"] == -4.5
+
+        singles = mirror.segment_stats("2025-01-01T00:00:00Z", min_efforts=1)
+        assert [s["segment_id"] for s in singles] == [10, 11]
+        assert singles[1]["trend_pct"] == 0.0
+
+    def test_rides_are_excluded(self, mirror):
+        mirror.ingest(_segment_detail(1, "2025-01-01T06:00:00Z", 100))
+        mirror.ingest(_segment_detail(2, "2025-02-01T06:00:00Z", 60, sport_type="Ride"))
+
+        [segment] = mirror.segment_stats("2025-01-01T00:00:00Z", min_efforts=1)
+        assert segment["effort_count"] == 1
+
+    def test_existing_details_are_backfilled(self, tmp_db):
+        detail = _segment_detail(1, "2025-01-01T06:00:00Z", 100)
+        with sqlite3.connect(tmp_db) as conn:
+            conn.execute(
+                """CREATE TABLE activity_detail (activity_id INTEGER PRIMARY KEY, name TEXT, sport_type TEXT,
+                   start_date TEXT, fetched_at REAL NOT NULL, payload BLOB NOT NULL)"""
+            )
+            conn.execute(
+                "INSERT INTO activity_detail VALUES (1, ?, 'Run', ?, 0, ?)",
+                (detail["name"], detail["start_date"], zlib.compress(json.dumps(detail).encode())),
+            )
+        conn.close()
+
+        [segment] = ActivityMirror(tmp_db).segment_stats("2025-01-01T00:00:00Z", min_efforts=1)
+        assert segment["effort_count"] == 1
+
+
+class TestActivitySummaries:
+    def test_search_pushes_filters_down(self, mirror):
+        mirror.upsert_activities(
+            [
+                sample_activity(1, start_date="2025-03-03T06:00:00Z", distance=5000.0),
+                sample_activity(2, start_date="2025-03-04T06:00:00Z", distance=21100.0, name="Half_Marathon Race"),
+                sample_activity(3, start_date="2025-03-05T06:00:00Z", type="Ride", sport_type="Ride"),
+                sample_activity(4, start_date="2025-03-06T06:00:00Z", sport_type="TrailRun", distance=12000.0),
+            ],
+            covered_from=0,
+        )
+        after = 1_740_000_000  # 2025-02-19
+
+        def ids(**filters):
+            return [a["activity_id"] for a in mirror.search_activities(after, **filters)]
+
+        assert ids() == [1, 2, 3, 4]
+        assert ids(activity_type="ride") == [3]
+        assert ids(activity_type="trailrun") == [4]
+        assert ids(min_distance_m=10000, max_distance_m=15000) == [3, 4]
+        assert ids(name_contains="half_") == [2]
+        assert ids(name_contains="%") == []
+        assert mirror.search_activities(1_741_300_000) == []  # after every activity
+
+    def test_weekly_run_totals_group_by_iso_week(self, mirror):
+        mirror.upsert_activities(
+            [
+                sample_activity(1, start_date="2024-12-29T06:00:00Z", distance=8000.0),  # Sunday of 2024-W52
+                sample_activity(2, start_date="2024-12-30T06:00:00Z", distance=10000.0),  # Monday of 2025-W01
+                sample_activity(3, start_date="2025-01-02T06:00:00Z", distance=6000.0, moving_time=2000),
+                sample_activity(4, start_date="2025-01-03T06:00:00Z", type="Ride", sport_type="Ride"),
+            ],
+            covered_from=0,
+        )
+
+        weeks = mirror.weekly_run_totals(0)
+        assert [(w["week"], w["run_count"]) for w in weeks] == [("2024-W52", 1), ("2025-W01", 2)]
+        assert weeks[1]["total_distance_m"] == 16000.0
+        assert weeks[1]["total_time_s"] == 5000
+        assert weeks[1]["longest_run_m"] == 10000.0
+        assert mirror.run_ids(1_735_500_000) == [2, 3]  # from 2024-12-29T19:20Z; the ride is left out
+
+    def test_sync_state_only_widens(self, mirror):
+        assert mirror.activity_sync_state() is None
+        assert mirror.newest_activity_start() is None
+
+        mirror.upsert_activities([sample_activity(1)], covered_from=1000, synced_at=50.0)
+        mirror.upsert_activities([], covered_from=2000, synced_at=40.0)
+        assert mirror.activity_sync_state() == {"covered_from": 1000, "synced_at": 50.0}
+
+        mirror.upsert_activities([], covered_from=500)
+        assert mirror.activity_sync_state() == {"covered_from": 500, "synced_at": 50.0}
+        assert mirror.newest_activity_start() == 1_733_032_800  # 2024-12-01T06:00:00Z
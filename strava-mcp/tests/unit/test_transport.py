@@ -0,0 +1,115 @@
+"""Unit tests for the HTTP transport helpers."""
+
+from __future__ import annotations
+
+import asyncio
+
+import httpx
+import pytest
+
+from strava_mcp.transport import POOL_LIMITS, SingleFlight, ValidatorStore, build_http_client, validator_key
+
+
+@pytest.fixture()
+def store(tmp_db):
+    return ValidatorStore(tmp_db)
+
+
+class TestValidatorStore:
+    def test_nothing_stored_means_no_conditional_headers(self, store):
+        assert store.conditional_headers("GET /athlete") == {}
+        assert store.not_modified("GET /athlete") is None
+
+    def test_stores_body_with_its_validators(self, store):
+        resp = httpx.Response(200, headers={"ETag": '"abc"', "Last-Modified": "Wed, 11 Mar 2026 10:00:00 GMT"})
+        store.store("GET /athlete", resp, {"id": 1})
+
+        assert store.conditional_headers("GET /athlete") == {
+            "If-None-Match": '"abc"',
+            "If-Modified-Since": "Wed, 11 Mar 2026 10:00:00 GMT",
+        }
+        assert store.not_modified("GET /athlete") == {"id": 1}
+
+    def test_response_without_validators_is_not_stored(self, store):
+        store.store("GET /athlete", httpx.Response(200), {"id": 1})
+        assert store.conditional_headers("GET /athlete") == {}
+        assert store.stats()["stored"] == 0
+
+    def test_key_ignores_parameter_order(self):
+        assert validator_key("GET", "/gear/g1", {"b": 2, "a": 1}) == validator_key("GET", "/gear/g1", {"a": 1, "b": 2})
+        assert validator_key("GET", "/athlete") == "GET /athlete"
+
+
+class TestBuildHttpClient:
+    @pytest.mark.asyncio()
+    async def test_pool_limits_applied(self):
+        client = build_http_client("http://127.0.0.1")
+        pool = client._transport._pool
+        assert pool._max_connections == POOL_LIMITS.max_connections
+        assert pool._max_keepalive_connections == POOL_LIMITS.max_keepalive_connections
+        await client.aclose()
+
+    @pytest.mark.asyncio()
+    async def test_http2_falls_back_without_h2(self):
+        client = build_http_client("http://127.0.0.1", http2=True)
+        assert isinstance(client, httpx.AsyncClient)
+        await client.aclose()
+
+
+class TestSingleFlight:
+    @pytest.mark.asyncio()
+    async def test_concurrent_calls_share_one_result(self):
+        flights = SingleFlight()
+        calls = 0
+
+        async def fetch():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.01)
+            return {"id": 1}
+
+        results = await asyncio.gather(*(flights.do("k", fetch) for _ in range(5)))
+        assert calls == 1
+        assert results == [{"id": 1}] * 5
+        assert len({id(r) for r in results}) == 5  # followers get copies
+        assert flights.stats() == {"calls": 5, "collapsed": 4, "in_flight": 0}
+
+    @pytest.mark.asyncio()
+    async def test_error_is_shared(self):
+        flights = SingleFlight()
+
+        async def fail():
+            await asyncio.sleep(0.01)
+            raise RuntimeError("boom")
+
+        results = await asyncio.gather(flights.do("k", fail), flights.do("k", fail), return_exceptions=True)
+        assert [str(r) for r in results] == ["boom", "boom"]
+
+    @pytest.mark.asyncio()
+    async def test_different_keys_and_sequential_calls_are_not_collapsed(self):
+        flights = SingleFlight()
+
+        async def fetch():
+            await asyncio.sleep(0)
+            return 1
+
+        await asyncio.gather(flights.do("a", fetch), flights.do("b", fetch))
+        await flights.do("a", fetch)
+        assert flights.stats()["collapsed"] == 0
+
+    @pytest.mark.asyncio()
+    async def test_cancelled_leader_does_not_cancel_followers(self):
+        flights = SingleFlight()
+        release = asyncio.Event()
+
+        async def fetch():
+            await release.wait()
+            return "done"
+
+        leader = asyncio.ensure_future(flights.do("k", fetch))
+        await asyncio.sleep(0)
+        follower = asyncio.ensure_future(flights.do("k", fetch))
+        await asyncio.sleep(0)
+        leader.cancel()
+        release.set()
+        assert await follower == "done"
@@ -6,6 +6,7 @@ import asyncio
 import json
 import re
 import subprocess
+import threading
 from concurrent.futures import ThreadPoolExecutor
 
 from flask import Flask, Response, render_template_string, request, session
@@ -66,6 +67,9 @@ from ui.templates import (
 app = Flask(__name__)
 app.secret_key = "pace-ai-dev-key"
 
+# Sync runs off the request thread; pages only ever read what has already been synced.
+_sync_thread: threading.Thread | None = None
+
 
 @app.after_request
 def _auto_persist_session(response):
@@ -89,6 +93,10 @@ def index():
 
         goals = get_goals(db)
         has_race_goals = bool(goals)
+        # Drop the cached status once a sync (here or in pace-ai-syncd) changed its inputs
+        if "status_change_seq" in store and db.change_seq() > store["status_change_seq"]:
+            for key in ("status_snapshot", "status_generated_at", "status_change_seq"):
+                store.pop(key, None)
     except Exception:
         pass
 
@@ -131,6 +139,8 @@ def index():
             sync_status = "Not synced yet — click Sync All to load your data"
     except Exception:
         pass
+    if _sync_thread is not None and _sync_thread.is_alive():
+        sync_status = "Sync in progress — refresh to see new data"
 
     return render_template_string(
         HTML,
@@ -509,6 +519,7 @@ def status():
 
     # 1. Gather all data upfront
     db = HistoryDB(DB_PATH)
+    change_seq = db.change_seq()
     data = _gather_status_data(db)
 
     # 2. Direct-render data-only sections
@@ -570,6 +581,7 @@ def status():
 
     store["status_snapshot"] = status_snapshot
     store["status_generated_at"] = datetime.now().isoformat()
+    store["status_change_seq"] = change_seq
     store["messages"].append(
         {"role": "assistant", "content": rendered, "agent": "status"}
     )
@@ -593,6 +605,7 @@ def plan():
     if not store.get("status_snapshot"):
         log.info("No status cached — auto-generating before plan (parallel)")
         db = HistoryDB(DB_PATH)
+        change_seq = db.change_seq()
         status_data = _gather_status_data(db)
 
         schedule_html = _render_schedule_html(status_data.get("schedule") or [])
@@ -635,6 +648,7 @@ def plan():
             snapshot_parts.append(readiness_raw)
         store["status_snapshot"] = "\n\n".join(snapshot_parts)
         store["status_generated_at"] = datetime.now().isoformat()
+        store["status_change_seq"] = change_seq
         store["messages"].append(
             {"role": "assistant", "content": rendered_status, "agent": "status"}
         )
@@ -918,34 +932,33 @@ def end_session():
     )
 
 
-@app.route("/sync", methods=["POST"])
-def sync():
-    db = HistoryDB(DB_PATH)
+def _background_sync() -> None:
     try:
-        result = asyncio.run(_sync_all(db))
-    except Exception as e:
+        result = asyncio.run(_sync_all(HistoryDB(DB_PATH)))
+    except Exception:
         log.exception("sync_all failed")
-        store = _get_store()
-        store["messages"].append({"role": "assistant", "content": f"Sync failed: {e}"})
-        return Response(status=302, headers={"Location": "/"})
-
-    # Summarise results for the chat
-    parts = []
-    for source, info in result.get("results", {}).items():
-        count = info.get("activities_synced") or info.get("records_synced", 0)
-        parts.append(f"{source}: {count}")
+        return
     errors = result.get("errors", {})
-    summary = "Sync complete — " + ", ".join(parts)
-    if errors:
-        summary += f" | errors: {', '.join(errors)}"
-
-    store = _get_store()
-    store["messages"].append({"role": "assistant", "content": summary})
+    log.info(
+        "sync complete%s — %d source(s) synced%s",
+        f" (joined in-flight run {result['joined']})" if result.get("joined") else "",
+        result.get("sources_synced", 0),
+        f", errors: {', '.join(errors)}" if errors else "",
+    )
 
-    # Invalidate cached status so next calls pick up fresh data
-    store.pop("status_snapshot", None)
-    store.pop("status_generated_at", None)
 
+@app.route("/sync", methods=["POST"])
+def sync():
+    global _sync_thread
+    store = _get_store()
+    if _sync_thread is not None and _sync_thread.is_alive():
+        message = "A sync is already running — refresh in a minute to see new data."
+    else:
+        # The cached status is dropped on the next page load if this sync changes anything
+        _sync_thread = threading.Thread(target=_background_sync, name="pace-ai-ui-sync", daemon=True)
+        _sync_thread.start()
+        message = "Sync started in the background — refresh in a minute to see new data."
+    store["messages"].append({"role": "assistant", "content": message})
     return Response(status=302, headers={"Location": "/"})
 
 
@@ -29,6 +29,18 @@ from ui.config import (
     log,
 )
 
+# Columns the activity summaries below actually render; keeps status builds from
+# loading descriptions and notes for every activity in the window.
+_ACTIVITY_SUMMARY_COLUMNS = (
+    "date",
+    "name",
+    "sport_type",
+    "distance_m",
+    "average_speed_ms",
+    "average_hr",
+    "elapsed_time_s",
+)
+
 
 def _get_upcoming_schedule(days: int = 10) -> list[dict]:
     """Fetch upcoming scheduled workouts from Garmin calendar.
@@ -279,7 +291,9 @@ def _build_diary_section(db: HistoryDB, days: int = 7) -> str | None:
             return None
 
         # Build a lookup of activities by date for annotation
-        activities = get_recent_activities(db, days=days)
+        activities = get_recent_activities(
+            db, days=days, columns=_ACTIVITY_SUMMARY_COLUMNS
+        )
         activities_by_date: dict[str, list[str]] = {}
         for a in activities:
             a_date = a.get("date", "")[:10]
@@ -640,7 +654,9 @@ def _gather_status_data(db: HistoryDB) -> dict:
         data["profile"] = None
 
     try:
-        data["activities"] = get_recent_activities(db, days=28)
+        data["activities"] = get_recent_activities(
+            db, days=28, columns=_ACTIVITY_SUMMARY_COLUMNS
+        )
     except Exception:
         log.exception("Failed to load recent activities")
         data["activities"] = []
@@ -851,7 +867,9 @@ def _build_status_context_full() -> str:
         log.exception("Failed to load athlete profile")
 
     try:
-        activities = get_recent_activities(db, days=28)
+        activities = get_recent_activities(
+            db, days=28, columns=_ACTIVITY_SUMMARY_COLUMNS
+        )
         if activities:
             sections.append(
                 f"## Recent Activities (28 days, {len(activities)} total)\n"
@@ -1065,7 +1083,9 @@ def _build_nutrition_context(
 
     # Recent activity summary and weekly distances
     try:
-        activities = get_recent_activities(db, days=14)
+        activities = get_recent_activities(
+            db, days=14, columns=_ACTIVITY_SUMMARY_COLUMNS
+        )
         if activities:
             lines = []
             for a in activities:
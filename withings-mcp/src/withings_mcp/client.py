@@ -2,10 +2,14 @@
 
 from __future__ import annotations
 
+import copy
 import logging
+import threading
 from typing import TYPE_CHECKING, Any
 
 if TYPE_CHECKING:
+    from collections.abc import Callable, Hashable
+
     from withings_sync.withings2 import WithingsAccount, WithingsMeasureGroup
 
     from withings_mcp.config import Settings
@@ -29,18 +33,87 @@ class WithingsAPIError(RuntimeError):
         }
 
 
+class _Flight:
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: BaseException | None = None
+
+
+class SingleFlight:
+    """Collapse concurrent identical calls into one, across threads.
+
+    The first thread to ask for a key makes the call; threads asking for it while
+    the call is in flight wait and get a copy of its result, or its exception.
+    Server tools call the client through ``asyncio.to_thread``, so two identical
+    tool calls land here on different worker threads.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._flights: dict[Hashable, _Flight] = {}
+        self._counters = dict.fromkeys(("calls", "collapsed"), 0)
+
+    def do(self, key: Hashable, call: Callable[[], Any]) -> Any:
+        with self._lock:
+            self._counters["calls"] += 1
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = _Flight()
+            else:
+                self._counters["collapsed"] += 1
+
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return copy.deepcopy(flight.result)
+
+        try:
+            flight.result = call()
+        except BaseException as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._flights[key]
+            flight.done.set()
+        return flight.result
+
+    def stats(self) -> dict[str, int]:
+        """Calls made through the layer, how many of them joined one already in flight, and flights open now."""
+        with self._lock:
+            return {**self._counters, "in_flight": len(self._flights)}
+
+
 class WithingsClient:
-    """Wraps withings-sync WithingsAccount with lazy init and error handling."""
+    """Wraps withings-sync WithingsAccount with lazy init and error handling.
+
+    Concurrent identical reads share one request.
+    """
 
     def __init__(self, settings: Settings) -> None:
         self._settings = settings
         self._account: WithingsAccount | None = None
+        self._login_lock = threading.Lock()
+        self.flights = SingleFlight()
 
     def _ensure_account(self) -> WithingsAccount:
-        """Lazily initialize the Withings account (triggers auth if needed)."""
-        if self._account is not None:
+        """Lazily initialize the Withings account (triggers auth if needed).
+
+        Safe to call from several threads at once: only the first caller logs in.
+        """
+        account = self._account
+        if account is not None:
+            return account
+        with self._login_lock:
+            if self._account is None:
+                self._login()
             return self._account
 
+    def _login(self) -> None:
+        """Create the Withings account; caller holds ``_login_lock``."""
         try:
             from withings_mcp.auth import create_account
 
@@ -52,8 +125,6 @@ class WithingsClient:
                 action="Check your Withings credentials and re-authenticate.",
             ) from e
 
-        return self._account
-
     def _call_measurements(self, startdate: int, enddate: int) -> list[WithingsMeasureGroup] | None:
         """Call get_measurements with error handling."""
         account = self._ensure_account()
@@ -79,6 +150,11 @@ class WithingsClient:
 
         Returns list of parsed measurement dicts with named fields.
         """
+        return self.flights.do(
+            ("get_measurements", startdate, enddate), lambda: self._fetch_measurements(startdate, enddate)
+        )
+
+    def _fetch_measurements(self, startdate: int, enddate: int) -> list[dict[str, Any]]:
         groups = self._call_measurements(startdate, enddate)
         if groups is None:
             return []
@@ -86,6 +162,9 @@ class WithingsClient:
 
     def get_height(self) -> float | None:
         """Get the user's height in meters."""
+        return self.flights.do(("get_height",), self._fetch_height)
+
+    def _fetch_height(self) -> float | None:
         account = self._ensure_account()
         try:
             return account.get_height()
@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import asyncio
 import time
 from datetime import datetime, timedelta, timezone
 from typing import Any
@@ -54,7 +55,7 @@ async def get_measurements(from_date: str, to_date: str) -> dict:
     try:
         startdate = _date_to_timestamp(from_date)
         enddate = _date_to_timestamp(to_date, end_of_day=True)
-        measurements = withings.get_measurements(startdate, enddate)
+        measurements = await asyncio.to_thread(withings.get_measurements, startdate, enddate)
         return {
             "from_date": from_date,
             "to_date": to_date,
@@ -75,7 +76,7 @@ async def get_latest_weight() -> dict:
         now = int(time.time())
         # Look back 90 days for the most recent measurement
         startdate = now - (90 * 86400)
-        measurements = withings.get_measurements(startdate, now)
+        measurements = await asyncio.to_thread(withings.get_measurements, startdate, now)
 
         weight_entries = [m for m in measurements if "weight_kg" in m]
         if not weight_entries:
@@ -103,7 +104,7 @@ async def get_blood_pressure(from_date: str, to_date: str) -> dict:
     try:
         startdate = _date_to_timestamp(from_date)
         enddate = _date_to_timestamp(to_date, end_of_day=True)
-        measurements = withings.get_measurements(startdate, enddate)
+        measurements = await asyncio.to_thread(withings.get_measurements, startdate, enddate)
 
         # Filter to only entries that have BP data
         bp_entries = [m for m in measurements if "systolic_mmhg" in m or "diastolic_mmhg" in m]
@@ -132,7 +133,7 @@ async def get_body_composition_trend(weeks: int = 8) -> dict:
     try:
         now = int(time.time())
         startdate = now - (weeks * 7 * 86400)
-        measurements = withings.get_measurements(startdate, now)
+        measurements = await asyncio.to_thread(withings.get_measurements, startdate, now)
 
         weight_entries = [m for m in measurements if "weight_kg" in m]
         if not weight_entries:
@@ -189,6 +190,12 @@ async def measure_types_resource() -> str:
     return json.dumps(fields, indent=2)
 
 
+@mcp.resource("withings://request-stats")
+async def request_stats_resource() -> dict:
+    """Single-flight counters: ``collapsed`` calls shared an identical in-flight request instead of calling Withings."""
+    return {"single_flight": withings.flights.stats()}
+
+
 # ── Helpers ────────────────────────────────────────────────────────────
 
 
@@ -176,3 +176,37 @@ class TestGetBodyCompositionTrend:
         _wired.get_measurements.side_effect = WithingsAPIError("api_error", "Failed", "Retry")
         result = await get_body_composition_trend()
         assert result["error"] == "api_error"
+
+
+class TestSingleFlight:
+    @pytest.mark.asyncio()
+    async def test_concurrent_identical_calls_make_one_upstream_request(self, monkeypatch):
+        import asyncio
+        import threading
+
+        import withings_mcp.server as srv
+        from withings_mcp.client import WithingsClient
+
+        from ..conftest import make_mock_measure_group
+
+        client = WithingsClient(Settings())
+        release = threading.Event()
+        account = MagicMock()
+        account.get_measurements.side_effect = lambda *_: release.wait(5) and [make_mock_measure_group()]
+        client._account = account
+        monkeypatch.setattr(srv, "withings", client)
+
+        calls = asyncio.gather(
+            srv.get_measurements("2026-03-01", "2026-03-10"),
+            srv.get_measurements("2026-03-01", "2026-03-10"),
+        )
+        while client.flights.stats()["collapsed"] < 1:  # the second call joined the first
+            await asyncio.sleep(0.01)
+        release.set()
+        first, second = await calls
+
+        assert account.get_measurements.call_count == 1
+        assert first == second
+        assert first["count"] == 1
+        stats = await srv.request_stats_resource()
+        assert stats["single_flight"] == {"calls": 2, "collapsed": 1, "in_flight": 0}
@@ -2,11 +2,14 @@
 
 from __future__ import annotations
 
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from unittest.mock import MagicMock, patch
 
 import pytest
 
-from withings_mcp.client import WithingsAPIError, WithingsClient, _parse_group
+from withings_mcp.client import SingleFlight, WithingsAPIError, WithingsClient, _parse_group
 from withings_mcp.config import Settings
 
 from ..conftest import make_mock_bp_group, make_mock_measure_group
@@ -52,6 +55,49 @@ class TestParseGroup:
         assert "muscle_mass_kg" not in result
 
 
+class TestSingleFlight:
+    def test_concurrent_calls_share_one_result(self):
+        flights = SingleFlight()
+        calls = []
+
+        def fetch():
+            calls.append(1)
+            time.sleep(0.05)
+            return [{"weight_kg": 80.0}]
+
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            results = list(pool.map(lambda _: flights.do("k", fetch), range(4)))
+        assert len(calls) == 1
+        assert results == [[{"weight_kg": 80.0}]] * 4
+        assert len({id(r) for r in results}) == 4  # waiting threads get copies
+        assert flights.stats() == {"calls": 4, "collapsed": 3, "in_flight": 0}
+
+    def test_error_is_shared(self):
+        flights = SingleFlight()
+        started = threading.Event()
+
+        def fail():
+            started.set()
+            time.sleep(0.05)
+            raise WithingsAPIError(code="api_error", message="boom", action="retry")
+
+        def run(_):
+            try:
+                flights.do("k", fail)
+            except WithingsAPIError as e:
+                return str(e)
+
+        with ThreadPoolExecutor(max_workers=3) as pool:
+            assert list(pool.map(run, range(3))) == ["boom"] * 3
+        assert flights.stats()["calls"] == 3
+
+    def test_sequential_calls_are_not_collapsed(self):
+        flights = SingleFlight()
+        assert flights.do("k", lambda: 1) == 1
+        assert flights.do("k", lambda: 2) == 2
+        assert flights.stats()["collapsed"] == 0
+
+
 class TestWithingsClient:
     def test_ensure_account_caches(self):
         settings = Settings()
@@ -124,3 +170,31 @@ class TestWithingsClient:
 
         result = client.get_height()
         assert result == 1.78
+
+    def test_concurrent_first_calls_log_in_once(self):
+        client = WithingsClient(Settings())
+        account = MagicMock()
+
+        def create(_folder):
+            time.sleep(0.05)
+            return account
+
+        with (
+            patch("withings_mcp.auth.create_account", side_effect=create) as mock_create,
+            ThreadPoolExecutor(max_workers=4) as pool,
+        ):
+            accounts = list(pool.map(lambda _: client._ensure_account(), range(4)))
+        assert mock_create.call_count == 1
+        assert all(a is account for a in accounts)
+
+    def test_concurrent_identical_reads_share_one_request(self):
+        client = WithingsClient(Settings())
+        mock_account = MagicMock()
+        mock_account.get_measurements.side_effect = lambda *_: time.sleep(0.05) or [make_mock_measure_group()]
+        client._account = mock_account
+
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            results = list(pool.map(lambda _: client.get_measurements(1000, 2000), range(4)))
+        assert all(r == results[0] for r in results)
+        assert mock_account.get_measurements.call_count == 1
+        assert client.flights.stats()["collapsed"] == 3